@@ -5,8 +5,11 @@ import aiohttp
 from ops.data_ops import sort_list_dict
 from ops.log_ops import get_logger
 from ops.net_ops import read_capped, unpack_zstd_peer, MAX_PEER_BODY
+from ops.peer_transport import decode, peer_session
+from ops.status_core import unpack_core, CORE_MAX_BYTES
 from config import hostport
-"""this module is optimized for low memory and bandwidth usage"""
+"""this module is optimized for low memory and bandwidth usage; every request rides the pooled keep-alive
+session of ops/peer_transport (per-request timeouts — the session is shared)"""
 
 
 async def get_list_of(key, peer, port, fail_storage, logger, semaphore, compress=None):
@@ -22,11 +25,11 @@ async def get_list_of(key, peer, port, fail_storage, logger, semaphore, compress
     try:
         async with semaphore:
             
-            async with aiohttp.ClientSession(timeout = aiohttp.ClientTimeout(total=5)) as session:
-                async with session.get(url_construct) as response:
+            async with peer_session() as session:
+                async with session.get(url_construct, timeout=aiohttp.ClientTimeout(total=5)) as response:
                     body = await read_capped(response, MAX_PEER_BODY)   # anti-OOM: cap untrusted peer body
                     if compress == "zstd":
-                        fetched = unpack_zstd_peer(body)                # bomb-capped zstd(msgpack) wire
+                        fetched = await decode(unpack_zstd_peer, body)  # bomb-capped zstd(msgpack) wire
                     else:
                         fetched = json.loads(body.decode())[key]
         return fetched
@@ -63,19 +66,25 @@ async def compound_get_list_of(key, entries, port, logger, fail_storage, semapho
     return sort_list_dict(success_storage)
 
 
-async def get_tx_ids_of(peer, port, logger, fail_storage, semaphore):
-    """GET /transaction_ids from one peer -> (peer, [txid,...]) or None. A peer that cannot serve
-    the reconciliation wire is treated like any other failing peer (fail_storage -> purge queue) —
-    NO legacy-wire tolerance on betanet; the whole mesh speaks one protocol version."""
+async def get_tx_ids_of(peer, port, logger, fail_storage, semaphore, sketch=None):
+    """GET /transaction_ids from one peer -> (peer, [txid,...]) or, when `sketch` (a log2 size) is asked
+    and the peer's pool is big enough to make one worth it, (peer, {"sketch": <IBLT bytes>}) — see
+    ops/pool_sketch. None on failure. A peer that cannot serve the reconciliation wire is treated like any
+    other failing peer (fail_storage -> purge queue) — NO legacy-wire tolerance on betanet; the whole mesh
+    speaks one protocol version."""
     url_construct = f"http://{hostport(peer, port)}/transaction_ids?compress=zstd"
+    if sketch:
+        url_construct += f"&sketch={int(sketch)}"
     try:
         async with semaphore:
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5)) as session:
-                async with session.get(url_construct) as response:
+            async with peer_session() as session:
+                async with session.get(url_construct, timeout=aiohttp.ClientTimeout(total=5)) as response:
                     if response.status != 200:
                         raise ValueError(f"HTTP {response.status}")
                     body = await read_capped(response, MAX_PEER_BODY)
-                    fetched = unpack_zstd_peer(body)
+                    fetched = await decode(unpack_zstd_peer, body)
+                    if isinstance(fetched, dict) and sketch and isinstance(fetched.get("sketch"), bytes):
+                        return peer, {"sketch": fetched["sketch"]}
                     if not isinstance(fetched, list):
                         raise ValueError("malformed id list")
                     return peer, fetched
@@ -86,10 +95,12 @@ async def get_tx_ids_of(peer, port, logger, fail_storage, semaphore):
         return None
 
 
-async def compound_get_tx_ids(ips, port, logger, fail_storage, semaphore):
-    """{peer: [txid,...]} for every peer that answered /transaction_ids — the cheap half of mempool
-    set reconciliation (ids are ~64B vs ~7KB per full ML-DSA tx)."""
-    results = await asyncio.gather(*[get_tx_ids_of(ip, port, logger, fail_storage, semaphore) for ip in ips])
+async def compound_get_tx_ids(ips, port, logger, fail_storage, semaphore, sketch=None):
+    """{peer: [txid,...] or {"sketch": bytes}} for every peer that answered /transaction_ids — the cheap
+    half of mempool set reconciliation (ids are ~64B vs ~7KB per full ML-DSA tx; a sketch is sized by the
+    pools' difference, not by the pool)."""
+    results = await asyncio.gather(*[get_tx_ids_of(ip, port, logger, fail_storage, semaphore, sketch)
+                                     for ip in ips])
     return {peer: ids for peer, ids in filter(None, results)}
 
 
@@ -105,12 +116,13 @@ async def post_txs_by_id(peer, port, txids, logger, fail_storage, semaphore):
             # tx when push-gossip fails, so it must be able to carry the biggest legitimate tx there is: an
             # inline settle proof at ~120 MiB. With both paths timing out, a proof-carrying settle could
             # reach a peer by neither route. read_capped already bounds the body at MAX_PEER_BODY.
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=300)) as session:
-                async with session.post(url_construct, data=codec.pack(list(txids))) as response:
+            async with peer_session() as session:
+                async with session.post(url_construct, data=codec.pack(list(txids)),
+                                        timeout=aiohttp.ClientTimeout(total=300)) as response:
                     if response.status != 200:
                         return []
                     body = await read_capped(response, MAX_PEER_BODY)
-                    fetched = unpack_zstd_peer(body)
+                    fetched = await decode(unpack_zstd_peer, body)
                     return fetched if isinstance(fetched, list) else []
     except Exception as e:
         if peer not in fail_storage:
@@ -139,8 +151,9 @@ async def send_transaction(peer, port, logger, fail_storage, transaction, semaph
     _timeout = max(5.0, len(_body) / (2 << 20) + 180.0)
     try:
         async with semaphore:
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=_timeout)) as session:
-                async with session.post(url_construct, data=_body) as response:
+            async with peer_session() as session:
+                async with session.post(url_construct, data=_body,
+                                        timeout=aiohttp.ClientTimeout(total=_timeout)) as response:
                     body = await response.json(content_type=None)
                     return peer, (body.get("message") if isinstance(body, dict) else body)
     except Exception as e:
@@ -166,9 +179,13 @@ async def compound_send_transaction(ips, port, logger, fail_storage, transaction
 
 
 async def get_status(peer, port, logger, fail_storage, semaphore, compress=None):
-    """method compounded by compound_get_status_pool"""
+    """method compounded by compound_get_status_pool. compress="core" fetches the binary core record
+    (/status_core, ops/status_core) — the consensus subset, a fraction of the bytes and decode of the full
+    status — and falls back to the full zstd /status for a peer that does not serve it (mid-rollout)."""
 
-    if compress:
+    if compress == "core":
+        url_construct = f"http://{hostport(peer, port)}/status_core"
+    elif compress:
         url_construct = f"http://{hostport(peer, port)}/status?compress={compress}"
     else:
         url_construct = f"http://{hostport(peer, port)}/status"
@@ -176,11 +193,17 @@ async def get_status(peer, port, logger, fail_storage, semaphore, compress=None)
     try:
         async with semaphore:
             
-            async with aiohttp.ClientSession(timeout = aiohttp.ClientTimeout(total=5)) as session:
-                async with session.get(url_construct) as response:
+            async with peer_session() as session:
+                if compress == "core":
+                    async with session.get(url_construct, timeout=aiohttp.ClientTimeout(total=5)) as response:
+                        if response.status == 200:
+                            return peer, unpack_core(await read_capped(response, CORE_MAX_BYTES))
+                    compress = "zstd"
+                    url_construct = f"http://{hostport(peer, port)}/status?compress=zstd"
+                async with session.get(url_construct, timeout=aiohttp.ClientTimeout(total=5)) as response:
                     body = await read_capped(response, MAX_PEER_BODY)   # anti-OOM: cap untrusted peer body
                     if compress == "zstd":
-                        fetched = unpack_zstd_peer(body)                # bomb-capped zstd(msgpack) wire
+                        fetched = await decode(unpack_zstd_peer, body)  # bomb-capped zstd(msgpack) wire
                     else:
                         fetched = json.loads(body.decode())
 
@@ -217,8 +240,8 @@ async def announce_self(peer, port, my_ip, fail_storage, semaphore):
     try:
         async with semaphore:
             
-            async with aiohttp.ClientSession(timeout = aiohttp.ClientTimeout(total=5)) as session:
-                async with session.get(url_construct) as response:
+            async with peer_session() as session:
+                async with session.get(url_construct, timeout=aiohttp.ClientTimeout(total=5)) as response:
                     fetched = await response.text()
                     return fetched
 
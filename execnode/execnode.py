@@ -22,6 +22,7 @@ Query:  curl localhost:9273/exec/root
         curl 'localhost:9273/exec/view?cid=<id>&method=balanceOf&args=["<address>"]'
 """
 import asyncio
+import hashlib
 import json
 import os
 import sys
@@ -36,6 +37,7 @@ from aiohttp import web
 
 from execnode.state import ExecState
 from execnode import shielded_state as _appstate
+from execnode import parallel_exec
 
 L1 = os.environ.get("NADO_L1_URL", "http://127.0.0.1:9173").rstrip("/")
 STATE_PATH = os.environ.get("NADO_EXEC_STATE", "exec_state.json")
@@ -316,7 +318,7 @@ def _rewind_to(cursor):
     """Restore every namespace from its rewind source at `cursor` and reset the derived globals, exactly
     as _reset_states_to_genesis does minus the wipe. Stash entries ABOVE the cursor are from the abandoned
     chain and are dropped; the DA store is untouched (content-addressed). Returns True on success."""
-    global _last_settled_cursor, prov_states, _prov_key, _prov_last, _prov_since_full
+    global _last_settled_cursor, prov_states, _prov_key, _prov_last, _prov_since_full, _prov_stack
     sources = _rewind_sources()
     restored = {}
     for ns, st in states.items():
@@ -346,6 +348,7 @@ def _rewind_to(cursor):
     _prov_key = None
     _prov_last = None
     _prov_since_full = 0
+    _prov_stack = []
     # stash entries above the rewind point describe the dead chain
     for ns, hist in list(_settled_history.items()):
         for c in [c for c in hist if c > cursor]:
@@ -1116,7 +1119,8 @@ def _reset_states_to_genesis(reason="", keep_da=False):
     Both leave exec running on OLD-chain state whose cursor OUTRUNS the fresh L1 chain. Stale exec and fresh L1
     share no overlapping heights, so there's nothing to hash-compare — the tail loop detects the height inversion
     (cursor > finalized, impossible on a consistent chain) and calls this to self-heal."""
-    global states, state, DA, _last_settled_cursor, prov_states, _prov_key, _prov_last, _prov_since_full
+    global states, state, DA, _last_settled_cursor, prov_states, _prov_key, _prov_last, _prov_since_full, \
+        _prov_stack
     import glob as _g
     import shutil as _s
     print(f"[execnode] RESET to genesis{(' — ' + reason) if reason else ''}: wiping exec state"
@@ -1145,6 +1149,7 @@ def _reset_states_to_genesis(reason="", keep_da=False):
     _prov_key = None
     _prov_last = None
     _prov_since_full = 0
+    _prov_stack = []
     try:
         with open(_EXEC_GEN_MARK, "w") as _f:      # re-stamp so a subsequent reroll is still detected once
             _f.write(str(_CHAIN_GENERATION))
@@ -1160,9 +1165,9 @@ def _state_for(request):
     finalized state (a plain fetch, no ?provisional)."""
     ns = request.query.get("ns", "default")
     if request.query.get("provisional") in ("1", "true", "yes"):
-        pv = prov_states
-        if pv is not None and ns in pv:
-            return pv[ns]
+        pv = _prov_for(ns)
+        if pv is not None:
+            return pv
     return states.get(ns)
 
 
@@ -2547,7 +2552,14 @@ async def _apply_block(session, states_map, default_state, block, verbose=True):
             except Exception as e:
                 if verbose:
                     print(f"[execnode] block {h}: skipping {d.get('op')} with bad DA proof ({type(e).__name__})", flush=True)
-    for tx in block.get("block_transactions", []):
+    # PARALLEL SPECULATION (execnode/parallel_exec.py): a busy block's zkvm calls run ahead in forked workers
+    # against the state as the block found it; below, each call adopts its speculative run only if nothing it
+    # read has moved since, so the block applies exactly as sequentially — just with fewer VM runs in line.
+    # THREADED: the pool wait (up to SPECULATE_TIMEOUT on a wedged worker) must not hold the HTTP loop that
+    # serves /exec/root and /exec/view. Nothing that runs meanwhile can change an answer — every adopted
+    # run is re-checked against the live state.
+    specs = await asyncio.to_thread(parallel_exec.speculate, states_map, block.get("block_transactions", []))
+    for i, tx in enumerate(block.get("block_transactions", [])):
       # PER-TX GUARD (halt-class, audit 2026-07): this DISPATCH code — not apply_blob, which is already
       # fully guarded — used a payload field (`ns`) as a dict key with no type check, so a blob carrying an
       # unhashable ns raised TypeError HERE and aborted the whole block before the cursor advance below. The
@@ -2564,7 +2576,7 @@ async def _apply_block(session, states_map, default_state, block, verbose=True):
             bns = d.get("ns", "default") if isinstance(d, dict) else "default"
             tgt = states_map.get(bns) if isinstance(bns, str) else None
             if tgt is not None:
-                res = tgt.apply_blob(d, tx.get("sender"), tx.get("txid"))
+                res = tgt.apply_blob(d, tx.get("sender"), tx.get("txid"), spec=specs.get(i))
                 if verbose:
                     print(f"[execnode] block {h} ns={bns}: {res}", flush=True)
         elif r == "xmsg":
@@ -2637,6 +2649,8 @@ async def _apply_block(session, states_map, default_state, block, verbose=True):
         # same tx and skips identically, so no fork. (apply_blob's own effects are already guarded upstream.)
         if verbose:
             print(f"[execnode] block {h}: skipped tx {(tx.get('txid') or '')[:12]}… ({type(e).__name__}: {e})", flush=True)
+    if verbose and specs:
+        print(f"[execnode] block {h}: {sum(s.adopted for s in specs.values())}/{len(specs)} speculative calls adopted", flush=True)
     for _st in states_map.values():
         _st.cursor = h
         # TIME opcode: the DETERMINISTIC chain clock, NOT block_timestamp. block_timestamp sits outside the
@@ -2665,6 +2679,55 @@ _prov_since_full = 0
 _prov_div_epoch = None
 PROV_FULL_EVERY = 50
 PROV_DEBUG = os.environ.get("NADO_EXEC_PROV_DEBUG") == "1"
+# THE LAYER STACK (execnode/overlay.py): one (height, block_hash, {ns: layer}) per applied unfinalized block,
+# oldest first; each layer is a copy-on-write ExecOverlay over the one before it, the first over the
+# finalized state. prov_states is the top entry's map. A reorg pops the orphaned entries, a finality advance
+# drops the finalized ones — neither re-executes anything below the fork point.
+_prov_stack = []
+# how many tail heights a reorg check re-probes before giving up and rebuilding (reorgs are 1-2 blocks)
+PROV_REORG_PROBES = max(1, int(os.environ.get("NADO_EXEC_PROV_REORG_PROBES", "6")))
+
+
+def _prov_for(ns):
+    """The provisional state for `ns`, or None when there is none or it is BEHIND the finalized state.
+
+    A tail layer reads through to the live finalized state (execnode/overlay.py), which is exact while the
+    tail covers every block the finalized state has applied. Between the finalized tail jumping past the
+    whole provisional tail and the next _refresh_provisional, it does not — the view would be a mix of two
+    cursors — so readers get the finalized state, which is then the newer of the two anyway."""
+    pv = prov_states
+    st = pv.get(ns) if pv else None
+    fin = states.get(ns)
+    if st is None or (fin is not None and st.cursor < fin.cursor):
+        return None
+    return st
+
+
+async def _extend_tail(session, top, h, tip, clock=None):
+    """Apply blocks h..tip, each onto a fresh layer over the previous one (the first over `top`, a
+    {ns: state} map). Returns (layers, next height); stops at the first unfetchable, body-less or stalled
+    block, whose empty layer is dropped. `clock` accumulates clone/fetch/apply seconds for the audit line."""
+    layers = []
+    while h <= tip:
+        _m = time.time()
+        block = await _get_json(session, f"/get_block?number={h}")
+        if clock is not None:
+            clock["fetch"] += time.time() - _m
+        if not isinstance(block, dict) or "block_transactions" not in block:
+            break                                # unfetchable / body-less -> stop the speculative tail here
+        _m = time.time()
+        nxt = {ns: st.clone() for ns, st in top.items()}
+        if clock is not None:
+            clock["clone"] += time.time() - _m
+        _m = time.time()
+        ok = await _apply_block(session, nxt, nxt.get("default"), block, verbose=False)
+        if clock is not None:
+            clock["apply"] += time.time() - _m
+        if not ok:
+            break
+        layers.append((h, block.get("block_hash"), nxt))
+        top, h = nxt, h + 1
+    return layers, h
 
 
 async def _refresh_provisional(session, finalized, tip, tip_hash=None):
@@ -2681,21 +2744,29 @@ async def _refresh_provisional(session, finalized, tip, tip_hash=None):
     finalized(F+1) + blocks F+2..T+1, and finalized(F+1) is finalized(F) + block F+1 — so it equals the tail
     we already applied plus the one new block. The window slides; the applied set only grows. What must NOT
     be assumed is that the chain under us is the same one, so the anchor block is re-checked by hash every
-    poll (one request) and ANY mismatch — reorg, re-anchor, shorter chain — falls back to the full rebuild.
-    A periodic forced rebuild bounds any drift the incremental path could ever accumulate."""
-    global prov_states, _prov_key, _prov_last, _prov_since_full, _prov_div_epoch
+    poll (one request). A mismatch re-probes the tail's lower layers (up to PROV_REORG_PROBES) and pops the
+    orphaned ones, re-applying only from the fork point; a re-anchor deeper than that, a shorter chain or a
+    changed finalized state falls back to the full rebuild. A periodic forced rebuild bounds any drift the
+    incremental path could ever accumulate.
+
+    The tail is a stack of copy-on-write layers, one per block (execnode/overlay.py), so neither path
+    copies the state: a rebuild costs the re-execution and nothing else, and an extension costs the new
+    blocks. Layers at or below the finalized height are dropped by re-basing the lowest kept one onto the
+    finalized state, which by then has applied exactly those blocks."""
+    global prov_states, _prov_key, _prov_last, _prov_since_full, _prov_div_epoch, _prov_stack
     tip = min(tip, finalized + PROV_MAX_TAIL)
     if tip <= finalized:
         prov_states = None
         _prov_key = None
         _prov_last = None
+        _prov_stack = []
         return
     key = (finalized, tip, tip_hash, sum(st._mut_gen for st in states.values()))
     if prov_states is not None and tip_hash is not None and key == _prov_key:
         return                                   # nothing changed since the last COMPLETE build — keep it
 
-    t0, start_h = time.time(), finalized + 1
-    clones, h, keep = None, finalized + 1, False
+    t0 = time.time()
+    stack, keep = None, False
     # THE ACCRUAL FENCE. Extending assumes the finalized state moved ONLY by applying blocks — that is the
     # whole algebra in the docstring above. The presence-dividend accrual breaks it: it runs in the poll
     # loop AFTER a batch of blocks, writes state.dividend (a state_root leaf, exec_root T_DIV_BAL), and the
@@ -2713,29 +2784,43 @@ async def _refresh_provisional(session, finalized, tip, tip_hash=None):
     _div_epoch_now = getattr(states.get("default"), "last_div_epoch", None)
     if (prov_states is not None and _prov_last and _prov_since_full < PROV_FULL_EVERY
             and finalized <= _prov_last[0] < tip
-            and _prov_div_epoch == _div_epoch_now):
-        anchor = await _get_json(session, f"/get_block?number={_prov_last[0]}")
-        if isinstance(anchor, dict) and anchor.get("block_hash") == _prov_last[1]:
-            # same chain: keep the tail we already executed and add only what's new. Clone it rather than
-            # mutating in place — readers hold prov_states while we work, and a half-applied block is a
-            # board that shows a bet placed and the balance not yet moved. The clone is what the old code
-            # paid every poll anyway; the replay it replaces is the part that cost 20 seconds.
-            clones, h, keep = {ns: st.clone() for ns, st in prov_states.items()}, _prov_last[0] + 1, True
-    if clones is None:
-        clones, h, keep = {ns: st.clone() for ns, st in states.items()}, finalized + 1, False
+            and _prov_div_epoch == _div_epoch_now
+            and _prov_stack and _prov_stack[-1][0] == _prov_last[0]
+            and all(set(m) == set(states) and all(layer.base() is states[ns] for ns, layer in m.items())
+                    for _h, _bh, m in _prov_stack)):
+        # same chain up to some layer: keep the tail we already executed and add only what's new. New
+        # blocks go on NEW layers — readers hold prov_states while we work, and a half-applied block is a
+        # board that shows a bet placed and the balance not yet moved; the layers they hold never change.
+        cand = list(_prov_stack)
+        for _probe in range(PROV_REORG_PROBES):
+            if not cand:
+                break
+            anchor = await _get_json(session, f"/get_block?number={cand[-1][0]}")
+            if not isinstance(anchor, dict):
+                break                            # can't tell -> rebuild, as a failed anchor fetch always did
+            if anchor.get("block_hash") == cand[-1][1]:
+                stack, keep = cand, True
+                break
+            cand.pop()                           # orphaned by a reorg: drop the layer, probe the one below
+            if cand and cand[-1][0] <= finalized:
+                break                            # a reorg reaching into finalized history: rebuild
+        if keep:
+            # FINALITY: layers whose block is now finalized are already in the finalized state — drop them
+            # and let the lowest kept layer read straight through to it (overlay.ExecOverlay.rebase).
+            fin = [e for e in stack if e[0] <= finalized]
+            stack = [e for e in stack if e[0] > finalized]
+            if fin and stack:
+                for ns, layer in stack[0][2].items():
+                    layer.rebase(states[ns])
+    if stack is None:
+        stack = []
         _prov_since_full = 0
         _prov_div_epoch = _div_epoch_now      # this tail is forked from THIS dividend generation
+    h = (stack[-1][0] + 1) if stack else finalized + 1
     start_h = h
-    default_clone = clones.get("default")
-    last = _prov_last if keep else None
-    while h <= tip:
-        block = await _get_json(session, f"/get_block?number={h}")
-        if not isinstance(block, dict) or "block_transactions" not in block:
-            break                                # unfetchable / body-less -> stop the speculative tail here
-        if not await _apply_block(session, clones, default_clone, block, verbose=False):
-            break
-        last = (h, block.get("block_hash"))
-        h += 1
+    layers, h = await _extend_tail(session, stack[-1][2] if stack else dict(states), h, tip)
+    stack = stack + layers
+    clones = stack[-1][2] if stack else {ns: st.clone() for ns, st in states.items()}
     # AUDIT: every PROV_FULL_EVERY polls the extended tail is re-derived from the finalized checkpoint and
     # the two are compared root-for-root. The incremental path must be bit-identical to the rebuild — this
     # state root is what the bonded quorum settles on L1 — so rather than trust the argument, prove it on
@@ -2748,25 +2833,12 @@ async def _refresh_provisional(session, finalized, tip, tip_hash=None):
         # HTTP) is NOT it: 46 blocks fetch in 0.5s when measured directly. So split the clock three ways
         # — clone, fetch, apply — and let the next occurrence say which one owns the minutes, instead of
         # guessing at a fix for the wrong bottleneck.
-        _t_clone = time.time()
-        fresh = {ns: st.clone() for ns, st in states.items()}
-        _t_clone = time.time() - _t_clone
-        _t_fetch = _t_apply = 0.0
-        fdef, fh = fresh.get("default"), finalized + 1
-        while fh <= tip:
-            _m = time.time()
-            b = await _get_json(session, f"/get_block?number={fh}")
-            _t_fetch += time.time() - _m
-            if not isinstance(b, dict) or "block_transactions" not in b:
-                break
-            _m = time.time()
-            _ok_apply = await _apply_block(session, fresh, fdef, b, verbose=False)
-            _t_apply += time.time() - _m
-            if not _ok_apply:
-                break
-            fh += 1
-        print(f"[execnode] prov AUDIT rebuild {finalized}..{tip}: clone {_t_clone:.1f}s · "
-              f"fetch {_t_fetch:.1f}s · apply {_t_apply:.1f}s · {fh - (finalized + 1)} block(s)", flush=True)
+        clock = {"clone": 0.0, "fetch": 0.0, "apply": 0.0}
+        fresh_layers, fh = await _extend_tail(session, dict(states), finalized + 1, tip, clock)
+        fresh = fresh_layers[-1][2] if fresh_layers else {}
+        print(f"[execnode] prov AUDIT rebuild {finalized}..{tip}: clone {clock['clone']:.1f}s · "
+              f"fetch {clock['fetch']:.1f}s · apply {clock['apply']:.1f}s · {fh - (finalized + 1)} block(s)",
+              flush=True)
         if fh > tip:
             bad = [ns for ns in fresh if ns in clones and fresh[ns].state_root() != clones[ns].state_root()]
             if bad:
@@ -2799,15 +2871,16 @@ async def _refresh_provisional(session, finalized, tip, tip_hash=None):
                       f"incremental tail disagreed with the rebuild; using the rebuild"
                       + ("  ||  " + "; ".join(detail[:8]) if detail else "  ||  roots differ, no component diff"),
                       flush=True)
-            clones = fresh
+            stack, clones = fresh_layers, fresh
             _prov_since_full = -1                # this WAS the full build; start the next window from it
             _prov_div_epoch = _div_epoch_now     # ...and it is forked from the current dividend generation
 
     if PROV_DEBUG:
         print(f"[execnode] prov {'extend' if keep else 'FULL'} {finalized}..{tip} "
-              f"applied={h - (start_h)} in {time.time() - t0:.2f}s", flush=True)
+              f"applied={h - (start_h)} layers={len(stack)} in {time.time() - t0:.2f}s", flush=True)
     prov_states = clones
-    _prov_last = last
+    _prov_stack = stack
+    _prov_last = (stack[-1][0], stack[-1][1]) if stack else None
     _prov_since_full += 1
     # record the key only for a COMPLETE build; a partial one (fetch break) must retry next poll
     _prov_key = key if h > tip else None
@@ -2883,7 +2956,7 @@ async def _repair_bootstrap(session):
     settle-activity window (SETTLE_ACTIVITY_CURSORS), the remaining complete node(s) justify a FRESH
     cursor, and THAT checkpoint is servable. Called inline from the tail (single-task, so it can
     never race _apply_block), throttled to every _REPAIR_EVERY seconds."""
-    global _last_settled_cursor, prov_states, _prov_key, _prov_last, _prov_since_full
+    global _last_settled_cursor, prov_states, _prov_key, _prov_last, _prov_since_full, _prov_stack
     import threading as _threading
     need = [ns for ns, st in states.items() if st.cursor >= 0 and not st.state_complete()]
     if not need:
@@ -2936,6 +3009,7 @@ async def _repair_bootstrap(session):
                 _prov_key = None
                 _prov_last = None
                 _prov_since_full = 0
+                _prov_stack = []
                 print(f"[execnode] REPAIR-BOOTSTRAPPED ns={ns} from {donor} at settled cursor "
                       f"{st.cursor} root {root[:16]}… (verified against L1 quorum) — provenance "
                       f"restored, settle attestations re-enabled", flush=True)
@@ -3054,7 +3128,7 @@ async def _anchor_adopt(session, finalized):
         detector and reset the state to genesis — measured code path, not a hypothetical)
       * one adoption per freeze episode (anchor_adopted_at rate-limit)
       * the anchor node itself never adopts."""
-    global _last_settled_cursor, prov_states, _prov_key, _prov_last, _prov_since_full
+    global _last_settled_cursor, prov_states, _prov_key, _prov_last, _prov_since_full, _prov_stack
     import threading as _threading
     if _anchor_self():
         return
@@ -3124,6 +3198,7 @@ async def _anchor_adopt(session, finalized):
                 _prov_key = None
                 _prov_last = None
                 _prov_since_full = 0
+                _prov_stack = []
                 print(f"[execnode] ANCHOR ADOPTION ns={ns}: quorum frozen at {settled_cur} for "
                       f"{st.cursor - settled_cur}+ cursors — adopted the anchor lineage from {donor} at "
                       f"cursor {snap_cur} root {root[:16]}… (verified against the anchor's signed settle "
@@ -4001,7 +4076,24 @@ async def h_view(request):
     # the browser JSON.parses it (amounts over ~900k NADO, hashes, commitments). Emit it as a STRING so the
     # client can BigInt() it exactly; Number("123") still works for small legacy readers (forward-compatible).
     _ret = st.view(cid, method, args)
-    return web.json_response({"cid": cid, "method": method, "result": None if _ret is None else str(_ret)})
+    # REVALIDATION. Frontends poll the same view every tick; the ETag is a digest of the exact reply, so a
+    # poller that echoes it in If-None-Match (nadodapp.js view()) gets a bodiless 304 until the answer
+    # itself changes. _cors still stamps no-store — the poller keeps the tag itself, no proxy ever does.
+    body = json.dumps({"cid": cid, "method": method, "result": None if _ret is None else str(_ret)})
+    etag = '"' + hashlib.blake2b(body.encode(), digest_size=16).hexdigest() + '"'
+    headers = {"ETag": etag, "Access-Control-Expose-Headers": "ETag"}
+    if etag in (t.strip() for t in request.headers.get("If-None-Match", "").split(",")):
+        return web.Response(status=304, headers=headers)
+    return web.Response(text=body, content_type="application/json", headers=headers)
+
+
+async def h_view_stats(request):
+    """GET /exec/view_stats: hit/miss counters and occupancy of each namespace's view result cache
+    (ExecState.view), finalized and — when a tail is up — provisional."""
+    out = {ns: st.view_stats() for ns, st in states.items()}
+    pv = prov_states
+    prov = {ns: st.view_stats() for ns, st in pv.items()} if pv else {}
+    return web.json_response({"finalized": out, "provisional": prov})
 
 
 # (coinflip read endpoints removed — the Coin Flip dApp reads its state from the generic /exec/contract
@@ -4020,9 +4112,10 @@ async def h_blockhash(request):
     reverts and the player re-acts — a visible retry, never silent unfairness. It cuts the reveal wait from
     ~FINALITY_DEPTH blocks (~90s) to ~one block (~6-18s)."""
     ns = request.query.get("ns", "default")
-    if request.query.get("provisional") in ("1", "true", "yes") and prov_states and ns in prov_states:
-        st = prov_states[ns]           # fast pre-finality tail (opt-in; public+validated randomness only)
-    else:
+    st = None
+    if request.query.get("provisional") in ("1", "true", "yes"):
+        st = _prov_for(ns)             # fast pre-finality tail (opt-in; public+validated randomness only)
+    if st is None:
         st = states.get(ns)            # finalized: immutable, safe for hidden info
     if st is None:
         return _NS404()
@@ -4081,10 +4174,10 @@ async def h_bridge(request):
     bridge balances live on the DEFAULT layer regardless of ?ns=, so pick the default clone directly."""
     st = state
     if request.query.get("provisional") in ("1", "true", "yes"):
-        pv = prov_states
-        if pv is not None and "default" in pv:
-            st = pv["default"]
-    return web.json_response({"balances": st.bridge, "withdrawals": st.withdrawals, "cursor": st.cursor})
+        st = _prov_for("default") or st
+    # .copy(): a provisional layer's maps are LayerDicts (execnode/overlay.py), which json cannot encode
+    return web.json_response({"balances": st.bridge.copy(), "withdrawals": st.withdrawals.copy(),
+                              "cursor": st.cursor})
 
 
 async def h_assets(request):
@@ -4531,6 +4624,7 @@ async def main():
                     web.get("/exec/contracts", h_contracts),
                     web.get("/exec/contract", h_contract),
                     web.get("/exec/view", h_view),
+                    web.get("/exec/view_stats", h_view_stats),
                     web.get("/exec/blockhash", h_blockhash),
                     web.get("/exec/outbox", h_outbox),
                     web.get("/exec/outbox_proof", h_outbox_proof),
@@ -0,0 +1,281 @@
+"""
+COPY-ON-WRITE exec state: the layered ExecState the provisional tail runs on (execnode._refresh_provisional).
+
+WHY. ExecState.clone() used to be copy.deepcopy(self._snapshot()) + _restore — every contract's code and
+storage, every balance, the 20000-entry blockhash ring and both note pools, copied in full, and then a COLD
+build of both depth-256 half-trees the first time anybody asked the clone for its root. The provisional
+refresh paid that on every full rebuild and on every extension, and the PROV_FULL_EVERY audit paid it once
+more for its second tail. All of it for a view that differs from the finalized state by one finality
+window's worth of writes.
+
+An ExecOverlay holds only those writes. Reads fall through to the state below it; writes land in a per-layer
+delta; the state below is never touched. Creating one is O(1) — a handful of empty dicts plus the scalars
+(cursor, nonces, floors) — and its memory is what the tail wrote, plus what it read up for writing.
+Overlays STACK: the provisional tail keeps one layer per unfinalized block on top of the finalized state, so
+a reorg drops the orphaned layers and a finality advance drops the finalized ones, and neither re-executes
+the blocks in between.
+
+THE RULES THAT MAKE IT EXACT
+  * A dict field becomes a LayerDict. A key read up from below whose value is MUTABLE (a contract, an asset
+    row, a reveal set) is COPIED into the layer on first access, because every mutator in state.py follows
+    the get-then-mutate pattern (c = contracts.get(cid); c["storage"] = ...). A read therefore can never hand
+    a caller an object that belongs to a lower layer. Whole-map iteration (items/values/copy) returns the
+    merged view WITHOUT copying — nothing in state.py mutates what it iterates, and the root projections
+    walk every key.
+  * The note pools and the inbox are objects and lists, not maps: a layer takes its own copy on first
+    attribute access (copy.deepcopy keeps the cached roots, so no rehash).
+  * Any OTHER container the state grows later is deep-copied at fork time — slow but correct by default, so a
+    new field cannot silently alias the finalized state.
+  * state_root forks the nearest ancestor's half-trees (SparseStore.copy: pointer copies, memo included) and
+    diff-applies this layer's projection, so the hashing is O(what the tail changed · depth) instead of a
+    cold build of the whole state.
+
+THE ONE ASSUMPTION. The bottom of a stack is the LIVE finalized state, and it keeps moving while the tail is
+read. That is sound for the same reason tail extension is (see _refresh_provisional): the finalized state
+advances only by applying the very blocks the tail already applied, so every key it writes is already
+shadowed by a layer above with the identical value. What it does NOT cover is an out-of-band write — the
+dividend accrual — and that already retires the tail (the accrual fence); the PROV_FULL_EVERY audit still
+compares every extended tail against a rebuild, so a violation is caught, not settled.
+"""
+import copy
+import threading
+from collections.abc import Mapping, MutableMapping
+
+from execnode.state import ExecState
+
+_MUTABLE = (dict, list, set)
+
+
+def _own_contract(c):
+    """A contract for writing: its storage is copied, its code and abi are SHARED. Both are only ever
+    REPLACED (the upgrade op assigns c["code"]), never edited in place, and code can be megabytes — copying
+    it for every layer that calls the contract would cost more than the whole old clone did."""
+    out = dict(c)
+    if "storage" in out:
+        out["storage"] = copy.deepcopy(out["storage"])
+    return out
+
+
+class LayerDict(MutableMapping):
+    """A dict that reads through to `parent` (a dict or another LayerDict) and keeps its own writes and
+    deletions. `own` makes a writable copy of a mutable value read up from below (see the module docstring)."""
+    __slots__ = ("_parent", "_delta", "_dead", "_own")
+
+    def __init__(self, parent, own=copy.deepcopy):
+        self._parent = parent
+        self._delta = {}
+        self._dead = set()
+        self._own = own
+
+    def _peek(self, key):
+        """The visible value of `key`, WITHOUT copying it up. Raises KeyError."""
+        m = self
+        while type(m) is LayerDict:
+            if key in m._delta:
+                return m._delta[key]
+            if key in m._dead:
+                raise KeyError(key)
+            m = m._parent
+        return m[key]
+
+    def _flat(self):
+        """The merged view as a plain dict (values shared, not copied)."""
+        chain, m = [], self
+        while type(m) is LayerDict:
+            chain.append(m)
+            m = m._parent
+        out = dict(m)
+        for layer in reversed(chain):
+            for k in layer._dead:
+                out.pop(k, None)
+            out.update(layer._delta)
+        return out
+
+    def __getitem__(self, key):
+        d = self._delta
+        if key in d:
+            return d[key]
+        v = self._peek(key)
+        if isinstance(v, _MUTABLE):
+            v = d[key] = self._own(v)
+        return v
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        try:
+            self._peek(key)
+            return True
+        except KeyError:
+            return False
+
+    def __setitem__(self, key, value):
+        self._delta[key] = value
+        self._dead.discard(key)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self._delta.pop(key, None)
+        self._dead.add(key)
+
+    def __iter__(self):
+        return iter(self._flat())
+
+    def __len__(self):
+        return len(self._flat())
+
+    def __bool__(self):
+        # `(block_hashes or {})` is on the VM's BHASH path — answer without flattening a 20000-entry ring
+        dead, m = set(), self
+        while type(m) is LayerDict:
+            if any(k not in dead for k in m._delta):
+                return True
+            dead |= m._dead
+            m = m._parent
+        return any(k not in dead for k in m)
+
+    def keys(self):
+        return self._flat().keys()
+
+    def items(self):
+        return self._flat().items()
+
+    def values(self):
+        return self._flat().values()
+
+    def copy(self):
+        """A plain, shallow dict of the merged view — what dict.copy() gives for a plain field, so a handler
+        can serialize either without caring which it holds."""
+        return self._flat()
+
+    def __repr__(self):
+        return f"LayerDict({self._flat()!r})"
+
+
+# dict fields -> the copier for a mutable value read up from below
+_LAYERED = {"contracts": _own_contract, "bridge": copy.deepcopy, "assets": copy.deepcopy,
+            "abal": copy.deepcopy, "allow": copy.deepcopy, "withdrawals": copy.deepcopy,
+            "outbox": copy.deepcopy, "dividend": copy.deepcopy, "dividend_withdrawals": copy.deepcopy,
+            "unshield_withdrawals": copy.deepcopy, "randao_reveals": copy.deepcopy, "beacons": copy.deepcopy,
+            "block_hashes": copy.deepcopy, "zk_addrs": copy.deepcopy, "boundary_roots": copy.deepcopy,
+            "attested": copy.deepcopy}
+# object/list fields -> how a layer takes its own copy on first access (inbox entries are never edited)
+_OWNED = {"shielded": copy.deepcopy, "field_pool": copy.deepcopy, "app_state": copy.deepcopy, "inbox": list}
+
+
+def _owned_attr(name, own):
+    def get(self):
+        mine = self._owned
+        if name not in mine:
+            mine[name] = own(self._peek_attr(name))
+        return mine[name]
+
+    def put(self, value):
+        self._owned[name] = value
+    return property(get, put, doc=f"this layer's own `{name}`, copied up from below on first access")
+
+
+class ExecOverlay(ExecState):
+    """A copy-on-write layer over `parent` (an ExecState or another ExecOverlay). Disk-free like the deep
+    clone it replaces: __init__ never reads the state file and `path` carries the '#prov' sentinel."""
+
+    def __init__(self, parent):
+        self._parent = parent
+        self._owned = {}
+        self._mutate_lock = threading.RLock()
+        for k, v in vars(parent).items():
+            if k in _LAYERED:
+                setattr(self, k, LayerDict(v, _LAYERED[k]) if isinstance(v, Mapping) else copy.deepcopy(v))
+            elif k in _OWNED or k.startswith("_"):
+                continue                          # owned lazily / lock, caches, half-trees, layer links
+            elif isinstance(v, _MUTABLE):
+                setattr(self, k, copy.deepcopy(v))   # a container this module does not know: never alias it
+            else:
+                setattr(self, k, v)               # cursor, block_ts, nonces, floors, provenance flags
+        self.path = parent.path if parent.path.endswith("#prov") else parent.path + "#prov"
+        self._root_cache = None
+        self._kv_store = None
+        self._rec_store = None
+        self._mut_gen = 0
+
+    def _peek_attr(self, name):
+        """The nearest owned copy of an _OWNED field below this layer, without copying it."""
+        m = self._parent
+        while isinstance(m, ExecOverlay):
+            if name in m._owned:
+                return m._owned[name]
+            m = m._parent
+        return getattr(m, name)
+
+    def base(self):
+        """The non-overlay state at the bottom of this stack."""
+        m = self._parent
+        while isinstance(m, ExecOverlay):
+            m = m._parent
+        return m
+
+    def depth(self):
+        """How many layers this stack has, counting this one."""
+        n, m = 1, self._parent
+        while isinstance(m, ExecOverlay):
+            n, m = n + 1, m._parent
+        return n
+
+    def rebase(self, parent):
+        """Read through to `parent` instead, dropping every layer in between. Only sound when the dropped
+        layers' writes are already in `parent` — the finalized state after it applied their blocks."""
+        with self._mutate_lock:
+            self._parent = parent
+            for name in _LAYERED:
+                ld = self.__dict__.get(name)
+                if type(ld) is LayerDict:
+                    ld._parent = getattr(parent, name)
+
+    def _snapshot(self):
+        """The merged payload, with plain dicts where the layer holds LayerDicts (json cannot encode them)."""
+        with self._mutate_lock:
+            return {k: (v.copy() if type(v) is LayerDict else v) for k, v in super()._snapshot().items()}
+
+    def _fork_stores(self):
+        """Half-trees to diff from: the nearest ancestor's. A lower LAYER's trees are taken over outright (a
+        layer with a child is never rooted again; its cached root hex stays valid); the finalized state's
+        are copied, since it keeps using them. (None, None) when nothing below has built any yet."""
+        m = self._parent
+        while True:
+            with m._mutate_lock:
+                if getattr(m, "_kv_store", None) is not None:
+                    if isinstance(m, ExecOverlay):
+                        kv, rec = m._kv_store, m._rec_store
+                        m._kv_store = m._rec_store = None
+                        return kv, rec
+                    return m._kv_store.copy(), m._rec_store.copy()
+            if not isinstance(m, ExecOverlay):
+                return None, None
+            m = m._parent
+
+    def _sparse_stores(self):
+        """ExecState._sparse_stores over the merged view, starting from a forked tree rather than a cold
+        build. The contracts projection reads the flattened map so it does not copy every contract up."""
+        from execnode import exec_root as ER
+        from execnode.stark import storage_tree as SST
+        with self._mutate_lock:
+            if self._kv_store is None:
+                self._kv_store, self._rec_store = self._fork_stores()
+            kv_p = ER.kv_projection(self.contracts.copy())
+            rec_p = ER.records_projection(self)
+            if self._kv_store is None:
+                self._kv_store = SST.SparseStore(ER.DEPTH, kv_p)
+                self._rec_store = SST.SparseStore(ER.DEPTH, rec_p)
+            else:
+                ER.apply_projection(self._kv_store, kv_p)
+                ER.apply_projection(self._rec_store, rec_p)
+            return self._kv_store, self._rec_store
+
+
+for _name, _own in _OWNED.items():
+    setattr(ExecOverlay, _name, _owned_attr(_name, _own))
@@ -0,0 +1,231 @@
+"""
+Optimistic parallel execution of one block's contract calls (execnode._apply_block).
+
+A block applies in L1 order, one blob after another, and that order IS the semantics. But nearly all the time
+of a busy block is VM runs, and a zkVM call reads very little of the state: its own contract's code and slots,
+its own asset holding, the chain-randomness maps and its call context. A dice roll and a chess move never
+read anything the other writes.
+
+So before the ordered loop, speculate() forks worker processes and runs every zkvm call of the block in them.
+The fork IS the read snapshot: each worker sees the state exactly as the block found it, and nothing is
+serialized to get it there. Calls on the same contract stay together in one worker and chain in L1 order, so
+a run of moves on one game still speculates. Each call comes back with its result and everything it read: the
+slots it loaded (from its io log, including the partial log of a call that reverted), and every holding and
+chain-randomness key it looked up.
+
+The ordered loop then applies the block exactly as before. When a call reaches the VM, the runtime adopts its
+speculative run only if every recorded read still holds against the live state (Speculation.replay).
+Otherwise it runs the call itself. A stale speculation — an earlier call wrote a slot this one read, an asset
+landed on the contract, an upgrade swapped the code — therefore costs time but never changes an answer. The
+state and root are those of sequential application by construction.
+
+Workers: NADO_EXEC_WORKERS (default: core count; 0/1 disables). Blocks with fewer than PARALLEL_MIN_CALLS
+zkvm calls do not fork (IPC and fork cost more than they save), nor do platforms without fork. Any pool
+failure — or workers still running after NADO_EXEC_SPEC_TIMEOUT seconds — means plain sequential application
+of that block.
+"""
+import multiprocessing
+import os
+
+from execnode import runtimes
+
+PARALLEL_MIN_CALLS = max(1, int(os.environ.get("NADO_EXEC_PARALLEL_MIN", "16")))
+# How long the exec loop waits for the whole pool. The fork happens in a process with live threads, so a
+# worker can deadlock on a lock it inherited held; it is then killed and the block applies sequentially.
+SPECULATE_TIMEOUT = max(0.1, float(os.environ.get("NADO_EXEC_SPEC_TIMEOUT", "30")))
+
+# What the fork hands the workers: [(state, cid, [(tx_index, payload, sender), ...]), ...]. Set immediately
+# before the pool forks and cleared once it is done; workers read their copy, never this process's.
+_JOBS = []
+
+
+# FORK WITH LIVE THREADS. The exec node forks from a process that has other threads running:
+# asyncio.to_thread workers (this speculation among them), the detached settle prover, aiohttp's resolver. A
+# fork copies only the forking thread, so any lock another thread held at that instant stays held in the
+# child forever. The workers only run the VM against the forked state, which keeps that window small but not
+# closed — hence SPECULATE_TIMEOUT and the kill in _kill_pool, and why the exec loop awaits speculate() on a
+# thread instead of blocking on the pool itself.
+def exec_workers():
+    """How many worker processes speculate(): NADO_EXEC_WORKERS if set, else the core count. 0/1 disables
+    speculation entirely (every call runs inline)."""
+    try:
+        return max(1, int(os.environ.get("NADO_EXEC_WORKERS", "") or (os.cpu_count() or 1)))
+    except ValueError:
+        return max(1, os.cpu_count() or 1)
+
+
+class _Reads:
+    """A read-only stand-in for one of the maps a call reads through .get (its asset holding, block hashes,
+    beacons) that records every key looked up and the value handed back. `add` folds in this call's own value
+    escrow, which the live path credits before the VM runs."""
+    __slots__ = ("src", "add", "seen")
+
+    def __init__(self, src, add=None):
+        self.src, self.add, self.seen = src, add or {}, {}
+
+    def get(self, key, default=None):
+        v = self.src.get(key, default)
+        if key in self.add:
+            v = v + self.add[key]
+        self.seen[key] = v
+        return v
+
+
+class Speculation:
+    """One call's speculative run (ok, ret, io), the io it emitted before any revert, and every map read it
+    made. `code` is the code object the run was made against, attached in the parent process (identity does
+    not survive the trip back from the worker)."""
+    __slots__ = ("code", "method", "inputs", "result", "io", "reads", "adopted")
+
+    def __init__(self, method, inputs, result, io, reads):
+        self.code, self.method, self.inputs = None, method, inputs
+        self.result, self.io, self.reads = result, io, reads
+        self.adopted = False
+
+    def __getstate__(self):
+        return (self.method, self.inputs, self.result, self.io, self.reads)
+
+    def __setstate__(self, s):
+        self.__init__(*s)
+
+    def replay(self, code, method, inputs, slots, beacons, block_hashes, abal):
+        """The call's (ok, ret, new_slots, io) if nothing it read differs in the live state, else None. The
+        live inputs are exactly what the runtime would hand zkvm.run — `slots` the contract's current slots.
+        Everything the VM reads from outside the call is covered: code, call context, the first read of each
+        slot, and every holding, block-hash and beacon lookup, so an adopted run is the run."""
+        if code is not self.code or method != self.method or inputs != self.inputs:
+            return None
+        held, hashes, beacon = self.reads
+        if any(abal.get(k, 0) != v for k, v in held.items()):
+            return None
+        if any((block_hashes or {}).get(k) != v for k, v in hashes.items()):
+            return None
+        if any((beacons or {}).get(k) != v for k, v in beacon.items()):
+            return None
+        from execnode import zkvm
+        new, own = dict(slots), set()
+        for kind, a, b in self.io:
+            if kind == zkvm.IO_SLOAD:
+                if a not in own and slots.get(a, 0) != b:
+                    return None
+            elif kind == zkvm.IO_SSTORE:
+                own.add(a)
+                if b == 0:
+                    new.pop(a, None)
+                else:
+                    new[a] = b
+        self.adopted = True
+        ok, ret, io = self.result
+        return (True, ret, new, io) if ok else (False, None, slots, [])
+
+
+def _speculate_group(st, cid, calls):
+    """Worker body for one contract: run its calls in L1 order against this process's (forked) state,
+    chaining each successful run's slots into the next. Mirrors the argument handling of the call branch of
+    ExecState._apply_blob_inner; a call that branch would skip, or that raises here, gets no speculation."""
+    from execnode import zkvm
+    c = st.contracts[cid]
+    slots = {int(k): int(v) for k, v in (c["storage"].get("slots") or {}).items()}
+    selfd = runtimes.zkvm_addr_digest(cid)
+    out = []
+    for idx, payload, sender in calls:
+        try:
+            method, args, value = payload.get("method"), payload.get("args", []), payload.get("value", 0)
+            if not isinstance(args, list) or not isinstance(value, int) or isinstance(value, bool) or value < 0:
+                continue
+            in_asset = payload.get("asset") or 0
+            asset = int(str(in_asset)) if in_asset else 0
+            cf, fargs = runtimes.zkvm_statement(sender, args, st.zk_addrs)
+            held = _Reads(st.holder_assets(cid), {asset: value} if asset and value > 0 else None)
+            hashes, beacon = _Reads(st.block_hashes or {}), _Reads(st.beacons or {})
+            seen = []
+            ok, ret, new_slots, io = zkvm.run(c["code"], method, cf, fargs, slots, value=value,
+                                              cursor=st.cursor, timestamp=st.block_ts, beacons=beacon,
+                                              block_hashes=hashes, asset=asset, selfd=selfd, abal=held,
+                                              seen=seen)
+            inputs = (cf, tuple(fargs), value, st.cursor, st.block_ts, asset, selfd)
+            out.append((idx, Speculation(method, inputs, (ok, ret, io if ok else []), io if ok else seen,
+                                         (held.seen, hashes.seen, beacon.seen))))
+            if ok and runtimes.split_io(io, st.zk_addrs) is not None:
+                slots = new_slots          # the next call on this contract reads what this one wrote
+        except Exception:
+            continue
+    return out
+
+
+def _speculate_chunk(groups):
+    """Worker entry point: speculate a list of _JOBS groups; returns [(group, tx_index, Speculation)]."""
+    out = []
+    for g in groups:
+        st, cid, calls = _JOBS[g]
+        out.extend((g, idx, spec) for idx, spec in _speculate_group(st, cid, calls))
+    return out
+
+
+def _kill_pool(pool):
+    """Tear down a pool whose workers may be wedged: drop queued chunks, then SIGKILL every worker."""
+    procs = list((getattr(pool, "_processes", None) or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for p in procs:
+        try:
+            p.kill()
+            p.join(1)
+        except Exception:
+            pass
+
+
+def speculate(states_map, txs):
+    """Speculatively run the zkvm calls among `txs` (one block's transactions, L1 order) in worker
+    processes. Returns {tx_index: Speculation} for ExecState.apply_blob(..., spec=); empty when the block is
+    too small to be worth a fork, workers are disabled, or anything at all goes wrong. It runs ahead of
+    _apply_block's per-tx guard, so it must never raise."""
+    try:
+        return _speculate(states_map, txs)
+    except Exception:
+        return {}
+
+
+def _speculate(states_map, txs):
+    global _JOBS
+    groups = {}
+    for i, tx in enumerate(txs):
+        if not isinstance(tx, dict):
+            continue
+        d = tx.get("data")
+        if tx.get("recipient") != "blob" or not isinstance(d, dict) or d.get("op") != "call":
+            continue
+        ns, cid = d.get("ns", "default"), d.get("contract")
+        st = states_map.get(ns) if isinstance(ns, str) else None
+        c = st.contracts.get(cid) if st is not None and isinstance(cid, str) else None
+        if c is None or (c.get("runtime") or runtimes.DEFAULT_RUNTIME) != "zkvm":
+            continue
+        groups.setdefault((ns, cid), []).append((i, d, tx.get("sender")))
+    calls = sum(len(v) for v in groups.values())
+    workers = min(exec_workers(), len(groups))
+    if calls < PARALLEL_MIN_CALLS or workers < 2 or "fork" not in multiprocessing.get_all_start_methods():
+        return {}
+    jobs = [(states_map[ns], cid, members) for (ns, cid), members in groups.items()]
+    codes = [st.contracts[cid]["code"] for st, cid, _ in jobs]
+    chunks, loads = [[] for _ in range(workers)], [0] * workers
+    for g in sorted(range(len(jobs)), key=lambda g: -len(jobs[g][2])):    # longest group first, to the
+        k = loads.index(min(loads))                                        # least-loaded worker
+        chunks[k].append(g)
+        loads[k] += len(jobs[g][2])
+    from concurrent.futures import ProcessPoolExecutor, wait
+    _JOBS = jobs
+    try:
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork"))
+        futures = [pool.submit(_speculate_chunk, ch) for ch in chunks]
+        if wait(futures, timeout=SPECULATE_TIMEOUT).not_done:
+            _kill_pool(pool)
+            return {}
+        pool.shutdown(wait=True)
+        parts = [f.result() for f in futures]      # a chunk that raised -> speculate() returns {}
+    finally:
+        _JOBS = []
+    out = {}
+    for part in parts:
+        for g, idx, spec in part:
+            spec.code = codes[g]
+            out[idx] = spec
+    return out
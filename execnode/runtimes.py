@@ -137,20 +137,23 @@ class _ZkVM:
         return zkvm.validate_code(code)
 
     def run(self, code, method, caller, args, storage, value=0, cursor=0, timestamp=0, beacons=None,
-            block_hashes=None, registry=None, asset=0, selfd=0, abal=None):
+            block_hashes=None, registry=None, asset=0, selfd=0, abal=None, speculated=None):
+        """`speculated` is this call's execnode/parallel_exec.Speculation, if the block speculated it: its
+        run is taken instead of a fresh one only when everything it read still holds here."""
         from execnode import zkvm
-        from execnode.stark.field import P
         reg = registry if registry is not None else {}
         try:
             cf, fargs = zkvm_statement(caller, args, reg)
         except ValueError:
             return (False, None, storage, [], [])
         slots = {int(k): int(v) for k, v in (storage.get("slots") or {}).items()}
-        ok, ret, new_slots, io = zkvm.run(code, method, cf, fargs, slots, value=value, cursor=cursor,
-                                         timestamp=timestamp,
-                                         beacons={e: v % P for e, v in (beacons or {}).items()},
-                                         block_hashes={h: v % P for h, v in (block_hashes or {}).items()},
-                                         asset=asset, selfd=selfd, abal=abal)
+        pre = None
+        if speculated is not None:
+            pre = speculated.replay(code, method, (cf, tuple(fargs), value, cursor, timestamp, asset, selfd),
+                                    slots, beacons, block_hashes, abal)
+        ok, ret, new_slots, io = pre or zkvm.run(code, method, cf, fargs, slots, value=value, cursor=cursor,
+                                                timestamp=timestamp, beacons=beacons, block_hashes=block_hashes,
+                                                asset=asset, selfd=selfd, abal=abal)   # zkvm reduces what it reads
         if not ok:
             return (False, None, storage, [], [])
         # ASSET EFFECTS ride the SAME digest→address registry as payouts and revert on the same rule (see
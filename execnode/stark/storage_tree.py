@@ -263,6 +263,17 @@ class SparseStore:
         self._keys = sorted(vals)
         self._memo = {}                            # (level, index) -> digest, level >= 1
 
+    def copy(self):
+        """An independent store with the same leaves AND the same memoized nodes — a fork that costs pointer
+        copies, not hashing. Writes to either side invalidate only their own memo, so a forked store reaches
+        a nearby root in O(changed · depth) instead of the cold build a fresh SparseStore(values) pays."""
+        out = type(self).__new__(type(self))
+        out.depth, out.e = self.depth, self.e
+        out.values = self.values.copy()
+        out._keys = list(self._keys)
+        out._memo = self._memo.copy()
+        return out
+
     # -- occupancy ------------------------------------------------------------------------------------
     def _count(self, lo, hi):
         return bisect.bisect_left(self._keys, hi) - bisect.bisect_left(self._keys, lo)
@@ -11,7 +11,6 @@ A blob payload is JSON:
 State never affects L1 consensus. A malformed blob is skipped, never fatal.
 """
 import json
-import os
 import threading
 
 from hashing import blake2b_hash, canonical_bytes
@@ -28,6 +27,10 @@ from ops.address_ops import validate_address
 _BEACON_RETENTION_EPOCHS = 4000     # advance_beacons keeps beacons for [cur_epoch - this, cur_epoch]
 _BLOCKHASH_RING = 20000             # record_block_hash keeps the most recent this-many finalized L1 heights
 _GENESIS_BEACON_FLOOR = 2           # the beacon_floor a from-genesis node sets (epoch 0 first advance -> 0+2)
+# VIEW RESULT CACHE (ExecState.view). Every game frontend polls the same read-only views — balances, tables,
+# leaderboards — on a tick, so one (cid, method, args) re-runs the interpreter thousands of times per block
+# for an unchanged answer. Results are memoized per state, bounded LRU.
+VIEW_CACHE_MAX = 4096
 import base64
 import zstandard as _zstd
 
@@ -246,6 +249,46 @@ def commit_asset_effects_pure(abal, assets, deltas, sup, meta_ops=()):
         assets[aid]["mintable"] = False
 
 
+class _ViewCache:
+    """The bounded LRU behind ExecState.view, plus the per-contract generations its keys carry.
+
+    A key is (cid, method, canonical args, the contract's generation, cursor, block_ts, registry size) —
+    everything a view can read. The generation is bumped whenever a blob changes the contract's storage or
+    code or moves an asset row it holds (ExecState._view_bump); cursor and block_ts cover the per-block
+    inputs (BHASH, beacons, TIME); the registry is append-only, so its size stands for it. A bump never
+    has to find and evict the stale entries: no lookup builds their key again, and the LRU ages them out."""
+    __slots__ = ("lru", "gens", "hits", "misses", "lock")
+
+    def __init__(self):
+        from collections import OrderedDict
+        self.lru = OrderedDict()
+        self.gens = {}
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """(True, result) on a hit, (False, None) on a miss."""
+        with self.lock:
+            if key in self.lru:
+                self.lru.move_to_end(key)
+                self.hits += 1
+                return True, self.lru[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, result):
+        with self.lock:
+            self.lru[key] = result
+            self.lru.move_to_end(key)
+            while len(self.lru) > VIEW_CACHE_MAX:
+                self.lru.popitem(last=False)
+
+    def stats(self):
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self.lru), "max": VIEW_CACHE_MAX}
+
+
 class ExecState:
     def __init__(self, path):
         """Initialise every state component empty, then load() the last snapshot from `path` if one
@@ -438,6 +481,7 @@ class ExecState:
         self.anchor_adopted_at = int(d.get("anchor_adopted_at", -1))
         self.boundary_roots = {int(c): str(r) for c, r in (d.get("boundary_roots") or {}).items()}
         self.attested = {int(c): str(r) for c, r in (d.get("attested") or {}).items()}
+        self._views = _ViewCache()   # a restored state can revisit a cursor with reset generations
         self._touch()          # also (re)creates the cache fields on a bare clone() instance
 
     def _snapshot(self):
@@ -470,63 +514,56 @@ class ExecState:
                     "attested": {str(c): r for c, r in self.attested.items()}}
 
     def clone(self):
-        """A deep, independent, DISK-FREE copy for provisional/speculative apply (the unfinalized L1 tail).
-        The RLock is rebuilt fresh (locks aren't copyable) and __init__ is skipped so it never reads disk.
-        Operations on the clone NEVER touch the finalized state — settlement/state_root/save stay exact."""
-        import copy
-        snap = copy.deepcopy(self._snapshot())
-        c = ExecState.__new__(ExecState)
-        c.path = self.path + "#prov"       # sentinel: a clone is display-only and must never be save()d
-        c._mutate_lock = threading.RLock()
-        c._restore(snap)
-        # block_ts is deliberately NOT in _snapshot() — it is derived per applied block and must stay out
-        # of the persisted payload and the root. But __init__ (which seeds it to 0) is skipped here, so
-        # without this line a clone has no such ATTRIBUTE at all until a block is applied to it. A tail
-        # that applies zero blocks — the first fetch fails, or the block has no body — therefore 500s
-        # /exec/root?provisional=1 with AttributeError, and that endpoint is what every game client polls
-        # for its cursor: the page then reports the chain unreachable or stalled. Carry it explicitly;
-        # the clone inherits the clock of the state it forked from, which is exactly right for a view
-        # that has not yet advanced past it.
-        c.block_ts = getattr(self, "block_ts", 0)
-        return c
+        """A copy-on-write, DISK-FREE layer over this state for provisional/speculative apply (the
+        unfinalized L1 tail) — execnode/overlay.py. O(1) to create: reads fall through to this state,
+        writes land in the layer, and operations on it NEVER touch this state, so settlement/state_root/
+        save stay exact. Cloning a clone stacks another layer.
+
+        It replaced copy.deepcopy(self._snapshot()) + _restore, which copied the whole state and then
+        cold-built both half-trees on the clone's first root — per provisional rebuild, per extension, and
+        once more for the audit's second tail.
+
+        block_ts is deliberately NOT in _snapshot() (derived per applied block, out of the payload and the
+        root), and the deep clone once lost it: a tail that applied zero blocks 500'd
+        /exec/root?provisional=1 with AttributeError, which every game client polls for its cursor. The
+        overlay copies every scalar attribute, block_ts included, so the clone inherits the clock of the
+        state it forked from — exactly right for a view that has not yet advanced past it."""
+        from execnode.overlay import ExecOverlay
+        return ExecOverlay(self)
+
+    def _journal_for(self):
+        """This path's StateJournal (execnode/state_journal.py), created on first load()/save(). Lazy and
+        underscore-named so the disk-free instances (snapshot_view, clone overlays) never grow one."""
+        j = self.__dict__.get("_journal")
+        if j is None or j.path != self.path:
+            from execnode.state_journal import StateJournal
+            j = self._journal = StateJournal(self.path)
+        return j
 
     def load(self):
-        """Restore the last save()d snapshot from self.path, if any. A torn/empty file — e.g. a crash between
-        os.replace and the data reaching disk — is treated as NO snapshot: the exec state is fully re-derivable
-        by replaying L1, so re-bootstrap instead of crash-looping on json.load every start."""
-        if os.path.exists(self.path):
-            try:
-                with open(self.path) as f:
-                    d = json.load(f)
-            except (ValueError, OSError):
-                return
+        """Restore the last save()d snapshot from self.path, if any: the base file plus every intact record
+        of its journal (execnode/state_journal.py). A torn/empty base — e.g. a crash between os.replace and
+        the data reaching disk — is treated as NO snapshot: the exec state is fully re-derivable by
+        replaying L1, so re-bootstrap instead of crash-looping on json.load every start. A torn journal
+        record is dropped with everything after it, which loads exactly the save before it."""
+        d = self._journal_for().load()
+        if d is not None:
             self._restore(d)
 
     def save(self):
-        """Atomically persist the whole state: snapshot under the mutate lock (consistent vs concurrent
-        thread-applies), then write sorted-key JSON to a tmp file and os.replace it — a crash mid-write
-        can never leave a torn state file."""
-        # M-10: _snapshot() holds the mutate lock while building the payload so a concurrent thread-apply
-        # can't mutate the nullifier set / commitment list mid-serialization (torn snapshot / "set changed
-        # size during iteration").
-        payload = self._snapshot()
-        # '~tmp' (not '.tmp'): a namespace state path is STATE_PATH + '.' + ns and ns excludes '~', so this
-        # temp can never equal another namespace's persistent path (a ns literally named 'tmp' would have
-        # collided a '.tmp' temp and corrupted its state on every default save).
-        tmp = self.path + "~tmp"
-        with open(tmp, "w") as f:
-            json.dump(payload, f, sort_keys=True)
-            f.flush()
-            os.fsync(f.fileno())              # data on disk BEFORE the rename (os.replace is atomic, not durable)
-        os.replace(tmp, self.path)
-        try:                                  # fsync the directory so the rename itself survives a power loss
-            dfd = os.open(os.path.dirname(self.path) or ".", os.O_RDONLY)
-            try:
-                os.fsync(dfd)
-            finally:
-                os.close(dfd)
-        except OSError:
-            pass
+        """Persist the state crash-atomically: normally ONE fsynced, checksummed journal record holding only
+        what changed since the last save, occasionally a compaction that rewrites the whole sorted-key JSON
+        base through a tmp file and os.replace (execnode/state_journal.py). Either way a crash mid-write
+        leaves the previous save loadable, never a torn one. Returns the number of bytes written."""
+        j = self._journal_for()
+        with j.lock:
+            # M-10: _snapshot() holds the mutate lock while building the payload so a concurrent thread-apply
+            # can't mutate the nullifier set / commitment list mid-serialization (torn snapshot / "set
+            # changed size during iteration"). The diff + encode walk the same live objects, so they run
+            # under it too; only the write and fsync happen outside.
+            with self._mutate_lock:
+                pending = j.encode(self._snapshot())
+            return j.commit(pending)
 
     def _sparse_stores(self):
         """The two persistent depth-256 half-trees of the FROZEN root scheme (execnode/exec_root.py),
@@ -998,6 +1035,7 @@ class ExecState:
         """Move `delta` (signed) of asset `aid` on `holder`'s row, pruning to absence at zero. Callers have
         already validated solvency — this is the commit half of a staged, all-or-nothing settlement."""
         asset_credit_dict(self.abal, aid, holder, delta)
+        self._view_bump(holder)
 
     def asset_allowance(self, aid, owner, spender):
         """How much of `aid` `spender` may move on `owner`'s behalf. Absent == 0, same canonical rule as a
@@ -1028,6 +1066,8 @@ class ExecState:
     def commit_asset_effects(self, deltas, sup, meta_ops=()):
         """Apply what stage_asset_effects validated. Never called without that validation."""
         commit_asset_effects_pure(self.abal, self.assets, deltas, sup, meta_ops)
+        for _aid, who in deltas:
+            self._view_bump(who)
 
     def contract_id(self, deployer, code, nonce):
         """Deterministic contract id H(deployer, code, nonce) (truncated) — identical on every exec node,
@@ -1035,14 +1075,16 @@ class ExecState:
         return blake2b_hash(["deploy", deployer, code, nonce])[:32]
 
     # --- applying blobs --------------------------------------------------------------------------
-    def apply_blob(self, payload, sender, txid):
+    def apply_blob(self, payload, sender, txid, spec=None):
+        """`spec`: the call's speculative run from execnode/parallel_exec.py, if any (adopted only when still
+        valid — the result is the same either way)."""
         with self._mutate_lock:
             try:
-                return self._apply_blob_inner(payload, sender, txid)
+                return self._apply_blob_inner(payload, sender, txid, spec)
             finally:
                 self._touch()
 
-    def _apply_blob_inner(self, payload, sender, txid):
+    def _apply_blob_inner(self, payload, sender, txid, spec=None):
         """Apply ONE blob payload from sender (the blob tx's L1 sender). Returns a short human string.
         Never raises: a malformed or reverting blob is a no-op ('skip'/'revert')."""
         try:
@@ -1085,6 +1127,7 @@ class ExecState:
                 self.contracts[cid] = {"code": code, "storage": storage, "deployer": sender,
                                        "runtime": rt_name, "abi": abi if isinstance(abi, dict) else {},
                                        "upgradable": upgradable}
+                self._view_bump(cid)               # a fixed-name cid can be deployed over
                 return f"deploy {cid} ({rt_name}{'' if upgradable else ', LOCKED'}) by {sender[:12]}…"
 
             if op == "call":
@@ -1128,6 +1171,8 @@ class ExecState:
                             del self.bridge[sender]
                         self.bridge[cid] = self.bridge.get(cid, 0) + value
                 kw = {"registry": self.zk_addrs} if getattr(rt, "wants_registry", False) else {}
+                if spec is not None and rt is runtimes.get("zkvm") and spec.code is c["code"]:
+                    kw["speculated"] = spec       # only the zkVM takes it; an upgrade may have swapped the runtime
                 ok, _ret, new_storage, payouts, effects = self._rt_run(
                     rt, c["code"], method, sender, args, c["storage"],
                     value=value, cursor=self.cursor, timestamp=self.block_ts, beacons=self.beacons,
@@ -1159,6 +1204,7 @@ class ExecState:
                     _refund()
                     return f"call {cid}.{method} -> revert ({a_why})"
                 c["storage"] = new_storage
+                self._view_bump(cid)
                 for to, amt in payouts:
                     self.bridge[cid] = self.bridge.get(cid, 0) - amt
                     if self.bridge.get(cid, 0) == 0:
@@ -1404,6 +1450,7 @@ class ExecState:
                     return f"skip: invalid code ({e})"
                 c["code"] = code
                 c["runtime"] = rt_name
+                self._view_bump(cid)
                 if isinstance(payload.get("abi"), dict):
                     c["abi"] = payload["abi"]
                 return f"upgrade {cid} by {sender[:12]}… (code replaced, storage kept)"
@@ -1678,15 +1725,50 @@ class ExecState:
                 out[bd["name"]] = m
         return out
 
+    def _view_cache(self):
+        """This state's _ViewCache, created on first use — so bare instances (snapshot_view, clone overlays,
+        whose underscore fields are never copied) each get their own and never share a parent's results."""
+        vc = self.__dict__.get("_views")
+        if vc is None:
+            vc = self._views = _ViewCache()
+        return vc
+
+    def _view_bump(self, cid):
+        """Retire every cached view of contract `cid`: its storage, code or asset holdings just moved."""
+        if cid in self.contracts:
+            gens = self._view_cache().gens
+            gens[cid] = gens.get(cid, 0) + 1
+
+    def view_stats(self):
+        """Hit/miss counters and occupancy of the view result cache."""
+        return self._view_cache().stats()
+
     def view(self, cid, method, args):
         """Read-only call: run a method WITHOUT persisting storage; return its RETURN value (or None).
-        caller is the sentinel 'view'. Used by the query API (e.g. balanceOf)."""
+        caller is the sentinel 'view'. Used by the query API (e.g. balanceOf). Results are served from the
+        view cache until the contract or the block moves (see _ViewCache)."""
         c = self.contracts.get(cid)
         if not c:
             return None
         rt = runtimes.get(c.get("runtime", runtimes.DEFAULT_RUNTIME))
         if rt is None:
             return None
-        kw = {"registry": dict(self.zk_addrs)} if getattr(rt, "wants_registry", False) else {}
+        wants_registry = getattr(rt, "wants_registry", False)
+        vc = self._view_cache()
+        try:
+            akey = json.dumps(args or [], sort_keys=True, separators=(",", ":"))
+        except (TypeError, ValueError):
+            akey = None                   # not canonically encodable: run it, don't cache it
+        key = None
+        if akey is not None:
+            key = (cid, method, akey, vc.gens.get(cid, 0), self.cursor, self.block_ts,
+                   len(self.zk_addrs) if wants_registry else -1)
+            hit, ret = vc.get(key)
+            if hit:
+                return ret
+        kw = {"registry": dict(self.zk_addrs)} if wants_registry else {}
         ok, ret, _, _, _ = self._rt_run(rt, c["code"], method, "view", args or [], c["storage"], cursor=self.cursor, timestamp=self.block_ts, beacons=self.beacons, block_hashes=self.block_hashes, selfd=runtimes.zkvm_addr_digest(cid), abal=self.holder_assets(cid), **kw)
-        return ret if ok else None
+        ret = ret if ok else None
+        if key is not None:
+            vc.put(key, ret)
+        return ret
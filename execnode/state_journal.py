@@ -0,0 +1,276 @@
+"""
+INCREMENTAL exec-state persistence: a base snapshot plus an append-only journal of per-save deltas
+(ExecState.save / ExecState.load).
+
+WHY. save() used to json.dump the WHOLE payload — every contract's code and storage, the 20000-entry
+blockhash ring, both note pools — then fsync and rename it, after every applied batch. On a busy node that
+is ~6 MB of serialization and a ~6 MB fsync per block for a state that moved by a few slots, and the tail
+loop waits on it. Now a save writes only what changed since the last save, as ONE checksummed journal
+record, and the full rewrite (the compaction) happens only when the journal has grown past the base.
+
+ON DISK, next to the state file:
+  <path>            the base: the exact sorted-key JSON payload save() always wrote. Tools and tests that
+                    json.load it, and a node running older code, keep working on a compacted file.
+  <path>~journal    a header line binding it to ONE base (the base file's digest), then one line per save:
+                    "<16-hex blake2b of body> <json body>". '~' for the same reason as save()'s '~tmp': a
+                    namespace path is STATE_PATH + '.' + ns and ns excludes '~', so this name can never be
+                    another namespace's state file — and the generation/purge wipes (STATE_PATH + "*")
+                    still remove it along with the base.
+
+A DELTA is a map of top-level payload key -> op, applied in order:
+  ["=", v]        replace (or add) the value
+  ["-"]           delete the key
+  ["~", {k: op}]  descend into a dict and apply ops to its keys — contract -> storage -> map -> slot, so a
+                  call that moved one slot journals that slot, not the contract
+  ["+", [...]]    extend a list (the note pools' commitment lists and the inbox only ever grow)
+
+CRASH-ATOMICITY, the guarantee the whole-file os.replace gave and this must keep: a torn write is NEVER
+observed. A journal record is one write + fsync; load() stops at the first record that is incomplete or
+fails its checksum, so a crash mid-append loads exactly the previous save, and the next append truncates the
+torn bytes away. Compaction writes the new base to a temp file and fsyncs it, UNLINKS the journal, and only
+then renames the base into place: a crash in between loads the old base without its journal — an OLDER
+cursor, still a consistent one, which replay from L1 rolls forward — and never an old journal replayed over
+a base it was not written against. The header digest catches the rest (a base replaced by hand, a restored
+backup): a journal whose header does not name the base on disk is ignored.
+
+WHY NOT LMDB, which ops/kv_ops.py already uses for L1. The exec state's lifecycle is path-based: the reroll
+and genesis-reset wipes glob STATE_PATH + "*" and os.remove each hit, rewinds and bootstraps _restore whole
+payloads, and ExecState instances are created freely (verification candidates, tests, snapshot views). An
+LMDB environment is a long-lived process-wide handle that must not be opened twice or deleted underneath
+itself, and its directory survives an os.remove. Two flat files fit the life the state already has.
+
+The in-memory model is unchanged: load() still materializes the whole state (the root projection, views and
+settlement walk every map), so startup parses the base once plus a bounded journal — compaction keeps the
+journal no bigger than the base — and _snapshot() is byte-for-byte what it was. The price of diffing
+instead of dumping is one decoded copy of the payload held as the `shadow` the next save compares against.
+"""
+import copy
+import hashlib
+import json
+import os
+import threading
+
+JOURNAL_SUFFIX = "~journal"
+# compact (full rewrite) once the journal outgrows the base, but never for less than this: replaying a small
+# journal at startup costs less than rewriting a small base on every few saves
+COMPACT_MIN_BYTES = 4 * 1024 * 1024
+
+
+def _digest(b):
+    return hashlib.blake2b(b, digest_size=8).hexdigest()
+
+
+def _jkey(k):
+    """A dict key as json.dumps writes it — the shadow only ever holds the decoded form."""
+    if type(k) is str:
+        return k
+    if k is True or k is False or k is None:
+        return json.dumps(k)
+    return json.dumps(k) if isinstance(k, float) else str(k)
+
+
+def diff(old, new):
+    """The op turning `old` (a decoded payload value) into `new` (a live one), or None when they are equal."""
+    if type(new) is dict and type(old) is dict:
+        if old == new:
+            return None
+        if not all(type(k) is str for k in new):
+            new = {_jkey(k): v for k, v in new.items()}
+        ops = {k: ["-"] for k in old if k not in new}
+        for k, v in new.items():
+            if k not in old:
+                ops[k] = ["=", v]
+            else:
+                op = diff(old[k], v)
+                if op is not None:
+                    ops[k] = op
+        return ["~", ops] if ops else None
+    if isinstance(new, (list, tuple)) and type(old) is list:
+        n = len(old)
+        if len(new) >= n and list(new[:n]) == old:
+            return ["+", list(new[n:])] if len(new) > n else None
+        return ["=", new]
+    if old == new and type(old) is type(new):
+        return None
+    return ["=", new]
+
+
+def patch(doc, ops):
+    """Apply a `~` op map to the dict `doc`, in place."""
+    for k, op in ops.items():
+        tag = op[0]
+        if tag == "=":
+            doc[k] = op[1]
+        elif tag == "-":
+            doc.pop(k, None)
+        elif tag == "~":
+            patch(doc[k], op[1])
+        elif tag == "+":
+            doc[k].extend(op[1])
+        else:
+            raise ValueError(f"unknown journal op {tag!r}")
+
+
+def _frame(obj):
+    body = json.dumps(obj, sort_keys=True, separators=(",", ":")).encode()
+    return _digest(body).encode() + b" " + body + b"\n"
+
+
+def _fsync_dir(path):
+    try:                                  # the rename / create / unlink itself must survive a power loss
+        dfd = os.open(os.path.dirname(path) or ".", os.O_RDONLY)
+        try:
+            os.fsync(dfd)
+        finally:
+            os.close(dfd)
+    except OSError:
+        pass
+
+
+class StateJournal:
+    """The persisted image of one ExecState path: the decoded payload as of the last save (`shadow`, which
+    the next save diffs against), plus the sizes that drive truncation and compaction.
+
+    A save is two steps so the caller can hold its mutate lock for exactly the in-memory half: encode()
+    walks the live payload and returns the bytes to write, commit() does the I/O. `lock` serializes whole
+    saves of one path against each other (the shadow and the offsets must advance in write order)."""
+
+    def __init__(self, path):
+        self.path = path
+        self.jpath = path + JOURNAL_SUFFIX
+        self.lock = threading.Lock()
+        self.shadow = None            # decoded payload on disk; None -> the next save is a full rewrite
+        self.base_digest = None
+        self.base_bytes = 0
+        self.journal_bytes = 0        # length of the VALID journal prefix (a torn tail lies beyond it)
+        self.records = 0
+
+    def load(self):
+        """The persisted payload (base + every intact journal record), or None when there is no usable base.
+        A torn/empty base is no snapshot at all, exactly as before — the state re-derives from L1. The
+        caller owns the returned payload (ExecState._restore adopts its maps); the shadow is a separate copy."""
+        try:
+            with open(self.path, "rb") as f:
+                raw = f.read()
+            payload = json.loads(raw)
+        except (ValueError, OSError):
+            return None
+        if not isinstance(payload, dict):
+            return None
+        self.base_digest, self.base_bytes = _digest(raw), len(raw)
+        self.journal_bytes = self.records = 0
+        try:
+            with open(self.jpath, "rb") as f:
+                jraw = f.read()
+        except OSError:
+            jraw = b""
+        pos, header = 0, False
+        while True:
+            end = jraw.find(b"\n", pos)
+            if end < 0:
+                break                                     # absent, or a torn final record: stop before it
+            line = jraw[pos:end]
+            sep = line.find(b" ")
+            body = line[sep + 1:]
+            if sep != 16 or line[:sep].decode("ascii", "replace") != _digest(body):
+                break
+            try:
+                rec = json.loads(body)
+            except ValueError:
+                break
+            if not header:
+                if rec.get("base") != self.base_digest:
+                    break                                 # written against a different base: not ours
+                header = True
+            else:
+                try:
+                    patch(payload, rec["c"])
+                except (KeyError, TypeError, AttributeError, ValueError):
+                    # an intact record that does not fit its own base is a bug, not a torn write — and it
+                    # may be half applied by now. No snapshot at all beats a mixed one: re-derive from L1.
+                    return None
+                self.records += 1
+            pos = end + 1
+        if header:
+            self.journal_bytes = pos
+        self.shadow = copy.deepcopy(payload)
+        return payload
+
+    def due_for_compaction(self):
+        # a base that vanished underneath us (a wipe racing a live instance) must be rewritten, not journaled
+        # against: a journal without its base loads as nothing
+        return (self.shadow is None or self.journal_bytes > max(COMPACT_MIN_BYTES, self.base_bytes)
+                or not os.path.exists(self.path))
+
+    def encode(self, payload):
+        """What saving `payload` would write: ("base", raw) for a compaction, ("rec", frame) for a delta, or
+        None when nothing moved since the last save. Reads the live payload and touches no disk."""
+        if self.due_for_compaction():
+            return ("base", json.dumps(payload, sort_keys=True).encode())
+        op = diff(self.shadow, payload)
+        if op is None:
+            return None
+        return ("rec", _frame({"c": op[1]}))
+
+    def commit(self, pending):
+        """Make an encode() result durable. Returns the number of bytes written."""
+        if pending is None:
+            return 0                          # nothing moved since the last save: nothing to make durable
+        kind, data = pending
+        if kind == "base":
+            self.compact(data)
+            return self.base_bytes
+        before = self.journal_bytes
+        self.append(data)
+        return self.journal_bytes - before
+
+    def compact(self, raw):
+        """Write the encoded payload `raw` as the new base and drop the journal (see the module docstring
+        for the order)."""
+        self.shadow = None                    # until this completes, the next save must compact again
+        tmp = self.path + "~tmp"
+        with open(tmp, "wb") as f:
+            f.write(raw)
+            f.flush()
+            os.fsync(f.fileno())              # data on disk BEFORE the rename (os.replace is atomic, not durable)
+        try:
+            os.remove(self.jpath)
+        except FileNotFoundError:
+            pass
+        _fsync_dir(self.path)                 # the journal is gone before the base it described is
+        os.replace(tmp, self.path)
+        _fsync_dir(self.path)
+        self.shadow = json.loads(raw)
+        self.base_digest, self.base_bytes = _digest(raw), len(raw)
+        self.journal_bytes = self.records = 0
+
+    def append(self, rec):
+        """Append one framed delta record (durable on return). A fresh journal gets its header in the same
+        write."""
+        out = rec if self.journal_bytes else _frame({"base": self.base_digest}) + rec
+        fd = os.open(self.jpath, os.O_WRONLY | os.O_CREAT, 0o644)
+        try:
+            os.lseek(fd, self.journal_bytes, os.SEEK_SET)
+            view = memoryview(out)
+            while view:
+                view = view[os.write(fd, view):]          # os.write may be short on a large record
+            os.ftruncate(fd, self.journal_bytes + len(out))   # drop any torn tail beyond the valid prefix
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        if not self.journal_bytes:
+            _fsync_dir(self.jpath)
+        self.journal_bytes += len(out)
+        self.records += 1
+        # the shadow takes the DECODED delta, so it never aliases a live object and equals what load() rebuilds
+        patch(self.shadow, json.loads(rec[17:])["c"])
+
+    def save(self, payload):
+        """encode + commit in one go, for a caller with no lock to hold in between."""
+        with self.lock:
+            return self.commit(self.encode(payload))
+
+
+def load_payload(path):
+    """The persisted payload at `path`, journal included — for tools that read a state file directly."""
+    return StateJournal(path).load()
@@ -38,6 +38,12 @@ Commit-reveal / randomness: HINIT/HABS/HR0..HR{ROUNDS-1}/HOUT are alghash.hashn
 HR block scales with alghash.ROUNDS — 27 rounds, one opcode each); BHASH and
 BEACON read finalized chain randomness through the I/O log (public, so the verifier checks them natively).
 """
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
 from execnode.stark import field as F, alghash
 
 GAS_LIMIT = 131070               # executed steps per call = the FULL proof capacity: the AIR ceiling is
@@ -49,6 +55,8 @@ MAX_ARGS = 1024                  # statement-size guard, not a semantic limit: a
                                  # call statement (they ride in the blob + proof statement), so this only
                                  # bounds DoS-sized statements. The first 8 preload r0..r7; ARG reaches all.
 NUM_REGS = 8
+INTERP = os.environ.get("NADO_ZKVM_INTERP", "compiled")   # compiled | reference | crosscheck (see run)
+COMPILED_CACHE_MAX = 1024        # distinct method bodies kept pre-decoded (LRU; a miss only re-decodes)
 
 # opcode ids — FROZEN once contracts deploy against them (they are baked into program tables inside proofs).
 # New ops are APPENDED so existing bytecode/proof statements never shift. The HR round opcodes MUST stay a
@@ -193,7 +201,7 @@ def _decomp15(v):
 
 
 def run(code, method, caller, args, storage, value=0, cursor=0, timestamp=0, beacons=None, block_hashes=None,
-        asset=0, selfd=0, abal=None, witness=False):
+        asset=0, selfd=0, abal=None, witness=False, seen=None):
     """Execute code[method] with r0..r7 = the first 8 args (padded); ARG reaches all of them (up to
     MAX_ARGS) by dynamic index. `caller` is a FIELD element (the alghash address
     digest — address strings never enter zkVM; the exec layer digests them at the call boundary). `storage` is
@@ -206,7 +214,33 @@ def run(code, method, caller, args, storage, value=0, cursor=0, timestamp=0, bea
     the contract HOLDS, read through ABAL exactly the way `beacons`/`block_hashes` are read through
     BEACON/BHASH: supplied by the exec layer, echoed into the public io log, replayed by the verifier.
     On any revert (REQUIRE fail, window violation, gas, missing chain data) returns (False, None, storage, [])
-    — a no-op, and equally unprovable in the AIR."""
+    — a no-op, and equally unprovable in the AIR.
+    Without a witness the method runs pre-decoded (compile_program, below); NADO_ZKVM_INTERP=reference forces
+    the step-by-step interpreter, =crosscheck runs both and raises ZkVMError if they ever disagree.
+    `seen`, a list, receives the io entries a REVERTED call emitted before it reverted — what its revert
+    depended on (execnode/parallel_exec.py validates speculative runs against it)."""
+    if witness or INTERP == "reference" or method not in code:
+        return _run_reference(code, method, caller, args, storage, value, cursor, timestamp, beacons,
+                              block_hashes, asset, selfd, abal, witness, seen)
+    fns = _program(code[method])
+    if fns is None:                                      # a shape only the reference decodes (unvalidated code)
+        return _run_reference(code, method, caller, args, storage, value, cursor, timestamp, beacons,
+                              block_hashes, asset, selfd, abal, seen=seen)
+    res = _run_compiled(fns, caller, args, storage, value, cursor, timestamp, beacons, block_hashes, asset,
+                        selfd, abal, seen)
+    if INTERP == "crosscheck":
+        ref = _run_reference(code, method, caller, args, storage, value, cursor, timestamp, beacons,
+                             block_hashes, asset, selfd, abal)
+        if ref != res:
+            raise ZkVMError(f"compiled interpreter diverged from the reference on {method}: {res!r} != {ref!r}")
+    return res
+
+
+def _run_reference(code, method, caller, args, storage, value=0, cursor=0, timestamp=0, beacons=None,
+                   block_hashes=None, asset=0, selfd=0, abal=None, witness=False, seen=None):
+    """The step-by-step interpreter run() is specified by: decodes every instruction as it executes it and
+    records the per-row prover witness. The witness path always comes here; the compiled path must match it
+    result for result, io entry for io entry, revert for revert (NADO_ZKVM_INTERP=crosscheck asserts it)."""
     if method not in code:
         return (False, None, storage, []) + (([],) if witness else ())
     prog = code[method]
@@ -441,9 +475,487 @@ def run(code, method, caller, args, storage, value=0, cursor=0, timestamp=0, bea
             pc = nxt_pc
         return (True, ret, st, io) + ((steps,) if witness else ())
     except (ZkVMRevert, IndexError, KeyError, ZeroDivisionError):
+        if seen is not None:
+            seen.extend(io)
         return (False, None, storage, []) + (([],) if witness else ())
 
 
+# ---------------------------------------------------------------------------------------------------------------
+# PRE-DECODED INTERPRETER — the non-witness fast path of run(). A method body is decoded ONCE into a tuple of
+# handlers, one per instruction, each a closure with its operands (and the next pc) already bound: executing a
+# step is one indexed call instead of a tuple unpack, an OP lookup, a walk down the if/elif chain and two
+# fresh limb lists. Handlers mutate the register list and a _Frame in place and return the next pc (-1 = RET).
+# Limbs and the wi/wj inverses are witness columns, so they are not computed here — but every place the
+# reference would have RAISED while computing one (F.inv of a non-canonical multiple of p) raises here too,
+# so the set of reverting calls is the same.
+
+_P = F.P
+
+
+class _Frame:
+    """The non-register machine state of one compiled call."""
+    __slots__ = ("st", "io", "h0", "h1", "ret", "asel", "apend", "abal", "fargs", "ctxv", "actxv", "selfd",
+                 "beacons", "block_hashes")
+
+
+def _frame_aspend(f, a, amt):
+    """_aspend of the reference, over a _Frame."""
+    have = int(f.abal.get(a, 0)) + f.apend.get(a, 0)
+    if amt > have:
+        raise ZkVMRevert("asset move exceeds the contract's holding")
+    f.apend[a] = f.apend.get(a, 0) - amt
+
+
+def _noncanon_zero(v):
+    """True iff F.inv(v) raises for a nonzero v — an unreduced multiple of p (only reachable from raw storage)."""
+    return (v < 0 or v >= _P) and v % _P == 0
+
+
+
+def _op_nop(d, s, imm, nxt):
+    def h(regs, f):
+        return nxt
+    return h
+
+
+def _op_movi(d, s, imm, nxt):
+    def h(regs, f):
+        regs[d] = imm
+        return nxt
+    return h
+
+
+def _op_mov(d, s, imm, nxt):
+    def h(regs, f):
+        regs[d] = regs[s]
+        return nxt
+    return h
+
+
+def _op_add(d, s, imm, nxt):
+    def h(regs, f):
+        regs[d] = (regs[d] + regs[s]) % _P
+        return nxt
+    return h
+
+
+def _op_sub(d, s, imm, nxt):
+    def h(regs, f):
+        regs[d] = (regs[d] - regs[s]) % _P
+        return nxt
+    return h
+
+
+def _op_mul(d, s, imm, nxt):
+    def h(regs, f):
+        regs[d] = (regs[d] * regs[s]) % _P
+        return nxt
+    return h
+
+
+def _op_eq(d, s, imm, nxt):
+    def h(regs, f):
+        regs[d] = 0 if (regs[d] - regs[s]) % _P else 1
+        return nxt
+    return h
+
+
+def _op_nez(d, s, imm, nxt):
+    def h(regs, f):
+        v = regs[d]
+        if v and _noncanon_zero(v):
+            raise ZeroDivisionError("no inverse of 0 in F_p")
+        regs[d] = 1 if v else 0
+        return nxt
+    return h
+
+
+def _op_notb(d, s, imm, nxt):
+    def h(regs, f):
+        v = regs[d]
+        if v not in (0, 1):
+            raise ZkVMRevert("NOTB on a non-bit")
+        regs[d] = 1 - v
+        return nxt
+    return h
+
+
+def _op_lt(d, s, imm, nxt):
+    def h(regs, f):
+        a, b = regs[d], regs[s]
+        bit = 1 if a < b else 0
+        dv = (b - a - 1) if bit else (a - b)
+        if dv < 0 or dv >= 1 << 63:
+            raise ZkVMRevert("LT operands outside the 63-bit window")
+        regs[d] = bit
+        return nxt
+    return h
+
+
+def _op_range(d, s, imm, nxt):
+    def h(regs, f):
+        v = regs[d]
+        if v < 0 or v >= 1 << 62:
+            raise ZkVMRevert("RANGE failed (value >= 2^62)")
+        return nxt
+    return h
+
+
+def _op_divmod(d, s, imm, nxt):
+    def h(regs, f):
+        a, b = regs[d], regs[s]
+        if not (1 <= b <= (1 << 15)):
+            raise ZkVMRevert("DIVMOD divisor outside [1, 2^15]")
+        q, rem = a // b, a % b
+        if q >= (1 << 48):
+            raise ZkVMRevert("DIVMOD quotient outside [0, 2^48)")
+        regs[7] = rem
+        regs[d] = q
+        return nxt
+    return h
+
+
+def _op_divmodw(d, s, imm, nxt):
+    def h(regs, f):
+        a, b = regs[d], regs[s]
+        if not (1 <= b <= (1 << 31)):
+            raise ZkVMRevert("DIVMODW divisor outside [1, 2^31]")
+        q, rem = a // b, a % b
+        if q >= (1 << 32):
+            raise ZkVMRevert("DIVMODW quotient outside [0, 2^32)")
+        regs[7] = rem
+        regs[d] = q
+        return nxt
+    return h
+
+
+def _op_lo32(d, s, imm, nxt):
+    def h(regs, f):
+        v = regs[d]
+        if v >> 32 == (1 << 32) - 1 and v & 0xFFFFFFFF:
+            raise ZkVMRevert("LO32 non-canonical")
+        regs[d] = v & 0xFFFFFFFF
+        return nxt
+    return h
+
+
+def _op_jmp(d, s, imm, nxt):
+    def h(regs, f):
+        return imm
+    return h
+
+
+def _op_jnz(d, s, imm, nxt):
+    def h(regs, f):
+        v = regs[s]
+        if v:
+            if _noncanon_zero(v):
+                raise ZeroDivisionError("no inverse of 0 in F_p")
+            return imm
+        return nxt
+    return h
+
+
+def _op_require(d, s, imm, nxt):
+    def h(regs, f):
+        v = regs[s]
+        if not v:
+            raise ZkVMRevert("REQUIRE failed")
+        if _noncanon_zero(v):
+            raise ZeroDivisionError("no inverse of 0 in F_p")
+        return nxt
+    return h
+
+
+def _op_ctx(d, s, imm, nxt):
+    def h(regs, f):
+        if imm > 3:
+            raise ZkVMRevert("bad CTX index")
+        regs[d] = f.ctxv[imm]
+        return nxt
+    return h
+
+
+def _op_hinit(d, s, imm, nxt):
+    iv = alghash.IV
+    def h(regs, f):
+        f.h0, f.h1 = 0, iv
+        return nxt
+    return h
+
+
+def _op_habs(d, s, imm, nxt):
+    def h(regs, f):
+        f.h0 = (f.h0 + regs[s]) % _P
+        return nxt
+    return h
+
+
+def _op_hout(d, s, imm, nxt):
+    def h(regs, f):
+        regs[d] = f.h0
+        return nxt
+    return h
+
+
+def _op_hr(r):
+    """HR{r}: one alghash round, round constants and S-box exponent bound at decode time."""
+    rc0, rc1 = alghash.RC[r]
+    alpha = alghash.ALPHA
+
+    def make(d, s, imm, nxt):
+        def h(regs, f):
+            t0 = pow((f.h0 + rc0) % _P, alpha, _P)
+            t1 = pow((f.h1 + rc1) % _P, alpha, _P)
+            f.h0, f.h1 = (2 * t0 + t1) % _P, (t0 + 3 * t1) % _P
+            return nxt
+        return h
+    return make
+
+
+def _op_sload(d, s, imm, nxt):
+    def h(regs, f):
+        k = regs[s]
+        val = f.st.get(k, 0)
+        f.io.append((IO_SLOAD, k, val))
+        regs[d] = val
+        return nxt
+    return h
+
+
+def _op_sstore(d, s, imm, nxt):
+    def h(regs, f):
+        k, v = regs[d], regs[s]
+        if v == 0:
+            f.st.pop(k, None)
+        else:
+            f.st[k] = v
+        f.io.append((IO_SSTORE, k, v))
+        return nxt
+    return h
+
+
+def _op_pay(d, s, imm, nxt):
+    def h(regs, f):
+        to, amt = regs[d], regs[s]
+        if f.asel:
+            if not (f.selfd and to == f.selfd):
+                _frame_aspend(f, f.asel, amt)
+            f.asel = 0
+        f.io.append((IO_PAY, to, amt))
+        return nxt
+    return h
+
+
+def _op_bhash(d, s, imm, nxt):
+    def h(regs, f):
+        k = regs[s]
+        hv = f.block_hashes.get(k)
+        if hv is None:
+            raise ZkVMRevert("block hash for height not available")
+        hv %= _P
+        f.io.append((IO_BHASH, k, hv))
+        regs[d] = hv
+        return nxt
+    return h
+
+
+def _op_beacon(d, s, imm, nxt):
+    def h(regs, f):
+        k = regs[s]
+        bv = f.beacons.get(k)
+        if bv is None:
+            raise ZkVMRevert("beacon for epoch not available")
+        bv %= _P
+        f.io.append((IO_BEACON, k, bv))
+        regs[d] = bv
+        return nxt
+    return h
+
+
+def _op_ret(d, s, imm, nxt):
+    def h(regs, f):
+        f.ret = regs[s]
+        f.io.append((IO_RET, f.ret, 0))
+        return -1
+    return h
+
+
+def _op_arg(d, s, imm, nxt):
+    def h(regs, f):
+        i = regs[s]
+        if i >= len(f.fargs):
+            raise ZkVMRevert("ARG index out of range")
+        regs[d] = f.fargs[i]
+        return nxt
+    return h
+
+
+def _op_asel(d, s, imm, nxt):
+    def h(regs, f):
+        a = regs[s]
+        if a == 0:
+            raise ZkVMRevert("ASEL of asset 0 (native NADO needs no selection)")
+        f.asel = a
+        f.io.append((IO_ASEL, a, 0))
+        return nxt
+    return h
+
+
+def _op_amint(d, s, imm, nxt):
+    def h(regs, f):
+        to, amt = regs[d], regs[s]
+        if f.selfd and to == f.selfd:
+            f.apend[f.asel] = f.apend.get(f.asel, 0) + amt
+        f.asel = 0
+        f.io.append((IO_AMINT, to, amt))
+        return nxt
+    return h
+
+
+def _op_aburn(d, s, imm, nxt):
+    def h(regs, f):
+        a, amt = regs[d], regs[s]
+        _frame_aspend(f, a, amt)
+        f.io.append((IO_ABURN, a, amt))
+        return nxt
+    return h
+
+
+def _op_abal(d, s, imm, nxt):
+    def h(regs, f):
+        a = regs[s]
+        bv = (int(f.abal.get(a, 0)) + f.apend.get(a, 0)) % _P
+        f.io.append((IO_ABAL, a, bv))
+        regs[d] = bv
+        return nxt
+    return h
+
+
+def _op_actx(d, s, imm, nxt):
+    def h(regs, f):
+        regs[d] = f.actxv[imm]
+        return nxt
+    return h
+
+
+def _op_arenounce(d, s, imm, nxt):
+    def h(regs, f):
+        f.io.append((IO_ARENOUNCE, regs[d], 0))
+        return nxt
+    return h
+
+
+# integer opcode -> handler factory; complete over OPS (asserted below), so decoding never meets an unknown op
+_HANDLERS = {OP[name]: mk for name, mk in (
+    ("NOP", _op_nop), ("MOVI", _op_movi), ("MOV", _op_mov), ("ADD", _op_add), ("SUB", _op_sub),
+    ("MUL", _op_mul), ("EQ", _op_eq), ("NEZ", _op_nez), ("NOTB", _op_notb), ("LT", _op_lt),
+    ("RANGE", _op_range), ("DIVMOD", _op_divmod), ("LO32", _op_lo32), ("JMP", _op_jmp), ("JNZ", _op_jnz),
+    ("REQUIRE", _op_require), ("CTX", _op_ctx), ("HINIT", _op_hinit), ("HABS", _op_habs),
+    ("HOUT", _op_hout), ("SLOAD", _op_sload), ("SSTORE", _op_sstore), ("PAY", _op_pay),
+    ("BHASH", _op_bhash), ("BEACON", _op_beacon), ("RET", _op_ret), ("ARG", _op_arg),
+    ("DIVMODW", _op_divmodw), ("ASEL", _op_asel), ("AMINT", _op_amint), ("ABURN", _op_aburn),
+    ("ABAL", _op_abal), ("ACTX", _op_actx), ("ARENOUNCE", _op_arenounce))}
+_HANDLERS.update({HR0 + r: _op_hr(r) for r in range(alghash.ROUNDS)})
+assert sorted(_HANDLERS) == list(range(len(OPS))), "every opcode needs a compiled handler"
+
+
+def compile_program(prog):
+    """Pre-decode one method body into its handler tuple, or None when it holds anything validate_code would
+    have refused at the instruction level (unknown op, non-int operand, register outside r0..r7, negative or
+    out-of-field imm). Such a body runs on the reference interpreter, which is what defines its behaviour."""
+    if not isinstance(prog, list):
+        return None
+    fns = []
+    for pc, ins in enumerate(prog):
+        if not isinstance(ins, (list, tuple)) or len(ins) != 4:
+            return None
+        name, d, s, imm = ins
+        op = OP.get(name) if isinstance(name, str) else None
+        if op is None or not all(type(x) is int for x in (d, s, imm)):
+            return None
+        if not (0 <= d < NUM_REGS and 0 <= s < NUM_REGS and 0 <= imm < _P):
+            return None
+        fns.append(_HANDLERS[op](d, s, imm, pc + 1))
+    return tuple(fns)
+
+
+_by_prog = OrderedDict()        # id(prog) -> (prog, fns); holds prog so its id cannot be reused while cached
+_by_digest = OrderedDict()      # content digest -> fns; shares one decode across copies of the same body
+_cache_lock = threading.Lock()
+
+
+def _reset_cache_lock():
+    """A forked child (parallel_exec's workers) must not inherit the lock mid-hold from another thread."""
+    global _cache_lock
+    _cache_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_cache_lock)
+
+
+def _program(prog):
+    """compile_program(prog) through a two-level LRU. The method body object is the hot key (a deployed
+    contract's code is one long-lived object); its content digest catches the same code arriving as a fresh
+    object (a reload, a snapshot restore, an upgrade back to an older body), so decoding is paid once per
+    distinct body rather than per contract, method or state copy. Bodies are never edited in place (deploy
+    and upgrade install a new code object), which is what makes the identity key safe."""
+    key = id(prog)
+    with _cache_lock:
+        hit = _by_prog.get(key)
+        if hit is not None and hit[0] is prog:
+            _by_prog.move_to_end(key)
+            return hit[1]
+    try:
+        digest = hashlib.blake2b(json.dumps(prog, separators=(",", ":")).encode(), digest_size=16).digest()
+    except (TypeError, ValueError):
+        return None
+    with _cache_lock:
+        fns = _by_digest.get(digest, False)
+        if fns is not False:
+            _by_digest.move_to_end(digest)
+    if fns is False:
+        fns = compile_program(prog)
+    with _cache_lock:
+        _by_digest[digest] = fns
+        _by_prog[key] = (prog, fns)
+        for cache in (_by_digest, _by_prog):
+            while len(cache) > COMPILED_CACHE_MAX:
+                cache.popitem(last=False)
+    return fns
+
+
+def _run_compiled(fns, caller, args, storage, value, cursor, timestamp, beacons, block_hashes, asset, selfd,
+                  abal, seen=None):
+    """run() over a pre-decoded program (non-witness). Same argument handling, same results, same reverts."""
+    fargs = [a % _P for a in args]
+    regs = [(fargs[i] if i < len(fargs) else 0) for i in range(NUM_REGS)]
+    if len(fargs) > MAX_ARGS:
+        return (False, None, storage, [])
+    f = _Frame()
+    f.fargs = fargs
+    f.ctxv = [caller % _P, value % _P, cursor % _P, timestamp % _P]
+    f.actxv = [asset % _P, selfd % _P, 0, 0]
+    f.selfd = selfd % _P
+    f.asel, f.apend, f.abal = 0, {}, abal or {}
+    f.beacons, f.block_hashes = beacons or {}, block_hashes or {}
+    f.st, f.io = dict(storage), []
+    f.h0 = f.h1 = 0
+    f.ret = None
+    try:
+        pc = 0
+        for _ in range(GAS_LIMIT):
+            pc = fns[pc](regs, f)
+            if pc < 0:
+                return (True, f.ret, f.st, f.io)
+        raise ZkVMRevert("gas limit exceeded")
+    except (ZkVMRevert, IndexError, KeyError, ZeroDivisionError):
+        if seen is not None:
+            seen.extend(f.io)
+        return (False, None, storage, [])
+
+
 def replay_io(io_log, storage, with_assets=False):
     """What a VERIFIER does instead of executing: replay a proven call's public I/O log against its copy of
     the contract storage. Returns (ok, ret, new_storage, payouts, chain_reads). Read entries must match the
@@ -95,7 +95,13 @@ def merkle_root(leaves) -> str:
     CONTENT (the canonical_bytes leaf encoders below). The empty set hashes a fixed domain tag so
     'no leaves' has a distinct, unforgeable root instead of an error/sentinel. CONSENSUS-CRITICAL:
     this is the settled exec-layer state_root that L1 withdrawal verification anchors to."""
-    cur = _leaf_hashes(leaves)
+    return merkle_root_hashed([_mh(l) for l in leaves])
+
+
+def merkle_root_hashed(leaf_digests) -> str:
+    """merkle_root over leaves the CALLER already hashed with _mh (blake2b-256 of the raw leaf bytes) —
+    for leaves too big to materialise, which ops/da.py streams into the hash instead. Same tree, same root."""
+    cur = sorted(leaf_digests)
     if not cur:
         return _mh(DOMAIN_EMPTY_MERKLE).hex()
     while len(cur) > 1:
@@ -105,8 +111,12 @@ def merkle_root(leaves) -> str:
 
 def merkle_proof(leaves, leaf):
     """Inclusion proof (list of sibling hashes, hex, bottom-up) for `leaf`; None if the leaf is absent."""
-    cur = _leaf_hashes(leaves)
-    target = _mh(leaf)
+    return merkle_proof_hashed([_mh(l) for l in leaves], _mh(leaf))
+
+
+def merkle_proof_hashed(leaf_digests, target: bytes):
+    """merkle_proof over pre-hashed leaves (see merkle_root_hashed); `target` is the leaf's _mh digest."""
+    cur = sorted(leaf_digests)
     if target not in cur:
         return None
     idx = cur.index(target)
@@ -7,7 +7,7 @@ import time
 import traceback
 
 from config import get_timestamp_seconds, get_config
-from ops.account_ops import get_totals, index_totals, get_bonded_registry, get_open_registry, set_finalized_height, get_finalized_height, get_hard_finality, set_hard_finality, get_account
+from ops.account_ops import get_totals, index_totals, get_bonded_registry, get_open_registry, registry_key, set_finalized_height, get_finalized_height, get_hard_finality, set_hard_finality, get_account
 from ops.block_ops import (
     knows_block,
     get_blocks_after,
@@ -41,12 +41,13 @@ from protocol import CHAIN_ID, BASE_SUBSIDY, MIN_TX_FEE, BOND_CAP, AUTO_BOND_MIN
 from ops.data_ops import shuffle_dict, sort_list_dict, get_byte_size, get_home
 from ops.peer_ops import check_ip, qualifies_to_sync, get_remote_status
 from ops import snapshot_ops
-from ops.pool_ops import cull_buffer
-from ops.transaction_ops import remove_outdated_transactions
+from ops import peer_transport
+from ops.sync_pipeline import SyncPipeline
 from ops.transaction_ops import (
     to_readable_amount,
     validate_transaction,
-    validate_all_spending, index_transactions, assert_unique_reserved, assert_block_blob_cap, SpendingLedger, ProofUnavailable)
+    validate_all_spending, index_transactions, assert_unique_reserved, assert_block_blob_cap, SpendingLedger, ProofUnavailable,
+    preverify_origins)
 import secrets as _secrets
 from rollback import rollback_one_block, MissingParentError, FinalityViolation
 from ops.reward_ops import credit_block_reward, apply_treasury_burn
@@ -55,7 +56,7 @@ from ops.transaction_ops import (construct_duty_tx,
                                  construct_dividend_withdraw_tx)
 from ops.attestation_ops import ffg_finalized_checkpoint
 from ops.mining_ops import beacon_commitment
-from protocol import EPOCH_LENGTH, FINALITY_DEPTH, FINALITY_HARD_BACKSTOP, REWARD_WINDOW
+from protocol import EPOCH_LENGTH, FINALITY_DEPTH, FINALITY_HARD_BACKSTOP, REWARD_WINDOW, TX_LANDING_WINDOW
 
 # ARCHIVE SELF-REPAIR cadence (seconds): how often an archive node whose history does not reach genesis
 # looks for a peer that reaches deeper and starts a background fill (_maybe_refill_archive). Only while a
@@ -93,6 +94,9 @@ REANCHOR_COOLDOWN = 30
 # tight spin: a transient misreading cannot reach the escalation, while a genuine wedge (which persists for
 # as long as nobody intervenes) reaches it in well under a minute instead of never.
 DEAD_FORK_ESCALATE_AFTER = 3
+# guards the lazy creation of CoreClient._probe_memo: the first verdict round creates it from the fan-out's
+# worker threads, several at once
+_PROBE_MEMO_LOCK = threading.Lock()
 
 
 
@@ -459,24 +463,26 @@ class CoreClient(threading.Thread):
             # it can never be re-included, so keeping it only bloats the pool and empties block candidates
             # (the zombie cleanup for a tx that mined but reverted at the exec layer, or that a lagging peer
             # re-gossiped); (2) keep the pool within its byte budget for the peer-transferable fetch.
-            # ASSIGN ONLY ON CHANGE. The property setter bumps pool_gen, which is the cache key for
-            # get_transaction_pool_hash() and get_upcoming_block_hash(). Reassigning unconditionally
-            # (twice) on every pass invalidated both caches ~2x/second even when nothing had changed,
-            # so neither cache ever hit under load — the exact opposite of their purpose.
-            with self.memserver.mempool_lock:
-                pool = self.memserver.transaction_pool
-                if pool:
-                    # ... and (3) EVICT EXPIRED txs (max_block behind the tip) HERE, every pass — not
-                    # only after producing a block ourselves. Eviction lived solely on the own-production
-                    # path, so a node that rarely wins slots NEVER evicted: measured 2026-08-18 as one
-                    # node re-serving an hour-dead claim to the whole fleet every reconcile (and hoarding
-                    # 54 expired bonds), a permanent pool-divergence pump.
-                    _tip_now = self.memserver.latest_block["block_number"]
-                    kept = [t for t in pool if kv_ops.tx_get(t.get("txid")) is None
-                            and t.get("max_block", 0) > _tip_now]
-                    culled = cull_buffer(buffer=kept, limit=self.memserver.transaction_pool_max_bytes)
-                    if len(culled) != len(pool):
-                        self.memserver.transaction_pool = culled
+            # MUTATE ONLY ON CHANGE. Every mempool change bumps pool_gen, the cache key for
+            # get_upcoming_block_hash() and the pool snapshot, so a pass that finds nothing to drop must
+            # leave the pool untouched. Each step is indexed (ops/mempool.py), not a rebuild of the pool:
+            mempool = self.memserver.mempool
+            if len(mempool):
+                # ... (3) EVICT EXPIRED txs (max_block behind the tip) HERE, every pass — not only after
+                # producing a block ourselves. Eviction lived solely on the own-production path, so a
+                # node that rarely wins slots NEVER evicted: measured 2026-08-18 as one node re-serving
+                # an hour-dead claim to the whole fleet every reconcile (and hoarding 54 expired bonds),
+                # a permanent pool-divergence pump. Pops the expiry heap: costs the expired txs only.
+                mempool.evict_outdated(self.memserver.latest_block["block_number"])
+                # (1) the mined-txid scan can only find something after a COMMIT (merge_transaction
+                # already refuses a mined txid at the door), so it runs once per committed write
+                # generation instead of one tx-index read per pooled tx every second.
+                _wgen = kv_ops.write_generation()
+                if _wgen != getattr(self, "_mined_scan_gen", None):
+                    self._mined_scan_gen = _wgen
+                    mempool.discard_ids([i for i in mempool.ids() if kv_ops.tx_get(i) is not None])
+                # (2) byte budget on the running canonical-byte total: one compare while under it
+                mempool.cull(self.memserver.transaction_pool_max_bytes)
 
             # MEMPOOL CONVERGENCE is handled entirely off this loop now: PUSH gossip delivers a new tx
             # to peers the instant it is accepted (ops/gossip.py, nado._gossip_worker), and the
@@ -678,14 +684,12 @@ class CoreClient(threading.Thread):
                                                remote=False,
                                                remote_peer=None)
 
-                            # same lost-update race as the drain above: snapshot-filter-reassign must be
-                            # atomic vs concurrent merge_transaction appends (mempool lock). Drops txs whose
-                            # max_block deadline has passed — an expired tx is NOT re-injected; the wallet
-                            # re-submits a fresh one on the user's action (Re-open), never silently.
-                            with self.memserver.mempool_lock:
-                                self.memserver.transaction_pool = remove_outdated_transactions(
-                                    self.memserver.transaction_pool.copy(),
-                                    self.memserver.latest_block["block_number"])
+                            # Drops txs whose max_block deadline has passed or lies beyond the landing
+                            # window (the remove_outdated_transactions rule, off the mempool's expiry
+                            # heaps) — an expired tx is NOT re-injected; the wallet re-submits a fresh
+                            # one on the user's action (Re-open), never silently.
+                            self.memserver.mempool.evict_outdated(self.memserver.latest_block["block_number"],
+                                                                  TX_LANDING_WINDOW)
                     else:
                         self.logger.warning("No eligible bonded producer this round; skipping production")
 
@@ -746,7 +750,7 @@ class CoreClient(threading.Thread):
             if not block:
                 return False
             try:
-                return asyncio.run(knows_block(
+                return peer_transport.run(knows_block(
                     target_peer=peer, port=self.memserver.port,
                     hash=block["block_hash"], number=block["block_number"], logger=self.logger))
             except (KeyError, TypeError):
@@ -761,9 +765,9 @@ class CoreClient(threading.Thread):
     def _fetch_sync_batch(self, peer, from_hash):
         """pull one forward-sync batch (up to SYNC_BATCH_MAX blocks after from_hash) from the donor.
         Falsy on ANY failure — never raises, so it is safe to run in the emergency loop's prefetch
-        thread (asyncio.run spins a private event loop per call, thread-safe)."""
+        thread (peer_transport.run is thread-safe and reuses the donor's pooled connection)."""
         try:
-            batch = asyncio.run(get_blocks_after(
+            batch = peer_transport.run(get_blocks_after(
                 target_peer=peer,
                 from_hash=from_hash,
                 count=SYNC_BATCH_MAX,
@@ -1011,7 +1015,7 @@ class CoreClient(threading.Thread):
                 (return_exceptions) so one dead peer can't sink the whole quorum sample."""
                 return await asyncio.gather(*[get_remote_status(ip, logger=self.logger) for ip in ips],
                                             return_exceptions=True)
-            raw = asyncio.run(_statuses(peers))
+            raw = peer_transport.run(_statuses(peers))
             # CHAIN-ID GATE: a peer on a DIFFERENT chain must NEVER be a snapshot / re-anchor donor. A node
             # stranded on a prior generation (after a reroll) advertises a valid-looking, much-heavier
             # snapshot from its OLD chain; without this a fresh node adopts that cross-chain snapshot
@@ -1104,9 +1108,15 @@ class CoreClient(threading.Thread):
                     self.logger.info("Single-donor snapshot source is not an operator seed; using full sync")
                     return False
 
-            # 2) fetch, then verify against the quorum hash and re-derive the state root locally
+            # 2) fetch, then verify against the quorum hash and re-derive the state root locally. The chunks
+            # land in the on-disk download journal (never all in RAM), so a fetch that dies half way resumes
+            # from the verified chunks on the next attempt instead of starting over. The manifest comes from
+            # `source` (the donor chosen above); every other peer advertising the SAME snapshot_hash helps
+            # serve chunks — bytes only, each checked against that manifest's sha256 and the re-derived
+            # state_root, so an extra donor adds bandwidth but no trust.
+            donors = [ip for ip, st in zip(peers, statuses) if st and st.get("snapshot_hash") == target_hash]
             manifest, chunks = asyncio.run(
-                snapshot_ops.fetch_snapshot(source, self.memserver.port, logger=self.logger))
+                snapshot_ops.fetch_snapshot(source, self.memserver.port, logger=self.logger, sources=donors))
             if not manifest or manifest.get("snapshot_hash") != target_hash:
                 self.logger.warning("Fetched snapshot does not match the agreed hash")
                 return False
@@ -1116,14 +1126,14 @@ class CoreClient(threading.Thread):
             # advertising a checkpoint it cannot extend (a dead fork's snapshot — the live wedge that
             # pinned a fresh joiner at 13000) is refused while our current identity is fully intact,
             # so a poisoned or inconsistent donor can never trade our working state for a dead end.
-            anchor = asyncio.run(
+            anchor = peer_transport.run(
                 snapshot_ops.fetch_block(source, self.memserver.port, manifest["block_hash"]))
             if (not anchor or anchor.get("block_hash") != manifest["block_hash"]
                     or anchor.get("block_number") != target_height):
                 self.logger.warning("Snapshot donor cannot serve its own checkpoint block; refusing pre-import")
                 return False
-            if not asyncio.run(get_blocks_after(target_peer=source, from_hash=anchor["block_hash"],
-                                                count=1, logger=self.logger)):
+            if not peer_transport.run(get_blocks_after(target_peer=source, from_hash=anchor["block_hash"],
+                                                       count=1, logger=self.logger)):
                 self.logger.warning("Snapshot donor cannot extend its own checkpoint (no block after the "
                                     "anchor) — dead-end snapshot refused pre-import")
                 return False
@@ -1138,7 +1148,9 @@ class CoreClient(threading.Thread):
             # 4) COMMIT: replace the carried consensus state. import_snapshot verifies every chunk
             # sha256 + the re-derived state_root BEFORE its write txn, so a failure here still leaves
             # the old identity fully intact.
-            if not snapshot_ops.import_snapshot(manifest, chunks, logger=self.logger):
+            imported = snapshot_ops.import_snapshot(manifest, chunks, logger=self.logger)
+            snapshot_ops.discard_incoming()     # the journal only resumes a DOWNLOAD; imported or rejected, done
+            if not imported:
                 return False
 
             # ...and retire the abandoned identity: every artifact NOT carried by the snapshot dies
@@ -1243,6 +1255,7 @@ class CoreClient(threading.Thread):
         if not heaviest:
             return True
         _budget = [4]      # shared prefix-probe budget for this pass (see LAGGING-PREFIX below)
+        self._asked_this_pass = set()      # (peer, height) already asked by _prefetch_extends this pass
         if not majority_on_our_canonical(heaviest, get_block, get_block_hash_by_number):
             # LAGGING-PREFIX ESCAPE (2026-08-19, second landing of the same fix): this early return was
             # the gate the first landing never reached — a lagging node NEVER holds the heaviest
@@ -1252,8 +1265,10 @@ class CoreClient(threading.Thread):
             # our height MATCHED ours). Same principle as below: if a heaviest-class peer's signed hash
             # at OUR height equals OUR tip hash, the heavier chain CONTAINS us — we are behind it, not
             # forked from it.
-            for _peer, _w in sorted(((p, w) for p, w in (self.consensus.weight_pool or {}).copy().items()
-                                     if isinstance(w, int)), key=lambda kv: -kv[1])[:4]:
+            _top = sorted(((p, w) for p, w in (self.consensus.weight_pool or {}).copy().items()
+                           if isinstance(w, int)), key=lambda kv: -kv[1])[:4]
+            self._prefetch_extends([p for p, _w in _top], _budget, "any")
+            for _peer, _w in _top:
                 if self._extends_us(_peer, _budget):
                     break
             else:
@@ -1302,6 +1317,16 @@ class CoreClient(threading.Thread):
         # unmemoized serial probing is what caused the 2026-08-18 09:00 fleet freeze. (_budget is
         # created above, before the heaviest-tip gate — ONE budget per pass, never reset mid-pass.)
         _our_w = int((self.memserver.latest_block or {}).get("cumulative_weight", 0) or 0)
+        # the veto loop below asks genesis, then prefix, one peer at a time — warm both memos for every
+        # heavier off-chain claimant concurrently first, so it reads answers instead of paying timeouts
+        _heavier = [p for p, w in (self.consensus.weight_pool or {}).copy().items()
+                    if isinstance(w, int) and w > _our_w
+                    and (self.consensus.block_hash_pool.get(p) is None
+                         or not majority_on_our_canonical(self.consensus.block_hash_pool.get(p), get_block,
+                                                          get_block_hash_by_number))]
+        if _heavier:
+            self._prefetch_genesis(_heavier)
+            self._prefetch_extends([p for p in _heavier if self._same_genesis(p)], _budget, "all")
         for _peer, _w in (self.consensus.weight_pool or {}).copy().items():
             if not isinstance(_w, int) or _w <= _our_w:
                 continue
@@ -1326,9 +1351,10 @@ class CoreClient(threading.Thread):
                 return True
         # nobody advertises a tip we hold — the lagging case. Ask the heaviest few directly whether
         # their chain contains our tip (see the header comment).
-        for _peer, _w in sorted(((p, w) for p, w in (self.consensus.weight_pool or {}).copy().items()
-                                 if isinstance(w, int) and p not in _me),
-                                key=lambda kv: -kv[1])[:4]:
+        _top = sorted(((p, w) for p, w in (self.consensus.weight_pool or {}).copy().items()
+                       if isinstance(w, int) and p not in _me), key=lambda kv: -kv[1])[:4]
+        self._prefetch_extends([p for p, _w in _top], _budget, "any")
+        for _peer, _w in _top:
             if self._extends_us(_peer, _budget):
                 return True
         return False
@@ -1359,6 +1385,18 @@ class CoreClient(threading.Thread):
         _cache[peer] = (same, _now)
         return same
 
+    def _prefetch_genesis(self, peers):
+        """Run _same_genesis for every `peers` entry not already memoized, CONCURRENTLY (bounded by
+        PROBE_DEADLINE_S), so the veto loop's one-by-one calls hit the 600 s cache."""
+        _cache = getattr(self, "_genesis_id_cache", None)
+        if _cache is None:
+            _cache = self._genesis_id_cache = {}
+        _now = time.time()
+        ask = [p for p in dict.fromkeys(peers) if not (_cache.get(p) and _now - _cache[p][1] < 600.0)]
+        if ask:
+            fork_resolution.fan_out(ask, self._same_genesis,
+                                    deadline=time.monotonic() + fork_resolution.PROBE_DEADLINE_S)
+
     def _extends_us(self, peer, budget):
         """True when `peer`'s SIGNED hash claim at OUR tip height equals our tip hash — proof our chain
         is a strict prefix of the peer's (we are behind the same chain, not on a fork). Uses the same
@@ -1378,6 +1416,8 @@ class CoreClient(threading.Thread):
         # floor stays frozen. Successes are immutable facts and ride the memo; failures re-probe
         # whenever the budget allows.
         if not (cached and cached[0]):
+            if (peer, our_h) in (getattr(self, "_asked_this_pass", None) or ()):
+                return False                       # asked this pass already (_prefetch_extends)
             if budget[0] <= 0:
                 return False
             budget[0] -= 1
@@ -1423,13 +1463,24 @@ class CoreClient(threading.Thread):
             # what turned every >45-block fork into a floor-crossing "wedge recovery"; above the hard floor
             # the verdict is now REORG and the ordinary rollback leg handles it.
             from ops.account_ops import get_hard_finality as _ghf
+            # ONE DEADLINE FOR THE WHOLE VERDICT, and each round stops as soon as its majority is settled.
+            # max_weight is the most a single signed answer can weigh (1 + the capped seat count), which
+            # is what lets a round call a majority before every straggler answered.
+            from ops.mining_ops import selection_shares
             verdict = fork_resolution.resolve(
                 our_hash_at=get_block_hash_by_number,
                 tip=tip, finalized=_ghf(), peers=peers,
-                probe=lambda peer, h: self._memo_probe(peer, h, tip))
-            self._fork_state_cache = (now, verdict)   # FULL verdict: the reorg leg needs the ancestor too
+                probe=lambda peer, h: self._memo_probe(peer, h, tip),
+                deadline=time.monotonic() + fork_resolution.VERDICT_DEADLINE_S,
+                max_weight=1 + selection_shares(BOND_CAP))
+            # FULL verdict: the reorg leg needs the ancestor too. A verdict the deadline cut short is only
+            # held ~10 s: the memo kept every answer that did arrive, so the retry resumes warm instead of
+            # sitting on UNKNOWN for a whole FORK_STATE_TTL_S.
+            self._fork_state_cache = ((now - FORK_STATE_TTL_S + 10) if verdict.get("timed_out") else now,
+                                      verdict)
             self.logger.info(f"Fork state: {verdict['state']} (ancestor={verdict['ancestor']}, "
-                             f"tip={tip}, probes={verdict['probes']})")
+                             f"tip={tip}, probes={verdict['probes']}"
+                             f"{', timed out' if verdict.get('timed_out') else ''})")
             return verdict["state"]
         except Exception as e:
             self.logger.warning(f"fork-state probe failed: {e}")
@@ -1471,19 +1522,61 @@ class CoreClient(threading.Thread):
         binary search re-asks the same heights every FORK_STATE_TTL_S — unmemoized, each emergency pass
         burned ~65 s of serial probing, the core loop hit 140 s/pass, and the whole fleet starved each
         other's event loops into timeouts (the 2026-08-18 09:00 freeze). Answers are immutable facts about
-        committed heights, so a short memo is safe; it dies with the verdict cache."""
-        from ops.peer_ops import probe_block_hash_signed
-        now = time.monotonic()
+        committed heights, so a short memo is safe.
+
+        The memo (peer_ops.ProbeMemo) lives across verdict passes and expires PER ENTRY — answers after
+        90 s, failures after 10 s — instead of being wiped whole every 90 s, and it is what the concurrent
+        fan-outs share: safe from their worker threads, one probe in flight per key, and a straggler a
+        deadline abandoned still fills it for the next pass."""
+        from ops.peer_ops import probe_block_hash_signed, ProbeMemo
         memo = getattr(self, "_probe_memo", None)
-        if memo is None or now - memo[0] > 90:
-            memo = (now, {})
-            self._probe_memo = memo
-        key = (peer, int(h))
-        if key in memo[1]:
-            return memo[1][key]
-        r = probe_block_hash_signed(peer, h, port=self.memserver.port, timeout=3, tip_hint=tip)
-        memo[1][key] = r
-        return r
+        if memo is None or not isinstance(memo[1], ProbeMemo):
+            with _PROBE_MEMO_LOCK:
+                memo = getattr(self, "_probe_memo", None)
+                if memo is None or not isinstance(memo[1], ProbeMemo):
+                    memo = self._probe_memo = (time.monotonic(), ProbeMemo(ttl=90, fail_ttl=10))
+        return memo[1].fetch(
+            (peer, int(h)),
+            lambda: probe_block_hash_signed(peer, h, port=self.memserver.port, timeout=3, tip_hint=tip))
+
+    def _prefetch_extends(self, peers, budget, want):
+        """Ask `peers` for their signed hash at OUR tip height CONCURRENTLY, through the memo, so the
+        serial _extends_us checks that follow read answers instead of each paying a 3 s probe in turn.
+
+        Same accounting as _extends_us: a peer with a memoized success is free, every other one spends one
+        unit of the pass `budget`, and one that is asked here is not re-asked by _extends_us this pass
+        (_asked_this_pass). want="any" stops the round at the first claim that extends us, want="all" at
+        the first that does not — either settles the caller's loop. Bounded by PROBE_DEADLINE_S."""
+        lb = self.memserver.latest_block or {}
+        our_h = int(lb.get("block_number", 0) or 0)
+        our_hash = lb.get("block_hash")
+        if not our_h or not our_hash:
+            return
+        memo = getattr(self, "_probe_memo", None)
+        ask = []
+        for p in dict.fromkeys(peers):
+            cached = memo is not None and memo[1].get((p, our_h))
+            if cached and cached[0]:
+                continue
+            if budget[0] <= 0:
+                break
+            budget[0] -= 1
+            if memo is not None:
+                memo[1].pop((p, our_h), None)
+            ask.append(p)
+        if not ask:
+            return
+        asked = getattr(self, "_asked_this_pass", None)
+        if asked is not None:
+            asked.update((p, our_h) for p in ask)
+
+        def _probe(p):
+            h, _seats = self._memo_probe(p, our_h, our_h)
+            return h == our_hash
+
+        fork_resolution.fan_out(
+            ask, _probe, deadline=time.monotonic() + fork_resolution.PROBE_DEADLINE_S,
+            stop=lambda done, pending: any(done.values()) if want == "any" else not all(done.values()))
 
     def _inline_tip_swap(self):
         """ONE-BLOCK TIE FAST PATH (2026-08-19). Every organic fork this week was a single divergent
@@ -1671,7 +1764,7 @@ class CoreClient(threading.Thread):
             # Now each short life fetches what is still missing and the walk completes across lives.
             b = get_block(cur) or None
             if not isinstance(b, dict):
-                b = asyncio.run(snapshot_ops.fetch_block(src, self.memserver.port, cur))
+                b = peer_transport.run(snapshot_ops.fetch_block(src, self.memserver.port, cur))
                 if not isinstance(b, dict) or b.get("block_hash") != cur:
                     self._rec_fail("donor stopped serving", at_hash=str(cur)[:12], src=src)
                     self.logger.info(f"Branch adoption: {src} stopped serving its own branch at {cur[:12]}")
@@ -2264,7 +2357,7 @@ class CoreClient(threading.Thread):
                     time.sleep(1)
                 else:
                     block_hash = self.memserver.latest_block["block_hash"]
-                    known_block = asyncio.run(knows_block(
+                    known_block = peer_transport.run(knows_block(
                         target_peer=peer,
                         port=self.memserver.port,
                         hash=block_hash,
@@ -2364,21 +2457,27 @@ class CoreClient(threading.Thread):
             raise
 
     def _fast_forward_from(self, peer, from_hash) -> bool:
-        """FAST-FORWARD leg of emergency sync: the donor knows our tip, so pull the gap from it in
-        pipelined batches — the NEXT batch (keyed off the current batch's tail hash) downloads in a
-        background thread while the CPU verifies the current one. Sync is verify-bound, so the
-        download rides for free. Returns True when the emergency pass should END (the tip was
-        rejected: a block failed verification, the donor served nothing, or the fetch errored) and
-        False when this donor's chain was consumed cleanly — the outer loop then re-evaluates
-        being-behind and re-picks a donor."""
+        """FAST-FORWARD leg of emergency sync: the donor knows our tip, so pull the gap from it through a
+        SyncPipeline (ops/sync_pipeline.py) — a fetcher walks the donor's chain up to
+        SYNC_PREFETCH_BATCHES batches ahead (each keyed off the previous batch's tail hash) and a worker
+        pool runs the STATELESS checks (content hash, winner signature, linkage, the tx-signature batch)
+        on them, while this thread applies blocks strictly in order through produce_block, which stays the
+        only authority on accept/reject. Sync is verify-bound, so download and signature work ride for
+        free. Returns True when the emergency pass should END (the tip was rejected: a block failed
+        verification, the donor served nothing, or the fetch errored) and False when this donor's chain
+        was consumed cleanly — the outer loop then re-evaluates being-behind and re-picks a donor. Every
+        exit closes the pipeline, which drops whatever was prefetched past the point we stopped."""
+        pipeline = None
         try:
-            new_blocks = self._fetch_sync_batch(peer=peer, from_hash=from_hash)
+            pipeline = SyncPipeline(lambda tail: self._fetch_sync_batch(peer=peer, from_hash=tail), from_hash)
+            new_blocks = pipeline.next()
             if not new_blocks:
                 # peer advertised heavier + claims to know our tip, then serves NOTHING —
                 # a lying/broken peer. Reject the tip or we loop on it forever. If a strictly-heavier
                 # chain exists this can also mean OUR tip is a dead end no donor extends (a fork all
                 # honest peers abandoned) — try the re-anchor jump (cooldown-limited internally)
                 # instead of only excluding tips one by one until the pool runs dry.
+                pipeline.close()
                 self.logger.info(f"No newer blocks found from {peer}")
                 self._reject_heaviest_tip()
                 if self._maybe_reanchor():
@@ -2387,14 +2486,6 @@ class CoreClient(threading.Thread):
                 return True
 
             while new_blocks and not self.memserver.terminate:
-                prefetch = {}
-                prefetch_thread = threading.Thread(
-                    target=lambda tail=new_blocks[-1]["block_hash"]: prefetch.update(
-                        batch=self._fetch_sync_batch(peer=peer, from_hash=tail)),
-                    daemon=True)
-                prefetch_thread.start()
-
-                rejected = False
                 for block in new_blocks:
                     if self.memserver.terminate:
                         break
@@ -2404,27 +2495,29 @@ class CoreClient(threading.Thread):
                         # on the same bad advertisement (Sybil-stall). Auto-cleared, so a transient
                         # failure on a REAL heavier chain is retried in ~30s. (produce_block also
                         # returns False when interrupted by shutdown — don't reject the tip then.)
+                        # Everything prefetched past this block descends from it: discard it.
+                        pipeline.close()
                         if not self.memserver.terminate:
                             self._reject_heaviest_tip()
-                        rejected = True
-                        break
-
-                prefetch_thread.join()
-                if rejected:
-                    return True
+                        return True
+                if self.memserver.terminate:
+                    break
                 # A batch from this donor VERIFIED AND APPLIED — the only honest healing signal there
                 # is. A peer struck while briefly down (update-wave restart) is rehabilitated on first
                 # service instead of sitting out an escalated bench; for a lone seed bridge that bench
                 # meant coasting adrift on our own fork for its whole lifetime (observed live: 70+
                 # blocks within the hour of shipping the 2h bench).
                 self.consensus.peer_fetch_succeeded(peer)
-                new_blocks = prefetch.get("batch")
+                new_blocks = pipeline.next()
             return False
 
         except Exception as e:
             self.logger.error(f"Failed to get blocks after {from_hash} from {peer}: {e}")
             self._reject_heaviest_tip()
             return True
+        finally:
+            if pipeline is not None:
+                pipeline.close()
 
     def _rollback_one_for_reorg(self, ancestor=None) -> bool:
         """REORG leg of emergency sync: the MEASURED verdict says our chain diverged (see emergency_mode
@@ -2615,12 +2708,14 @@ class CoreClient(threading.Thread):
         parent = self.memserver.latest_block
         block_number = parent["block_number"] + 1
         _epoch = epoch_of(block_number)
+        _reg_key = registry_key()                # captured before the registry reads (see registry_key)
         bonded_registry = get_bonded_registry()  # as-of-parent (tip == parent here)
         # RANDAO gate (pass-through while RANDAO_ENFORCED is off — reveals are optional); the FULL
         # registry always feeds block_fork_weight below (withholding must not move fork-choice).
         winner = select_producer_two_lane(get_open_registry(_epoch),
                                           randao_eligible_bonded(bonded_registry, _epoch),
-                                          epoch_beacon(_epoch), slot=block_number)
+                                          epoch_beacon(_epoch), slot=block_number,
+                                          registry_key=_reg_key)
         return construct_block(
             # CRITICAL: use the INCOMING block's OWN timestamp, NOT our wall-clock. rebuild_block
             # deterministically reconstructs a REMOTE block to re-derive the winner/reward/weight (anti-forgery),
@@ -3081,7 +3176,7 @@ class CoreClient(threading.Thread):
             while cur_hash and cur_h > lo:
                 body = get_block(cur_hash) or None
                 if not body:
-                    body = asyncio.run(snapshot_ops.fetch_block(source, self.memserver.port, cur_hash))
+                    body = peer_transport.run(snapshot_ops.fetch_block(source, self.memserver.port, cur_hash))
                     if body and body.get("block_hash") == cur_hash:
                         save_block(body, logger=self.logger)
                     else:
@@ -3118,7 +3213,7 @@ class CoreClient(threading.Thread):
         deep_missing = [(h, bh) for h, bh in missing if h < C - tail_depth]
         fetched = 0
         for h, bh in near:
-            body = asyncio.run(snapshot_ops.fetch_block(source, self.memserver.port, bh))
+            body = peer_transport.run(snapshot_ops.fetch_block(source, self.memserver.port, bh))
             if body and body.get("block_hash") == bh:
                 save_block(body, logger=self.logger)
                 fetched += 1
@@ -3171,7 +3266,7 @@ class CoreClient(threading.Thread):
             fetched = failed = 0
             for h, bh in deep_missing:                                # highest first, as planned
                 try:
-                    body = asyncio.run(snapshot_ops.fetch_block(source, self.memserver.port, bh))
+                    body = peer_transport.run(snapshot_ops.fetch_block(source, self.memserver.port, bh))
                 except Exception:
                     body = None
                 if body and body.get("block_hash") == bh:
@@ -3197,7 +3292,7 @@ class CoreClient(threading.Thread):
                 cur_h -= 1
                 if kv_ops.block_loc_get(ph) is None:
                     try:
-                        nb = asyncio.run(snapshot_ops.fetch_block(source, self.memserver.port, ph))
+                        nb = peer_transport.run(snapshot_ops.fetch_block(source, self.memserver.port, ph))
                     except Exception:
                         nb = None
                     if not nb or nb.get("block_hash") != ph:
@@ -3264,7 +3359,7 @@ class CoreClient(threading.Thread):
             async def _statuses(ips):
                 return await asyncio.gather(*[get_remote_status(ip, logger=self.logger) for ip in ips],
                                             return_exceptions=True)
-            raw = asyncio.run(_statuses(peers))
+            raw = peer_transport.run(_statuses(peers))
             cands = []
             for ip, st in zip(peers, raw):
                 if not isinstance(st, dict) or st.get("chain_id") != CHAIN_ID:
@@ -3816,14 +3911,15 @@ class CoreClient(threading.Thread):
             # this one didn't, so _txid_set_cache and _pool_hash_cache went stale and
             # get_transaction_pool_hash() kept advertising a pool hash that still contained the txs we
             # had just mined — polluting transaction_hash_pool_percentage, a consensus VOLATILITY
-            # signal, for up to a second after every block. Rebuilding and reassigning goes through the
-            # property setter, which bumps pool_gen, so both caches invalidate correctly.
-            included_txids = {t.get("txid") for t in transactions}
-            with self.memserver.mempool_lock:
-                pool = self.memserver.transaction_pool
-                kept = [t for t in pool if t.get("txid") not in included_txids]
-                if len(kept) != len(pool):
-                    self.memserver.transaction_pool = kept
+            # signal, for up to a second after every block. The mempool drops them by txid (O(B)) and
+            # bumps pool_gen itself, so every pool-derived cache invalidates correctly.
+            self.memserver.mempool.discard_ids({t.get("txid") for t in transactions})
+
+            # ONE parallel signature pass for the whole block (signatures.verify_many across worker
+            # processes) before the strictly sequential state checks below, so block verification scales
+            # with cores rather than tx count. Only ACCEPTED signatures are recorded; anything the pass
+            # rejected or skipped is verified again in validate_origin, so the outcome per tx is unchanged.
+            preverified = preverify_origins(transactions)
 
             for transaction in transactions:
                 try:
@@ -3841,7 +3937,8 @@ class CoreClient(threading.Thread):
                     validate_transaction(transaction=transaction,
                                          logger=logger,
                                          block_height=block["block_number"],
-                                         deep=_deep)
+                                         deep=_deep,
+                                         preverified=preverified)
                 except ProofUnavailable:
                     # THE THIRD OUTCOME: not valid, not invalid — NOT YET. A DA-published settle proof we do
                     # not hold says nothing about whether this block is good, so we must neither accept it
@@ -3884,10 +3981,13 @@ class CoreClient(threading.Thread):
         epoch = epoch_of(block_number)
         # RANDAO gate (consensus): verification draws over the same eligible set production uses
         # (the full registry while RANDAO_ENFORCED is off; the revealed-for-epoch subset when on).
+        # The registry key is captured BEFORE the registry reads (see account_ops.registry_key).
+        reg_key = registry_key()
         winner = select_producer_two_lane(get_open_registry(epoch),
                                           randao_eligible_bonded(get_bonded_registry(), epoch),
                                           epoch_beacon(epoch),
-                                          slot=block_number)
+                                          slot=block_number,
+                                          registry_key=reg_key)
         if winner is None:
             raise ValueError("No eligible producer for this block (fail-closed)")
         if block.get("block_creator") != winner:
@@ -407,7 +407,7 @@ class MessageClient(threading.Thread):
 
                 # Supporting detail (kept at debug — the report above is the summary)
                 self.logger.debug(
-                    f"Mempool: {len(self.memserver.transaction_pool)} tx")
+                    f"Mempool: {len(self.memserver.mempool)} tx")
                 self.logger.debug(
                     f"Tx volatility index: {int(100 - self.consensus.transaction_hash_pool_percentage)}%")
                 self.logger.debug(
@@ -3,12 +3,13 @@ import threading
 import time
 import traceback
 
-from compounder import compound_get_status_pool
 from config import get_timestamp_seconds
 from config import test_self_port
 from ops.peer_ops import announce_me, get_list_of_peers, load_ips, check_save_peers
 from ops.peer_ops import get_public_ip, update_local_ip, check_ip, subnet_diversity_ok
 from ops.peer_ops import seed_default_peers, seed_peers, status_fields_well_typed
+from ops import peer_transport
+from ops.status_feed import StatusSubscriptions
 from ops import self_update
 from protocol import CHAIN_ID, GENESIS_TIMESTAMP, BLOCK_TIME
 
@@ -52,6 +53,7 @@ class PeerClient(threading.Thread):
         self.duration = 0
         self.heavy_refresh_timer = 0
         self._last_peerless_reload = 0   # backoff timer for the "no peers, reload from drive" retry (anti-spam)
+        self.status_subs = StatusSubscriptions(port=memserver.port, logger=logger)
 
     def sniff_buffered_peers(self):
         """gets peers from buffer and adds them to routine"""
@@ -124,8 +126,8 @@ class PeerClient(threading.Thread):
         eclipse), merge peers' gossiped txs into the mempool EVERY pass (continuous, mirroring the
         local drain in core_loop.normal_mode), un-bench cooled-down unreachable peers (operator
         seeds immediately — they are the anchor), run the periodic heavy refresh (announce, peer
-        health, public-IP + self-port probe -> can_mine), and pull every peer's status into
-        consensus.status_pool. Status admission is fail-closed on protocol AND chain_id: a foreign
+        health, public-IP + self-port probe -> can_mine), and admit every peer's pushed status
+        (StatusSubscriptions) into consensus.status_pool. Status admission is fail-closed on protocol AND chain_id: a foreign
         chain's tip weight in the pools would flip the caught-up gate and minority_block_consensus,
         stalling production against blocks verify_block can only reject. Failures accumulate in
         purge_peers_list and are flushed at the end of each pass."""
@@ -150,10 +152,10 @@ class PeerClient(threading.Thread):
                         self._last_peerless_reload = now
                         self.logger.info("No peers, reloading from drive")
                         seed_default_peers(self.logger, getattr(self.memserver, "ip", None))   # bake-in bootstrap seed if drive is empty
-                        self.memserver.peers = asyncio.run(load_ips(fail_storage=self.memserver.purge_peers_list,
-                                                                    unreachable=self.memserver.unreachable,
-                                                                    logger=self.logger,
-                                                                    port=self.memserver.port))
+                        self.memserver.peers = peer_transport.run(load_ips(fail_storage=self.memserver.purge_peers_list,
+                                                                           unreachable=self.memserver.unreachable,
+                                                                           logger=self.logger,
+                                                                           port=self.memserver.port))
 
                 # merge peers' gossiped txs into the mempool EVERY pass (continuous, like the local drain in
                 # core_loop.normal_mode) — no phase gating, so remote txs never stall waiting for a slot.
@@ -214,16 +216,17 @@ class PeerClient(threading.Thread):
 
                     self.memserver.can_mine = test_self_port(self.memserver.ip, self.memserver.port)
 
-                candidates = asyncio.run(
-                    compound_get_status_pool(
-                        ips=self.memserver.peers,
-                        port=self.memserver.port,
-                        logger=self.logger,
-                        fail_storage=self.memserver.purge_peers_list,
-                        compress="zstd",
-                        semaphore=asyncio.Semaphore(50)
-                    )
-                )
+                # PUSHED status (ops/status_feed.py): one /status_stream long-poll per peer keeps its latest
+                # status current — the peer builds it once per change for all subscribers, instead of
+                # once per poller per second. A failed subscription queues the peer for purge exactly
+                # like a failed poll did; admission below is unchanged and runs on every pass. The frames
+                # ride the binary CORE wire (ops/status_core.py): each peer's entry is the consensus subset
+                # of its status, not the full diagnostic dict — /status stays the on-demand diagnostic.
+                self.status_subs.follow(self.memserver.peers)
+                for failed in self.status_subs.drain_failures():
+                    if failed not in self.memserver.purge_peers_list:
+                        self.memserver.purge_peers_list.append(failed)
+                candidates = self.status_subs.snapshot()
 
                 for key, value in candidates.items():
                     # Fail-closed on a malformed status: a peer that omits `protocol` (old/broken/hostile
@@ -1,7 +1,6 @@
 import asyncio
 import os
 import queue
-import threading
 
 from config import get_protocol, get_timestamp_seconds, get_config
 from hashing import blake2b_hash
@@ -9,14 +8,15 @@ from ops.account_ops import get_account, get_finalized_height
 from ops.block_ops import get_block_ends_info
 from ops.data_ops import sort_list_dict, get_home
 from ops.key_ops import load_keys
+from ops.mempool import Mempool
 from ops.message_pool import MessagePool
 from ops.transaction_ops import (
     validate_single_spending,
     validate_transaction,
-    sort_transaction_pool,
     validate_txid
 
 )
+from ops import peer_transport
 from ops import kv_ops   # tx-index oracle: an already-mined txid can never re-enter the mempool
 from versioner import read_version
 
@@ -58,10 +58,12 @@ class MemServer:
         # already-mined txid, so an IDENTICAL transaction (same content -> same txid) is impossible to
         # reintroduce or re-mine. A tx that misses its max_block simply expires; the wallet re-submits a
         # fresh tx (new nonce -> new txid) on the user's action, never silently re-injected.
-        self.mempool_lock = threading.RLock()
-        self.pool_gen = 0                 # bumped on EVERY pool mutation (see transaction_pool property)
-        self._txid_set_cache = None        # (pool_gen, {txid}) — O(1) duplicate checks between mutations
-        self.transaction_pool = []
+        # INDEXED MEMPOOL (ops/mempool.py): txid map, per-sender queues, expiry heaps, running byte total
+        # and the incrementally kept pool hash, locked per sender stripe. transaction_pool is now its
+        # read-only list snapshot; every mutation goes through self.mempool. mempool_lock is the
+        # mempool's structural lock, kept for callers that held the old one.
+        self._mempool = Mempool()
+        self.mempool_lock = self._mempool.lock
         # GOSSIP REJECT CACHE {txid: retry_after_ts}: bodies fetched during set reconciliation that
         # merge_transaction REFUSED (expired target, cross-fork max_block, invalid). Without it a
         # divergent peer's pool hash never matches ours, so the SAME rejected bodies were re-fetched
@@ -112,7 +114,9 @@ class MemServer:
         block_ends_info = get_block_ends_info(logger=logger)
         self.latest_block = block_ends_info["latest_block"]
         self.earliest_block = block_ends_info["earliest_block"]
-        # MEMPOOL CAPS (LOCAL policy, non-consensus — get_byte_size is a rough sys.getsizeof(repr) estimate).
+        # MEMPOOL CAPS (LOCAL policy, non-consensus). The byte budget is measured in CANONICAL bytes (the
+        # mempool's running total of hashing.canonical_bytes per tx — what the peer wire carries); it used to
+        # be get_byte_size, a rough sys.getsizeof(repr) estimate recomputed over the whole pool every pass.
         # These were ONE fused constant (150000) that meant "150k txs" in the accept gate but "150000 BYTES"
         # (~146 KB) in cull_buffer — and 146 KB is SMALLER than one block's blob budget (MAX_BLOB_BYTES_PER_BLOCK
         # = 256 KB), so cull evicted blob txs before a block could ever fill to 256 KB. Split into:
@@ -321,81 +325,68 @@ class MemServer:
         if peer not in self.purge_peers_list and peer not in self.unreachable:
             self.purge_peers_list.append(peer)
 
-    # HASH CACHES for the two per-second consensus signals below. Key = the pool LIST OBJECT itself
-    # (the cache keeps a live reference, so CPython can never recycle its id) + its length: every
-    # pool mutation either REASSIGNS self.transaction_pool (merge_transaction's post-append sort,
-    # purge, drain, cull — a new object) or changes its LENGTH in place (block-inclusion evict), so
-    # (same object, same length) proves the tx set is unchanged and the cached hash is exact. This
-    # turns the old O(pool)·sort + canonical-serialize EVERY SECOND into O(1) between pool changes —
-    # the whole-mempool rehash was the classic hot-loop serialization cost at mempool scale.
-    _pool_hash_cache = None            # (pool_gen, hash)
+    # HASH CACHE for the upcoming-block signal below: keyed by pool_gen (the mempool's change counter),
+    # the tip hash and the committed-write generation, so it is exact between changes and O(1) per
+    # second. The whole-pool hash needs no cache here — the mempool keeps it incrementally (pool_hash).
     _upcoming_hash_cache = None        # (pool_gen, parent_hash, kv_write_gen, hash)
 
-    # The pool is a property so EVERY reassignment (merge append path, purges, the core loop's
-    # drain/cull swaps) bumps pool_gen — the one content-change signal all pool-derived caches key on.
-    # (Object identity is NOT a safe key: CPython reuses freed list addresses, and in-place appends
-    # keep identity while changing content. In-place mutation sites bump pool_gen explicitly.)
+    @property
+    def mempool(self):
+        """The indexed mempool (ops/mempool.Mempool). Created on first use for a MemServer built without
+        __init__ (tests bind methods onto object.__new__(MemServer))."""
+        mp = self.__dict__.get("_mempool")
+        if mp is None:
+            mp = self._mempool = Mempool()
+        return mp
+
+    # The list view. READ: a read-only snapshot (PoolView) rebuilt once per change — the API dumps and
+    # the loops' readers keep working unchanged. ASSIGN: replaces the pool's contents (re-indexed).
     @property
     def transaction_pool(self):
-        return self._transaction_pool
+        return self.mempool.snapshot()
 
     @transaction_pool.setter
     def transaction_pool(self, value):
-        self._transaction_pool = value
-        self.pool_gen += 1
-
-    def _pool_txid_set(self):
-        """set of pooled txids at the current pool_gen — rebuilt only after a mutation, so the
-        per-second re-gossip storm (peers re-serve their whole pool) dedups in O(1) per tx instead
-        of an O(pool) deep-compare over the full posw payloads."""
-        c = self._txid_set_cache
-        if c is None or c[0] != self.pool_gen:
-            c = (self.pool_gen, {t.get("txid") for t in self._transaction_pool})
-            self._txid_set_cache = c
-        return c[1]
+        self.mempool.replace(value)
+
+    # the one content-change signal all pool-derived caches key on
+    @property
+    def pool_gen(self):
+        return self.mempool.gen
+
+    @pool_gen.setter
+    def pool_gen(self, value):
+        self.mempool.gen = value
 
     def get_transaction_pool_hash(self) -> [str, None]:
-        """blake2b of the SORTED transaction pool (None when empty). Sorting first makes the hash
-        canonical — two nodes holding the same tx set report the same hash regardless of arrival
-        order — which is what lets the consensus loop majority-vote on pool hashes instead of
-        shipping full pools around. Hashes a copy so a concurrent merge can't mutate mid-sort.
-        Cached per pool object+length (see cache note above) — a pure function of the tx set."""
-        pool = self.transaction_pool
-        if not pool:
-            return None
-        cached = self._pool_hash_cache
-        gen = self.pool_gen
-        if cached is not None and cached[0] == gen:
-            return cached[1]
-        pool_hash = blake2b_hash(sort_transaction_pool(pool.copy()))
-        self._pool_hash_cache = (gen, pool_hash)
-        return pool_hash
+        """Digest of the transaction pool's tx SET (None when empty). Order-independent — two nodes
+        holding the same tx set report the same hash regardless of arrival order — which is what lets
+        the consensus loop majority-vote on pool hashes instead of shipping full pools around. A
+        multiset accumulator kept by the mempool per insert/drop (Mempool.pool_hash): O(1) to read,
+        where hashing the sorted pool re-serialized every tx on every change."""
+        return self.mempool.pool_hash()
 
     def get_upcoming_block_hash(self):
-        """blake2b of the NEXT block's content ON TOP OF OUR TIP: parent hash + next height + the mature,
-        target-height tx subset (match_transactions_target). This is EXACTLY what block determinism / the
-        fast-forward depend on — two nodes at the same tip agree here iff they will build the identical
-        next block, INCLUDING an empty one (a produced block always has a hash). Unlike the whole-pool
-        hash it excludes immature (min_block not reached) and future-targeted txs that won't be in the
-        next block. parent+height make it tip-specific, so nodes on a different tip correctly don't match.
+        """Hash of the NEXT block's content ON TOP OF OUR TIP: parent hash + next height + the digest of
+        the mature, target-height tx subset (the set match_transactions_target selects). This is EXACTLY
+        what block determinism / the fast-forward depend on — two nodes at the same tip agree here iff
+        they will build the identical next block, INCLUDING an empty one (a produced block always has a
+        hash). Unlike the whole-pool hash it excludes immature (min_block not reached) and
+        future-targeted txs that won't be in the next block. parent+height make it tip-specific, so nodes
+        on a different tip correctly don't match.
         NEVER None (an empty next block still hashes) — so a peer's absence of eligible txs is a real,
         comparable signal, not a null that poisons the majority.
-        Cached per (pool object+length, tip hash, committed-write generation): the match also reads
-        the on-chain mined-txid index, and the write generation invalidates on ANY commit, so the
-        cache can never outlive the state it was derived from."""
-        from ops.block_ops import match_transactions_target
+        The tx subset is maintained incrementally by the mempool (Mempool.upcoming_digest: rebuilt once
+        per tip / committed-write generation, then per insert/drop) instead of re-matching and
+        re-serializing the whole pool on every pool change; the result is cached per (pool_gen, tip
+        hash, committed-write generation) on top."""
         parent = self.latest_block
-        pool = self.transaction_pool
         cached = self._upcoming_hash_cache
         key = (self.pool_gen, parent["block_hash"], kv_ops.write_generation())
         if cached is not None and cached[0:3] == key:
             return cached[3]
         next_height = parent["block_number"] + 1
-        matched = match_transactions_target(transaction_list=pool.copy(),
-                                            block_number=next_height, logger=self.logger) if pool else []
-        if matched is False:                              # a match error -> treat as empty
-            matched = []
-        upcoming = blake2b_hash([parent["block_hash"], next_height, sort_transaction_pool(matched)])
+        upcoming = blake2b_hash([parent["block_hash"], next_height, self.mempool.upcoming_digest(next_height)])
         self._upcoming_hash_cache = (*key, upcoming)
         return upcoming
 
@@ -407,6 +398,9 @@ class MemServer:
     # per-peer/per-pass bound on bodies fetched during set reconciliation; the server side caps a
     # /transactions_by_id request at the same figure. The remainder arrives on the next 1s pass.
     _RECONCILE_MAX_IDS = 1000
+    # the IBLT size asked of each divergent peer (ops/pool_sketch): 3 x 2**7 cells, ~17 KB, peels a
+    # difference of ~250 ids. A bigger difference fails to peel and falls back to that peer's id list.
+    _RECONCILE_SKETCH_LOG2 = 7
 
     @staticmethod
     def reject_cooldown_s(message, funder_in_pool):
@@ -450,7 +444,7 @@ class MemServer:
         txs. Each missing txid is claimed from ONE peer per pass (no duplicate downloads)."""
         pool_peers = [p for p in self.peers if p not in skip_pool_peers]
         if pool_peers:
-            missing = asyncio.run(self._fetch_missing_remote_txs(pool_peers))
+            missing = peer_transport.run(self._fetch_missing_remote_txs(pool_peers))
             now = get_timestamp_seconds()
             for tx in missing:
                 result = self.merge_transaction(tx, user_origin)
@@ -458,8 +452,7 @@ class MemServer:
                 # rejected tx from the same divergent peer every second. 60s TTL: a transient reason
                 # (mempool full, account funded later) is retried after the cooldown.
                 if isinstance(result, dict) and not result.get("result") and isinstance(tx.get("txid"), str):
-                    _funder_seen = any(isinstance(t, dict) and t.get("recipient") == tx.get("sender")
-                                       for t in self.transaction_pool)
+                    _funder_seen = self.mempool.has_recipient(tx.get("sender"))
                     _cool = self.reject_cooldown_s(result.get("message"), _funder_seen)
                     if _cool:
                         self._tx_reject_cache[tx["txid"]] = now + _cool
@@ -481,14 +474,31 @@ class MemServer:
     async def _fetch_missing_remote_txs(self, pool_peers) -> list:
         """ids from all divergent peers in parallel -> per-peer want-lists (deduped across peers,
         mined txids excluded) -> parallel bounded body fetches. A peer that cannot serve the
-        reconciliation wire goes to the purge queue like any other failing peer (no legacy wire)."""
+        reconciliation wire goes to the purge queue like any other failing peer (no legacy wire).
+        Each peer is asked for a SKETCH first (ops/pool_sketch): theirs minus ours peels to exactly the
+        ids they hold and we don't. A peer whose sketch does not peel (difference too big for it) is
+        asked for its plain id list in a second round."""
         from compounder import compound_get_tx_ids, post_txs_by_id
+        from ops.pool_sketch import PoolSketch
         semaphore = asyncio.Semaphore(50)
         ids_by_peer = await compound_get_tx_ids(pool_peers, self.port, self.logger,
-                                                self.purge_peers_list, semaphore)
+                                                self.purge_peers_list, semaphore,
+                                                sketch=self._RECONCILE_SKETCH_LOG2)
+        unpeeled = []
+        for peer, ids in list(ids_by_peer.items()):
+            if isinstance(ids, dict):
+                theirs = self._peel_peer_sketch(ids["sketch"], PoolSketch)
+                if theirs is None:
+                    unpeeled.append(peer)
+                    del ids_by_peer[peer]
+                else:
+                    ids_by_peer[peer] = theirs
+        if unpeeled:
+            ids_by_peer.update(await compound_get_tx_ids(unpeeled, self.port, self.logger,
+                                                         self.purge_peers_list, semaphore))
         if not ids_by_peer:
             return []
-        local = {t.get("txid") for t in self.transaction_pool}
+        local = self.mempool
         claimed = set()
         plans = []
         _now = get_timestamp_seconds()
@@ -516,6 +526,16 @@ class MemServer:
         return out
 
 
+    def _peel_peer_sketch(self, body, sketch_cls):
+        """The txids a peer's pool sketch holds and ours doesn't, or None when the wire is malformed or
+        the difference does not peel at that size."""
+        try:
+            theirs, _n = sketch_cls.from_bytes(body)
+            diff = theirs.subtract(self.mempool.sketch_table(theirs.log2)).peel()
+        except ValueError:
+            return None
+        return None if diff is None else diff[0]
+
     def maybe_watchtower_slash(self, transaction):
         """THE WATCHTOWER: automatic slashing on an OBSERVED FFG double-vote. Slash validation has been
         complete for a while (resolve_slash: both proof kinds, dedup, penalty) — but nothing ever
@@ -587,14 +607,14 @@ class MemServer:
         # re-hashed the 36 KiB posw body per duplicate, which alone saturated the GIL at fleet scale.
         # Success, not error: it IS present (same contract as the late "Already present" branch).
         _txid = transaction.get("txid")
-        if isinstance(_txid, str) and _txid in self._pool_txid_set():
+        if isinstance(_txid, str) and _txid in self.mempool:
             return {"message": "Already present", "result": True}
 
         # Anti-DoS: hard-cap the mempool so a flood (incl. fee-exempt register/heartbeat spam) cannot
         # grow it unbounded and OOM the node. Pairs with the per-IP HTTP rate limiter. The lane cap
         # already stops spam from buying extra block share; this stops it taking the node down.
         # PERF: O(1) length check on the single pool — a flood already at the cap is rejected in O(1).
-        if len(self.transaction_pool) >= self.transaction_pool_max_txs:
+        if len(self.mempool) >= self.transaction_pool_max_txs:
             return {"result": False, "message": "Mempool full"}
 
         # CHEAP BOUNDS FIRST (audit): the two integer max_block compares run before the LMDB
@@ -637,8 +657,7 @@ class MemServer:
         # already-admitted duplicates must keep relaying identically on every node.
         elif (user_origin and transaction.get("recipient") == "withdraw"
                 and any(t.get("recipient") == "withdraw"
-                        and t.get("sender") == transaction.get("sender")
-                        for t in self.transaction_pool)):
+                        for t in self.mempool.of_sender(transaction.get("sender")))):
             msg = {"result": False,
                    "message": "unbond withdrawal already pending — the earlier claim is still waiting "
                               "to land"}
@@ -651,9 +670,8 @@ class MemServer:
         # exempt — identical divergence-safety argument as the two gates above.
         elif (user_origin and transaction.get("recipient") == "dividend_withdraw"
                 and any(t.get("recipient") == "dividend_withdraw"
-                        and t.get("sender") == transaction.get("sender")
                         and (t.get("data") or {}).get("nonce") == (transaction.get("data") or {}).get("nonce")
-                        for t in self.transaction_pool)):
+                        for t in self.mempool.of_sender(transaction.get("sender")))):
             msg = {"result": False,
                    "message": "dividend claim already pending — the earlier claim is still waiting "
                               "to land"}
@@ -682,8 +700,7 @@ class MemServer:
         # refuse it at the door (gossip exempt) so the pool carries one attempt per wallet.
         elif (user_origin and transaction.get("recipient") == "register"
                 and any(t.get("recipient") == "register"
-                        and t.get("sender") == transaction.get("sender")
-                        for t in self.transaction_pool)):
+                        for t in self.mempool.of_sender(transaction.get("sender")))):
             msg = {"result": False,
                    "message": "registration already pending — the earlier attempt is still waiting "
                               "to land"}
@@ -731,7 +748,7 @@ class MemServer:
             # whole pool doing full-dict __eq__ on every genuinely NEW tx (the one case the fast path
             # at the top of this method cannot short-circuit). Kept rather than deleted because another
             # thread can have added this txid since that fast path ran.
-            if transaction.get("txid") in self._pool_txid_set():
+            if transaction.get("txid") in self.mempool:
                 # Idempotent: already pooled (e.g. a re-gossiped heartbeat) — a benign success, not an
                 # error (matches the "already present" handling clients now expect).
                 return {"message": "Already present", "result": True}
@@ -745,15 +762,12 @@ class MemServer:
                 return msg
             else:
                 try:
-                    validate_single_spending(transaction_pool=self.transaction_pool, transaction=transaction)
-
-                    # mutation tail under the mempool lock: the membership re-check and the append+sort
-                    # must be atomic vs the core loop's drain/production swaps and vs sibling
-                    # merge_transaction calls on other threads (double-accept / lost-append races).
-                    with self.mempool_lock:
-                        if _txid not in self._pool_txid_set():
-                            self._transaction_pool.append(transaction)
-                            self.pool_gen += 1   # in-place append — bump the content signal by hand
+                    # spend check + insert run atomically under the SENDER's lock stripe (Mempool.add):
+                    # the check reads only this sender's queue, and a concurrent same-sender admission
+                    # can no longer pass it against a pool that holds neither tx. A txid another thread
+                    # pooled meanwhile is simply not added twice.
+                    self.mempool.add(transaction, check=lambda queued: validate_single_spending(
+                        transaction_pool=queued, transaction=transaction))
 
                 except Exception as e:
                     msg = f"Remote transaction failed to validate: {e}"
@@ -787,7 +801,6 @@ class MemServer:
         """of sender sending different txs to different nodes both exhausting balance"""
         # AUDIT FIX: was `for tx in pool: pool.remove(tx)` — removing while iterating shifts the
         # index and SKIPS the element after every hit, so adjacent same-sender txs (the exact
-        # double-spend shape this guard exists for) half-survived the purge. Rebuild the pool under
-        # the mempool lock instead.
-        with self.mempool_lock:
-            self.transaction_pool = [t for t in self.transaction_pool if t["sender"] != sender]
+        # double-spend shape this guard exists for) half-survived the purge. The sender's queue is
+        # dropped whole, under its lock stripe.
+        self.mempool.purge_sender(sender)
@@ -7,6 +7,7 @@ import re
 import signal
 import socket
 import sys
+from collections import OrderedDict
 
 from ops import codec
 from ops.gossip import should_gossip, gossip_targets
@@ -47,6 +48,9 @@ from ops.log_ops import get_logger
 from ops.peer_ops import save_peer, get_remote_status, check_ip, me_to, known_peer_ips
 from ops.transaction_ops import get_transaction, get_transactions_of_account, to_readable_amount
 from ops import snapshot_ops
+from ops import peer_transport
+from ops.status_feed import StatusFeed
+from ops import status_core as status_core_ops
 from ops import mining_history
 from protocol import (GENESIS_ADDRESS, TREASURY_ADDRESS, TREASURY_GENESIS, GENESIS_TIMESTAMP, CHAIN_ID,
                       ADDRESS_PREFIX, FINALITY_DEPTH, EPOCH_LENGTH)
@@ -214,6 +218,124 @@ def _genesis_hash_cached():
     return _GENESIS_HASH_CACHE[0]
 
 
+def _status_dict():
+    """Assemble the /status dict (worker thread) — shared by GET /status and the /status_stream feed."""
+    # Defensive: /status is the exec node's lifeline (finalized_height) and the wallet's connection
+    # check, so NO single field may 403 the whole endpoint. Guard the block-ends + snapshot lookups
+    # (in rolling mode a pruned body could make these falsy) — degrade to null, never crash.
+    lb = memserver.latest_block if isinstance(memserver.latest_block, dict) else {}
+    eb = memserver.earliest_block if isinstance(memserver.earliest_block, dict) else {}
+    status_dict = {
+        "reported_uptime": memserver.reported_uptime,
+        "address": memserver.address,
+        "transaction_pool_hash": memserver.transaction_pool_hash,
+        "upcoming_block_hash": memserver.upcoming_block_hash,
+        "latest_block_hash": lb.get("block_hash"),
+        # TIP height, not just its hash: the network panel showed finalized_height in its Height
+        # column (the only height advertised), and finality legitimately trails the tip — so a
+        # healthy node "lagged" by its finality gap on every dashboard, twice mistaken for a sync
+        # problem. Old peers without this field fall back to finalized_height in the UI.
+        "latest_block_height": lb.get("block_number"),
+        "latest_block_weight": lb.get("cumulative_weight", 0),
+        # GENERATION IDENTITY (2026-08-20, the betanet-4 cutover): CHAIN_ID is a code label two
+        # generations can momentarily share (un-purged reroll stragglers run the new code over the
+        # old chain), but block 0's hash is unforgeable chain identity. Peers refuse status
+        # admission on a mismatch (peer_loop) — one filter that starves every consensus pool of
+        # foreign-generation weight/verdict claims at once.
+        "genesis_hash": _genesis_hash_cached(),
+        "earliest_block_hash": eb.get("block_hash"),
+        # BODY HORIZON — the oldest height this node can actually serve a BODY for, which is the
+        # question every caller of node_type is really asking. node_type is a POLICY flag ("do I
+        # prune?"), and it was being read as a capability claim. Those are not the same thing, and on
+        # a snapshot-booted node they are barely related: snapshot_bootstrap backfills only
+        # REWARD_WINDOW + 2*EPOCH_LENGTH + FINALITY_DEPTH = 265 bodies behind its anchor and nothing
+        # older, ever. Such a node with archive=true advertises "archive" while holding 265 blocks of
+        # history — it archives everything from its snapshot FORWARD and nothing before it. Publish
+        # the horizon so a peer picking a donor, or an explorer deciding what it can render, reads a
+        # measured fact instead of a promise the flag cannot keep.
+        "earliest_block_height": eb.get("block_number"),
+        "finalized_height": memserver.finalized_height,
+        "ffg_finalized": memserver.ffg_finalized,
+        # the UN-CROSSABLE floor (two-floor model, protocol.FINALITY_HARD_BACKSTOP): quorum checkpoint
+        # folded with the wide liveness backstop — what rollback refuses and re-anchors floor at
+        "hard_finality": _ghf(),
+        # the recovery state machine's current step (verdicts, adoption phases, last swallowed
+        # exception) — remote diagnosis for nodes with no shell access; see core_loop._rec
+        "recovery": getattr(memserver, "recovery_debug", None),
+        "recovery_fail": getattr(memserver, "recovery_fail", None),
+        "last_block_reject": getattr(memserver, "last_block_reject", None),
+        "last_fork_diff": getattr(memserver, "last_fork_diff", None),
+        "recent_tx_rejects": getattr(memserver, "recent_tx_rejects", []),
+        "protocol": memserver.protocol,
+        # CONSENSUS CONSTANTS THE BROWSER MUST MATCH. static/interface.js hardcodes these and its own
+        # comments say "MUST match protocol.py" — they drifted anyway (FINALITY_DEPTH sat at 12 vs 45,
+        # making the browser's RANDAO reveal window 33 blocks too late, so a browser-signed reveal was
+        # rejected). Serve them so the client can adopt them the way it already adopts chain_id, and the
+        # pair cannot silently diverge again.
+        "finality_depth": FINALITY_DEPTH,
+        "epoch_length": EPOCH_LENGTH,
+        # DEGRADATION VISIBILITY, same purpose as update_capable: without the native ML-DSA lib
+        # every verify is ~84x slower (0.154 ms -> 12.98 ms measured) and serialised behind one
+        # global lock, so the node silently stops keeping up. The fallback warns once to stderr at
+        # import and is invisible from then on; this makes it queryable.
+        "pq_backend": _pq_backend_name(),
+        # ...and WHY, when degraded: an unset env var needs a unit edit, a failed import needs a
+        # build. Without the reason an operator cannot tell those apart without shell on the box.
+        "pq_degraded": _pq_backend_reason(),
+        "version": memserver.version,
+        # UPDATE VISIBILITY: the commit this process RUNS, the newest origin/main commit this node
+        # has SEEN (cached by the last /update or daily check — never fetched inline here), and
+        # whether it is running behind it. Lets anyone spot a lagging node from /status alone.
+        "running_commit": self_update.running_head(),
+        "latest_main": self_update.latest_known(),
+        # NODE TYPE (non-consensus, doc/rolling-mode-and-da.md): "archive" keeps every block body
+        # forever; "rolling" drops bodies past its retention window (state + number<->hash indexes are
+        # always kept, so it still validates and serves the beacon/FFG). Advertised so the network
+        # panel can show WHAT each peer is, not just which commit it runs — the two answer different
+        # questions when you are working out who can serve history.
+        "node_type": "archive" if getattr(memserver, "archive", False) else "rolling",
+        "history_retention": (0 if getattr(memserver, "archive", False)
+                              else int(getattr(memserver, "history_retention_blocks", 0) or 0)),
+        "update_available": bool(self_update.latest_known() and self_update.running_head()
+                                 and self_update.latest_known() != self_update.running_head()),
+        # CAN THIS NODE UPDATE AT ALL? `running_commit: null` across 21 of 25 peers is what exposed the
+        # gap: a node installed by hand or by an old installer has no git metadata, so it can never
+        # self-update and cannot even be version-checked — it just silently drifts until it forks.
+        # Advertised so the condition is visible from the OUTSIDE (network panel, a sweep of peers),
+        # not only to whoever happens to call /update. False here is a node that WILL diverge.
+        "update_capable": (memserver.updatability or {}).get("capable"),
+        # WHY it cannot update, and WHY a forked node is not healing itself — both visible from OUTSIDE.
+        # `capable` is a bare boolean covering only LOCAL defects, and /log is authenticated, so a remote
+        # operator had no way to tell which precondition was vetoing. That guessing is what stretched the
+        # .141 incident; these are diagnostics only, nothing reads them back.
+        "update_blocking": (memserver.updatability or {}).get("blocking") or [],
+        # THE WARNING BAND IS THE PART THAT PREVENTS ANYTHING. `blocking` only fires once the node is
+        # ALREADY unable to update — by then the disk is full and, measured, not even `git gc` can run
+        # (it writes the new pack before dropping the old objects, so it needs roughly the pack size
+        # free). The low-disk warning fires with ~1 GiB of headroom, i.e. days of notice, and without
+        # it here that notice existed only in this node's own journal — invisible to exactly the
+        # fleet-wide sweep that would act on it. Four nodes wedged on betanet-3 while every remote
+        # check said they were fine.
+        "update_warnings": (memserver.updatability or {}).get("warnings") or [],
+        "update_free_disk_mb": ((memserver.updatability or {}).get("checks") or {}).get("free_disk_mb"),
+        "update_remote_reachable": ((memserver.updatability or {}).get("checks") or {}).get("remote_reachable"),
+        "dead_fork_probe": getattr(memserver, "dead_fork_probe", None),
+        # NETWORK PARTITION KEY: peers gate admission on this (peer_loop) so nodes on a different
+        # chain (e.g. a pre-relaunch betanet) never enter the status/consensus pools — a foreign
+        # chain's advertised weight would otherwise stall production via the caught-up gate.
+        "chain_id": CHAIN_ID,
+    }
+    try:
+        _ch = snapshot_ops.latest_final_checkpoint_height(memserver.finalized_height)
+        snap_manifest = snapshot_ops.load_checkpoint_manifest(_ch) if _ch is not None else None
+        snap_manifest = snap_manifest if isinstance(snap_manifest, dict) else None
+    except Exception:
+        snap_manifest = None
+    status_dict["snapshot_height"] = snap_manifest.get("snapshot_height") if snap_manifest else None
+    status_dict["snapshot_hash"] = snap_manifest.get("snapshot_hash") if snap_manifest else None
+    return status_dict
+
+
 async def status(request):
     """GET /status: the node's status dict — address, chain ends (latest/earliest hash, weight),
     finalized_height + ffg_finalized, protocol/version, chain_id (the network partition key peers gate
@@ -221,127 +343,60 @@ async def status(request):
     single fields to null rather than 403ing (exec nodes and wallets poll this as a lifeline).
     ?compress=msgpack|zstd."""
     def _build():
-        """Assemble the status dict (worker thread)."""
-        # Defensive: /status is the exec node's lifeline (finalized_height) and the wallet's connection
-        # check, so NO single field may 403 the whole endpoint. Guard the block-ends + snapshot lookups
-        # (in rolling mode a pruned body could make these falsy) — degrade to null, never crash.
-        lb = memserver.latest_block if isinstance(memserver.latest_block, dict) else {}
-        eb = memserver.earliest_block if isinstance(memserver.earliest_block, dict) else {}
-        status_dict = {
-            "reported_uptime": memserver.reported_uptime,
-            "address": memserver.address,
-            "transaction_pool_hash": memserver.transaction_pool_hash,
-            "upcoming_block_hash": memserver.upcoming_block_hash,
-            "latest_block_hash": lb.get("block_hash"),
-            # TIP height, not just its hash: the network panel showed finalized_height in its Height
-            # column (the only height advertised), and finality legitimately trails the tip — so a
-            # healthy node "lagged" by its finality gap on every dashboard, twice mistaken for a sync
-            # problem. Old peers without this field fall back to finalized_height in the UI.
-            "latest_block_height": lb.get("block_number"),
-            "latest_block_weight": lb.get("cumulative_weight", 0),
-            # GENERATION IDENTITY (2026-08-20, the betanet-4 cutover): CHAIN_ID is a code label two
-            # generations can momentarily share (un-purged reroll stragglers run the new code over the
-            # old chain), but block 0's hash is unforgeable chain identity. Peers refuse status
-            # admission on a mismatch (peer_loop) — one filter that starves every consensus pool of
-            # foreign-generation weight/verdict claims at once.
-            "genesis_hash": _genesis_hash_cached(),
-            "earliest_block_hash": eb.get("block_hash"),
-            # BODY HORIZON — the oldest height this node can actually serve a BODY for, which is the
-            # question every caller of node_type is really asking. node_type is a POLICY flag ("do I
-            # prune?"), and it was being read as a capability claim. Those are not the same thing, and on
-            # a snapshot-booted node they are barely related: snapshot_bootstrap backfills only
-            # REWARD_WINDOW + 2*EPOCH_LENGTH + FINALITY_DEPTH = 265 bodies behind its anchor and nothing
-            # older, ever. Such a node with archive=true advertises "archive" while holding 265 blocks of
-            # history — it archives everything from its snapshot FORWARD and nothing before it. Publish
-            # the horizon so a peer picking a donor, or an explorer deciding what it can render, reads a
-            # measured fact instead of a promise the flag cannot keep.
-            "earliest_block_height": eb.get("block_number"),
-            "finalized_height": memserver.finalized_height,
-            "ffg_finalized": memserver.ffg_finalized,
-            # the UN-CROSSABLE floor (two-floor model, protocol.FINALITY_HARD_BACKSTOP): quorum checkpoint
-            # folded with the wide liveness backstop — what rollback refuses and re-anchors floor at
-            "hard_finality": _ghf(),
-            # the recovery state machine's current step (verdicts, adoption phases, last swallowed
-            # exception) — remote diagnosis for nodes with no shell access; see core_loop._rec
-            "recovery": getattr(memserver, "recovery_debug", None),
-            "recovery_fail": getattr(memserver, "recovery_fail", None),
-            "last_block_reject": getattr(memserver, "last_block_reject", None),
-            "last_fork_diff": getattr(memserver, "last_fork_diff", None),
-            "recent_tx_rejects": getattr(memserver, "recent_tx_rejects", []),
-            "protocol": memserver.protocol,
-            # CONSENSUS CONSTANTS THE BROWSER MUST MATCH. static/interface.js hardcodes these and its own
-            # comments say "MUST match protocol.py" — they drifted anyway (FINALITY_DEPTH sat at 12 vs 45,
-            # making the browser's RANDAO reveal window 33 blocks too late, so a browser-signed reveal was
-            # rejected). Serve them so the client can adopt them the way it already adopts chain_id, and the
-            # pair cannot silently diverge again.
-            "finality_depth": FINALITY_DEPTH,
-            "epoch_length": EPOCH_LENGTH,
-            # DEGRADATION VISIBILITY, same purpose as update_capable: without the native ML-DSA lib
-            # every verify is ~84x slower (0.154 ms -> 12.98 ms measured) and serialised behind one
-            # global lock, so the node silently stops keeping up. The fallback warns once to stderr at
-            # import and is invisible from then on; this makes it queryable.
-            "pq_backend": _pq_backend_name(),
-            # ...and WHY, when degraded: an unset env var needs a unit edit, a failed import needs a
-            # build. Without the reason an operator cannot tell those apart without shell on the box.
-            "pq_degraded": _pq_backend_reason(),
-            "version": memserver.version,
-            # UPDATE VISIBILITY: the commit this process RUNS, the newest origin/main commit this node
-            # has SEEN (cached by the last /update or daily check — never fetched inline here), and
-            # whether it is running behind it. Lets anyone spot a lagging node from /status alone.
-            "running_commit": self_update.running_head(),
-            "latest_main": self_update.latest_known(),
-            # NODE TYPE (non-consensus, doc/rolling-mode-and-da.md): "archive" keeps every block body
-            # forever; "rolling" drops bodies past its retention window (state + number<->hash indexes are
-            # always kept, so it still validates and serves the beacon/FFG). Advertised so the network
-            # panel can show WHAT each peer is, not just which commit it runs — the two answer different
-            # questions when you are working out who can serve history.
-            "node_type": "archive" if getattr(memserver, "archive", False) else "rolling",
-            "history_retention": (0 if getattr(memserver, "archive", False)
-                                  else int(getattr(memserver, "history_retention_blocks", 0) or 0)),
-            "update_available": bool(self_update.latest_known() and self_update.running_head()
-                                     and self_update.latest_known() != self_update.running_head()),
-            # CAN THIS NODE UPDATE AT ALL? `running_commit: null` across 21 of 25 peers is what exposed the
-            # gap: a node installed by hand or by an old installer has no git metadata, so it can never
-            # self-update and cannot even be version-checked — it just silently drifts until it forks.
-            # Advertised so the condition is visible from the OUTSIDE (network panel, a sweep of peers),
-            # not only to whoever happens to call /update. False here is a node that WILL diverge.
-            "update_capable": (memserver.updatability or {}).get("capable"),
-            # WHY it cannot update, and WHY a forked node is not healing itself — both visible from OUTSIDE.
-            # `capable` is a bare boolean covering only LOCAL defects, and /log is authenticated, so a remote
-            # operator had no way to tell which precondition was vetoing. That guessing is what stretched the
-            # .141 incident; these are diagnostics only, nothing reads them back.
-            "update_blocking": (memserver.updatability or {}).get("blocking") or [],
-            # THE WARNING BAND IS THE PART THAT PREVENTS ANYTHING. `blocking` only fires once the node is
-            # ALREADY unable to update — by then the disk is full and, measured, not even `git gc` can run
-            # (it writes the new pack before dropping the old objects, so it needs roughly the pack size
-            # free). The low-disk warning fires with ~1 GiB of headroom, i.e. days of notice, and without
-            # it here that notice existed only in this node's own journal — invisible to exactly the
-            # fleet-wide sweep that would act on it. Four nodes wedged on betanet-3 while every remote
-            # check said they were fine.
-            "update_warnings": (memserver.updatability or {}).get("warnings") or [],
-            "update_free_disk_mb": ((memserver.updatability or {}).get("checks") or {}).get("free_disk_mb"),
-            "update_remote_reachable": ((memserver.updatability or {}).get("checks") or {}).get("remote_reachable"),
-            "dead_fork_probe": getattr(memserver, "dead_fork_probe", None),
-            # NETWORK PARTITION KEY: peers gate admission on this (peer_loop) so nodes on a different
-            # chain (e.g. a pre-relaunch betanet) never enter the status/consensus pools — a foreign
-            # chain's advertised weight would otherwise stall production via the caught-up gate.
-            "chain_id": CHAIN_ID,
-        }
-        try:
-            _ch = snapshot_ops.latest_final_checkpoint_height(memserver.finalized_height)
-            snap_manifest = snapshot_ops.load_checkpoint_manifest(_ch) if _ch is not None else None
-            snap_manifest = snap_manifest if isinstance(snap_manifest, dict) else None
-        except Exception:
-            snap_manifest = None
-        status_dict["snapshot_height"] = snap_manifest.get("snapshot_height") if snap_manifest else None
-        status_dict["snapshot_hash"] = snap_manifest.get("snapshot_hash") if snap_manifest else None
-        return serialize(name="status", output=status_dict, compress=_q(request, "compress", "none"))
+        """Assemble + serialize the status dict (worker thread)."""
+        return serialize(name="status", output=_status_dict(), compress=_q(request, "compress", "none"))
     try:
         return _resp(await asyncio.to_thread(_build))
     except Exception as e:
         return _resp(f"Error: {e}", status=403)
 
 
+def _status_key():
+    """The cheap change key of the status feed — what a peer's consensus pools actually track: tip,
+    mempool hash, upcoming hash, finality. Attribute reads only; runs on the event loop every tick."""
+    lb = memserver.latest_block if isinstance(memserver.latest_block, dict) else {}
+    return (lb.get("block_hash"), memserver.transaction_pool_hash, memserver.upcoming_block_hash,
+            memserver.finalized_height, memserver.ffg_finalized)
+
+
+# ONE status build per change, shared by every subscriber (ops/status_feed.py). Started in make_app.
+STATUS_FEED = StatusFeed(build=_status_dict, key=_status_key, serialize=serialize)
+
+
+async def status_stream(request):
+    """GET /status_stream?since=<seq>&boot=<id>&wait=<s>&compress=zstd|core: the PUSH status channel peers
+    subscribe to instead of polling /status every second. Answers at once with a delta (one change
+    behind) or the full dict (further behind / new subscriber / we restarted); a caught-up subscriber is
+    held until the next change or `wait` seconds (empty heartbeat). Frames are built once per change and
+    shared — a subscriber costs no status build of its own. compress=core streams the binary core record
+    (ops/status_core.py) instead of zstd(JSON) frames of the whole dict. Rate-limited to 600/min per IP
+    (a change can arrive every STATUS_FEED_TICK_S; a well-behaved subscriber stays far below)."""
+    if _rate_limited(request, 600):
+        return _RL()
+    since = _qint(request, "since", 0)
+    wait = _qint(request, "wait", 0)
+    compress = _q(request, "compress")
+    compress = compress if compress in ("zstd", "core") else None     # bounded frame-cache key
+    wire = await STATUS_FEED.next_frame(since, _q(request, "boot", ""), compress=compress, wait=wait)
+    if wire is None:
+        return _resp("Status feed not ready", status=503)
+    return _resp(wire)
+
+
+async def status_core(request):
+    """GET /status_core: the consensus subset of /status (tip hash/height/weight, pool + upcoming hashes,
+    finality, genesis, snapshot, protocol, chain_id, address, build labels) as one fixed-layout binary
+    record — ops/status_core.py. What peers poll; /status stays the full diagnostic. Served from the
+    status feed's current build (packed once per change), so a poll costs no status build."""
+    try:
+        wire = STATUS_FEED.core()
+        if wire is None:                                  # the feed's first build has not landed yet
+            wire = await asyncio.to_thread(lambda: status_core_ops.pack_core(_status_dict()))
+        return _resp(wire)
+    except Exception as e:
+        return _resp(f"Error: {e}", status=403)
+
+
 async def mining_status(request):
     """GET /mining_status?address=&compress=: the address's mining view (lane, presence, share odds)
     at the current height. `address` defaults to this node's own. Full account-set scan under the
@@ -457,6 +512,28 @@ async def get_recommended_fee(request):
     return _resp({"fee": recommended_fee(memserver.latest_block) + 1})
 
 
+async def transaction_ids(request):
+    """GET /transaction_ids?compress=[&sketch=<log2>]: the cheap half of mempool set reconciliation — our
+    pooled txids. With ?sketch= the answer is {"sketch": <bytes>} instead, our txid IBLT folded to 2**log2
+    cells per subtable (ops/pool_sketch), which the caller subtracts its own from and peels, so two pools
+    that differ by a few ids exchange a few KB instead of every id. A pool whose plain id list is no
+    bigger than the requested sketch gets the list either way, and so does a JSON (non-zstd) caller."""
+    from ops.pool_sketch import SKETCH_MIN_LOG2, SKETCH_MAX_LOG2, sketch_bytes
+    log2 = _qint(request, "sketch", 0)
+    comp = _q(request, "compress", "none")
+
+    def _work():
+        mempool = memserver.mempool
+        if (comp == "zstd" and SKETCH_MIN_LOG2 <= log2 <= SKETCH_MAX_LOG2
+                and len(mempool) * 66 > sketch_bytes(log2)):        # ~66 B per id on the wire
+            out = {"sketch": mempool.sketch(log2)}
+        else:
+            out = mempool.ids()
+        return serialize(name="transaction_ids", output=out, compress=comp)
+
+    return _resp(await asyncio.to_thread(_work))
+
+
 async def transactions_by_id(request):
     """POST /transactions_by_id?compress=: body = codec list of txids (bounded); returns the named
     transactions from OUR pool — the expensive half of mempool set reconciliation, proportional to
@@ -476,7 +553,8 @@ async def transactions_by_id(request):
         if not isinstance(ids, list) or len(ids) > 1000:
             return "Error: too many ids", 400
         wanted = {i for i in ids if isinstance(i, str) and len(i) <= 64}
-        txs = [t for t in memserver.transaction_pool if t.get("txid") in wanted]
+        pooled = (memserver.mempool.get(i) for i in wanted)
+        txs = [t for t in pooled if t is not None]
         return serialize(name="transactions", output=txs, compress=_q(request, "compress", "none")), 200
 
     out, code = await asyncio.to_thread(_work, body)
@@ -758,6 +836,51 @@ def _collect_block_chain(start_hash, count, link_field):
     return collected, code
 
 
+# SERVED-BATCH CACHE for the two block-sync endpoints: (start hash, count, direction, compress) -> the
+# finished wire payload (zstd bytes for peers). During a fleet resync dozens of peers ask for the SAME range
+# within one block interval, and each used to cost up to SYNC_BATCH_MAX body loads + one codec.pack + one
+# zstd pass. Tagged with kv_ops.write_generation(): ANY commit (new block, rollback, prune) moves it, and an
+# entry from another generation is a miss — the walk's end and the tip's derived child_hash can change with
+# any of them. LRU under a byte budget (lists for ?compress=none are costed by get_byte_size).
+# (Forwarding the segment records' stored zstd frames straight to the socket isn't possible here: a stored
+# body is the binary storage codec WITHOUT its derived child_hash, while the wire is one zstd frame of the
+# JSON batch that every deployed client decodes — so the whole finished batch is what gets reused.)
+_SYNC_WIRE_CACHE = OrderedDict()   # key -> (generation, output, code, cost)
+_SYNC_WIRE_CACHE_BYTES = 64 << 20
+_SYNC_WIRE_CACHE_SIZE = [0]
+_SYNC_WIRE_CACHE_LOCK = _threading.Lock()
+
+
+def _serve_block_chain(request, link_field, name):
+    """Collect + serialize one /get_blocks_after|before batch, through _SYNC_WIRE_CACHE (worker thread)."""
+    from ops import kv_ops
+    compress = _q(request, "compress", "none")
+    key = (_q(request, "hash"), _qint(request, "count", 1), link_field, compress)
+    gen = kv_ops.write_generation()
+    with _SYNC_WIRE_CACHE_LOCK:
+        hit = _SYNC_WIRE_CACHE.get(key)
+        if hit is not None and hit[0] == gen:
+            _SYNC_WIRE_CACHE.move_to_end(key)
+            return hit[1], hit[2]
+    collected, code = _collect_block_chain(key[0], key[1], link_field=link_field)
+    if link_field == "parent_hash":
+        collected.reverse()          # walked toward genesis; serve oldest-first
+    out = serialize(name=name, output=collected, compress=compress)
+    if code == 200 and kv_ops.write_generation() == gen:     # a commit mid-walk -> don't cache a torn batch
+        cost = len(out) if isinstance(out, (bytes, bytearray)) else get_byte_size(out)
+        with _SYNC_WIRE_CACHE_LOCK:
+            old = _SYNC_WIRE_CACHE.pop(key, None)
+            if old is not None:
+                _SYNC_WIRE_CACHE_SIZE[0] -= old[3]
+            if cost <= _SYNC_WIRE_CACHE_BYTES // 4:
+                _SYNC_WIRE_CACHE[key] = (gen, out, code, cost)
+                _SYNC_WIRE_CACHE_SIZE[0] += cost
+            while _SYNC_WIRE_CACHE_SIZE[0] > _SYNC_WIRE_CACHE_BYTES and _SYNC_WIRE_CACHE:
+                _k, old = _SYNC_WIRE_CACHE.popitem(last=False)
+                _SYNC_WIRE_CACHE_SIZE[0] -= old[3]
+    return out, code
+
+
 async def blocks_before(request):
     """GET /get_blocks_before?hash=&count=&compress=: up to `count` ancestors of `hash` (count capped at
     SYNC_BATCH_MAX + byte-budgeted, see _collect_block_chain), returned oldest-first. Rate-limited
@@ -766,10 +889,7 @@ async def blocks_before(request):
         return _RL()
 
     def _work():
-        collected, code = _collect_block_chain(_q(request, "hash"), _qint(request, "count", 1),
-                                               link_field="parent_hash")
-        collected.reverse()          # walked toward genesis; serve oldest-first
-        return serialize(name="blocks_before", output=collected, compress=_q(request, "compress", "none")), code
+        return _serve_block_chain(request, "parent_hash", "blocks_before")
     out, code = await asyncio.to_thread(_work)
     return _resp(out, status=code)
 
@@ -782,9 +902,7 @@ async def blocks_after(request):
         return _RL()
 
     def _work():
-        collected, code = _collect_block_chain(_q(request, "hash"), _qint(request, "count", 1),
-                                               link_field="child_hash")
-        return serialize(name="blocks_after", output=collected, compress=_q(request, "compress", "none")), code
+        return _serve_block_chain(request, "child_hash", "blocks_after")
     out, code = await asyncio.to_thread(_work)
     return _resp(out, status=code)
 
@@ -1022,7 +1140,6 @@ async def get_richest(request):
     # pile" visual. O(accounts) scan, cached per block height so it runs at most once per block.
     def _work():
         """Cached-per-height O(accounts) max scan (worker thread)."""
-        from ops import kv_ops
         try:
             h = memserver.latest_block["block_number"]
         except Exception:
@@ -1036,12 +1153,8 @@ async def get_richest(request):
             return _richest_scan(h)
 
     def _richest_scan(h):
-        from ops import kv_ops
-        best_v, best_a = 0, None
-        for addr, acc in kv_ops.iter_accounts():
-            tot = int(acc.get("balance", 0)) + int(acc.get("bonded", 0))
-            if tot > best_v:
-                best_v, best_a = tot, addr
+        from ops import account_columns          # columnar mirror: one C-level max, no doc decodes
+        best_v, best_a = account_columns.richest()
         _richest_cache.update(height=h, value=best_v, address=best_a)
         return {"richest": best_v, "address": best_a, "block_number": h}
     return _resp(await asyncio.to_thread(_work))
@@ -1062,14 +1175,10 @@ async def get_wealth_stats(request):
     # -> percentile ("richer than X% of wallets"), a distribution-based rank instead of "% of the single
     # richest wallet" (which one whale dominates). Cached per block height.
     def _work():
-        """Single-pass log-normal fit over non-zero accounts, cached per height (worker thread).
-        The same pass also builds the WALLET-DISTRIBUTION data the explorer stats chart shows:
+        """Log-normal fit over non-zero accounts (account_columns.wealth), cached per height (worker
+        thread). The same reduction also builds the WALLET-DISTRIBUTION data the explorer stats chart shows:
         `buckets` — non-zero wallet counts per NADO decade (<0.01, 0.01–0.1, …, 100k–1M, ≥1M) —
         and the held-supply concentration (`sum_total`, `top10`, `top100`, raw as strings)."""
-        import heapq
-        import math
-        from ops import kv_ops
-        from protocol import DENOMINATION
         try:
             h = memserver.latest_block["block_number"]
         except Exception:
@@ -1079,31 +1188,11 @@ async def get_wealth_stats(request):
         with _scan_locks["wealth"]:                        # one scan per height, not one per requester
             if _wealth_cache["height"] == h and _wealth_cache["data"] is not None:
                 return _wealth_cache["data"]
-            return _wealth_scan(h, heapq, math, kv_ops, DENOMINATION)
-
-    def _wealth_scan(h, heapq, math, kv_ops, DENOMINATION):
-        n, s, s2, richest = 0, 0.0, 0.0, 0
-        buckets = [0] * 10
-        top, gsum = [], 0
-        for _addr, acc in kv_ops.iter_accounts():
-            tot = int(acc.get("balance", 0)) + int(acc.get("bonded", 0))
-            if tot > richest:
-                richest = tot
-            if tot > 0:
-                lt = math.log(tot)
-                n += 1; s += lt; s2 += lt * lt
-                gsum += tot
-                nado = tot / DENOMINATION
-                buckets[0 if nado < 0.01 else min(9, int(math.floor(math.log10(nado))) + 3)] += 1
-                heapq.heappush(top, tot)
-                if len(top) > 100:
-                    heapq.heappop(top)
-        mean = (s / n) if n else 0.0
-        std = math.sqrt(max(0.0, s2 / n - mean * mean)) if n else 0.0
-        tops = sorted(top, reverse=True)
-        data = {"count": n, "richest": richest, "log_mean": mean, "log_std": std, "block_number": h,
-                "buckets": buckets, "sum_total": str(gsum),
-                "top10": str(sum(tops[:10])), "top100": str(sum(tops))}
+            return _wealth_scan(h)
+
+    def _wealth_scan(h):
+        from ops import account_columns          # columnar mirror: whole-column reductions, no doc decodes
+        data = {**account_columns.wealth(), "block_number": h}
         _wealth_cache.update(height=h, data=data)
         return data
     return _resp(await asyncio.to_thread(_work))
@@ -1381,7 +1470,6 @@ async def get_rich_list(request):
     # O(accounts) scan, cached per block height (top 100 kept, sliced to n) so it runs at most once/block.
     def _work():
         """Cached-per-height O(accounts) top-100 scan (worker thread)."""
-        from ops import kv_ops
         try:
             h = memserver.latest_block["block_number"]
         except Exception:
@@ -1398,15 +1486,9 @@ async def get_rich_list(request):
             return _rich_list_scan(h, n)
 
     def _rich_list_scan(h, n):
-        from ops import kv_ops
-        top = []
-        for addr, acc in kv_ops.iter_accounts():
-            bal, bond = int(acc.get("balance", 0)), int(acc.get("bonded", 0))
-            tot = bal + bond
-            if tot > 0:
-                top.append((tot, addr, bal, bond))
-        top.sort(key=lambda t: t[0], reverse=True)
-        rich = [{"address": a, "total": tot, "balance": bal, "bonded": bond} for (tot, a, bal, bond) in top[:100]]
+        from ops import account_columns          # columnar mirror: top-100 selection, no doc decodes
+        rich = [{"address": a, "total": tot, "balance": bal, "bonded": bond}
+                for (tot, a, bal, bond) in account_columns.rich_list(100)]
         _rich_list_cache.update(height=h, list=rich)
         return {"block_number": h, "rich_list": rich[:n]}
     return _resp(await asyncio.to_thread(_work))
@@ -2145,9 +2227,7 @@ async def make_app(port):
         web.get("/da/{what}", da_proxy),
         # mempool SET RECONCILIATION wire (memserver.merge_remote_transactions): the cheap id list +
         # the bounded fetch-by-id — divergent peers no longer re-download each other's whole pools.
-        web.get("/transaction_ids", _dump_handler("transaction_ids",
-                                                  lambda: [t.get("txid") for t in memserver.transaction_pool],
-                                                  heavy=True)),
+        web.get("/transaction_ids", transaction_ids),
         web.post("/transactions_by_id", transactions_by_id),
         web.get("/transaction_hash_pool", _dump_handler("transactions_hash_pool", lambda: {
             "transactions_hash_pool": consensus.transaction_hash_pool,
@@ -2160,6 +2240,8 @@ async def make_app(port):
         web.get("/mining_history", mining_history_handler),
         web.get("/get_unbond", get_unbond),
         web.get("/status", status),
+        web.get("/status_stream", status_stream),
+        web.get("/status_core", status_core),
         web.get("/peers", _dump_handler("peers", lambda: me_to(list(memserver.peers)))),
         web.get("/geo_peers", geo_peers),
         web.get("/peer_buffer", _dump_handler("peer_buffer", lambda: list(memserver.peer_buffer))),
@@ -2195,6 +2277,12 @@ async def make_app(port):
     ])
     runner = web.AppRunner(app, access_log=None)
     await runner.setup()
+    # this loop lives as long as the node: give it a pooled peer session so handlers that dial peers
+    # (announce_peer's status probe) reuse keep-alive connections (ops/peer_transport.py)
+    await peer_transport.adopt_loop()
+    # the push status channel: one build per status change, fanned out to every /status_stream subscriber
+    # (a local keeps the task referenced: make_app never returns)
+    status_feed_task = asyncio.create_task(STATUS_FEED.run(logger=logger))
     # In NADO_TESTNET mode bind to the node's own (loopback) IP so several nodes can share the port on
     # distinct 127.0.0.x addresses.
     if os.environ.get("NADO_TESTNET"):
@@ -2499,7 +2587,7 @@ def _daily_stats_loop():
         try:
             tip = int((memserver.latest_block or {}).get("block_number") or 0)
             if tip:
-                gauges = {"peers": len(memserver.peers), "mempool": len(memserver.transaction_pool)}
+                gauges = {"peers": len(memserver.peers), "mempool": len(memserver.mempool)}
                 try:
                     # registry reads full-scan the account set (same cost the throttled /mining_status
                     # endpoint pays per wallet poll) — cheap at one pass per SAMPLE_INTERVAL
@@ -2562,7 +2650,7 @@ def _gossip_worker():
             for tx, exclude_ip in batch:
                 key = tx.get("txid") if isinstance(tx, dict) else None
                 picked.setdefault(key if key is not None else id(tx), (tx, exclude_ip))
-            asyncio.run(_flush(list(picked.values())))
+            peer_transport.run(_flush(list(picked.values())))   # pooled: one warm connection per peer
         except Exception as e:
             logger.error(f"Gossip worker error: {e}")
             time.sleep(1)
@@ -0,0 +1,216 @@
+"""
+Columnar in-memory MIRROR of the `accounts` sub-DB — a DERIVED read index, never a source of truth.
+
+Why: get_bonded_registry (producer selection, verified on EVERY block), get_open_registry and the explorer's
+/get_richest, /wealth_stats and /rich_list each walked kv_ops.iter_accounts() and decoded every account doc.
+The write-generation caches only help BETWEEN commits — every block commit invalidates them and the next
+scan pays the whole decode again (~100k docs on a busy node, the dominant per-block read cost after the
+state root). So the six ACCOUNT_FIELDS are mirrored here as parallel columns (one Python list per field,
+ints of any width, row-aligned with an address list + an address->row index), and kept CURRENT from each
+commit's own account write set (kv_ops records every account put/delete made inside a write txn and hands
+the set to apply_commit() as it commits) instead of being rebuilt. On top of the columns the mirror keeps
+the one membership the consensus path asks for — addresses with bonded >= B_MIN — so deriving the bonded
+registry touches only those rows (a few hundred), not 100k.
+
+CORRECTNESS CONTRACT (this feeds producer selection, so it must be EXACT, not approximately fresh):
+  * the mirror carries the kv_ops.write_generation() it equals. Commits happen (and bump the generation)
+    under kv_ops._commit_lock, which is also THIS module's lock, so a commit's write set is applied in
+    commit order and in the same critical section as its generation bump — a mirror whose `gen` equals the
+    current generation is byte-for-byte the committed accounts table.
+  * any commit that touches accounts WITHOUT a tracked write set (snapshot restore drops the whole sub-DB),
+    or that lands while the mirror was already behind, simply DROPS the mirror; the next reader rebuilds it
+    from one MVCC read txn and installs it only if no commit landed during the scan (same capture-the-key-
+    before-the-scan rule the registry cache uses).
+  * readers INSIDE a write txn must see the block's own uncommitted writes — they never use the mirror
+    (callers check kv_ops.in_write_txn(), exactly as the registry caches always did).
+  * one mirror per LMDB env (keyed by kv_ops.env_path()), so multi-HOME tests never cross-read.
+
+Pure-Python lists rather than NumPy: NumPy is not a node dependency, and account values are arbitrary-
+precision ints (a uint64 column would silently wrap an oversized balance). The reductions below are still
+column-at-a-time — map/zip/heapq over whole lists run in C — instead of a per-doc decode loop.
+"""
+import heapq
+import math
+import threading
+from bisect import bisect_left
+from operator import add, mul, sub
+
+from protocol import B_MIN, DENOMINATION
+
+FIELDS = ("balance", "produced", "bonded", "registered", "fidelity", "last_hb_epoch")   # == kv_ops.ACCOUNT_FIELDS
+
+# Shared with kv_ops as its _commit_lock: held across txn.commit() + generation bump + apply_commit(), and
+# briefly by readers taking a consistent view. RLock: apply_commit runs while the committing thread holds it.
+LOCK = threading.RLock()
+
+_mirrors = {}          # env_path -> AccountColumns
+
+
+class AccountColumns:
+    """Row-aligned columns for every account row of one env, valid for committed generation `gen`."""
+
+    def __init__(self, gen):
+        self.gen = gen
+        self.addr = []                              # row -> address (None = freed row)
+        self.row = {}                               # address -> row
+        self.cols = {f: [] for f in FIELDS}         # field -> column (row-aligned)
+        self.free = []                              # freed rows, reused by the next insert
+        self.bonded_min = set()                     # addresses with bonded >= B_MIN
+
+    def put(self, address, doc):
+        """Insert or overwrite `address` from a (normalized) account doc."""
+        r = self.row.get(address)
+        if r is None:
+            if self.free:
+                r = self.free.pop()
+                self.addr[r] = address
+            else:
+                r = len(self.addr)
+                self.addr.append(address)
+                for col in self.cols.values():
+                    col.append(0)
+            self.row[address] = r
+        for f in FIELDS:
+            self.cols[f][r] = int(doc.get(f, 0))
+        if self.cols["bonded"][r] >= B_MIN:
+            self.bonded_min.add(address)
+        else:
+            self.bonded_min.discard(address)
+
+    def delete(self, address):
+        r = self.row.pop(address, None)
+        if r is None:
+            return
+        self.addr[r] = None
+        for col in self.cols.values():
+            col[r] = 0                              # freed rows read as all-zero -> inert in every reduction
+        self.free.append(r)
+        self.bonded_min.discard(address)
+
+
+def apply_commit(env_path, changes, full, gen_before, gen_after):
+    """Bring the env's mirror from `gen_before` to `gen_after` with one commit's account write set
+    (`changes`: address -> normalized doc, or None for a delete). Called by kv_ops with LOCK held, right
+    after the commit + generation bump. `full` (an untracked bulk rewrite) or a mirror that wasn't at
+    `gen_before` drops the mirror instead — the next reader rebuilds."""
+    m = _mirrors.get(env_path)
+    if m is None:
+        return
+    if full or m.gen != gen_before:
+        del _mirrors[env_path]
+        return
+    for address, doc in changes.items():
+        if doc is None:
+            m.delete(address)
+        else:
+            m.put(address, doc)
+    m.gen = gen_after
+
+
+def drop(env_path=None):
+    """Forget the mirror of one env (or all) — tests, and anything that rewrites accounts out of band."""
+    with LOCK:
+        if env_path is None:
+            _mirrors.clear()
+        else:
+            _mirrors.pop(env_path, None)
+
+
+def _build(kv_ops):
+    """Scan the committed accounts table into a fresh mirror tagged with the generation captured BEFORE the
+    scan; installed only if no commit landed meanwhile (otherwise it is still a consistent snapshot of a
+    committed state and serves this one caller)."""
+    gen = kv_ops.write_generation()
+    m = AccountColumns(gen)
+    for address, doc in kv_ops.iter_accounts():
+        m.put(address, doc)
+    with LOCK:
+        if kv_ops.write_generation() == gen:
+            _mirrors[kv_ops.env_path()] = m
+    return m
+
+
+def _current(kv_ops):
+    """The env's mirror at the current committed generation (building it if needed)."""
+    m = _mirrors.get(kv_ops.env_path())
+    if m is not None and m.gen == kv_ops.write_generation():
+        return m
+    return _build(kv_ops)
+
+
+def _view(fn):
+    """Run fn(mirror) against a mirror that is exact for one committed generation. Holding LOCK pins it:
+    apply_commit can't mutate it mid-read. fn must be cheap (it blocks commits) — copy columns out."""
+    from ops import kv_ops
+    m = _current(kv_ops)
+    with LOCK:
+        return fn(m)
+
+
+def bonded_at_least_min():
+    """[(address, bonded)] for every account with bonded >= B_MIN, sorted by address (LMDB key order — the
+    order get_bonded_registry has always produced)."""
+    def _q(m):
+        bonded, row = m.cols["bonded"], m.row
+        return [(a, bonded[row[a]]) for a in sorted(m.bonded_min)]
+    return _view(_q)
+
+
+def fields_of(addresses, fields):
+    """{address: {field: int}} for the given addresses that HAVE a row (absent addresses are omitted)."""
+    def _q(m):
+        out = {}
+        for a in addresses:
+            r = m.row.get(a)
+            if r is not None:
+                out[a] = {f: m.cols[f][r] for f in fields}
+        return out
+    return _view(_q)
+
+
+def holdings():
+    """(addresses, totals) — row-aligned copies of the address column and balance+bonded per row (freed rows
+    come back as (None, 0)). Copied under the lock in C (list(map(add, ...))), reduced by the caller."""
+    def _q(m):
+        return list(m.addr), list(map(add, m.cols["balance"], m.cols["bonded"]))
+    return _view(_q)
+
+
+def richest():
+    """(total, address) of the largest balance+bonded account, or (0, None) when every account is empty.
+    Ties go to the lowest address, like the sorted scan it replaces."""
+    addrs, totals = holdings()
+    best = max(totals, default=0)
+    if best <= 0:
+        return 0, None
+    return best, min(a for a, t in zip(addrs, totals) if t == best)
+
+
+def rich_list(n=100):
+    """The top `n` non-empty accounts by balance+bonded: [(total, address, balance, bonded)], descending.
+    Equal totals keep address order (the stable sort of the old sorted scan)."""
+    addrs, bal, bond = _view(lambda m: (list(m.addr), list(m.cols["balance"]), list(m.cols["bonded"])))
+    tot = list(map(add, bal, bond))
+    top = heapq.nsmallest(n, (r for r in range(len(tot)) if tot[r] > 0), key=lambda r: (-tot[r], addrs[r]))
+    return [(tot[r], addrs[r], bal[r], bond[r]) for r in top]
+
+
+# /wealth_stats decade edges in raw units: 0.01, 0.1, 1, …, 1M NADO
+_WEALTH_EDGES = [DENOMINATION * 10 ** e // 100 for e in range(9)]
+
+
+def wealth(top=100):
+    """The /wealth_stats reductions over every non-empty account's balance+bonded, a whole column at a time
+    (one sort, then bisect/map/sum in C — no per-row Python): {count, richest, log_mean, log_std, buckets,
+    sum_total, top10, top100}. `buckets` counts wallets per NADO decade (<0.01, 0.01–0.1, …, ≥1M); the
+    supply sums are strings, as the endpoint always returned them."""
+    live = sorted(filter((0).__lt__, holdings()[1]))
+    n = len(live)
+    logs = list(map(math.log, live))
+    mean = sum(logs) / n if n else 0.0
+    std = math.sqrt(max(0.0, sum(map(mul, logs, logs)) / n - mean * mean)) if n else 0.0
+    cuts = [0] + [bisect_left(live, e) for e in _WEALTH_EDGES] + [n]
+    tops = live[:-top - 1:-1]
+    return {"count": n, "richest": live[-1] if n else 0, "log_mean": mean, "log_std": std,
+            "buckets": list(map(sub, cuts[1:], cuts[:-1])), "sum_total": str(sum(live)),
+            "top10": str(sum(tops[:10])), "top100": str(sum(tops))}
@@ -1,4 +1,6 @@
 from ops import kv_ops
+from ops import account_columns
+from ops.dividend_ops import ledger_record
 from protocol import B_MIN, EPOCH_LENGTH, FIDELITY_GAIN, FIDELITY_MIN_GAP_EPOCHS, SLASH_BOND_PENALTY, BOND_UNLOCK_DELAY, BRIDGE_ESCROW, FAUCET_ESCROW, DIVIDEND_POOL, POSW_LEASE_EPOCHS, HTLC_ESCROW, SHIELD_ESCROW
 
 # Account state lives in the schemaless `accounts` sub-DB as a msgpack document keyed by address
@@ -528,6 +530,17 @@ def change_bonded(address: str, amount: int, logger, revert=False):
     return True
 
 
+def registry_key():
+    """Identity of the COMMITTED registries: (env_path, write_generation), or None inside a write txn (where
+    get_bonded_registry / get_open_registry see the block's own uncommitted writes, so nothing derived from
+    them may be cached). Selection callers capture it BEFORE reading the registries — the same capture-the-
+    key-before-the-scan rule as the caches below — and hand it to mining_ops so its selection indexes can
+    be shared by every slot, lane and committee draw over the same committed state."""
+    if kv_ops.in_write_txn():
+        return None
+    return (kv_ops.env_path(), kv_ops.write_generation())
+
+
 # bonded-registry cache: one ((env_path, write_generation), registry) tuple — a SINGLE reference so
 # a reader can never pair a stale key with a newer registry under concurrent replacement (GIL-atomic
 # load/store). The registry is a pure function of committed state, so an unchanged write generation
@@ -539,10 +552,16 @@ _bonded_reg_cache = [None]          # [(key, registry)] or [None]
 
 
 def _compute_bonded_registry():
-    accts = [(addr, doc) for addr, doc in kv_ops.iter_accounts() if doc.get("bonded", 0) >= B_MIN]
+    """Inside a write txn: the full scan (must see the block's own uncommitted bonds). Otherwise: the
+    columnar account mirror's bonded >= B_MIN membership — a few hundred rows, not every account doc
+    (ops/account_columns.py; exact for the committed generation, same address order as the scan)."""
+    if kv_ops.in_write_txn():
+        accts = [(addr, doc["bonded"]) for addr, doc in kv_ops.iter_accounts() if doc.get("bonded", 0) >= B_MIN]
+    else:
+        accts = account_columns.bonded_at_least_min()
     since = kv_ops.bond_since_many([a for a, _ in accts])
-    return {addr: {"bonded": doc["bonded"], "fidelity": None, "bond_since": since.get(addr)}
-            for addr, doc in accts}
+    return {addr: {"bonded": bonded, "fidelity": None, "bond_since": since.get(addr)}
+            for addr, bonded in accts}
 
 
 def get_bonded_registry():
@@ -626,12 +645,19 @@ def get_open_registry(current_epoch: int):
             if account and account.get("registered", 0) == 1:
                 registry[address] = {"fidelity": account.get("fidelity", 0)}
         return registry
+
+    def _compute_columnar():
+        """Same result, account fields from the columnar mirror instead of one doc decode per lessee."""
+        leased = list(kv_ops.recert_addresses_after(current_epoch - POSW_LEASE_EPOCHS))
+        cols = account_columns.fields_of(leased, ("registered", "fidelity"))
+        return {a: {"fidelity": cols[a]["fidelity"]} for a in leased
+                if a in cols and cols[a]["registered"] == 1}
     if kv_ops.in_write_txn():
         return _compute()
     key = (kv_ops.env_path(), kv_ops.write_generation(), current_epoch)
     entry = _open_reg_cache[0]
     if entry is None or entry[0] != key:
-        entry = (key, _compute())
+        entry = (key, _compute_columnar())
         _open_reg_cache[0] = entry
     return {addr: dict(info) for addr, info in entry[1].items()}
 
@@ -650,6 +676,7 @@ def apply_register(address: str, epoch: int, logger, revert=False):
             if not kv_ops.account_adjust(address, "fidelity", -net, floor_zero=True):
                 raise AssertionError(f"Fidelity revert underflow for {address}")
         kv_ops.recert_del(address, epoch)
+        kv_ops.fid_ledger_del(epoch, address)                   # the dividend ledger row rides the recert
         if kv_ops.recert_latest(address) < 0:
             kv_ops.account_set(address, "registered", 0)
     else:
@@ -670,6 +697,7 @@ def apply_register(address: str, epoch: int, logger, revert=False):
         if continuous and (epoch - prev) < FIDELITY_MIN_GAP_EPOCHS:
             gain = 0
         net = gain - decay                                      # cur_fid+net = cur_fid+gain (cont) or GAIN
+        ledger_record(address, epoch, prev)                     # dividend fidelity ledger (dividend_ops)
         kv_ops.recert_put(address, epoch)
         kv_ops.account_set(address, "registered", 1)
         if not kv_ops.account_adjust(address, "fidelity", net, floor_zero=True):
@@ -1,10 +1,11 @@
 import json
 import os
 import time
+from collections import OrderedDict
 
 from ops import codec
 import aiohttp
-from .account_ops import get_bonded_registry, get_open_registry, fetch_totals
+from .account_ops import get_bonded_registry, get_open_registry, registry_key, fetch_totals
 from config import get_timestamp_seconds, get_config, hostport
 from .data_ops import average, get_home, is_hex_hash
 from hashing import blake2b_hash_link, blake2b_hash
@@ -20,9 +21,9 @@ from protocol import (CHAIN_ID, REWARD_WINDOW, BASE_SUBSIDY, GENESIS_BEACON, EPO
 from protocol import ADDRESS_PREFIX
 import zstandard as zstd
 
-# Block bodies are stored as zstd(codec(block)) (#14) — ops/codec.py is a compact portable JSON
-# container (it replaced msgpack, which cannot hold >64-bit ints), and zstd recovers the ~2x redundancy
-# of hex signature/pubkey strings — important once post-quantum (ML-DSA) sigs bloat blocks. This is purely LOCAL/non-consensus (the block HASH is over
+# Block bodies are stored as zstd(codec.pack_storage(block)) (#14) — ops/codec.py's binary storage codec
+# (older bodies: its portable JSON container, which replaced msgpack because msgpack cannot hold >64-bit
+# ints; still readable), and zstd squeezes what's left after the hex signature/pubkey strings went raw — important once post-quantum (ML-DSA) sigs bloat blocks. This is purely LOCAL/non-consensus (the block HASH is over
 # canonical_bytes, never the stored file), so it can change with no fork. Genesis is also stored
 # this way (genesis.make_genesis calls save_block).
 # python-zstandard's ZstdCompressor/ZstdDecompressor are NOT thread-safe — a single instance shared across
@@ -45,13 +46,15 @@ def _zd():
 
 
 def _pack_block(block) -> bytes:
-    """local zstd(codec) block-body encoding — non-consensus, see module note (#14)."""
-    return _zc().compress(codec.pack(block))
+    """local zstd(storage codec) block-body encoding — non-consensus, see module note (#14). The binary
+    storage codec keeps signatures/public keys as raw bytes in a columnar tx table (ops/codec.py)."""
+    return _zc().compress(codec.pack_storage(block))
 
 
 def _unpack_block(raw: bytes):
-    """inverse of _pack_block for locally-stored (trusted) block files."""
-    return codec.unpack(_zd().decompress(raw))
+    """inverse of _pack_block for locally-stored (trusted) block files — also reads bodies written before
+    the storage codec (zstd(JSON)); those are immutable and simply stay JSON."""
+    return codec.unpack_stored(_zd().decompress(raw))
 
 
 # Bounded decompress for the zstd block-sync WIRE payload (get_blocks_after/before). max_output_size caps a
@@ -191,6 +194,22 @@ def check_target_match(transaction_list, block_number, logger):
         return False
 
 
+def lands_at(transaction, block_number) -> bool:
+    """Whether `transaction` may be assembled into block `block_number` — the per-tx target rule of
+    match_transactions_target, shared with the mempool's incremental upcoming set (ops/mempool.py).
+    Raises on a malformed tx; the callers skip it."""
+    tb = transaction["max_block"]
+    if _lands_flexibly(transaction):
+        # INCLUSION DELAY: a flexibly-landing tx becomes eligible only from its sender-set
+        # min_block (default 0). Set to submit_tip + a couple blocks by wallets, this guarantees
+        # the tx has gossiped to EVERY producer before any of them may include it — so all nodes
+        # hold the identical mature tx set at each height and build byte-identical blocks (the
+        # deterministic fast-forward then always hits). min_block is in the signed txid, so every
+        # node agrees on the eligibility window; absent -> 0 keeps historical blocks valid.
+        return transaction.get("min_block", 0) <= block_number <= tb   # [min_block, max_block]
+    return tb == block_number                                         # timing-critical: exact landing
+
+
 def match_transactions_target(transaction_list, block_number, logger):
     """Producer-side pool filter — the assembly mirror of check_target_match: keep only txs targeting
     this block number, drop duplicate reserved txs and cap blobs to the per-block byte budget, i.e.
@@ -207,7 +226,6 @@ def match_transactions_target(transaction_list, block_number, logger):
             # single poison mempool tx would otherwise halt production on every node that holds it.
             # (validate_transaction now rejects malformed min_block at admission; this is the belt.)
             try:
-                tb = transaction["max_block"]
                 txid = transaction.get("txid")
                 # AT-MOST-ONCE (2026-07): never re-select a txid already mined (in the on-chain tx-index) or
                 # already picked for THIS candidate. A flexibly-landing tx is otherwise eligible for every
@@ -215,17 +233,7 @@ def match_transactions_target(transaction_list, block_number, logger):
                 # the bridge-deposit double-credit. verify_block enforces the same rule for remote blocks.
                 if txid in seen or kv_ops.tx_get(txid) is not None:
                     continue
-                if _lands_flexibly(transaction):
-                    # INCLUSION DELAY: a flexibly-landing tx becomes eligible only from its sender-set
-                    # min_block (default 0). Set to submit_tip + a couple blocks by wallets, this guarantees
-                    # the tx has gossiped to EVERY producer before any of them may include it — so all nodes
-                    # hold the identical mature tx set at each height and build byte-identical blocks (the
-                    # deterministic fast-forward then always hits). min_block is in the signed txid, so every
-                    # node agrees on the eligibility window; absent -> 0 keeps historical blocks valid.
-                    if transaction.get("min_block", 0) <= block_number <= tb:   # [min_block, max_block]
-                        matched_txs.append(transaction)
-                        seen.add(txid)
-                elif tb == block_number:             # timing-critical: exact landing
+                if lands_at(transaction, block_number):
                     matched_txs.append(transaction)
                     seen.add(txid)
             except Exception as e:
@@ -263,12 +271,14 @@ def get_block_candidate(
     # is set to the winner address so the hashed body is identical per node.
     epoch = epoch_of(block_number)
     beacon = epoch_beacon(epoch)
+    reg_key = registry_key()                  # BEFORE the registry reads (see account_ops.registry_key)
     open_registry = get_open_registry(epoch)
     bonded_registry = get_bonded_registry()
     # RANDAO gate (pass-through while RANDAO_ENFORCED is off — reveals are optional). The full
     # registry always backs block_fork_weight below (withholding must not move fork-choice).
     eligible_bonded = randao_eligible_bonded(bonded_registry, epoch)
-    winner = select_producer_two_lane(open_registry, eligible_bonded, beacon, slot=block_number)
+    winner = select_producer_two_lane(open_registry, eligible_bonded, beacon, slot=block_number,
+                                      registry_key=reg_key)
     if winner is None:
         logger.error("No eligible producer (open+bonded empty / bonded slot skipped); skipping block")
         return None
@@ -321,16 +331,82 @@ def _stamp_child(block):
     return block
 
 
+# DECODED-BODY LRU. Every get_block / load_block_from_hash used to zstd-decompress + decode the body from
+# scratch, and a fleet resync has dozens of peers pulling the SAME recent range through /get_blocks_after
+# (plus the explorer re-reading the tip). Keyed by (block_hash, locator) rather than the hash alone, so no
+# invalidation protocol is needed: rollback/prune drop the locator (-> the lookup misses before it gets
+# here) and a re-save (replay, last write wins) appends a NEW locator (-> a different key); the stale entry
+# just ages out. child_hash is NOT cached — _stamp_child derives it from the index on every read, as before.
+# Byte-budgeted on the decompressed storage size (a proxy: the decoded dicts are a few times bigger, so the
+# real footprint is a small multiple of the budget). Callers get a private structural copy — they are free
+# to mutate what they're handed (several do), and must never reach the shared cached dict.
+BLOCK_CACHE_BYTES = int(os.environ.get("NADO_BLOCK_CACHE_BYTES", 32 << 20))
+_body_cache = OrderedDict()                           # (block_hash, loc) -> (decoded body, cost)
+_body_cache_bytes = [0]
+_body_cache_lock = _threading.Lock()
+
+
+def _copy_body(o):
+    """Structural copy of a decoded body: fresh dicts/lists, shared immutable leaves (str/int/bytes) —
+    several times cheaper than copy.deepcopy, which memoizes every leaf."""
+    if type(o) is dict:
+        return {k: _copy_body(v) for k, v in o.items()}
+    if type(o) is list:
+        return [_copy_body(v) for v in o]
+    return o
+
+
+def _body_cache_get(key):
+    with _body_cache_lock:
+        hit = _body_cache.get(key)
+        if hit is None:
+            return None
+        _body_cache.move_to_end(key)
+        return hit[0]
+
+
+def _body_cache_put(key, body, cost: int):
+    if cost > BLOCK_CACHE_BYTES // 4:                 # one fat (inline-proof) block must not flush the rest
+        return
+    with _body_cache_lock:
+        old = _body_cache.pop(key, None)
+        if old is not None:
+            _body_cache_bytes[0] -= old[1]
+        _body_cache[key] = (body, cost)
+        _body_cache_bytes[0] += cost
+        while _body_cache_bytes[0] > BLOCK_CACHE_BYTES and _body_cache:
+            _k, (_b, c) = _body_cache.popitem(last=False)
+            _body_cache_bytes[0] -= c
+
+
+def clear_block_cache():
+    """Drop every cached decoded body (tests; never needed for correctness — see the note above)."""
+    with _body_cache_lock:
+        _body_cache.clear()
+        _body_cache_bytes[0] = 0
+
+
 def _load_body(block_hash: str):
     """Verified block dict from the segment store via the hash->locator index, or None. Every
-    failure mode (no locator, deleted segment, crc/hash mismatch) is a clean miss."""
+    failure mode (no locator, deleted segment, crc/hash mismatch) is a clean miss. Served from the
+    decoded-body LRU when the (hash, locator) pair was read before."""
     loc = kv_ops.block_loc_get(block_hash)
     if loc is None:
         return None
-    payload = segment_store.read(loc[0], loc[1], loc[2], block_hash)
-    if payload is None:
-        return None
-    return _stamp_child(_unpack_block(payload))
+    key = (block_hash, tuple(loc))
+    body = _body_cache_get(key)
+    if body is None:
+        payload = segment_store.read_view(loc[0], loc[1], loc[2], block_hash)   # mmap view, decoded right away
+        if payload is None:
+            return None
+        try:
+            raw = _zd().decompress(payload)
+        finally:
+            if isinstance(payload, memoryview):
+                payload.release()                     # unpin the segment map (delete_segment can close it)
+        body = codec.unpack_stored(raw)
+        _body_cache_put(key, body, len(raw))
+    return _stamp_child(_copy_body(body))
 
 
 def migrate_block_store(logger) -> int:
@@ -1208,11 +1284,12 @@ async def knows_block(target_peer, port, hash, number, logger):
     healthy). Absence of information is never evidence of divergence — the same rule the exec layer's
     finality-revert probe enforces, for the same reason (2026-08-03). Truthiness-only callers are
     unaffected (None is falsy, the conservative read for donor qualification)."""
+    from ops import peer_transport        # local import: keep net_ops off block_ops' import-time graph
     try:
         url_construct = f"http://{hostport(target_peer, port)}/get_block?number={int(number)}"
 
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5)) as session:
-            async with session.get(url_construct) as response:
+        async with peer_transport.peer_session() as session:
+            async with session.get(url_construct, timeout=aiohttp.ClientTimeout(total=5)) as response:
                 if response.status != 200:
                     return None
                 data = await response.json(content_type=None)
@@ -1232,17 +1309,19 @@ async def get_blocks_after(target_peer, from_hash, logger, count=50, compress="z
     on to another peer. connect stays tight (a dead peer fails in 5s) while total allows a full
     SYNC_BATCH_MAX batch to transfer on a slow link."""
     from ops.net_ops import read_capped   # local import: keep net_ops off block_ops' import-time graph
+    from ops import peer_transport
     try:
         url_construct = f"http://{hostport(target_peer, get_config()['port'])}/get_blocks_after?hash={from_hash}&count={count}&compress={compress}"
 
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=60, connect=5)) as session:
-            async with session.get(url_construct) as response:
+        async with peer_transport.peer_session() as session:
+            async with session.get(url_construct, timeout=aiohttp.ClientTimeout(total=60, connect=5)) as response:
                 code = response.status
 
                 if code == 200 and compress == "zstd":
-                    return _unpack_wire(await read_capped(response, _SYNC_WIRE_CAP))
+                    return await peer_transport.decode(_unpack_wire, await read_capped(response, _SYNC_WIRE_CAP))
                 elif code == 200:
-                    return json.loads((await read_capped(response, _SYNC_WIRE_CAP)).decode())["blocks_after"]
+                    body = await read_capped(response, _SYNC_WIRE_CAP)
+                    return (await peer_transport.decode(json.loads, body))["blocks_after"]
                 else:
                     return False
 
@@ -1255,17 +1334,19 @@ async def get_blocks_before(target_peer, from_hash, logger, count=50, compress="
     toward genesis), same bomb-capped zstd wire decode, same tight-connect/long-total timeout split,
     falsy on any failure."""
     from ops.net_ops import read_capped   # local import: keep net_ops off block_ops' import-time graph
+    from ops import peer_transport
     try:
         url_construct = f"http://{hostport(target_peer, get_config()['port'])}/get_blocks_before?hash={from_hash}&count={count}&compress={compress}"
 
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=60, connect=5)) as session:
-            async with session.get(url_construct) as response:
+        async with peer_transport.peer_session() as session:
+            async with session.get(url_construct, timeout=aiohttp.ClientTimeout(total=60, connect=5)) as response:
                 code = response.status
 
                 if code == 200 and compress == "zstd":
-                    return _unpack_wire(await read_capped(response, _SYNC_WIRE_CAP))
+                    return await peer_transport.decode(_unpack_wire, await read_capped(response, _SYNC_WIRE_CAP))
                 elif code == 200:
-                    return json.loads((await read_capped(response, _SYNC_WIRE_CAP)).decode())["blocks_before"]
+                    body = await read_capped(response, _SYNC_WIRE_CAP)
+                    return (await peer_transport.decode(json.loads, body))["blocks_before"]
                 else:
                     return False
 
@@ -1278,14 +1359,15 @@ async def get_from_single_target(key, target_peer, logger) -> list:
     """obtain from a single target over the bomb-capped zstd(codec) wire, returns list ([] on failure).
     The old JSON path also had NO body cap — a malicious peer could stream unbounded bytes."""
     from ops.net_ops import read_capped, unpack_zstd_peer, MAX_PEER_BODY
+    from ops import peer_transport
 
     try:
         url_construct = f"http://{hostport(target_peer, get_config()['port'])}/{key}?compress=zstd"
 
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5)) as session:
-            async with session.get(url_construct) as response:
+        async with peer_transport.peer_session() as session:
+            async with session.get(url_construct, timeout=aiohttp.ClientTimeout(total=5)) as response:
                 if response.status == 200:
-                    fetched = unpack_zstd_peer(await read_capped(response, MAX_PEER_BODY))
+                    fetched = await peer_transport.decode(unpack_zstd_peer, await read_capped(response, MAX_PEER_BODY))
                     return fetched if isinstance(fetched, list) else []
                 else:
                     return []
@@ -44,3 +44,350 @@ def unpack(raw):
     if isinstance(raw, (bytes, bytearray)):
         raw = bytes(raw).decode("utf-8")
     return json.loads(raw, object_hook=_object_hook)
+
+
+# ---------------------------------------------------------------------------------------------------------
+# STORAGE CODEC (binary, schema-aware) — LOCAL BYTES ONLY, NEVER CONSENSUS OR WIRE.
+#
+# Profiling a 100k-account node showed JSON doing most of the work on the hot read paths: every get_account /
+# account_adjust pays a json.loads (13-16 µs for a six-int doc), get_bonded_registry / iter_accounts scans pay
+# it per row, and a block body spends ~7.5 KB per tx on the HEX text of an ML-DSA signature + public key that
+# are really ~3.7 KB of bytes. So LMDB documents and segment-store block bodies are written with the compact
+# binary form below, and pack()/unpack() above keep doing exactly what they always did for everything else.
+#
+# What must NOT change (and doesn't):
+#   * the STATE ROOT / snapshot / state_digest bytes: snapshot_ops.read_state re-renders every binary value
+#     through canonical(), which decodes it and runs the unchanged pack() — the SAME JSON bytes the row held
+#     before this codec existed (tests/test_storage_codec.py pins root identity between a JSON-stored and a
+#     binary-stored DB). A snapshot therefore still ships JSON rows, and a JSON row restored from one reads
+#     fine (lazy migration, below).
+#   * canonical_bytes / block hashes / tx ids: those hash their own preimages, never the stored file.
+#   * the peer WIRE: peers run older codecs and net_ops decodes untrusted bodies with plain unpack(), which
+#     deliberately does NOT auto-detect this format (no new parser exposed to the network).
+#
+# Format: STORAGE_MAGIC (0xFF — can never begin UTF-8 JSON, so a legacy row is told apart by its first byte)
+# + a version byte, then one tagged value. ints are arbitrary precision (length-prefixed big-endian
+# magnitude, 0..63 in the tag byte itself), bytes are raw, a lowercase even-length hex str of >=16 chars
+# (txids, hashes, signatures, public keys) is stored as its raw bytes and re-hexed on read, dict keys from
+# _FIELDS are one byte, an account doc whose six ACCOUNT_FIELDS lead in order is a fixed ">6Q" struct, and a
+# list of same-shaped dicts (block_transactions) is stored COLUMNAR — key schema once, then one column per
+# field — so zstd sees all signatures back to back. Every value decodes to EXACTLY what unpack(pack(v))
+# returns (tuples come back as lists, non-str dict keys are coerced the way json coerces them, bytes come
+# back as bytes), so callers can't tell which codec a row was written with.
+#
+# LAZY MIGRATION: nothing is rewritten up front. unpack_stored() reads both forms; the next write of a row
+# (kv_ops._pack) stores it binary. Block bodies are immutable, so legacy JSON bodies simply stay readable.
+# DOWNGRADE: an older binary cannot read binary rows — NADO_STORAGE_CODEC=json makes this node keep writing
+# legacy JSON (set it well before rolling back). The VERSION byte exists so a future layout can coexist:
+# a reader refuses a version it doesn't know rather than mis-decoding it.
+# ---------------------------------------------------------------------------------------------------------
+import os
+import struct
+
+STORAGE_MAGIC = 0xFF
+STORAGE_VERSION = 1
+_HEADER = bytes((STORAGE_MAGIC, STORAGE_VERSION))
+STORAGE_BINARY = os.environ.get("NADO_STORAGE_CODEC", "binary").strip().lower() != "json"
+
+# Interned dict keys: APPEND-ONLY. An id is baked into every row ever written with it — never reorder,
+# rename or remove an entry (a retired name just stays); add new names at the END (max 127 entries).
+_FIELDS = (
+    # account docs (kv_ops.ACCOUNT_FIELDS) + the common schemaless extras
+    "balance", "produced", "bonded", "registered", "fidelity", "last_hb_epoch", "public_key", "kem_pub",
+    "alias",
+    # transactions (draft_transaction / create_transaction)
+    "sender", "recipient", "amount", "timestamp", "data", "nonce", "max_block", "chain_id", "fee", "txid",
+    "signature",
+    # blocks (construct_block / save_block)
+    "block_number", "block_hash", "parent_hash", "block_creator", "block_timestamp", "block_transactions",
+    "child_hash", "block_reward", "cumulative_fees", "cumulative_weight", "state_root", "exec_root",
+    "exec_cursor", "auth_root", "auth_count",
+)
+_FIELD_ID = {f: i for i, f in enumerate(_FIELDS)}
+_ACCOUNT_FIELDS = _FIELDS[:6]          # == kv_ops.ACCOUNT_FIELDS (asserted by tests/test_storage_codec.py)
+
+_T_NONE, _T_FALSE, _T_TRUE, _T_INT, _T_NEG, _T_FLOAT, _T_STR, _T_HEX, _T_BYTES, _T_LIST, _T_DICT, \
+    _T_ACCOUNT, _T_TABLE = range(13)
+_T_SMALL = 0x40                        # 0x40..0x7F: the int 0..63
+_T_FIELD = 0x80                        # key position only: 0x80 + _FIELD_ID
+_HEX_MIN = 16
+_U64 = 1 << 64
+_ACCT = struct.Struct(">6Q")
+_DBL = struct.Struct(">d")
+
+
+def _varint(n, out):
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _json_key(k):
+    """The str json.dumps would write for dict key `k` (it coerces scalars, raises on anything else)."""
+    if isinstance(k, str):
+        return k
+    if k is True or k is False or k is None or isinstance(k, (int, float)):
+        return json.dumps(k)
+    raise TypeError(f"codec: keys must be str, int, float, bool or None, not {type(k).__name__}")
+
+
+def _enc_int(n, out):
+    if 0 <= n < 64:
+        out.append(_T_SMALL + n)
+        return
+    if n.bit_length() > 14_000:
+        repr(n)                        # same int_max_str_digits ValueError json.dumps would raise
+    tag, m = (_T_INT, n) if n >= 0 else (_T_NEG, -n - 1)
+    b = m.to_bytes((m.bit_length() + 7) // 8 or 1, "big")
+    out.append(tag)
+    _varint(len(b), out)
+    out += b
+
+
+def _enc_str(s, out):
+    if len(s) >= _HEX_MIN and not len(s) & 1:
+        try:
+            b = bytes.fromhex(s)
+        except ValueError:
+            b = None
+        if b is not None and b.hex() == s:              # fromhex tolerates case/whitespace — be exact
+            out.append(_T_HEX)
+            _varint(len(b), out)
+            out += b
+            return
+    b = s.encode("utf-8")                               # strict: a lone surrogate raises, as in pack()
+    out.append(_T_STR)
+    _varint(len(b), out)
+    out += b
+
+
+def _enc_key(k, out):
+    k = _json_key(k)
+    fid = _FIELD_ID.get(k)
+    if fid is not None:
+        out.append(_T_FIELD + fid)
+    else:
+        _enc_str(k, out)
+
+
+def _is_account(d):
+    if len(d) < 6:
+        return False
+    it = iter(d.items())
+    for f in _ACCOUNT_FIELDS:
+        k, v = next(it)
+        if k != f or type(v) is not int or not 0 <= v < _U64:
+            return False
+    return True
+
+
+def _table_keys(lst):
+    """The shared key tuple when `lst` is >=2 dicts of identical shape (columnar candidates), else None."""
+    if len(lst) < 2 or type(lst[0]) is not dict:
+        return None
+    keys = tuple(lst[0])
+    if not keys or not all(isinstance(k, str) for k in keys):
+        return None
+    for d in lst:
+        if type(d) is not dict or tuple(d) != keys:
+            return None
+    return keys
+
+
+def _enc(o, out):
+    if o is None:
+        out.append(_T_NONE)
+    elif o is True:
+        out.append(_T_TRUE)
+    elif o is False:
+        out.append(_T_FALSE)
+    elif isinstance(o, int):
+        _enc_int(int(o), out)
+    elif isinstance(o, str):
+        _enc_str(o, out)
+    elif isinstance(o, float):
+        out.append(_T_FLOAT)
+        out += _DBL.pack(o)
+    elif isinstance(o, dict):
+        if _is_account(o):
+            out.append(_T_ACCOUNT)
+            it = iter(o.items())
+            out += _ACCT.pack(*(next(it)[1] for _ in range(6)))
+            rest = list(it)
+            _varint(len(rest), out)
+            for k, v in rest:
+                _enc_key(k, out)
+                _enc(v, out)
+            return
+        out.append(_T_DICT)
+        _varint(len(o), out)
+        for k, v in o.items():
+            _enc_key(k, out)
+            _enc(v, out)
+    elif isinstance(o, (list, tuple)):
+        keys = _table_keys(o)
+        if keys is not None:
+            out.append(_T_TABLE)
+            _varint(len(o), out)
+            _varint(len(keys), out)
+            for k in keys:
+                _enc_key(k, out)
+            for k in keys:
+                for d in o:
+                    _enc(d[k], out)
+            return
+        out.append(_T_LIST)
+        _varint(len(o), out)
+        for v in o:
+            _enc(v, out)
+    elif isinstance(o, (bytes, bytearray)):
+        out.append(_T_BYTES)
+        _varint(len(o), out)
+        out += o
+    else:
+        _default(o)                                    # raises the same TypeError pack() would
+
+
+def pack_storage(obj) -> bytes:
+    """Serialize `obj` for LOCAL storage (LMDB values, segment-store block bodies). Binary form unless the
+    operator pinned NADO_STORAGE_CODEC=json, in which case this is exactly pack(). Deterministic: the same
+    value (same dict order) always yields the same bytes, which kv_ops' revert symmetry relies on."""
+    if not STORAGE_BINARY:
+        return pack(obj)
+    out = bytearray(_HEADER)
+    _enc(obj, out)
+    return bytes(out)
+
+
+def is_storage(raw) -> bool:
+    """True iff `raw` is a binary storage-codec value (vs a legacy/canonical JSON one)."""
+    return len(raw) > 0 and raw[0] == STORAGE_MAGIC
+
+
+def _dec(buf, i, hook):
+    """Decode one value at buf[i]; returns (value, next_index). `hook` applies the __b64__ object hook."""
+    t = buf[i]
+    i += 1
+    if _T_SMALL <= t < _T_FIELD:
+        return t - _T_SMALL, i
+    if t == _T_STR or t == _T_HEX or t == _T_BYTES:
+        n, i = _dec_varint(buf, i)
+        b = buf[i:i + n]
+        if len(b) != n:
+            raise ValueError("codec: truncated storage value")
+        return (b.decode("utf-8") if t == _T_STR else b.hex() if t == _T_HEX else b), i + n
+    if t == _T_ACCOUNT:
+        d = dict(zip(_ACCOUNT_FIELDS, _ACCT.unpack_from(buf, i)))
+        i += 48
+        n, i = _dec_varint(buf, i)
+        for _ in range(n):
+            k, i = _dec_key(buf, i)
+            d[k], i = _dec(buf, i, hook)
+        return d, i
+    if t == _T_DICT:
+        n, i = _dec_varint(buf, i)
+        d = {}
+        for _ in range(n):
+            k, i = _dec_key(buf, i)
+            d[k], i = _dec(buf, i, hook)
+        if hook and n == 1 and "__b64__" in d:
+            return _object_hook(d), i
+        return d, i
+    if t == _T_LIST:
+        n, i = _dec_varint(buf, i)
+        lst = []
+        for _ in range(n):
+            v, i = _dec(buf, i, hook)
+            lst.append(v)
+        return lst, i
+    if t == _T_TABLE:
+        rows, i = _dec_varint(buf, i)
+        nk, i = _dec_varint(buf, i)
+        keys = []
+        for _ in range(nk):
+            k, i = _dec_key(buf, i)
+            keys.append(k)
+        lst = [{} for _ in range(rows)]
+        for k in keys:
+            for d in lst:
+                d[k], i = _dec(buf, i, hook)
+        if hook and nk == 1 and keys[0] == "__b64__":
+            lst = [_object_hook(d) for d in lst]
+        return lst, i
+    if t == _T_INT or t == _T_NEG:
+        n, i = _dec_varint(buf, i)
+        m = int.from_bytes(buf[i:i + n], "big")
+        return (m if t == _T_INT else -m - 1), i + n
+    if t == _T_NONE:
+        return None, i
+    if t == _T_TRUE:
+        return True, i
+    if t == _T_FALSE:
+        return False, i
+    if t == _T_FLOAT:
+        return _DBL.unpack_from(buf, i)[0], i + 8
+    raise ValueError(f"codec: unknown storage tag 0x{t:02x}")
+
+
+def _dec_varint(buf, i):
+    n = shift = 0
+    while True:
+        b = buf[i]
+        i += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, i
+        shift += 7
+
+
+def _dec_key(buf, i):
+    t = buf[i]
+    if t >= _T_FIELD:
+        return _FIELDS[t - _T_FIELD], i + 1
+    k, i = _dec(buf, i, False)
+    if not isinstance(k, str):
+        raise ValueError("codec: non-str dict key in storage value")
+    return k, i
+
+
+def _unpack_binary(raw, hook):
+    raw = bytes(raw)
+    if len(raw) < 2 or raw[1] != STORAGE_VERSION:
+        raise ValueError(f"codec: unsupported storage codec version {raw[1] if len(raw) > 1 else None}")
+    obj, i = _dec(raw, 2, hook)
+    if i != len(raw):
+        raise ValueError("codec: trailing bytes after storage value")
+    return obj
+
+
+def unpack_stored(raw):
+    """Decode a LOCALLY stored value in either form — binary (pack_storage) or legacy JSON (pack). Only for
+    bytes this node wrote itself; untrusted peer input goes through unpack()."""
+    if is_storage(raw):
+        return _unpack_binary(raw, True)
+    return unpack(raw)
+
+
+# raw binary value -> its canonical JSON bytes. read_state renders every binary row on every state-root walk,
+# and most rows don't change between blocks, so memoize like snapshot_ops._leaf_cache (a changed value is a
+# different key; flushed wholesale when it outgrows the bound).
+_CANONICAL_CACHE = {}
+_CANONICAL_CACHE_MAX = 500_000
+
+
+def canonical(raw) -> bytes:
+    """The EXACT bytes pack() produces for the value stored in `raw` — identity for a JSON row, a re-render
+    for a binary one. This is what the state root, snapshot chunks and state_digest hash, so they stay
+    byte-identical whichever codec wrote the row. Decodes WITHOUT the __b64__ hook so bytes re-render as the
+    same {"__b64__": ...} object and a literal {"__b64__": ...} dict stays a dict."""
+    if not is_storage(raw):
+        return raw
+    raw = bytes(raw)
+    out = _CANONICAL_CACHE.get(raw)
+    if out is None:
+        out = pack(_unpack_binary(raw, False))
+        if len(_CANONICAL_CACHE) >= _CANONICAL_CACHE_MAX:
+            _CANONICAL_CACHE.clear()
+        _CANONICAL_CACHE[raw] = out
+    return out
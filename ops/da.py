@@ -9,9 +9,15 @@ reconstructable — phones sample instead of storing.
 
 Reference implementation: a systematic Reed-Solomon over the Mersenne prime P = 2^61-1 via Lagrange
 interpolation. Correct and deterministic (integer-only, no floats); O(n·k^2) per stripe — fine for DA-sized
-shard counts. A production node would swap the interpolation for an FFT-based codec behind the same interface.
+shard counts. The stripes are coded a batch at a time as LANE VECTORS (one big int per shard position, see
+_lane_dot), so the per-stripe cost is paid in C, not the interpreter. A production node would swap the
+interpolation for an FFT-based codec behind the same interface.
 """
-from hashing import canonical_bytes, merkle_root, merkle_proof, verify_merkle_proof
+import binascii
+import os
+from hashlib import blake2b
+
+from hashing import canonical_bytes, merkle_root_hashed, merkle_proof_hashed, verify_merkle_proof
 
 P = (1 << 61) - 1          # Mersenne prime; a field element fits in 8 bytes (61 < 64 bits)
 
@@ -32,6 +38,8 @@ def _leaf(index, shard: bytes, k, n, stripes, length) -> bytes:
 
     This CHANGES THE COMMITMENT for identical bytes; commitments are not comparable across the change."""
     return canonical_bytes(["da", int(index), shard.hex(), int(k), int(n), int(stripes), int(length)])
+
+
 SYMBOL_BYTES = 7           # 7 data bytes per field element (56 bits < 61) — the input packing granule
 _WORD = 8                  # on-wire bytes per field element (big-endian, fixed width)
 
@@ -148,6 +156,175 @@ def _shard_syms(shard_bytes):
     return [int.from_bytes(shard_bytes[i:i + _WORD], "big") for i in range(0, len(shard_bytes), _WORD)]
 
 
+# --- LANE ARITHMETIC: one field operation over a whole batch of stripes at once ----------------------------
+#
+# Even with the generator matrix hoisted (_enc_matrix) and the systematic rows skipped, the codec still paid
+# the interpreter per SYMBOL: an int.from_bytes to pack it, k multiply-adds per parity row, a `% P`, and an
+# int.to_bytes to emit it — ~1 s/MiB each way, so two minutes to encode a 118 MiB settle proof and as long
+# again to rebuild one from parity shards. Every stripe runs the SAME k x (n-k) products with the SAME
+# constants, so the work vectorises; there is no numpy in the node's dependency set, and 61-bit fields times
+# 64-bit words overflow uint64 anyway, so the vectors are Python ints used as SIMD registers:
+#
+#   a LANE VECTOR packs the c symbols at one shard position of c consecutive stripes into one big int, each in
+#   its own fixed-width slot (`width` bytes) with enough headroom that sum_i coef_i * Y_i can never carry
+#   into the neighbouring slot. One bignum multiply by a constant then does c modmuls' worth of work in C;
+#   packing / unpacking a vector is ~8 extended-slice copies (the _systematic_bytes trick) instead of c
+#   int.from_bytes calls.
+#
+#   mod P per slot uses the Mersenne fold  x = hi*2^61 + lo  =>  x == hi + lo (mod P): `& P-in-every-slot`
+#   and `>> 61` then `&` a slot-local mask, so no bit crosses a slot boundary. A couple of folds bring every
+#   slot to [0, P+1]; one compare-free correction (bit 61 of x+1 is set exactly when x >= P) makes it
+#   canonical.
+#
+# Same field, same constants, same order of data: the shard bytes and therefore the commitment are
+# bit-identical to the per-stripe path (tests/test_da_encode_matrix.py, tests/test_da_reconstruct_matrix.py),
+# which stays in this file as _encode_stripe — the readable definition the vectors are checked against.
+
+# stripes per lane vector. Bounds the bignums (k+1 vectors of LANE_STRIPES*width bytes, ~0.3 MB each at the
+# default) — big enough that per-batch overhead vanishes, small enough to stay cache-friendly.
+LANE_STRIPES = max(1, int(os.environ.get("NADO_DA_LANE_STRIPES", str(1 << 14))))
+
+_LANE_MASKS = {}
+
+
+def _lane_width(k):
+    """Slot width in bytes for a k-term dot product of 64-bit words with coefficients < P: the largest slot
+    value is k * (2^64 - 1) * (P - 1) < 2^(125 + bit_length(k)), plus a guard bit."""
+    return (125 + int(k).bit_length() + 1 + 7) // 8
+
+
+def _lane_masks(count, width):
+    """(ones, P-per-slot, slot-local high mask) for `count` slots of `width` bytes, cached."""
+    key = (count, width)
+    m = _LANE_MASKS.get(key)
+    if m is None:
+        ones = int.from_bytes((1).to_bytes(width, "big") * count, "big")
+        m = (ones, ones * P, ones * ((1 << (width * 8 - 61)) - 1))
+        if len(_LANE_MASKS) > 8:
+            _LANE_MASKS.clear()
+        _LANE_MASKS[key] = m
+    return m
+
+
+def _lanes(words, count, width):
+    """`count` 8-byte big-endian words -> one lane vector (each word in the low bytes of its slot)."""
+    buf = bytearray(count * width)
+    base = width - _WORD
+    for t in range(_WORD):
+        buf[base + t::width] = words[t::_WORD]
+    return int.from_bytes(buf, "big")
+
+
+def _lane_words(vec, count, width):
+    """Inverse of _lanes for CANONICAL slots (< P < 2^64): lane vector -> `count` 8-byte words."""
+    buf = vec.to_bytes(count * width, "big")
+    out = bytearray(count * _WORD)
+    base = width - _WORD
+    for t in range(_WORD):
+        out[t::_WORD] = buf[base + t::width]
+    return out
+
+
+def _lane_mod(vec, masks, width):
+    """Reduce every slot of `vec` to its canonical residue in [0, P)."""
+    ones, p_slots, hi_mask = masks
+    bits = width * 8
+    while bits > 62:                          # each fold: b bits -> at most max(61, b-61)+1 bits
+        vec = (vec & p_slots) + ((vec >> 61) & hi_mask)
+        bits = max(61, bits - 61) + 1
+    vec = (vec & p_slots) + ((vec >> 61) & hi_mask)      # now every slot is in [0, P+1]
+    return vec - (((vec + ones) >> 61) & ones) * P       # subtract P from the slots that are >= P
+
+
+def _lane_dot(row, vecs, masks, width):
+    """sum_i row[i] * vecs[i], reduced per slot — one matrix row applied to a whole batch of stripes."""
+    acc = 0
+    for c, v in zip(row, vecs):
+        if c:
+            acc += c * v
+    return _lane_mod(acc, masks, width)
+
+
+class LeafHasher:
+    """The Merkle digest of _leaf(index, shard, …), fed the shard PIECE BY PIECE.
+
+    _leaf hex-encodes the WHOLE shard into one JSON string: for a ~120 MiB settle proof coded 4-of-8 that
+    is a 60 MiB hex string per shard, built n times over (and sample_proof used to rebuild all n for every
+    one of the n proofs). The canonical encoding is fixed around the hex — `["da",i,"` + hex + `",k,n,s,l]`
+    — so the same bytes can be streamed into blake2b a part at a time, never materialised. Bit-identical to
+    hashing._mh(_leaf(...)) (tests/test_da_stream_put.py)."""
+
+    __slots__ = ("_h", "_suffix")
+
+    def __init__(self, index, k, n, stripes, length):
+        enc = canonical_bytes(["da", int(index), "", int(k), int(n), int(stripes), int(length)])
+        cut = enc.index(b'""') + 1                 # between the quotes of the (empty) shard field
+        self._h = blake2b(enc[:cut], digest_size=32)
+        self._suffix = enc[cut:]
+
+    def update(self, part):
+        self._h.update(binascii.hexlify(part))    # lower-case, exactly bytes.hex()
+
+    def digest(self) -> bytes:
+        h = self._h.copy()
+        h.update(self._suffix)
+        return h.digest()
+
+
+def leaf_digests(manifest) -> list:
+    """The n leaf digests of an in-memory manifest (shards held), in shard order."""
+    k, n, stripes, length = _meta_of(manifest)
+    out = []
+    for j in range(n):
+        h = LeafHasher(j, k, n, stripes, length)
+        h.update(manifest["shards"][j])
+        out.append(h.digest())
+    return out
+
+
+def stripe_count(length, k):
+    """Stripes a `length`-byte blob codes into: 7 data bytes per symbol, at least one symbol (an empty blob
+    still encodes to one stripe, as _pack always did), zero-padded to whole stripes of k symbols."""
+    return -(-max(-(-int(length) // SYMBOL_BYTES), 1) // int(k))
+
+
+def encode_batches(data, k: int, n: int, batch_stripes=None):
+    """Erasure-code `data` a batch of stripes at a time: yields one list of n shard PARTS per batch, in
+    order, so shard j is b"".join of its parts. Nothing but the current batch is held — this is the
+    streaming core behind encode() and DaStore.put. `batch_stripes` defaults to one lane batch."""
+    if not (0 < k <= n):
+        raise ValueError("require 0 < k <= n")
+    length = len(data)
+    stripes = stripe_count(length, k)
+    span = k * SYMBOL_BYTES
+    view = memoryview(data).cast("B")
+    M = _enc_matrix(k, n)
+    width = _lane_width(k)
+    batch = max(1, int(batch_stripes or LANE_STRIPES))
+    for b0 in range(0, stripes, batch):
+        parts = [[] for _ in range(n)]
+        for s0 in range(b0, min(b0 + batch, stripes), LANE_STRIPES):
+            c = min(LANE_STRIPES, stripes - s0, b0 + batch - s0)
+            region = bytes(view[s0 * span:(s0 + c) * span])
+            if len(region) < c * span:
+                region += bytes(c * span - len(region))   # zero-pad the tail stripe
+            # the _pack layout without materialising a symbol: systematic shard j is data symbol j of every
+            # stripe as an 8-byte word (zero high byte + 7 bytes)
+            sys_words = []
+            for j in range(k):
+                w = bytearray(c * _WORD)
+                for t in range(SYMBOL_BYTES):
+                    w[1 + t::_WORD] = region[j * SYMBOL_BYTES + t::span]
+                sys_words.append(w)
+                parts[j].append(w)
+            if n > k:
+                masks = _lane_masks(c, width)
+                vecs = [_lanes(w, c, width) for w in sys_words]
+                for x in range(k, n):             # only the parity rows carry work (see _encode_stripe)
+                    parts[x].append(_lane_words(_lane_dot(M[x], vecs, masks, width), c, width))
+        yield [pp[0] if len(pp) == 1 else b"".join(pp) for pp in parts]
+
+
 def encode(data: bytes, k: int, n: int):
     """Erasure-encode `data` into `n` shards, any `k` of which reconstruct it, plus a hash-based Merkle
     commitment over the shard set. Returns a manifest dict:
@@ -155,21 +332,27 @@ def encode(data: bytes, k: int, n: int):
     `commitment` is what goes in the block header; a sampler checks one shard against it with sample_proof."""
     if not (0 < k <= n):
         raise ValueError("require 0 < k <= n")
-    syms, length = _pack(data)
-    while len(syms) % k:                          # pad the last stripe with zero symbols
-        syms.append(0)
-    stripes = len(syms) // k
-    # shard j gets the j-th symbol of every stripe
-    shard_syms = [[] for _ in range(n)]
-    for s in range(stripes):
-        enc = _encode_stripe(syms[s * k:(s + 1) * k], n)
+    length = len(data)
+    stripes = stripe_count(length, k)
+    parts = [[] for _ in range(n)]
+    for batch in encode_batches(data, k, n):
         for j in range(n):
-            shard_syms[j].append(enc[j])
-    shards = [_shard_bytes(ss) for ss in shard_syms]
+            parts[j].append(batch[j])
+    m = {"k": k, "n": n, "stripes": stripes, "length": length, "shards": [b"".join(pp) for pp in parts]}
     # hash-based (PQ) Merkle commitment, index- AND manifest-bound (see _leaf)
-    leaves = [_leaf(j, shards[j], k, n, stripes, length) for j in range(n)]
-    return {"commitment": merkle_root(leaves), "k": k, "n": n, "stripes": stripes,
-            "length": length, "shards": shards}
+    m["commitment"] = merkle_root_hashed(leaf_digests(m))
+    return m
+
+
+def commitment(data: bytes, k: int, n: int) -> str:
+    """encode(data, k, n)["commitment"] without holding the shards — each batch is hashed and dropped."""
+    length = len(data)
+    stripes = stripe_count(length, k)
+    hashers = [LeafHasher(j, k, n, stripes, length) for j in range(n)]
+    for batch in encode_batches(data, k, n):
+        for j in range(n):
+            hashers[j].update(batch[j])
+    return merkle_root_hashed([h.digest() for h in hashers])
 
 
 def _systematic_bytes(shards, k, stripes, length):
@@ -219,12 +402,11 @@ def reconstruct(manifest_meta, known_shards: dict, verify: bool = True):
     k = manifest_meta["k"]; stripes = manifest_meta["stripes"]; length = manifest_meta["length"]
     if len(known_shards) < k:
         raise ValueError(f"need >= {k} shards, have {len(known_shards)}")
-    sym_by_idx = {idx: _shard_syms(b) for idx, b in known_shards.items()}
     # SORTED, so the k SYSTEMATIC shards (indices 0..k-1) are preferred over parity whenever they are
     # available, and so the choice no longer depends on dict insertion order (i.e. on the order shards
     # happened to arrive from the network). Any k shards reconstruct the same bytes, so this changes no
     # output — it only decides which arithmetic path below can be taken.
-    idx_list = sorted(sym_by_idx)
+    idx_list = sorted(known_shards)
     use, extra = idx_list[:k], (idx_list[k:] if verify else [])
     # SYSTEMATIC FAST PATH. _encode_stripe is systematic: shard j < k IS data symbol j. So when the chosen
     # k are exactly 0..k-1 the decode matrix below is the IDENTITY and the whole per-stripe matrix-vector
@@ -285,16 +467,29 @@ def reconstruct(manifest_meta, known_shards: dict, verify: bool = True):
             row.append(num * _inv(den) % P)
         ext[idx] = row
 
-    out_syms = []
-    for s in range(stripes):
-        ys = [sym_by_idx[idx][s] % P for idx in use]
+    # the per-stripe matrix-vector products, a lane batch of stripes at a time (see LANE ARITHMETIC). The
+    # recovered data symbols come out as systematic-layout words, so the final byte assembly — and its
+    # out-of-7-byte-range check — is _systematic_bytes, shared with the fast path.
+    need = stripes * _WORD
+    for idx in use + extra:
+        if len(known_shards[idx]) < need:
+            raise ValueError("da: shard shorter than the manifest's stripe count")
+    width = _lane_width(k)
+    words = [[] for _ in range(k)]
+    for s0 in range(0, stripes, LANE_STRIPES):
+        c = min(LANE_STRIPES, stripes - s0)
+        masks = _lane_masks(c, width)
+        lo, hi = s0 * _WORD, (s0 + c) * _WORD
+        ys = [_lane_mod(_lanes(known_shards[idx][lo:hi], c, width), masks, width) for idx in use]
         # identity decode when the systematic shards were chosen — the data symbols ARE the shard symbols
-        data = ys if systematic else [sum(dec[j][i] * ys[i] for i in range(k)) % P for j in range(k)]
+        data = ys if systematic else [_lane_dot(dec[j], ys, masks, width) for j in range(k)]
         for idx, row in ext.items():
-            if sum(row[i] * data[i] for i in range(k)) % P != sym_by_idx[idx][s] % P:
+            got = _lane_mod(_lanes(known_shards[idx][lo:hi], c, width), masks, width)
+            if _lane_dot(row, data, masks, width) != got:
                 raise ValueError(f"shard {idx} inconsistent with the k-of-n interpolation (corrupt shard)")
-        out_syms.extend(data)
-    return _unpack(out_syms, length)
+        for j in range(k):
+            words[j].append(_lane_words(data[j], c, width))
+    return _systematic_bytes([b"".join(w) for w in words], k, stripes, length)
 
 
 def _meta_of(m):
@@ -304,10 +499,9 @@ def _meta_of(m):
 
 def sample_proof(manifest, index: int):
     """Merkle proof that shard `index` belongs to the commitment — what a sampler downloads with the shard."""
-    k, n, stripes, length = _meta_of(manifest)
-    leaves = [_leaf(j, manifest["shards"][j], k, n, stripes, length) for j in range(n)]
+    digests = leaf_digests(manifest)
     return {"index": index, "shard": manifest["shards"][index],
-            "proof": merkle_proof(leaves, _leaf(index, manifest["shards"][index], k, n, stripes, length))}
+            "proof": merkle_proof_hashed(digests, digests[index])}
 
 
 def verify_sample(commitment, index: int, shard: bytes, proof, meta) -> bool:
@@ -16,9 +16,25 @@ full/exec/DA-node concern).
 import os
 import json
 import shutil
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 
+from hashing import merkle_root_hashed, merkle_proof_hashed
 from ops import da
 
+# STREAMING PUBLISH. put() used to da.encode the whole blob, then build every proof through sample_proof:
+# the data, all n shards, and — n times over — all n hex-encoded leaves were live at once, several copies
+# of a ~120 MiB settle proof. It now codes DA_PUT_WINDOW bytes of shard output at a time: each batch is
+# handed to a worker per shard that appends it to that shard's staging file and streams it into the
+# shard's leaf hash (da.LeafHasher), while the next batch is being coded. Peak memory beyond the caller's
+# own `data` is ~2 windows; blake2b and file writes release the GIL, so the hashing/writing overlaps the
+# (GIL-bound) coding on other cores. Same bytes, same commitment, same files as the in-memory publish.
+DA_PUT_WINDOW = max(1 << 16, int(os.environ.get("NADO_DA_PUT_WINDOW", str(32 << 20))))
+DA_PUT_WORKERS = max(1, int(os.environ.get("NADO_DA_PUT_WORKERS", str(min(8, os.cpu_count() or 1)))))
+_STAGE_PREFIX = "~put-"       # put()'s staging dirs — not objects; '~' is outside the hex commitment charset
+_STAGE_STALE_S = 3600         # a staging dir this old is a crashed put's leftover
+
 
 def _atomic_write(path, data: bytes):
     """Crash-safe write: write to a temp sibling then rename ('~tmp' is outside the hex commitment charset)."""
@@ -66,13 +82,21 @@ class DaStore:
             return 0
         try:
             entries = []
+            now = time.time()
             for name in os.listdir(self.root):
                 d = os.path.join(self.root, name)
                 if os.path.isdir(d):
                     try:
-                        entries.append((os.path.getmtime(d), name))
+                        mtime = os.path.getmtime(d)
                     except OSError:
                         continue
+                    if name.startswith(_STAGE_PREFIX):
+                        # a put in flight is not an object and must not push a real one out of the window;
+                        # one left behind by a crash is removed once it is clearly dead
+                        if now - mtime > _STAGE_STALE_S:
+                            shutil.rmtree(d, ignore_errors=True)
+                        continue
+                    entries.append((mtime, name))
             if len(entries) <= keep:
                 return 0
             entries.sort(reverse=True)                 # newest first — those are the fetchable ones
@@ -93,28 +117,60 @@ class DaStore:
     # ---- publisher side -------------------------------------------------------------------------
     def put(self, data: bytes, k: int = 4, n: int = 8) -> dict:
         """Erasure-code `data` (k-of-n) and persist meta + every (shard, proof). Returns the PUBLIC
-        manifest {commitment,k,n,stripes,length} (no shard bytes) — what a publisher puts on-chain."""
-        m = da.encode(data, k, n)
-        d = self._dir(m["commitment"])
-        os.makedirs(d, exist_ok=True)
-        meta = {kk: m[kk] for kk in _META_KEYS}
-        _atomic_write(os.path.join(d, "meta.json"), json.dumps(meta).encode())
-        # KEEP THE ORIGINAL BYTES. get() otherwise reconstructs from shards AND re-encodes the result to
-        # round-trip the commitment — a full decode plus a full encode. Measured on a 118 MiB settle proof:
-        # 118 s for a /da/get of a blob this very process had encoded moments earlier.
-        #
-        # That is not merely wasteful, it BLOCKED SETTLEMENT: validate_transaction resolves a DA-carried
-        # proof with an 8 s budget (_fetch_da_proof), so the publisher timed out fetching its OWN proof and
-        # the settle was deferred as "not available via DA yet" — observed live 2026-08-04 at cursor 21214.
-        #
-        # Sound because the path is keyed by the commitment: _dir(m["commitment"]) is derived from the very
-        # bytes we hashed here, so a blob found there IS the preimage of that commitment. Shards ACCEPTED
-        # from a peer never write this file, so that path still reconstructs and re-verifies as before.
-        _atomic_write(os.path.join(d, "blob.bin"), data)
-        for i in range(n):
-            sp = da.sample_proof(m, i)
-            _atomic_write(os.path.join(d, f"{i}.shard"), sp["shard"])
-            _atomic_write(os.path.join(d, f"{i}.proof"), json.dumps(sp["proof"]).encode())
+        manifest {commitment,k,n,stripes,length} (no shard bytes) — what a publisher puts on-chain.
+        Streams (see DA_PUT_WINDOW): shards go to a staging dir as they are coded, and are moved under
+        the commitment once it is known."""
+        length = len(data)
+        stripes = da.stripe_count(length, k)
+        # a window holds one batch's n shard parts (8 bytes per stripe each); two batches are ever live
+        batch = max(1, DA_PUT_WINDOW // (2 * n * 8))
+        stage = os.path.join(self.root, f"{_STAGE_PREFIX}{uuid.uuid4().hex}")
+        os.makedirs(stage)
+        try:
+            hashers = [da.LeafHasher(i, k, n, stripes, length) for i in range(n)]
+            files = [open(os.path.join(stage, f"{i}.shard"), "wb") for i in range(n)]
+            try:
+                def _sink(i, part):
+                    hashers[i].update(part)
+                    files[i].write(part)
+                with ThreadPoolExecutor(max_workers=min(n, DA_PUT_WORKERS),
+                                        thread_name_prefix="da-put") as pool:
+                    pending = []
+                    for parts in da.encode_batches(data, k, n, batch_stripes=batch):
+                        for f in pending:              # a shard's parts must land in order: finish the
+                            f.result()                 # previous batch before queueing this one
+                        pending = [pool.submit(_sink, i, parts[i]) for i in range(n)]
+                    for f in pending:
+                        f.result()
+            finally:
+                for f in files:
+                    f.close()
+            digests = [h.digest() for h in hashers]
+            meta = {"commitment": merkle_root_hashed(digests), "k": k, "n": n,
+                    "stripes": stripes, "length": length}
+            d = self._dir(meta["commitment"])
+            os.makedirs(d, exist_ok=True)
+            _atomic_write(os.path.join(d, "meta.json"), json.dumps(meta).encode())
+            # KEEP THE ORIGINAL BYTES. get() otherwise reconstructs from shards AND re-encodes the result to
+            # round-trip the commitment — a full decode plus a full encode. Measured on a 118 MiB settle
+            # proof: 118 s for a /da/get of a blob this very process had encoded moments earlier.
+            #
+            # That is not merely wasteful, it BLOCKED SETTLEMENT: validate_transaction resolves a DA-carried
+            # proof with an 8 s budget (_fetch_da_proof), so the publisher timed out fetching its OWN proof
+            # and the settle was deferred as "not available via DA yet" — observed live 2026-08-04 at cursor
+            # 21214.
+            #
+            # Sound because the path is keyed by the commitment: _dir(m["commitment"]) is derived from the
+            # very bytes we hashed here, so a blob found there IS the preimage of that commitment. Shards
+            # ACCEPTED from a peer never write this file, so that path still reconstructs and re-verifies.
+            _atomic_write(os.path.join(d, "blob.bin"), data)
+            for i in range(n):
+                # os.replace per file, as _atomic_write does: a reader never sees a half-written shard
+                os.replace(os.path.join(stage, f"{i}.shard"), os.path.join(d, f"{i}.shard"))
+                proof = merkle_proof_hashed(digests, digests[i])
+                _atomic_write(os.path.join(d, f"{i}.proof"), json.dumps(proof).encode())
+        finally:
+            shutil.rmtree(stage, ignore_errors=True)
         # ROLLING WINDOW, ENFORCED HERE so no caller can forget it — which is what let the store reach 41 GB.
         # Swept AFTER the write, so the object just published is always among the newest and never its own
         # victim.
@@ -192,7 +248,7 @@ class DaStore:
             data = da.reconstruct(meta, known)
             # meta (k/n/stripes/length) may have been stored from an untrusted peer's `accept`; round-trip the
             # result against the commitment so a lied manifest can't yield wrong-but-passing bytes.
-            if da.encode(data, int(meta["k"]), int(meta["n"]))["commitment"] != commitment:
+            if da.commitment(data, int(meta["k"]), int(meta["n"])) != commitment:
                 return None
             return data
         except Exception:
@@ -13,11 +13,48 @@ immutable, revert-safe recert history — so we replay the exact ramp `apply_reg
 
 `fidelity_at_epoch` MUST stay byte-identical to that ramp (ops/account_ops.apply_register) — a fraud proof
 that miscomputes it would false-slash honest settlers. test_dividend_fidelity.py pins the two together.
+
+FIDELITY LEDGER (the fast path). Replaying every present address's whole recert history at every epoch
+boundary is O(present x history) — and the history is up to SATURATION_LOOKBACK_EPOCHS of rows per address —
+for a value apply_register already knew the moment it applied the recert. So apply_register now records it:
+one node-local kv_ops `fid_ledger` row per recert row, be8(epoch)||address -> the raw fidelity that recert
+left the address at (ledger_record; reverted with the recert). weights_at_epoch(E) is then ONE range read
+over the lease window (E - POSW_LEASE_EPOCHS, E]: the window's addresses ARE the present set, and each one's
+latest row in it IS fidelity_at_epoch(address, E).
+
+The ledger is an INDEX, never an input: it is not snapshot-carried and not in the state root, and it is only
+trusted when it holds exactly as many rows for the window as recert_by_epoch does. Anything else (a
+snapshot-booted node, rows written before the ledger existed, genesis recerts, a GC sweep) falls back to
+weights_at_epoch_replay — the definition, kept verbatim for the fraud-proof path — and, inside the block's
+write txn, backfills the missing rows from it so the next boundary is fast again. A ledger row written
+before idle-GC pruned older recerts may hold a LARGER raw fidelity than the replay of the pruned rows, but
+only ever past FIDELITY_CAP (the protocol.py weight-safety argument), so open_shares() — the only thing
+weights read — is identical. NADO_DIVIDEND_LEDGER_CHECK=1 recomputes every ledger read by replay and logs a
+mismatch (returning the replay), the same differential self-check state_tree.CROSS_CHECK gives the root.
 """
+import os
+
 from protocol import POSW_LEASE_EPOCHS, FIDELITY_GAIN, FIDELITY_MIN_GAP_EPOCHS
 from ops import kv_ops
 from ops.mining_ops import open_shares
 
+# differential self-check of the ledger against the replay (ops, tests). Costs the replay it replaces.
+CROSS_CHECK = os.environ.get("NADO_DIVIDEND_LEDGER_CHECK", "").strip() not in ("", "0")
+
+
+def _ramp(fid: int, prev: int, r: int) -> int:
+    """One step of the apply_register fidelity ramp: the fidelity after a recert at `r`, given the fidelity
+    `fid` after the previous recert at `prev` (-1: none)."""
+    continuous = prev >= 0 and (r - prev) <= POSW_LEASE_EPOCHS
+    # MUST MIRROR account_ops.apply_register EXACTLY, activation gate included — this replay is what a
+    # dividend fraud proof checks against, so any divergence false-slashes an honest settler.
+    # UNCONDITIONAL, and only because this ships WITH a genesis reroll: there is no pre-rule recert
+    # history for this loop to replay, so there is nothing the old activation gate could protect.
+    gain = FIDELITY_GAIN
+    if continuous and (r - prev) < FIDELITY_MIN_GAP_EPOCHS:
+        gain = 0
+    return (fid + gain) if continuous else FIDELITY_GAIN               # lapse/first -> reset to GAIN
+
 
 def fidelity_at_epoch(address: str, epoch: int) -> int:
     """Reconstruct `address`'s raw fidelity AS OF `epoch`, from its recert history (recerts <= epoch), by
@@ -26,19 +63,25 @@ def fidelity_at_epoch(address: str, epoch: int) -> int:
     fid = 0
     prev = -1
     for r in kv_ops.recert_epochs(address, upto_epoch=epoch):    # ascending, only recerts <= epoch
-        continuous = prev >= 0 and (r - prev) <= POSW_LEASE_EPOCHS
-        # MUST MIRROR account_ops.apply_register EXACTLY, activation gate included — this replay is what a
-        # dividend fraud proof checks against, so any divergence false-slashes an honest settler.
-        # UNCONDITIONAL, and only because this ships WITH a genesis reroll: there is no pre-rule recert
-        # history for this loop to replay, so there is nothing the old activation gate could protect.
-        gain = FIDELITY_GAIN
-        if continuous and (r - prev) < FIDELITY_MIN_GAP_EPOCHS:
-            gain = 0
-        fid = (fid + gain) if continuous else FIDELITY_GAIN            # lapse/first -> reset to GAIN
+        fid = _ramp(fid, prev, r)
         prev = r
     return fid
 
 
+def ledger_record(address: str, epoch: int, prev: int):
+    """Ledger the fidelity `address` reaches with its recert at `epoch` (apply_register, BEFORE recert_put;
+    `prev` = its previous recert epoch, -1 if none). One ramp step on top of the previous recert's ledger
+    row; a previous recert the ledger never saw is replayed once instead."""
+    if prev == epoch:
+        return                                                  # same-epoch re-put: no new recert row
+    fid = 0
+    if prev >= 0:
+        fid = kv_ops.fid_ledger_get(prev, address)
+        if fid is None:
+            fid = fidelity_at_epoch(address, prev)
+    kv_ops.fid_ledger_put(epoch, address, _ramp(fid, prev, epoch))
+
+
 def present_at_epoch(epoch: int) -> set:
     """The OPEN-lane present set AT `epoch`: addresses whose lease was valid then — a recert in
     (epoch - POSW_LEASE_EPOCHS, epoch]. Reconstructed from the recert history (not the live `registered`
@@ -52,8 +95,53 @@ def present_at_epoch(epoch: int) -> set:
     return present
 
 
+def weights_at_epoch_replay(epoch: int) -> dict:
+    """THE DEFINITION: {address: open_shares(fidelity_at_epoch(address, epoch))} for the present set at
+    `epoch`, replayed from the recert rows alone. The fraud-proof path and the ledger cross-check use this;
+    weights_at_epoch must always equal it."""
+    return {addr: open_shares(fidelity_at_epoch(addr, epoch)) for addr in present_at_epoch(epoch)}
+
+
+def _ledger_heal(lo: int, epoch: int):
+    """Backfill the ledger rows missing from the window [lo, epoch] by replay (inside a write txn only)."""
+    for r, addr in kv_ops.recert_window_rows(lo, epoch):
+        if kv_ops.fid_ledger_get(r, addr) is None:
+            kv_ops.fid_ledger_put(r, addr, fidelity_at_epoch(addr, r))
+
+
 def weights_at_epoch(epoch: int) -> dict:
     """{address: open_shares(fidelity_at_epoch(address, epoch))} for the present set at `epoch` — the
     fidelity-weighted open-lane weights the dividend distributes by, as of that epoch. Deterministic and
-    reconstructible: this is what the exec node accrues against and what an L1 challenge re-derives."""
-    return {addr: open_shares(fidelity_at_epoch(addr, epoch)) for addr in present_at_epoch(epoch)}
+    reconstructible: this is what the exec node accrues against and what an L1 challenge re-derives.
+    Read from the fidelity ledger when it covers the lease window, else replayed (module docstring)."""
+    lo = epoch - POSW_LEASE_EPOCHS + 1
+    latest, rows = kv_ops.fid_ledger_window(lo, epoch)
+    if rows != kv_ops.recert_count_in_window(lo, epoch):
+        if kv_ops.in_write_txn():
+            _ledger_heal(lo, epoch)
+        return weights_at_epoch_replay(epoch)
+    weights = {addr: open_shares(fid) for addr, fid in latest.items()}
+    if CROSS_CHECK:
+        replay = check_weights_at_epoch(epoch, weights)
+        if replay is not None:
+            return replay
+    return weights
+
+
+def check_weights_at_epoch(epoch: int, weights: dict = None, logger=None):
+    """Differential check of the ledger read against the replay definition. Returns None when they agree,
+    else reports the disagreement and returns the replay (the value callers must use)."""
+    if weights is None:
+        lo = epoch - POSW_LEASE_EPOCHS + 1
+        latest, _rows = kv_ops.fid_ledger_window(lo, epoch)
+        weights = {addr: open_shares(fid) for addr, fid in latest.items()}
+    replay = weights_at_epoch_replay(epoch)
+    if weights == replay:
+        return None
+    diff = sorted(a for a in set(weights) | set(replay) if weights.get(a) != replay.get(a))
+    msg = f"DIVIDEND LEDGER MISMATCH at epoch {epoch}: {len(diff)} address(es), e.g. {diff[:4]} — using replay"
+    if logger is not None:
+        logger.error(msg)
+    else:
+        print(f"[dividend_ops] {msg}", flush=True)
+    return replay
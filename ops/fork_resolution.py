@@ -27,6 +27,10 @@ verdict, so it is fully testable without a network, and it cannot be blinded by
 way consensus.status_pool can.
 """
 
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
 BEHIND, REORG, DEAD_FORK, SYNCED, UNKNOWN = "behind", "reorg", "dead_fork", "synced", "unknown"
 
 # Fraction of ANSWERING peers that must report the same hash at a height for it to count as "the majority's".
@@ -38,8 +42,83 @@ _AGREE = 0.5
 # range/_SWEEP — ~200 blocks on a 13k chain, well under any real pruning retention.
 _SWEEP = 64
 
+# WALL-CLOCK BOUNDS ON A PROBE ROUND (seconds; node-local tuning, not consensus). Every fan-out below stops
+# waiting at its deadline and treats whoever has not answered as silent — which every caller already reads
+# as "no evidence", never as a fork. VERDICT: one whole resolve() (the ancestor search is ~log2(depth)
+# rounds). PROBE: one flat round of the dead-fork detector / depth-floor corroboration.
+VERDICT_DEADLINE_S = max(1.0, float(os.environ.get("NADO_VERDICT_DEADLINE_S", "20")))
+PROBE_DEADLINE_S = max(1.0, float(os.environ.get("NADO_PROBE_DEADLINE_S", "8")))
+# probes in flight per round — the old majority_hash pool size
+FAN_OUT_WORKERS = max(1, int(os.environ.get("NADO_FAN_OUT_WORKERS", "8")))
+
+
+def fan_out(keys, call, deadline=None, stop=None, workers=FAN_OUT_WORKERS):
+    """{key: call(key)} for every key that answered, run CONCURRENTLY — the one probe fan-out shared by the
+    verdict (majority_hash), the dead-fork detector (peer_ops.stranded_below_finality) and the depth-floor
+    corroboration prefetch.
+
+    Returns early, leaving the rest unanswered, when the absolute time.monotonic() `deadline` passes or
+    when `stop(results_so_far, n_pending)` says the outcome is already decided. A call that raises counts
+    as unanswered. Stragglers are abandoned, not joined: each is bounded by its own probe timeout, and
+    under core_loop's memo its answer still lands for the next pass. This is what keeps one dead peer from
+    costing a round its full timeout — the old `ex.map` waited for every peer, so the slowest peer set
+    the pace of every round of a ~26-round binary search."""
+    keys = list(keys)
+    out = {}
+    if not keys or (deadline is not None and time.monotonic() >= deadline):
+        return out
+    ex = ThreadPoolExecutor(max_workers=min(max(1, int(workers)), len(keys)), thread_name_prefix="probe")
+    try:
+        pending = {ex.submit(call, k): k for k in keys}
+        while pending:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                break                                    # deadline: the stragglers are silent this round
+            for f in done:
+                k = pending.pop(f)
+                try:
+                    out[k] = f.result()
+                except Exception:
+                    pass
+            if pending and stop is not None and stop(out, len(pending)):
+                break
+    finally:
+        ex.shutdown(wait=False, cancel_futures=True)
+    return out
+
+
+def _tally(results):
+    """({hash: weight}, answer_count) over probe results — see majority_hash for the weighting."""
+    answers, count = {}, 0
+    for r in results:
+        h, seats = (r if isinstance(r, tuple) else (r, 0))
+        if h:
+            answers[h] = answers.get(h, 0) + 1 + max(0, int(seats or 0))
+            count += 1
+    return answers, count
+
 
-def majority_hash(height, peers, probe, min_answers=2):
+def _settled(answers, count, pending, min_answers, max_weight):
+    """True when the `pending` answers still out can no longer change what majority_hash returns.
+
+    Quorum unreachable -> settled (None) always. With `max_weight` (the most one answer can weigh) also:
+    the leader holds a strict majority even if every straggler answers against it at full weight ->
+    settled (the leader); or nobody can reach a majority even if every straggler joins them -> settled
+    (None). Without max_weight a round runs until everyone answered or the deadline."""
+    if count + pending < int(min_answers):
+        return True
+    if max_weight is None:
+        return False
+    slack = pending * max(1, int(max_weight))
+    total = sum(answers.values())
+    best = max(answers.values(), default=0)
+    if count >= int(min_answers) and best > (total + slack) * _AGREE:
+        return True
+    return best + slack <= (total + slack) * _AGREE
+
+
+def majority_hash(height, peers, probe, min_answers=2, deadline=None, max_weight=None):
     """The hash a strict majority of ANSWERING WEIGHT reports at `height`, or None if there is no majority
     or too few answers.
 
@@ -48,21 +127,20 @@ def majority_hash(height, peers, probe, min_answers=2):
     1 + its selection seats, an unsigned/unverifiable answer counts 1. This closes the Sybil-softness of
     the per-IP headcount without becoming a liveness dependency: a fleet with no signed answers degrades
     to exactly the old seeds-first headcount, while a single real validator outweighs any number of
-    seatless IPs. min_answers stays a COUNT of answers — stake weighs the verdict, never quorum liveness."""
-    answers = {}
-    count = 0
+    seatless IPs. min_answers stays a COUNT of answers — stake weighs the verdict, never quorum liveness.
+
+    `deadline` (absolute time.monotonic()) and `max_weight` (the most one answer can weigh, 1 + the seat
+    cap) only decide WHEN the round stops waiting — see fan_out / _settled. An early stop returns exactly
+    what the full round would have; a deadline stop counts the stragglers as silent."""
     # PARALLEL FAN-OUT. Serial probing cost ~1.5 s per peer, ~45 s per fresh verdict round — and the
     # emergency loop evaluates the verdict every pass, so nodes spent ~half their wall-clock parked in
     # non-producing emergency mode "evaluating" (measured 2026-08-18: 51% of an hour, 45-120 s per
-    # episode, block gaps up to 150 s fleet-wide). One slow peer now costs one timeout, not a round.
-    from concurrent.futures import ThreadPoolExecutor
-    with ThreadPoolExecutor(max_workers=min(8, max(1, len(peers)))) as ex:
-        results = list(ex.map(lambda pr: probe(pr, height), peers))
-    for r in results:
-        h, seats = (r if isinstance(r, tuple) else (r, 0))
-        if h:
-            answers[h] = answers.get(h, 0) + 1 + max(0, int(seats or 0))
-            count += 1
+    # episode, block gaps up to 150 s fleet-wide). One slow peer now costs one timeout, not a round —
+    # and, with early termination, not even that once the peers that did answer have settled it.
+    # Keyed by position: a peer listed twice is asked (and counted) twice, as it always was.
+    got = fan_out(range(len(peers)), lambda i: probe(peers[i], height), deadline=deadline,
+                  stop=lambda done, pending: _settled(*_tally(done.values()), pending, min_answers, max_weight))
+    answers, count = _tally(got.values())
     if count < int(min_answers):
         return None
     total = sum(answers.values())
@@ -141,13 +219,14 @@ def _highest_answerable(tip, floor, agrees):
     return lo
 
 
-def find_common_ancestor(our_hash_at, tip, peers, probe, floor=0, min_answers=2):
+def find_common_ancestor(our_hash_at, tip, peers, probe, floor=0, min_answers=2, deadline=None, max_weight=None):
     """Highest height in [floor, tip] where our hash equals the majority's, by binary search.
 
     Returns (ancestor, probes) with ancestor=None when the majority could not be established (peers silent
     or split) — which the caller MUST treat as "do nothing", never as a fork. If we disagree even at
     `floor`, returns floor-1 to signal "the divergence is below everything we can see", which is exactly the
-    dead-fork case."""
+    dead-fork case. `deadline` bounds the WHOLE search: once it passes every round comes back unanswered,
+    so the search ends in UNKNOWN instead of finishing late."""
     probes = 0
 
     def agrees(h, _attempts=8):
@@ -163,9 +242,12 @@ def find_common_ancestor(our_hash_at, tip, peers, probe, floor=0, min_answers=2)
         nonlocal probes
         for _ in range(max(1, int(_attempts))):
             probes += 1
-            theirs = majority_hash(h, peers, probe, min_answers=min_answers)
+            theirs = majority_hash(h, peers, probe, min_answers=min_answers, deadline=deadline,
+                                   max_weight=max_weight)
             if theirs is not None:
                 return our_hash_at(h) == theirs
+            if deadline is not None and time.monotonic() >= deadline:
+                break                            # out of time: retrying cannot help, report no majority
         return None
 
     # DISCOVER THE FLOOR. `floor` is a REQUEST, not a fact. Peers prune history, so on a pruned fleet
@@ -295,12 +377,14 @@ def classify(ancestor, tip, finalized):
     return DEAD_FORK
 
 
-def resolve(our_hash_at, tip, finalized, peers, probe, min_answers=2):
+def resolve(our_hash_at, tip, finalized, peers, probe, min_answers=2, deadline=None, max_weight=None):
     """Full verdict: {state, ancestor, tip, finalized, probes}. The caller maps state -> action:
     BEHIND/SYNCED -> ordinary forward sync (NEVER a rollback); REORG -> roll back to ancestor;
-    DEAD_FORK -> purge chain data + resync; UNKNOWN -> do nothing this pass."""
+    DEAD_FORK -> purge chain data + resync; UNKNOWN -> do nothing this pass. A verdict cut short by
+    `deadline` is UNKNOWN and carries "timed_out": True."""
     ancestor, probes = find_common_ancestor(our_hash_at, tip, peers, probe, floor=0,
-                                            min_answers=min_answers)
+                                            min_answers=min_answers, deadline=deadline,
+                                            max_weight=max_weight)
     if ancestor is None and finalized and finalized > 0:
         # RE-ANCHORED-ONTO-A-FORK RESCUE (2026-07-30, the h15076 aftermath). A node that snapshot-anchored
         # onto a minority fork holds NO block at any height it shares with the canonical chain's history —
@@ -315,11 +399,15 @@ def resolve(our_hash_at, tip, finalized, peers, probe, min_answers=2):
         # stranded_below_finality already stands on. Report ancestor as finalized-1 ("at or below the
         # floor"); the purge itself stays behind the escape's quorum/weight/unanimity gates.
         ours_f = our_hash_at(finalized)
-        theirs_f = majority_hash(finalized, peers, probe, min_answers=min_answers)
+        theirs_f = majority_hash(finalized, peers, probe, min_answers=min_answers, deadline=deadline,
+                                 max_weight=max_weight)
         probes += 1
         if ours_f is not None and theirs_f is not None and ours_f != theirs_f:
             return {"state": DEAD_FORK, "ancestor": finalized - 1,
                     "tip": tip, "finalized": finalized, "probes": probes,
                     "via": "finalized-height disagreement (ancestor unlocatable)"}
-    return {"state": classify(ancestor, tip, finalized), "ancestor": ancestor,
-            "tip": tip, "finalized": finalized, "probes": probes}
+    verdict = {"state": classify(ancestor, tip, finalized), "ancestor": ancestor,
+               "tip": tip, "finalized": finalized, "probes": probes}
+    if ancestor is None and deadline is not None and time.monotonic() >= deadline:
+        verdict["timed_out"] = True
+    return verdict
@@ -2,8 +2,8 @@
 Schemaless key-value index for NADO (LMDB / MDBX data model), replacing the SQLite index.
 
 Per doc/storage-kv-migration.md: ONE memory-mapped, ACID, single-writer LMDB env with named
-sub-DBs. Account/state records are *schemaless codec documents* (ops/codec.py JSON — no columns, no
-DDL) so adding a field needs no migration. This module encapsulates ALL key-encoding (8-byte
+sub-DBs. Account/state records are *schemaless codec documents* (ops/codec.py binary storage codec,
+legacy rows JSON; the state root always sees the canonical JSON — no columns, no DDL) so adding a field needs no migration. This module encapsulates ALL key-encoding (8-byte
 big-endian ints) and value (de)serialization (the codec) so call-sites never touch raw bytes.
 
 ATOMICITY: a whole block mutation (account docs + tx index + block index + totals + heartbeats)
@@ -28,6 +28,8 @@ import threading
 
 import lmdb
 from ops import codec
+from ops import account_columns
+from ops import state_tree
 
 from .data_ops import get_home
 
@@ -52,7 +54,7 @@ MAP_SIZE = 16 * 1024 * 1024 * 1024
 #   commits           "sender|target_epoch"    -> commitment                                   (RANDAO #7)
 #   reveals           target_epoch(8B BE)      -> secret                            [DUPSORT]  (RANDAO #7)
 #   unbonds           address                  -> msgpack({amount, release_block})         (unbond delay)
-_PLAIN_DBS = ("accounts", "totals", "block_by_num", "block_by_hash", "tx", "meta", "commits", "unbonds", "hb_revert", "aliases", "htlcs", "bond_since", "bond_since_revert", "treasury_proposals", "msgkey_revert", "pubkey_revert", "block_loc", "gc_revert", "execsum_revert", "attest_memo")
+_PLAIN_DBS = ("accounts", "totals", "block_by_num", "block_by_hash", "tx", "meta", "commits", "unbonds", "hb_revert", "aliases", "htlcs", "bond_since", "bond_since_revert", "treasury_proposals", "msgkey_revert", "pubkey_revert", "block_loc", "gc_revert", "execsum_revert", "attest_memo", "fid_ledger")
 _DUP_DBS = ("tx_by_sender", "tx_by_recipient", "attestations", "reveals", "settlements", "recerts", "recert_by_epoch", "treasury_votes")
 
 # CONSENSUS STATE a snapshot carries: every sub-DB EXCEPT the block-body + tx HISTORY (explorer-only,
@@ -85,8 +87,10 @@ _HISTORY_DBS = frozenset(("tx", "tx_by_sender", "tx_by_recipient"))
 #               rollback ever reads are for the (finalized, tip] reorg window, all ABOVE C, which the normal
 #               C+1..tip tail replay rebuilds byte-for-byte as it re-incorporates each block. wipe_non_carried_dbs
 #               (all-DBs - SNAPSHOT_DBS) clears any stale residue on re-anchor. So they belong here, not in the root.
+#   fid_ledger — the dividend FIDELITY LEDGER (ops/dividend_ops.py): a derived index of the recert rows,
+#               recomputable from them at any time, so it is rebuilt locally rather than carried
 _LOCAL_DBS = frozenset(("block_loc", "gc_revert", "bond_since_revert", "hb_revert", "msgkey_revert",
-                        "pubkey_revert", "execsum_revert", "attest_memo"))
+                        "pubkey_revert", "execsum_revert", "attest_memo", "fid_ledger"))
 SNAPSHOT_DBS = tuple(sorted(set(_PLAIN_DBS + _DUP_DBS) - _HISTORY_DBS - _LOCAL_DBS))
 
 # account doc fields that default to 0 when missing on read (schemaless: extra fields pass through).
@@ -99,6 +103,7 @@ _TOTALS_KEY = b"totals"
 # in a parallel dict (the lmdb Environment is a C type that rejects arbitrary attributes).
 _envs = {}
 _dbhandles = {}
+_dbnames = {}          # env path -> {sub-DB handle: name} for SNAPSHOT_DBS (state-root write tracking)
 _envs_lock = threading.Lock()
 
 # per-thread active write transaction (set by write_txn()). When present, every helper reads AND
@@ -142,6 +147,124 @@ def _bump_write_gen():
         _write_gen += 1
 
 
+# COMMIT LOCK + ACCOUNT WRITE SET. Every commit runs txn.commit() -> generation bump -> hand the txn's account
+# write set to the columnar mirror (ops/account_columns.py) inside ONE critical section, so the mirror sees
+# commits in commit order and a mirror tagged with generation G is exactly the committed accounts at G.
+# The write set is recorded per write txn in _local (acct_w: address -> normalized doc or None=deleted) by
+# _acct_put/_acct_del — EVERY account mutation in this module goes through those two. A bulk rewrite that
+# bypasses them (restore_snapshot_state drops the sub-DB) flags acct_full, which drops the mirror instead.
+_commit_lock = account_columns.LOCK
+
+
+def _track_begin():
+    _local.acct_w, _local.acct_full = {}, False
+
+
+def _acct_put(txn, address: str, doc: dict):
+    """Write one (already _normalize'd) account doc and record it in the txn's account write set."""
+    txn.put(address.encode(), _pack(doc), db=_dbs()["accounts"])
+    w = getattr(_local, "acct_w", None)
+    if w is not None:
+        w[address] = doc
+    else:
+        _local.acct_full = True                      # untracked context: never let the mirror go stale
+
+
+def _acct_del(txn, address: str) -> bool:
+    """Delete one account row and record the delete in the txn's account write set."""
+    existed = txn.delete(address.encode(), db=_dbs()["accounts"])
+    w = getattr(_local, "acct_w", None)
+    if w is not None:
+        w[address] = None
+    else:
+        _local.acct_full = True
+    return existed
+
+
+# STATE-ROOT WRITE SET. The incremental state root (ops/state_tree.py) needs every SNAPSHOT_DBS (db, key) a
+# commit touched, whichever helper touched it — so instead of instrumenting ~80 put/delete sites the write
+# txn itself is wrapped in a _TrackedTxn that records them (put/delete/drop only; reads and cursors are the
+# raw txn's own bound methods, no per-read overhead). Only wrapped when a tree EXISTS for the env at begin;
+# an unwrapped commit reports root_full, which drops any tree built meanwhile. No cursor in this module
+# writes a snapshot DB (the only cursor delete is gc_revert, node-local) — keep it that way, or track it.
+
+class _TrackedTxn:
+    """An lmdb write txn that remembers which consensus-state keys were written (see above)."""
+
+    def __init__(self, txn, names):
+        self._txn, self._names = txn, names
+        self.touched, self.full = set(), False
+        self.get, self.cursor, self.commit, self.abort = txn.get, txn.cursor, txn.commit, txn.abort
+
+    def put(self, key, value, db=None, **kw):
+        name = self._names.get(db)
+        if name is not None:
+            self.touched.add((name, bytes(key)))
+        return self._txn.put(key, value, db=db, **kw)
+
+    def delete(self, key, value=b"", db=None):
+        name = self._names.get(db)
+        if name is not None:
+            self.touched.add((name, bytes(key)))
+        return self._txn.delete(key, value, db=db)
+
+    def drop(self, db, delete=True):
+        if db in self._names:
+            self.full = True
+        return self._txn.drop(db, delete=delete)
+
+    def __getattr__(self, attr):
+        return getattr(self._txn, attr)
+
+
+def _begin_write():
+    """env.begin(write=True), wrapped for state-root tracking when this env has an incremental tree."""
+    txn = get_env().begin(write=True)
+    path = env_path()
+    if state_tree.wanted(path):
+        return _TrackedTxn(txn, _dbnames[path])
+    return txn
+
+
+def _root_changes(txn):
+    """{(db, key): [canonical triples]} — the FINAL committed form (exactly what read_state would yield) of
+    every key the tracked txn touched, read inside the txn just before it commits; None when the commit
+    can't be tracked (untracked txn, or a sub-DB was dropped)."""
+    if not isinstance(txn, _TrackedTxn) or txn.full:
+        return None
+    dbs, canonical, out = _dbs(), codec.canonical, {}
+    for name, key in txn.touched:
+        if name in _DUP_DBS:
+            rows = []
+            with txn.cursor(db=dbs[name]) as cur:
+                if cur.set_key(key):
+                    rows = [(name, key, bytes(v)) for v in cur.iternext_dup()]
+        else:
+            v = txn.get(key, db=dbs[name])
+            if v is None or (name == "accounts" and account_value_is_default(v)):
+                rows = []
+            else:
+                rows = [(name, key, canonical(bytes(v)))]
+        out[(name, key)] = rows
+    return out
+
+
+def _commit(txn):
+    """Commit a write txn, bump the generation and advance the account mirror and the incremental state
+    root — atomically w.r.t. every other commit (see _commit_lock). Raises (no bump, mirror/tree untouched)
+    if the commit itself fails."""
+    changes, full = getattr(_local, "acct_w", None) or {}, getattr(_local, "acct_full", False)
+    _local.acct_w, _local.acct_full = None, False
+    root_changes = _root_changes(txn)
+    with _commit_lock:
+        gen_before = _write_gen
+        txn.commit()
+        _bump_write_gen()
+        account_columns.apply_commit(env_path(), changes, full, gen_before, _write_gen)
+        state_tree.apply_commit(env_path(), root_changes or {}, full or root_changes is None,
+                                gen_before, _write_gen)
+
+
 def write_generation() -> int:
     """Monotonic committed-state version (see _write_gen). Cheap cache key for derived reads."""
     return _write_gen
@@ -173,7 +296,7 @@ def get_env(home=None):
         env = lmdb.open(
             path,
             map_size=MAP_SIZE,
-            max_dbs=32,          # headroom over the named sub-DBs (_PLAIN_DBS + _DUP_DBS, now 17)
+            max_dbs=32,          # headroom over the named sub-DBs (_PLAIN_DBS + _DUP_DBS, now 29)
             subdir=True,
             readahead=False,     # random point lookups dominate
             writemap=False,      # safe: a full map raises MapFullError (no corruption), per spec
@@ -189,6 +312,7 @@ def get_env(home=None):
         for name in _DUP_DBS:
             dbs[name] = env.open_db(name.encode(), dupsort=True)
         _dbhandles[path] = dbs
+        _dbnames[path] = {dbs[name]: name for name in SNAPSHOT_DBS}
         _envs[path] = env
         return env
 
@@ -213,6 +337,7 @@ def close_all():
                 pass
         _envs.clear()
         _dbhandles.clear()
+        _dbnames.clear()
 
 
 # --- key / value encoding (the ONLY place that touches raw bytes) ---------------------------------
@@ -240,13 +365,15 @@ def _split_dup_tx_value(v: bytes):
 
 def _pack(doc) -> bytes:
     """codec-encode a stored value (same content always yields the same bytes, which
-    revert-symmetry and the state root depend on)."""
-    return codec.pack(doc)
+    revert-symmetry depends on). Binary storage codec (codec.pack_storage) — the state root never sees
+    these bytes directly: snapshot_ops.read_state re-renders them to the canonical JSON via codec.canonical."""
+    return codec.pack_storage(doc)
 
 
 def _unpack(raw: bytes):
-    """Decode codec bytes written by _pack."""
-    return codec.unpack(raw)
+    """Decode bytes written by _pack — binary, or a legacy/snapshot-restored JSON row (lazy migration: the
+    row turns binary on its next write)."""
+    return codec.unpack_stored(raw)
 
 
 # --- transaction plumbing -------------------------------------------------------------------------
@@ -268,11 +395,12 @@ class _WriteTxn:
         disk needs attention."""
         depth = getattr(_local, "wdepth", 0)
         if depth == 0:
+            _track_begin()
             try:
-                _local.wtxn = get_env().begin(write=True)
+                _local.wtxn = _begin_write()
             except lmdb.MapFullError:
                 _grow_map()
-                _local.wtxn = get_env().begin(write=True)
+                _local.wtxn = _begin_write()
         _local.wdepth = depth + 1
         return _local.wtxn
 
@@ -289,7 +417,7 @@ class _WriteTxn:
             _local.wtxn = None
             if exc_type is None:
                 try:
-                    txn.commit()
+                    _commit(txn)
                 except lmdb.MapFullError:
                     try:
                         txn.abort()
@@ -297,8 +425,8 @@ class _WriteTxn:
                         pass
                     _grow_map()
                     raise
-                _bump_write_gen()
             else:
+                _local.acct_w, _local.acct_full = None, False
                 txn.abort()
         return False  # never suppress
 
@@ -325,9 +453,15 @@ def _write(fn):
     active = getattr(_local, "wtxn", None)
     if active is not None:
         return fn(active)
-    with get_env().begin(write=True) as txn:
+    _track_begin()
+    txn = _begin_write()
+    try:
         result = fn(txn)
-    _bump_write_gen()
+    except BaseException:
+        _local.acct_w, _local.acct_full = None, False
+        txn.abort()
+        raise
+    _commit(txn)
     return result
 
 
@@ -389,7 +523,7 @@ def account_value_is_default(value: bytes) -> bool:
 def put_account(address: str, fields: dict):
     """Create-or-replace an account doc (used by create_account / snapshot import / reindex)."""
     def _do(txn):
-        txn.put(address.encode(), _pack(_normalize(fields)), db=_dbs()["accounts"])
+        _acct_put(txn, address, _normalize(fields))
     _write(_do)
 
 
@@ -397,7 +531,7 @@ def create_account_if_absent(address: str, **fields):
     """INSERT-OR-IGNORE: write the doc only if the address has no row yet (idempotent seeding)."""
     def _do(txn):
         if txn.get(address.encode(), db=_dbs()["accounts"]) is None:
-            txn.put(address.encode(), _pack(_normalize(fields)), db=_dbs()["accounts"])
+            _acct_put(txn, address, _normalize(fields))
     _write(_do)
 
 
@@ -412,7 +546,7 @@ def account_adjust(address: str, field: str, delta: int, floor_zero: bool = True
         if floor_zero and new_val < 0:
             return False
         body[field] = new_val
-        txn.put(address.encode(), _pack(_normalize(body)), db=_dbs()["accounts"])
+        _acct_put(txn, address, _normalize(body))
         return True
     return _write(_do)
 
@@ -423,7 +557,7 @@ def account_set(address: str, field: str, value: int):
     def _do(txn):
         body = _get_body(txn, address) or {}
         body[field] = int(value)
-        txn.put(address.encode(), _pack(_normalize(body)), db=_dbs()["accounts"])
+        _acct_put(txn, address, _normalize(body))
     _write(_do)
 
 
@@ -433,7 +567,7 @@ def account_set_field(address: str, field: str, value):
     def _do(txn):
         body = _get_body(txn, address) or {}
         body[field] = value
-        txn.put(address.encode(), _pack(_normalize(body)), db=_dbs()["accounts"])
+        _acct_put(txn, address, _normalize(body))
     _write(_do)
 
 
@@ -444,7 +578,7 @@ def account_del_field(address: str, field: str):
         body = _get_body(txn, address)
         if body is not None and field in body:
             del body[field]
-            txn.put(address.encode(), _pack(_normalize(body)), db=_dbs()["accounts"])
+            _acct_put(txn, address, _normalize(body))
     _write(_do)
 
 
@@ -1014,6 +1148,72 @@ def backfill_recert_by_epoch() -> int:
     return _write(_do)
 
 
+# --- dividend FIDELITY LEDGER (node-local, ops/dividend_ops.py): be8(epoch)||address -> be8(fidelity) ------
+# One row per recert row: the raw fidelity the recert left its address at, by the fidelity_at_epoch ramp.
+# Keyed epoch-first so the rows of a lease window are ONE contiguous range — weights_at_epoch reads the
+# window instead of replaying every present address's whole recert history.
+
+def fid_ledger_put(epoch: int, address: str, fidelity: int):
+    """Record the fidelity `address` reached with its recert at `epoch` (apply_register, in the block txn)."""
+    def _do(txn):
+        txn.put(be8(int(epoch)) + address.encode(), be8(int(fidelity)), db=_dbs()["fid_ledger"])
+    _write(_do)
+
+
+def fid_ledger_get(epoch: int, address: str):
+    """The ledgered fidelity of `address`'s recert at `epoch`, or None (no row: pre-ledger / healed later)."""
+    def _do(txn):
+        raw = txn.get(be8(int(epoch)) + address.encode(), db=_dbs()["fid_ledger"])
+        return None if raw is None else un_be8(raw)
+    return _read(_do)
+
+
+def fid_ledger_del(epoch: int, address: str):
+    """Revert fid_ledger_put exactly (rollback of the register that wrote it)."""
+    def _do(txn):
+        txn.delete(be8(int(epoch)) + address.encode(), db=_dbs()["fid_ledger"])
+    _write(_do)
+
+
+def fid_ledger_window(lo_epoch: int, hi_epoch: int):
+    """One range read over ledger rows with epoch in [lo_epoch, hi_epoch]: returns ({address: fidelity of its
+    LATEST row in the window}, number of rows read). Rows come in epoch order, so a later recert simply
+    overwrites an earlier one."""
+    if hi_epoch < lo_epoch:
+        return {}, 0
+    lo = max(0, lo_epoch)
+    def _do(txn):
+        latest, n = {}, 0
+        with txn.cursor(db=_dbs()["fid_ledger"]) as cur:
+            if cur.set_range(be8(lo)):
+                for k, v in cur.iternext(keys=True, values=True):
+                    if un_be8(k[:8]) > hi_epoch:
+                        break
+                    latest[bytes(k[8:]).decode()] = un_be8(v)
+                    n += 1
+        return latest, n
+    return _read(_do)
+
+
+def recert_window_rows(lo_epoch: int, hi_epoch: int) -> list:
+    """Every (epoch, address) recert row with epoch in [lo_epoch, hi_epoch], ascending (the ledger heal
+    enumerates exactly the rows the window should hold)."""
+    if hi_epoch < lo_epoch:
+        return []
+    lo = max(0, lo_epoch)
+    def _do(txn):
+        out = []
+        with txn.cursor(db=_dbs()["recert_by_epoch"]) as cur:
+            if cur.set_range(be8(lo)):
+                for k, v in cur.iternext(keys=True, values=True):
+                    e = un_be8(k)
+                    if e > hi_epoch:
+                        break
+                    out.append((e, v.decode()))
+        return out
+    return _read(_do)
+
+
 def recert_latest(address: str) -> int:
     """The most recent recert epoch for `address` (DUPSORT values sort ascending, so the last dup is the
     max), or -1 if none. Used for the presence-lease eligibility check + revert (clear `registered` if
@@ -1919,19 +2119,45 @@ def iter_db_pairs(name):
                 yield bytes(k), bytes(v)
 
 
-def all_db_pairs(names):
+def all_db_pairs(names, txn=None):
     """Yield (db_name, key_bytes, value_bytes) across every sub-DB in `names` within ONE read txn — a single
     MVCC snapshot. read_state() must use this rather than a per-sub-DB iter_db_pairs: a fresh txn per sub-DB
     lets a block commit land BETWEEN two sub-DBs, tearing the state (e.g. accounts@N + totals@N+1) so the
     merkle root corresponds to no committed height — which surfaced as spurious /state_health root mismatches
     when l1_state_root() runs on an HTTP worker thread while the core loop commits. LMDB read txns are
     snapshot-isolated, so one begin() sees a consistent view for the whole walk."""
+    if txn is not None:                            # the caller's read_view() snapshot (see there)
+        yield from _db_pairs(txn, names)
+        return
     env = get_env()
     with env.begin() as txn:
-        for name in names:
-            with txn.cursor(db=_dbs()[name]) as cur:
-                for k, v in cur:
-                    yield name, bytes(k), bytes(v)
+        yield from _db_pairs(txn, names)
+
+
+def _db_pairs(txn, names):
+    for name in names:
+        with txn.cursor(db=_dbs()[name]) as cur:
+            for k, v in cur:
+                yield name, bytes(k), bytes(v)
+
+
+def read_view():
+    """A read-only MVCC snapshot (`with read_view() as txn:`) for callers that need SEVERAL walks to see the
+    same committed state — the streaming snapshot build reads the epochw:<E> range (the root's retention
+    floor) and then streams every sub-DB, and both must describe one height. Pass it as all_db_pairs(txn=)
+    / prefix_pairs(txn=)."""
+    return get_env().begin(write=False)
+
+
+def prefix_pairs(name, prefix: bytes, txn):
+    """Yield every (key_bytes, value_bytes) of sub-DB `name` whose key starts with `prefix`, in key order."""
+    with txn.cursor(db=_dbs()[name]) as cur:
+        if not cur.set_range(prefix):
+            return
+        for k, v in cur:
+            if not bytes(k).startswith(prefix):
+                break
+            yield bytes(k), bytes(v)
 
 
 def restore_snapshot_state(triples, txn=None):
@@ -1939,8 +2165,12 @@ def restore_snapshot_state(triples, txn=None):
     snapshot-import primitive. DUPSORT dbs get dupdata puts. Runs inside the caller's write txn (atomic)."""
     dup = set(_DUP_DBS)
     def _do(t):
+        _local.acct_full = True                    # bulk rewrite of `accounts`: the mirror rebuilds
         for name in SNAPSHOT_DBS:
             t.drop(_dbs()[name], delete=False)     # empty, keep the handle
+        # the fidelity ledger indexes the recert rows being replaced — drop it with them (it heals from
+        # the new rows; a stale ledger could otherwise pass the completeness check by row count alone)
+        t.drop(_dbs()["fid_ledger"], delete=False)
         for name, key, value in triples:
             t.put(key, value, db=_dbs()[name], dupdata=(name in dup))
     if txn is not None:
@@ -2036,14 +2266,14 @@ def account_raw_get(address: str):
 def account_raw_put(address: str, body: dict):
     """Restore a GC'd account doc byte-identically (gc revert path)."""
     def _do(txn):
-        txn.put(address.encode(), _pack(_normalize(body)), db=_dbs()["accounts"])
+        _acct_put(txn, address, _normalize(body))
     _write(_do)
 
 
 def account_del(address: str) -> bool:
     """Delete an account doc (idle-GC apply path; joins the block's write txn). True if it existed."""
     def _do(txn):
-        return txn.delete(address.encode(), db=_dbs()["accounts"])
+        return _acct_del(txn, address)
     return _write(_do)
 
 
@@ -2073,6 +2303,7 @@ def recert_bucket_del(epoch: int) -> list:
         for addr in pairs:
             txn.delete(addr.encode(), be8(int(epoch)), db=_dbs()["recerts"])
             txn.delete(be8(int(epoch)), addr.encode(), db=_dbs()["recert_by_epoch"])
+            txn.delete(be8(int(epoch)) + addr.encode(), db=_dbs()["fid_ledger"])   # node-local, not reverted
         return [(addr, int(epoch)) for addr in pairs]
     return _write(_do)
 
@@ -0,0 +1,379 @@
+"""Transaction mempool: the indexed store behind MemServer.transaction_pool.
+
+The pool used to be one plain list under one RLock (memserver.mempool_lock), and every operation on it
+was O(pool): admission scanned it for the sender's earlier spends (validate_single_spending) and for the
+user-origin duplicate gates, purge_txs_of_sender / the included-tx eviction / the per-pass expiry and cull
+each REBUILT it, and every rebuild bumped pool_gen, which threw away the txid set and re-sorted and
+re-serialized the whole pool for get_transaction_pool_hash. At the 150k-tx cap that made each admission and
+each eviction cost a full pass over the pool, on the HTTP executor threads and the core loop alike.
+
+This keeps the same contents under indexes sized to the operations:
+
+  * txid -> tx, in arrival order (the order the list always had — _candidate_pool's spending ledger
+    depends on it);
+  * per-sender queues (sender -> {txid: tx}) — admission's spend check and duplicate gates read one
+    sender's txs, never the pool;
+  * a recipient refcount — "is this sender's funder pooled" (reject_cooldown_s) without a scan;
+  * a (max_block, min_block, txid) expiry heap and a max_block horizon heap — expiry pops what expired
+    instead of filtering everything;
+  * a running byte total over each tx's CANONICAL encoding (hashing.canonical_bytes), replacing the
+    get_byte_size repr estimates: computed once per tx, deterministic, and what the peer wire carries;
+  * the pool digest as an order-independent MULTISET ACCUMULATOR: each tx contributes a 512-bit leaf
+    (blake2b of its canonical bytes, computed once at insert) and the pool's value is the leaf sum mod
+    2**512, so an insert or drop is one addition — no sort, no re-serialization, nothing proportional to
+    the pool. Equal tx sets give equal digests in any arrival order, which is all the pool-hash vote needs;
+  * the UPCOMING set (the txs the next block would carry, see upcoming_digest) kept the same way, per
+    target height and committed-write generation;
+  * an IBLT sketch of the txids (ops/pool_sketch.py), toggled per insert/drop, served on
+    /transaction_ids?sketch= so peers diff pools in O(difference) instead of exchanging id lists.
+
+LOCKING. Admission locks the SENDER's stripe (hash(sender) % stripes) across "spend check + insert", so two
+same-sender txs can no longer both pass the balance check against a pool that holds neither — which the
+list version allowed, since it checked outside the lock. Structural updates take `lock`, held only for O(1)
+/ O(log n) work per tx. Lock order is stripe -> lock, never the reverse.
+
+transaction_pool (the list view) stays for the API and the loops' readers: snapshot() is a read-only list
+built once per change (gen), so a handler that dumps it or a loop that iterates a .copy() keeps working and
+cannot mutate the pool behind the indexes.
+"""
+import heapq
+import threading
+from hashlib import blake2b
+
+from hashing import canonical_bytes
+from ops import kv_ops
+from ops.block_ops import lands_at
+from ops.pool_ops import FEE_EXEMPT_RECIPIENTS
+from ops.transaction_ops import reserved_uniqueness_keys, dedupe_reserved, cap_block_blobs
+from ops.pool_sketch import PoolSketch
+
+# sender lock stripes. Same-sender admissions serialize on one; different senders almost never share.
+MEMPOOL_LOCK_STRIPES = 64
+# the accumulator's modulus: leaves are 512-bit, so the sum is a 512-bit multiset hash (AdHash). A 256-bit
+# sum would be in reach of a generalized-birthday search over crafted tx sets; 512 bits is not.
+_ACC_BITS = 512
+_ACC_MASK = (1 << _ACC_BITS) - 1
+
+
+def _leaf(raw) -> int:
+    """A tx's accumulator leaf: blake2b-512 of its canonical bytes."""
+    return int.from_bytes(blake2b(raw, digest_size=_ACC_BITS // 8).digest(), "big")
+
+
+def multiset_digest(count, acc, person=b"nado-pool") -> str:
+    """The 32-byte hex digest of an accumulated multiset (`count` members summing to `acc`)."""
+    return blake2b(count.to_bytes(8, "big") + acc.to_bytes(_ACC_BITS // 8, "big"),
+                   digest_size=32, person=person).hexdigest()
+
+
+def _special(tx) -> bool:
+    """Whether `tx` takes part in a SET-level rule of block assembly (dedupe_reserved: it occupies a
+    reserved uniqueness key; cap_block_blobs: it is a blob). Every other matched tx is in the block iff it
+    matches on its own."""
+    return tx.get("recipient") == "blob" or bool(reserved_uniqueness_keys(tx))
+
+
+class PoolView(list):
+    """A read-only snapshot of the pool (arrival order). Reading, copying, slicing and `+` work as on a
+    list; any in-place mutation raises — mutate through MemServer.mempool."""
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("the mempool snapshot is read-only — mutate through MemServer.mempool")
+
+    append = extend = insert = remove = pop = clear = sort = reverse = _read_only
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+
+
+class Mempool:
+    """The indexed mempool (see the module docstring). Every method is thread-safe."""
+
+    def __init__(self, stripes=MEMPOOL_LOCK_STRIPES):
+        self.lock = threading.RLock()
+        self._stripes = [threading.RLock() for _ in range(max(1, int(stripes)))]
+        self._by_id = {}            # txid -> tx, arrival order
+        self._by_sender = {}        # sender -> {txid: tx}, arrival order
+        self._recipients = {}       # recipient -> pooled txs paying it
+        self._size = {}             # txid -> len(canonical_bytes(tx))
+        self._leaf = {}             # txid -> accumulator leaf
+        self._acc = 0               # sum of the leaves mod 2**512
+        self._sketch = PoolSketch() # IBLT of the txids
+        self._expiry = []           # heap (max_block, min_block, txid); stale entries skipped on pop
+        self._horizon = []          # heap (-max_block, txid); stale entries skipped on pop
+        self._bytes = 0
+        self.gen = 0                # bumped on every change — the key of every pool-derived cache
+        self._view = None           # (gen, PoolView)
+        self._folds = {}            # log2 -> (gen, folded PoolSketch)
+        self._wire = {}             # log2 -> (gen, its wire bytes)
+        # the upcoming set for one (height, write generation): plain members summed into _up_acc, members
+        # under a set-level rule (_special) kept whole for dedupe_reserved / cap_block_blobs
+        self._up_key = None
+        self._up_acc = self._up_n = 0
+        self._up_plain = set()
+        self._up_special = {}
+        self._up_cut = None         # (acc, n) of the special members that survive the set rules; False
+                                    # when those rules raise (the match's own error -> empty block)
+
+    # --- reads ---------------------------------------------------------------------------------------
+    def __len__(self):
+        return len(self._by_id)
+
+    def __contains__(self, txid):
+        return txid in self._by_id
+
+    def get(self, txid):
+        return self._by_id.get(txid)
+
+    @property
+    def byte_size(self):
+        """Running total of the pooled txs' canonical byte sizes."""
+        return self._bytes
+
+    def ids(self) -> list:
+        """Pooled txids, arrival order."""
+        with self.lock:
+            return list(self._by_id)
+
+    def of_sender(self, sender) -> list:
+        """`sender`'s pooled txs, arrival order."""
+        with self.lock:
+            return list(self._by_sender.get(sender, {}).values())
+
+    def has_recipient(self, recipient) -> bool:
+        """Whether any pooled tx pays `recipient`."""
+        return self._recipients.get(recipient, 0) > 0
+
+    def snapshot(self) -> PoolView:
+        """The whole pool as a read-only list, rebuilt once per change."""
+        view = self._view
+        if view is not None and view[0] == self.gen:
+            return view[1]
+        with self.lock:
+            view = self._view = (self.gen, PoolView(self._by_id.values()))
+            return view[1]
+
+    def pool_hash(self):
+        """The pool's multiset digest (see the module docstring), or None when empty. O(1): the
+        accumulator is kept per insert/drop."""
+        with self.lock:
+            return multiset_digest(len(self._by_id), self._acc) if self._by_id else None
+
+    def sketch_table(self, log2) -> PoolSketch:
+        """The txid IBLT folded to 2**log2 cells per subtable (ops/pool_sketch) — ours, to serve or to
+        subtract a peer's from. Cached per gen and size, so every peer in one pass shares one fold;
+        callers must not mutate it (subtract returns a new table)."""
+        cached = self._folds.get(log2)
+        if cached is not None and cached[0] == self.gen:
+            return cached[1]
+        with self.lock:
+            gen = self.gen
+            folded = self._sketch.fold(log2)
+        self._folds[log2] = (gen, folded)
+        return folded
+
+    def sketch(self, log2) -> bytes:
+        """sketch_table(log2) in its wire form, for /transaction_ids?sketch=."""
+        cached = self._wire.get(log2)
+        if cached is not None and cached[0] == self.gen:
+            return cached[1]
+        gen, n = self.gen, len(self._by_id)
+        wire = self.sketch_table(log2).to_bytes(n)
+        self._wire[log2] = (gen, wire)
+        return wire
+
+    def upcoming_digest(self, height) -> str:
+        """Multiset digest of the txs block `height` would carry if assembled from this pool now — the
+        set match_transactions_target selects (per-tx landing rule, not already mined, then
+        dedupe_reserved and cap_block_blobs). Kept incrementally per (height, committed-write
+        generation): a tip move or a commit rebuilds it once; between those, each insert/drop costs its
+        own tx. The set rules only ever relate reserved-key / blob txs to each other, so they re-run over
+        those few members, never over the pool."""
+        key = (height, kv_ops.write_generation())
+        with self.lock:
+            if self._up_key != key:
+                self._up_key = key
+                self._up_acc = self._up_n = 0
+                self._up_plain, self._up_special, self._up_cut = set(), {}, None
+                for txid, tx in self._by_id.items():
+                    self._up_consider(txid, tx)
+            if self._up_cut is None:
+                try:
+                    kept = cap_block_blobs(dedupe_reserved(list(self._up_special.values())))
+                    self._up_cut = (sum(self._leaf[t["txid"]] for t in kept) & _ACC_MASK, len(kept))
+                except Exception:
+                    self._up_cut = False             # the match errors out -> an empty block, as before
+            if self._up_cut is False:
+                return multiset_digest(0, 0, person=b"nado-upcoming")
+            acc = (self._up_acc + self._up_cut[0]) & _ACC_MASK
+            return multiset_digest(self._up_n + self._up_cut[1], acc, person=b"nado-upcoming")
+
+    # --- writes --------------------------------------------------------------------------------------
+    def _stripe(self, sender):
+        return self._stripes[hash(sender) % len(self._stripes)]
+
+    def _up_consider(self, txid, tx):
+        """Add a pooled tx to the upcoming set if block _up_key[0] would match it. Caller holds `lock`."""
+        try:
+            if not lands_at(tx, self._up_key[0]) or kv_ops.tx_get(txid) is not None:
+                return
+            special = _special(tx)
+        except Exception:
+            return                                   # malformed: the match skips it too
+        if special:
+            self._up_special[txid] = tx
+            self._up_cut = None
+        else:
+            self._up_plain.add(txid)
+            self._up_acc = (self._up_acc + self._leaf[txid]) & _ACC_MASK
+            self._up_n += 1
+
+    def _insert(self, tx, txid, size, leaf):
+        """Index one tx (`size` / `leaf` from its canonical bytes). Caller holds `lock` and has checked
+        txid is absent."""
+        sender = tx.get("sender")
+        self._by_id[txid] = tx
+        self._by_sender.setdefault(sender, {})[txid] = tx
+        recipient = tx.get("recipient")
+        self._recipients[recipient] = self._recipients.get(recipient, 0) + 1
+        self._size[txid] = size
+        self._bytes += size
+        self._leaf[txid] = leaf
+        self._acc = (self._acc + leaf) & _ACC_MASK
+        self._sketch.toggle(txid, 1)
+        if self._up_key is not None:
+            self._up_consider(txid, tx)
+        max_block = tx.get("max_block", 0)
+        max_block = max_block if isinstance(max_block, int) else 0
+        min_block = tx.get("min_block", 0)
+        min_block = min_block if isinstance(min_block, int) else 0
+        heapq.heappush(self._expiry, (max_block, min_block, txid))
+        heapq.heappush(self._horizon, (-max_block, txid))
+        self.gen += 1
+
+    def _drop(self, txid):
+        """Unindex one tx (heap entries go stale and are skipped later). Caller holds `lock`."""
+        tx = self._by_id.pop(txid, None)
+        if tx is None:
+            return None
+        sender = tx.get("sender")
+        queue = self._by_sender.get(sender)
+        if queue is not None:
+            queue.pop(txid, None)
+            if not queue:
+                del self._by_sender[sender]
+        recipient = tx.get("recipient")
+        left = self._recipients.get(recipient, 0) - 1
+        if left > 0:
+            self._recipients[recipient] = left
+        else:
+            self._recipients.pop(recipient, None)
+        self._bytes -= self._size.pop(txid, 0)
+        leaf = self._leaf.pop(txid, 0)
+        self._acc = (self._acc - leaf) & _ACC_MASK
+        self._sketch.toggle(txid, -1)
+        if txid in self._up_plain:
+            self._up_plain.discard(txid)
+            self._up_acc = (self._up_acc - leaf) & _ACC_MASK
+            self._up_n -= 1
+        elif self._up_special.pop(txid, None) is not None:
+            self._up_cut = None
+        self.gen += 1
+        return tx
+
+    def add(self, tx, check=None) -> bool:
+        """Pool `tx` unless its txid is already pooled. `check(sender_queue)` — e.g. the spend check —
+        runs under the sender's stripe lock right before the insert, so it sees every earlier
+        same-sender tx; if it raises, nothing is pooled and the exception propagates. Returns whether the
+        tx was added. A tx without a string txid is never poolable."""
+        txid = tx.get("txid") if isinstance(tx, dict) else None
+        if not isinstance(txid, str):
+            return False
+        sender = tx.get("sender")
+        with self._stripe(sender):
+            if txid in self._by_id:
+                return False
+            if check is not None:
+                check(self.of_sender(sender))
+            raw = canonical_bytes(tx)                # serialize + hash outside the structural lock
+            leaf = _leaf(raw)
+            with self.lock:
+                if txid in self._by_id:
+                    return False
+                self._insert(tx, txid, len(raw), leaf)
+                return True
+
+    def discard_ids(self, txids) -> int:
+        """Drop every pooled tx in `txids`; returns how many were pooled."""
+        with self.lock:
+            return sum(self._drop(t) is not None for t in txids if t in self._by_id)
+
+    def purge_sender(self, sender) -> int:
+        """Drop all of `sender`'s pooled txs; returns how many."""
+        with self._stripe(sender):
+            with self.lock:
+                return sum(self._drop(t) is not None for t in list(self._by_sender.get(sender, {})))
+
+    def evict_outdated(self, tip, window=None) -> int:
+        """Drop txs that can no longer land: max_block <= tip, and — with `window` — max_block >=
+        tip + window (beyond the landing window, e.g. after a rollback lowered the tip). Pops the heaps,
+        so it costs the expired txs, not the pool."""
+        dropped = 0
+        with self.lock:
+            while self._expiry and self._expiry[0][0] <= tip:
+                _max, _min, txid = heapq.heappop(self._expiry)
+                tx = self._by_id.get(txid)
+                if tx is not None and tx.get("max_block", 0) == _max:
+                    self._drop(txid)
+                    dropped += 1
+            if window is not None:
+                while self._horizon and -self._horizon[0][0] >= tip + window:
+                    neg, txid = heapq.heappop(self._horizon)
+                    tx = self._by_id.get(txid)
+                    if tx is not None and tx.get("max_block", 0) == -neg:
+                        self._drop(txid)
+                        dropped += 1
+            self._compact_heaps()
+        return dropped
+
+    def _compact_heaps(self):
+        """Rebuild a heap once stale entries (txs dropped some other way) outnumber live ones 2:1, so
+        churn without expiry cannot grow them without bound. Caller holds `lock`."""
+        live = len(self._by_id)
+        if len(self._expiry) > 2 * live + 64:
+            self._expiry = [e for e in self._expiry if e[2] in self._by_id]
+            heapq.heapify(self._expiry)
+        if len(self._horizon) > 2 * live + 64:
+            self._horizon = [e for e in self._horizon if e[1] in self._by_id]
+            heapq.heapify(self._horizon)
+
+    def cull(self, limit) -> int:
+        """Keep the pool under `limit` canonical bytes (LOCAL anti-DoS policy, non-consensus) — the
+        pool_ops.cull_buffer rule on the running total: an under-limit pool costs one compare; over it,
+        ordinary fee-bearing txs go cheapest first and a fee-exempt reserved tx never does. Returns how
+        many were dropped."""
+        if self._bytes <= limit:
+            return 0
+        dropped = 0
+        with self.lock:
+            ordinary = sorted((t for t in self._by_id.values()
+                               if t.get("recipient") not in FEE_EXEMPT_RECIPIENTS),
+                              key=lambda t: t.get("fee", 0))
+            for tx in ordinary:
+                if self._bytes <= limit:
+                    break
+                self._drop(tx["txid"])
+                dropped += 1
+        return dropped
+
+    def replace(self, txs):
+        """Make the pool exactly `txs` (first copy of a txid wins; entries without a string txid are
+        skipped) — the list-assignment path, MemServer.transaction_pool = [...]."""
+        with self.lock:
+            self._by_id, self._by_sender, self._recipients, self._size, self._leaf = {}, {}, {}, {}, {}
+            self._expiry, self._horizon, self._bytes, self._acc = [], [], 0, 0
+            self._sketch, self._up_key = PoolSketch(), None
+            for tx in txs:
+                txid = tx.get("txid") if isinstance(tx, dict) else None
+                if isinstance(txid, str) and txid not in self._by_id:
+                    raw = canonical_bytes(tx)
+                    self._insert(tx, txid, len(raw), _leaf(raw))
+            self.gen += 1
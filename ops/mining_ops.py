@@ -19,6 +19,9 @@ Design (from the red-teamed "Option A" hybrid):
   - An Ed25519 signature is NEVER used as the randomness (signatures.verify accepts non-unique
     (R,S) and would be grindable); signing stays only for authenticating heartbeats/reveals.
 """
+import bisect
+from collections import OrderedDict
+
 from hashing import blake2b_hash
 from protocol import DOMAIN_REGISTER, DOMAIN_RANDAO_COMMIT, DOMAIN_RANDAO_BEACON
 from protocol import (B_MIN, BOND_CAP, EPOCH_LENGTH, FIDELITY_CAP, BOND_RAMP_EPOCHS,
@@ -84,23 +87,8 @@ def select_producer(registry: dict, beacon: str, slot: int):
     Returns the winning address, or None if no eligible bonded identity exists.
     Integer-only and canonical (addresses walked in sorted order) so every node and a browser
     client compute the identical winner."""
-    weighted = []
-    total = 0
-    for address in sorted(registry):
-        shares = selection_shares(registry[address]["bonded"], registry[address].get("fidelity"))
-        if shares > 0:
-            weighted.append((address, shares))
-            total += shares
-    if total == 0:
-        return None
-
-    draw = int(blake2b_hash([beacon, slot]), 16) % total
-    cumulative = 0
-    for address, shares in weighted:
-        cumulative += shares
-        if draw < cumulative:
-            return address
-    return weighted[-1][0]  # unreachable (draw < total), defensive
+    return SelectionIndex(registry, lambda info: selection_shares(info["bonded"], info.get("fidelity"))).draw(
+        int(blake2b_hash([beacon, slot]), 16))
 
 
 # --- commit-reveal RANDAO beacon ---------------------------------------------------------
@@ -136,9 +124,24 @@ def lane_of(slot: int, beacon: str) -> str:
     is a permutation of slot INDICES — not a per-identity weight — the open lane is EXACTLY K_OPEN
     slots/epoch no matter how many identities register, so a zero-capital Sybil/botnet can never
     win more than OPEN_BPS of blocks. Integer-only and canonical (browser-reproducible)."""
-    i = slot % EPOCH_LENGTH
-    order = sorted(range(EPOCH_LENGTH), key=lambda j: (int(blake2b_hash([beacon, "lane", j]), 16), j))
-    return "open" if i in order[:K_OPEN] else "bonded"
+    return "open" if slot % EPOCH_LENGTH in _open_slots(beacon) else "bonded"
+
+
+_open_slots_memo = OrderedDict()      # beacon -> frozenset of open slot indices (pure, tiny, bounded)
+
+
+def _open_slots(beacon: str) -> frozenset:
+    """The K_OPEN slot indices lane_of assigns to the open lane under `beacon`. The permutation is a pure
+    function of the beacon, so it is computed once per epoch instead of EPOCH_LENGTH hashes + a sort for
+    every lane_of call (selection, verification, reward crediting and the explorer all ask per slot)."""
+    slots = _open_slots_memo.get(beacon)
+    if slots is None:
+        order = sorted(range(EPOCH_LENGTH), key=lambda j: (int(blake2b_hash([beacon, "lane", j]), 16), j))
+        slots = frozenset(order[:K_OPEN])
+        _open_slots_memo[beacon] = slots
+        while len(_open_slots_memo) > 8:
+            _open_slots_memo.popitem(last=False)
+    return slots
 
 
 def open_shares(fidelity) -> int:
@@ -156,6 +159,11 @@ def _bonded_shares(info: dict) -> int:
     return selection_shares(info["bonded"], info.get("fidelity"))
 
 
+def _committee_shares(info: dict) -> int:
+    """duty-committee weight of one registry entry: split-neutral capped shares, no fidelity ramp"""
+    return selection_shares(info["bonded"])
+
+
 def bond_ramp_weight(base_shares: int, bond_since, epoch: int) -> int:
     """Ramp a bonded identity's PRODUCER-selection weight from 0 -> full `base_shares` over BOND_RAMP_EPOCHS,
     by stake-weighted bond age: tenure = epoch - bond_since (bond_since 0/None = fully aged). Integer,
@@ -184,61 +192,91 @@ def _open_weight(info: dict) -> int:
     return open_shares(info.get("fidelity"))
 
 
+class SelectionIndex:
+    """The cumulative-weight view of one registry under one weight function: positive-weight addresses in
+    canonical SORTED order and the running (prefix) sum of their integer weights. A draw is one bisect for
+    the first band whose cumulative weight exceeds it — O(log N) — and lands on exactly the address the
+    sorted linear walk (_weighted_draw / duty_committee before the index) would have returned, because the
+    bands are the same bands in the same order. Building it is the O(N log N) part; see selection_index()
+    for the cache that lets every slot of an epoch share one build."""
+    __slots__ = ("addresses", "cumulative", "total")
+
+    def __init__(self, registry: dict, weight_fn):
+        self.addresses, self.cumulative = [], []
+        total = 0
+        for address in sorted(registry):
+            w = weight_fn(registry[address])
+            if w > 0:
+                total += w
+                self.addresses.append(address)
+                self.cumulative.append(total)
+        self.total = total
+
+    def draw(self, value: int):
+        """The address owning band `value % total`, or None when no identity has positive weight."""
+        if self.total == 0:
+            return None
+        return self.addresses[bisect.bisect_right(self.cumulative, value % self.total)]
+
+
+# selection-index cache: (registry key, epoch, kind) -> SelectionIndex, LRU-bounded. The registry key is
+# the caller's identity for the registry CONTENTS — account_ops.registry_key(), i.e. (env, committed write
+# generation), captured BEFORE the registry was read — and None means "uncached" (inside a write txn, tests
+# handing in ad-hoc dicts). (epoch, kind) completes it: the open registry and the ramped bonded weights are
+# per-epoch, and each lane/fallback/committee weighs the same registry differently. Small bound: the live
+# node only ever asks for the current and neighbouring epochs, a replay walks forward one epoch at a time.
+_INDEX_CACHE_MAX = 16
+_index_cache = OrderedDict()
+
+
+def selection_index(registry: dict, weight_fn, kind: str, epoch: int, registry_key=None) -> SelectionIndex:
+    """The SelectionIndex for `registry` weighed by `weight_fn`, shared across calls with the same
+    (registry_key, epoch, kind). registry_key=None always builds a fresh (uncached) index."""
+    if registry_key is None:
+        return SelectionIndex(registry, weight_fn)
+    key = (registry_key, int(epoch), kind)
+    index = _index_cache.get(key)
+    if index is None:
+        index = SelectionIndex(registry, weight_fn)
+        _index_cache[key] = index
+        while len(_index_cache) > _INDEX_CACHE_MAX:
+            _index_cache.popitem(last=False)
+    else:
+        _index_cache.move_to_end(key)
+    return index
+
+
 def _weighted_draw(registry: dict, weight_fn, beacon: str, slot: int):
     """Deterministic weighted draw shared by both lanes: walk addresses in canonical SORTED order,
     accumulate integer weights, pick the band the beacon/slot hash lands in. Returns the winning
-    address, or None if no positive-weight identity exists. Identical on every node + browser."""
-    weighted = []
-    total = 0
-    for address in sorted(registry):
-        w = weight_fn(registry[address])
-        if w > 0:
-            weighted.append((address, w))
-            total += w
-    if total == 0:
-        return None
-    draw = int(blake2b_hash([beacon, slot]), 16) % total
-    cumulative = 0
-    for address, w in weighted:
-        cumulative += w
-        if draw < cumulative:
-            return address
-    return weighted[-1][0]  # unreachable (draw < total), defensive
-
-
-def duty_committee(bonded_registry: dict, beacon: str, epoch: int) -> dict:
+    address, or None if no positive-weight identity exists. Identical on every node + browser.
+    (Uncached — the REFERENCE walk; the consensus paths draw through a cached selection_index.)"""
+    return SelectionIndex(registry, weight_fn).draw(int(blake2b_hash([beacon, slot]), 16))
+
+
+def duty_committee(bonded_registry: dict, beacon: str, epoch: int, registry_key=None) -> dict:
     """DUTY COMMITTEE (doc/consensus-aggregation.md): {address: seats} for epoch `epoch` —
     DUTY_COMMITTEE_SEATS independent stake-weighted draws (with replacement) keyed
     (beacon, "duty:<epoch>:<seat>"), the same deterministic weighted-draw discipline as producer
     selection (sorted addresses, integer cumulative bands), so every node derives the identical
     committee from committed parent state. Expected seats are proportional to selection shares;
     FFG quorum counts SEATS, so the committee quorum converges on the stake quorum. Empty
-    registry -> {} (no committee, nothing justifies — same fail-closed shape as selection)."""
+    registry -> {} (no committee, nothing justifies — same fail-closed shape as selection).
+    Drawn through a selection_index of its own kind: the committee weighs the FULL registry
+    (fidelity-free shares), the producer lanes the RANDAO-eligible one."""
     from protocol import DUTY_COMMITTEE_SEATS
-    cumulative, total = [], 0
-    for address in sorted(bonded_registry):
-        w = selection_shares(bonded_registry[address]["bonded"])
-        if w > 0:
-            total += w
-            cumulative.append((total, address))
-    if total == 0:
+    index = selection_index(bonded_registry, _committee_shares, "committee", epoch, registry_key)
+    if index.total == 0:
         return {}
     seats = {}
     for i in range(DUTY_COMMITTEE_SEATS):
-        draw = int(blake2b_hash([beacon, f"duty:{int(epoch)}:{i}"]), 16) % total
-        lo, hi = 0, len(cumulative) - 1
-        while lo < hi:                                   # first band with cumulative > draw
-            mid = (lo + hi) // 2
-            if draw < cumulative[mid][0]:
-                hi = mid
-            else:
-                lo = mid + 1
-        addr = cumulative[lo][1]
+        addr = index.draw(int(blake2b_hash([beacon, f"duty:{int(epoch)}:{i}"]), 16))
         seats[addr] = seats.get(addr, 0) + 1
     return seats
 
 
-def select_producer_two_lane(open_registry: dict, bonded_registry: dict, beacon: str, slot: int):
+def select_producer_two_lane(open_registry: dict, bonded_registry: dict, beacon: str, slot: int,
+                             registry_key=None):
     """The live two-lane producer selector. Returns the winning address, or None if the slot is
     skipped (no eligible producer).
 
@@ -251,23 +289,34 @@ def select_producer_two_lane(open_registry: dict, bonded_registry: dict, beacon:
         (zero stake), so the ceiling is moot; without this a no-premine chain (empty bonded at genesis) —
         or one where every validator unbonded — HALTS at the first bonded slot (a height can't be skipped).
         The instant ANY stake bonds, bonded slots return to the bonded lane and the ceiling re-applies.
-    The winner is credited by ADDRESS, so it need not be online (a relay builds the block for it)."""
-    bonded_weight = _bonded_ramped_weight(slot // EPOCH_LENGTH)   # tenure ramp for the sudden-whale brake
+    The winner is credited by ADDRESS, so it need not be online (a relay builds the block for it).
+
+    registry_key (account_ops.registry_key(), captured before the registries were read) lets every slot of
+    the epoch draw from one cached SelectionIndex per lane — O(log N) per slot instead of a sort + weight
+    recompute of the whole registry. None (in-txn, ad-hoc registries) builds the indexes uncached; the
+    winner is bit-identical either way."""
+    epoch = slot // EPOCH_LENGTH
+    bonded_weight = _bonded_ramped_weight(epoch)                  # tenure ramp for the sudden-whale brake
+    draw = int(blake2b_hash([beacon, slot]), 16)
+
+    def _open_draw():
+        return selection_index(open_registry, _open_weight, "open", epoch, registry_key).draw(draw)
+
     def _bonded_draw():
         """Bonded-lane draw with the tenure ramp applied, plus a deterministic un-ramped
         fallback: if EVERY bonded identity is still ramping (total ramped weight 0) the
         ramp has no established set to protect, so redraw un-ramped rather than stall —
         the whale brake must never cost liveness. Same result on every node."""
-        w = _weighted_draw(bonded_registry, bonded_weight, beacon, slot)
+        w = selection_index(bonded_registry, bonded_weight, "bonded_ramped", epoch, registry_key).draw(draw)
         # LIVENESS: the ramp must never STALL the chain. If every bonded identity is still ramping (total
         # ramped weight 0) but the registry is NON-empty, fall back to the un-ramped draw so a block is still
         # produced. Deterministic (same on every node). This only fires when NO aged validator has weight —
         # i.e. all stake is fresh — where there is no established set for the ramp to protect anyway.
         if w is None and bonded_registry:
-            w = _weighted_draw(bonded_registry, _bonded_shares, beacon, slot)
+            w = selection_index(bonded_registry, _bonded_shares, "bonded", epoch, registry_key).draw(draw)
         return w
     if lane_of(slot, beacon) == "open":
-        winner = _weighted_draw(open_registry, _open_weight, beacon, slot)
+        winner = _open_draw()
         if winner is not None:
             return winner
         return _bonded_draw()                                     # one-directional open->bonded fallback
@@ -278,7 +327,7 @@ def select_producer_two_lane(open_registry: dict, bonded_registry: dict, beacon:
     if not bonded_registry:
         # BOOTSTRAP LIVENESS: zero stake exists -> no capital lane to protect -> let open produce this
         # bonded slot so the chain still advances (halts otherwise). Reverts the moment any stake bonds.
-        return _weighted_draw(open_registry, _open_weight, beacon, slot)
+        return _open_draw()
     return None                                                  # stake exists but draw failed -> skip (no leak)
 
 
@@ -32,7 +32,7 @@ Browser/CLI reproducibility: every step is canonical-JSON + blake2b (see hashing
 so a phone derives the identical address and txid.
 """
 
-from signatures import verify, unhex
+from signatures import unhex
 from hashing import blake2b_hash
 from ops.address_ops import make_address, validate_address
 from protocol import MULTISIG_MAX_MEMBERS, DOMAIN_MSIG, MSIG_PREFIX
@@ -74,7 +74,7 @@ def validate_descriptor(descriptor) -> tuple:
     return threshold, members
 
 
-def verify_multisig_origin(transaction) -> bool:
+def verify_multisig_origin(transaction, preverified=None) -> bool:
     """The multisig counterpart of validate_origin: prove the spend was authorized by the account's
     policy. Checks (raising on the first failure): descriptor is canonical, the SENDER is exactly
     the descriptor's derived address (the binding that makes the descriptor unforgeable — a wrong
@@ -82,7 +82,10 @@ def verify_multisig_origin(transaction) -> bool:
     by a DISTINCT member whose pubkey derives its member address (proof_sender logic) and whose
     ML-DSA signature over the txid verifies. Every entry must be valid — one bad entry rejects the
     tx (deterministic accept/reject; no 'count the good ones' ambiguity), and len(entries) is capped
-    at len(members) so an attacker can't stuff entries to inflate verification cost."""
+    at len(members) so an attacker can't stuff entries to inflate verification cost. `preverified` is the
+    block's preverify_origins() set; entries it or the verified-signature cache already accepted are not
+    re-verified (see transaction_ops.signature_ok)."""
+    from ops.transaction_ops import signature_ok     # lazy: transaction_ops imports this module lazily too
     threshold, members = validate_descriptor(transaction["multisig"])
     assert transaction["sender"] == multisig_address(threshold, members), \
         "sender is not the address derived from the multisig descriptor"
@@ -102,7 +105,7 @@ def verify_multisig_origin(transaction) -> bool:
         member = make_address(public_key)
         assert member in members, "signature by a non-member key"
         assert member not in signed_by, "duplicate signature by the same member"
-        assert verify(signed=signature, public_key=public_key, message=message), \
+        assert signature_ok(signature, public_key, message, preverified), \
             f"invalid multisig signature from {member}"
         signed_by.add(member)
 
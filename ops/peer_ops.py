@@ -5,12 +5,15 @@ import json
 import os
 import os.path
 import threading
+import time
 
 from compounder import compound_get_list_of, compound_announce_self
 from compounder import compound_get_status_pool
 from config import get_port, get_config, get_timestamp_seconds, update_config, hostport
 from .data_ops import set_and_sort, get_home
 from .net_ops import read_capped, unpack_zstd_peer, MAX_PEER_BODY
+from . import peer_transport
+from .status_core import unpack_core, CORE_MAX_BYTES
 
 import aiohttp
 
@@ -125,16 +128,25 @@ def status_fields_well_typed(status) -> bool:
     return True
 
 
-async def get_remote_status(target_peer, logger) -> [dict, bool]:
-    """fetch a peer's /status dict over the bomb-capped zstd(msgpack) wire (5s total timeout); False on
-    any failure. The answer is UNTRUSTED peer input — callers pool it and act on the get_majority vote,
-    never on a single peer's word."""
+async def get_remote_status(target_peer, logger, core=True) -> [dict, bool]:
+    """fetch a peer's status (5s total timeout); False on any failure. core=True (every caller) reads the
+    binary core record (/status_core, ops/status_core — everything the donor/snapshot votes, the archive
+    refill and announce_peer read), falling back to the full bomb-capped zstd(msgpack) /status for a
+    peer that does not serve it; core=False always fetches the full diagnostic dict. The answer is
+    UNTRUSTED peer input — callers pool it and act on the get_majority vote, never on a single peer's word."""
 
     try:
-        url_construct = f"http://{hostport(target_peer, get_port())}/status?compress=zstd"
-
-        async with aiohttp.ClientSession(timeout = aiohttp.ClientTimeout(total=5)) as session:
-            async with session.get(url_construct) as response:
+        base = f"http://{hostport(target_peer, get_port())}"
+
+        async with peer_transport.peer_session() as session:
+            if core:
+                async with session.get(f"{base}/status_core", timeout=aiohttp.ClientTimeout(total=5)) as response:
+                    if response.status == 200:
+                        # fixed-layout record: the types are right by construction, but the size cap and the
+                        # strict decode still treat it as untrusted
+                        return unpack_core(await read_capped(response, CORE_MAX_BYTES))
+            url_construct = f"{base}/status?compress=zstd"
+            async with session.get(url_construct, timeout=aiohttp.ClientTimeout(total=5)) as response:
                 if response.status == 200:
                     # anti-OOM: cap the untrusted body like every other peer fetcher (compressed side),
                     # and unpack_zstd_peer caps the decompressed side against a zstd bomb.
@@ -223,11 +235,9 @@ def probe_block_hash_signed(peer, height, port=9173, timeout=6, tip_hint=0):
     zero weight no matter how many IPs it holds. Freshness: the signed as_of (the signer's tip at signing)
     must sit within 2 epochs of `tip_hint` — a signature captured before the signer itself reorged must
     not restate a dead view forever."""
-    import json as _json, urllib.request as _rq
     from protocol import EPOCH_LENGTH
     try:
-        with _rq.urlopen(f"http://{peer}:{port}/hash_attest?height={int(height)}", timeout=timeout) as r:
-            d = _json.loads(r.read(1_000_000))
+        d = peer_transport.get_json(f"http://{peer}:{port}/hash_attest?height={int(height)}", timeout=timeout)
         h = d.get("block_hash") if isinstance(d, dict) else None
         if not (isinstance(h, str) and len(h) == 64):
             raise ValueError("no usable claim")
@@ -249,14 +259,101 @@ def probe_block_hash_signed(peer, height, port=9173, timeout=6, tip_hint=0):
         return probe_block_hash(peer, height, port=port, timeout=timeout), 0
 
 
+class ProbeMemo(dict):
+    """(peer, height) -> probe answer, shared across fork-verdict and corroboration passes
+    (core_loop._memo_probe). A plain dict to its readers — get / pop / `in` / [] — but each entry expires
+    on its own: an answer `ttl` seconds after it was recorded, a FAILED one (None hash) after `fail_ttl`, so
+    a dead peer costs one timeout per fail_ttl instead of one per verdict retry while a flaky one is asked
+    again soon. The old memo was one dict wiped whole every 90 s, which re-paid every probe of a fresh
+    round at once, right when the verdict was needed.
+
+    Thread-safe for the fan-out's workers, and fetch() keeps ONE probe in flight per key: a straggler
+    abandoned by a cut-short round is joined by the next round's ask instead of duplicated."""
+
+    def __init__(self, ttl=90.0, fail_ttl=10.0):
+        super().__init__()
+        self.ttl, self.fail_ttl = float(ttl), float(fail_ttl)
+        self._at = {}
+        self._inflight = {}
+        self._lock = threading.RLock()
+
+    def _expired(self, key, now):
+        v = dict.get(self, key)
+        ok = v[0] if isinstance(v, tuple) else v
+        return now - self._at.get(key, now) > (self.ttl if ok else self.fail_ttl)
+
+    def _sweep(self, now):
+        for k in [k for k in dict.keys(self) if self._expired(k, now)]:
+            dict.pop(self, k, None)
+            self._at.pop(k, None)
+
+    def __contains__(self, key):
+        with self._lock:
+            if not dict.__contains__(self, key):
+                return False
+            if self._expired(key, time.monotonic()):
+                dict.pop(self, key, None)
+                self._at.pop(key, None)
+                return False
+            return True
+
+    def __getitem__(self, key):
+        with self._lock:
+            if key not in self:
+                raise KeyError(key)
+            return dict.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        with self._lock:
+            return dict.__getitem__(self, key) if key in self else default
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            now = time.monotonic()
+            if len(self) >= 4096:
+                self._sweep(now)                     # bound growth: a verdict asks ~26 heights x 8 peers
+            dict.__setitem__(self, key, value)
+            self._at[key] = now
+
+    def pop(self, key, *default):
+        with self._lock:
+            self._at.pop(key, None)
+            return dict.pop(self, key, *default)
+
+    def fetch(self, key, ask):
+        """The live answer for `key`, else ask() recorded under it. A concurrent fetch of the same key
+        waits for the one in flight (bounded by that probe's own timeout) instead of asking again."""
+        with self._lock:
+            if key in self:
+                return dict.__getitem__(self, key)
+            ev = self._inflight.get(key)
+            mine = ev is None
+            if mine:
+                ev = self._inflight[key] = threading.Event()
+        if not mine:
+            ev.wait()
+            with self._lock:
+                if key in self:
+                    return dict.__getitem__(self, key)
+            return ask()                             # the owner failed outright — ask for ourselves
+        try:
+            r = ask()
+            self[key] = r
+            return r
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            ev.set()
+
+
 def probe_block_hash(peer, height, port=9173, timeout=6):
     """One peer's block hash at `height`, or None. Deliberately a plain blocking GET against the peer's
     public API rather than anything routed through the status pool — see stranded_below_finality for why
-    that independence is the whole point."""
-    import json as _json, urllib.request as _rq
+    that independence is the whole point. (Independent of the status POOL, not of the connection pool:
+    it rides peer_transport's keep-alive connections like every other peer call, and the shared IO loop
+    decodes big sync batches off-loop, so a probe never queues behind one.)"""
     try:
-        with _rq.urlopen(f"http://{peer}:{port}/get_block?number={int(height)}", timeout=timeout) as r:
-            d = _json.loads(r.read(1_000_000))
+        d = peer_transport.get_json(f"http://{peer}:{port}/get_block?number={int(height)}", timeout=timeout)
         h = d.get("block_hash") if isinstance(d, dict) else None
         return h if isinstance(h, str) and len(h) == 64 else None
     except Exception:
@@ -266,10 +363,8 @@ def probe_block_hash(peer, height, port=9173, timeout=6):
 def _peer_finalized_height(peer, port=9173, timeout=6):
     """A peer's own finalized height from its /status, or None. Used only to pick a comparison height a
     BEHIND peer can actually answer — never as a fork-choice input."""
-    import json as _json, urllib.request as _rq
     try:
-        with _rq.urlopen(f"http://{peer}:{port}/status", timeout=timeout) as r:
-            d = _json.loads(r.read(1_000_000))
+        d = peer_transport.get_json(f"http://{peer}:{port}/status", timeout=timeout)
         h = d.get("finalized_height") if isinstance(d, dict) else None
         return int(h) if isinstance(h, int) and h >= 0 else None
     except Exception:
@@ -284,10 +379,8 @@ def peer_tip_weight(peer, port=9173, timeout=6):
     collapsed peer set or a stale entry can silently blind (2026-07-20). The escape uses this only as a
     SYMMETRY BREAKER — never to decide that a fork exists, only which side of an already-proven one yields
     — and None (unreachable, malformed) must therefore read as "not heavier", i.e. nobody purges."""
-    import json as _json, urllib.request as _rq
     try:
-        with _rq.urlopen(f"http://{peer}:{port}/status", timeout=timeout) as r:
-            d = _json.loads(r.read(1_000_000))
+        d = peer_transport.get_json(f"http://{peer}:{port}/status", timeout=timeout)
         w = d.get("latest_block_weight") if isinstance(d, dict) else None
         return int(w) if isinstance(w, int) and w >= 0 else None
     except Exception:
@@ -297,10 +390,8 @@ def peer_tip_weight(peer, port=9173, timeout=6):
 def _peer_heights(peer, port=9173, timeout=6):
     """A peer's (finalized_height, tip_height) from a single /status read; either element may be None.
     Used only to pick a comparison height — never as a fork-choice input."""
-    import json as _json, urllib.request as _rq
     try:
-        with _rq.urlopen(f"http://{peer}:{port}/status", timeout=timeout) as r:
-            d = _json.loads(r.read(1_000_000))
+        d = peer_transport.get_json(f"http://{peer}:{port}/status", timeout=timeout)
         if not isinstance(d, dict):
             return None, None
         def _h(k):
@@ -389,9 +480,18 @@ def stranded_below_finality(our_hash, height, peers, quorum=2, port=9173):
 
     A hash mismatch at a FINALIZED height is not a judgement call. If `quorum` independent peers that are
     not behind us disagree, we are in the minority by definition, and staying put is not the safe option
-    (the same argument _rejoin_by_rollback already makes). Returns (stranded, detail)."""
-    agree, disagree, unknown = [], [], []
-    for peer in peers:
+    (the same argument _rejoin_by_rollback already makes). Returns (stranded, detail).
+
+    Peers are asked CONCURRENTLY (fork_resolution.fan_out) under one PROBE_DEADLINE_S: serially, each
+    silent peer cost a 6 s timeout — twice when its /status fallback timed out too — and a dozen dead
+    peers held the core loop for over a minute. A peer that has not answered by the deadline is `unknown`,
+    as a timeout always was; the round also stops as soon as `quorum` disagreements are out of reach, since
+    nothing the rest could say would make this node stranded. Lists keep `peers` order."""
+    from ops.fork_resolution import fan_out, PROBE_DEADLINE_S
+    deadline = time.monotonic() + PROBE_DEADLINE_S
+
+    def _judge(peer):
+        """'agree' / 'disagree' / 'unknown' for one peer."""
         theirs = probe_block_hash(peer, height, port=port)
         if theirs is None:
             # THE PEER IS BEHIND US — which is exactly what a node RACING AHEAD ON ITS OWN FORK looks like.
@@ -403,20 +503,20 @@ def stranded_below_finality(our_hash, height, peers, quorum=2, port=9173):
             # and comparing at OUR height only was an accident of framing, not a soundness requirement.
             probe_h, theirs_lower = _common_probe_height(peer, height, port=port)
             if theirs_lower is None:
-                unknown.append(peer)
-                continue
+                return "unknown"
             ours_lower = _our_hash_at(probe_h)
             if ours_lower is None:
-                unknown.append(peer)
-            elif theirs_lower == ours_lower:
-                agree.append(peer)                    # same chain where we can both see it -> NOT stranded
-            else:
-                disagree.append(peer)
-            continue
-        if theirs == our_hash:
-            agree.append(peer)
-        else:
-            disagree.append(peer)
+                return "unknown"
+            # same chain where we can both see it -> NOT stranded
+            return "agree" if theirs_lower == ours_lower else "disagree"
+        return "agree" if theirs == our_hash else "disagree"
+
+    peers = list(dict.fromkeys(peers))
+    said = fan_out(peers, _judge, deadline=deadline,
+                   stop=lambda done, pending: sum(v == "disagree" for v in done.values()) + pending < int(quorum))
+    agree = [p for p in peers if said.get(p) == "agree"]
+    disagree = [p for p in peers if said.get(p) == "disagree"]
+    unknown = [p for p in peers if said.get(p, "unknown") == "unknown"]
     # A peer agreeing normally means our prefix is not provably abandoned — refuse to act. Wiping a node
     # that is merely poorly connected would be far worse than leaving it wedged for a human to look at.
     #
@@ -433,11 +533,14 @@ def stranded_below_finality(our_hash, height, peers, quorum=2, port=9173):
     effective_agree = list(agree)
     agree_discounted = []
     if agree and len(disagree) >= int(quorum):
-        dis_weights = [w for w in (peer_tip_weight(p, port=port) for p in disagree) if w is not None]
+        # one concurrent round for both sides; an unanswered weight is None (keeps the veto)
+        weights = fan_out(disagree + agree, lambda p: peer_tip_weight(p, port=port),
+                          deadline=time.monotonic() + PROBE_DEADLINE_S)
+        dis_weights = [w for w in (weights.get(p) for p in disagree) if w is not None]
         best_dis = max(dis_weights) if dis_weights else None
         if best_dis is not None:
             for p in agree:
-                w = peer_tip_weight(p, port=port)
+                w = weights.get(p)
                 if w is not None and w < best_dis:
                     agree_discounted.append(p)
             effective_agree = [p for p in agree if p not in agree_discounted]
@@ -520,7 +623,7 @@ async def load_ips(logger, port, fail_storage, unreachable, minimum=3, top_50=Tr
                                                                   port=port,
                                                                   fail_storage=fail_storage,
                                                                   logger=logger,
-                                                                  compress="zstd",
+                                                                  compress="core",
                                                                   semaphore=asyncio.Semaphore(50))))
         for entry in gathered:
             status_pool.extend(list(entry.keys()))
@@ -551,11 +654,12 @@ def check_save_peers(peers, logger, fails, unreachable):
     good_peers = {p for p in peers if isinstance(p, str)} - set(fails) - set(unreachable)
 
     local_fails = []
-    candidates = asyncio.run(compound_get_status_pool(
+    candidates = peer_transport.run(compound_get_status_pool(
         ips=good_peers,
         port=get_port(),
         fail_storage=local_fails,
         logger=logger,
+        compress="core",
         semaphore=asyncio.Semaphore(50)))
 
     my_ip = get_config()["ip"]
@@ -588,7 +692,7 @@ def check_save_peers(peers, logger, fails, unreachable):
 
 def get_list_of_peers(ips, port, fail_storage, logger) -> list:
     """gets peers of peers"""
-    returned_peers = asyncio.run(
+    returned_peers = peer_transport.run(
         compound_get_list_of(key="peers",
                              entries=ips,
                              port=port,
@@ -642,12 +746,12 @@ def me_to(target) -> list:
 
 def announce_me(targets, port, my_ip, logger, fail_storage) -> None:
     """announce self node to other peers"""
-    asyncio.run(compound_announce_self(ips=targets,
-                                       port=port,
-                                       my_ip=my_ip,
-                                       logger=logger,
-                                       fail_storage=fail_storage,
-                                       semaphore=asyncio.Semaphore(50)))
+    peer_transport.run(compound_announce_self(ips=targets,
+                                              port=port,
+                                              my_ip=my_ip,
+                                              logger=logger,
+                                              fail_storage=fail_storage,
+                                              semaphore=asyncio.Semaphore(50)))
 
 
 # own-IP cache for check_ip (audit): check_ip runs per peer per ~1s pass on two hot loops (donor
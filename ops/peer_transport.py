@@ -0,0 +1,205 @@
+"""
+PEER TRANSPORT — one pooled, keep-alive HTTP client for every outbound peer call.
+
+Why: every peer call used to build its own aiohttp.ClientSession and close it again — get_remote_status,
+compounder.get_status / get_list_of / get_tx_ids_of / post_txs_by_id / send_transaction,
+block_ops.get_blocks_after / before / knows_block, snapshot_ops.fetch_block — and the loops drove those
+through asyncio.run, a fresh event loop per call. So nothing could be reused: the ~1 s status pass to a
+24-peer mesh paid 24 TCP handshakes and 24 teardowns every second (the closing side parks each socket in
+TIME_WAIT for a minute, so a busy node sat on ~1.5k of them), and the fork-verdict probes
+(probe_block_hash_signed, peer_tip_weight, _peer_heights, ...) went out over blocking urllib, a new
+connection per probe, from the core thread.
+
+This module owns the connections instead:
+
+  * ONE long-lived ClientSession PER long-lived event loop, on a TCPConnector with a global and a per-host
+    connection limit, HTTP keep-alive and a DNS cache. A connection to a peer is opened once and then
+    carries every status poll, block fetch and probe to that peer until it idles out.
+  * A node-wide IO loop on its own daemon thread ("peer-transport"). The loops' synchronous call sites
+    run their peer coroutines on it through run() instead of asyncio.run, so the peer loop, the core loop,
+    the gossip worker and the mempool reconcile all share ONE pool. The HTTP server loop adopts its own
+    session at startup (adopt_loop) for the handlers that dial peers.
+  * get_json() — the sync facade for the blocking probes, thread-safe (the fork verdict fans probes out on
+    a ThreadPoolExecutor), same pooled connections.
+  * fetch() — the shared timeout + body-cap policy: read_capped on the compressed side, unpack_zstd_peer
+    on the decompressed side, per REQUEST timeouts (a pooled session cannot carry one per caller).
+  * decode() — every loop's peer coroutines share the IO loop, so a big body (a get_blocks_after sync
+    batch) is decoded on a worker thread; decoding it in line would stall status, gossip and fork probes
+    for every other loop until it finished.
+
+peer_session() is what the call sites use. On a loop that has a pooled session it yields that session;
+on any other loop — the wallet CLI's asyncio.run, a test — it yields a private session and closes it on
+exit, i.e. exactly the old behaviour, so nothing ever leaks a session onto a loop that is about to die.
+
+The transport changes how bytes reach a peer, never what is asked or how an answer is judged: every call
+site keeps its own URL, cap, decode and failure contract. A request on the IO loop is bounded by its own
+aiohttp timeout; run() adds an outer bound so a wedged coroutine cannot hang the calling thread forever.
+"""
+import asyncio
+import atexit
+import contextlib
+import os
+import threading
+
+import aiohttp
+
+from ops.net_ops import read_capped, unpack_zstd_peer, MAX_PEER_BODY
+
+# connections across all peers / to any one peer. Per-host stays small: the status pass, the core loop's
+# donor fetches and a gossip push to the same peer are the realistic concurrency, and a peer that answers
+# slowly must not soak up the whole pool. The compounder's Semaphore(50) still bounds fan-out per pass.
+PEER_POOL_LIMIT = max(1, int(os.environ.get("NADO_PEER_POOL_LIMIT", "256")))
+PEER_POOL_PER_HOST = max(1, int(os.environ.get("NADO_PEER_POOL_PER_HOST", "8")))
+# idle keep-alive. Status is polled ~every second so a live peer's connection never idles out; a peer that
+# went quiet frees its socket after this. Below aiohttp's server-side default (75 s), so WE close first
+# and never write into a connection the peer is tearing down.
+PEER_KEEPALIVE_S = max(1.0, float(os.environ.get("NADO_PEER_KEEPALIVE_S", "30")))
+# resolved-address cache for seed hostnames (peers are mostly literal IPs, which never hit the resolver).
+PEER_DNS_TTL_S = 300
+# session default for a request that passes no timeout of its own; every call site passes one.
+_DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=60, connect=5)
+# run()'s outer bound on top of the request's own timeout.
+_RUN_SLACK_S = 5.0
+# bodies at least this big decode off the event loop (decode()). Status, id lists and probes stay below it
+# and decode in line: a thread hop costs more than they do.
+OFFLOOP_DECODE_BYTES = max(0, int(os.environ.get("NADO_PEER_OFFLOOP_DECODE_BYTES", str(64 * 1024))))
+
+_sessions = {}                      # event loop -> its pooled ClientSession (long-lived loops only)
+_io = {"loop": None, "thread": None}
+_io_lock = threading.Lock()
+
+
+def new_session():
+    """A ClientSession on the pooled connector settings. Must be called with the target loop running."""
+    connector = aiohttp.TCPConnector(limit=PEER_POOL_LIMIT, limit_per_host=PEER_POOL_PER_HOST,
+                                     keepalive_timeout=PEER_KEEPALIVE_S, ttl_dns_cache=PEER_DNS_TTL_S)
+    return aiohttp.ClientSession(connector=connector, timeout=_DEFAULT_TIMEOUT)
+
+
+@contextlib.asynccontextmanager
+async def peer_session():
+    """The running loop's pooled session (left open), or a private one closed on exit when this loop has
+    none — an ephemeral asyncio.run loop must not keep a session past its own lifetime."""
+    session = _sessions.get(asyncio.get_running_loop())
+    if session is not None and not session.closed:
+        yield session
+        return
+    async with new_session() as session:
+        yield session
+
+
+async def adopt_loop():
+    """Give the RUNNING loop a pooled session (idempotent). For loops that live as long as the node —
+    the HTTP server loop calls this at startup. Returns the session."""
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        session = _sessions[loop] = new_session()
+    return session
+
+
+async def release_loop():
+    """Close and forget the running loop's pooled session (shutdown, tests)."""
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.close()
+
+
+def _io_loop():
+    """The node-wide IO loop, started on first use: a daemon thread running forever with its session."""
+    with _io_lock:
+        loop = _io["loop"]
+        if loop is not None and _io["thread"].is_alive():
+            return loop
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def _serve():
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(adopt_loop())
+            ready.set()
+            loop.run_forever()
+
+        thread = threading.Thread(target=_serve, daemon=True, name="peer-transport")
+        thread.start()
+        ready.wait()
+        _io["loop"], _io["thread"] = loop, thread
+        if not _io.get("atexit"):
+            atexit.register(close)             # close the pooled sockets cleanly instead of at GC
+            _io["atexit"] = True
+        return loop
+
+
+def run(coro, timeout=None):
+    """Run a peer coroutine on the shared IO loop and block for its result — the drop-in for asyncio.run at
+    the loops' synchronous call sites, thread-safe. `timeout` (seconds) bounds the wait from the outside;
+    on expiry the coroutine is cancelled and TimeoutError raised. Never call it FROM the IO loop (it
+    would wait on itself): that raises instead of deadlocking."""
+    loop = _io_loop()
+    if threading.current_thread() is _io["thread"]:
+        coro.close()
+        raise RuntimeError("peer_transport.run called from the peer transport loop")
+    fut = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return fut.result(timeout)
+    except TimeoutError:
+        fut.cancel()
+        raise
+
+
+def spawn(coro):
+    """Schedule a long-running coroutine on the shared IO loop without waiting for it (the status
+    subscriptions). Returns its concurrent.futures.Future — cancel() on it is thread-safe and cancels the
+    task on the loop."""
+    return asyncio.run_coroutine_threadsafe(coro, _io_loop())
+
+
+async def fetch(url, timeout, cap=MAX_PEER_BODY, method="GET", data=None, connect=None):
+    """One request on the running loop's peer session -> (status, body). The body is read under `cap`
+    (read_capped raises past it) and only for a 200 — any other status returns (status, b"") without
+    draining whatever the peer wants to send. `timeout` is the request's total; `connect`, when given,
+    bounds connection setup separately (a dead peer fails fast while a big batch may still transfer)."""
+    async with peer_session() as session:
+        async with session.request(method, url, data=data,
+                                   timeout=aiohttp.ClientTimeout(total=timeout, connect=connect)) as response:
+            if response.status != 200:
+                return response.status, b""
+            return 200, await read_capped(response, cap)
+
+
+async def decode(fn, body):
+    """fn(body) for a fetched peer body, off the running loop when the body is big enough to stall it
+    (asyncio.to_thread; zstd releases the GIL while it inflates). Raises whatever fn raises."""
+    if len(body) < OFFLOOP_DECODE_BYTES:
+        return fn(body)
+    return await asyncio.to_thread(fn, body)
+
+
+async def fetch_zstd(url, timeout, cap=MAX_PEER_BODY, method="GET", data=None, connect=None):
+    """fetch() + unpack_zstd_peer: a peer's bomb-capped zstd(codec) control payload, or None on a non-200.
+    Raises on transport errors and oversized / undecodable bodies, like the call sites always did."""
+    status, body = await fetch(url, timeout, cap=cap, method=method, data=data, connect=connect)
+    return await decode(unpack_zstd_peer, body) if status == 200 else None
+
+
+def get_json(url, timeout=6, cap=1_000_000):
+    """Blocking GET of a JSON document over the pooled connections — the sync facade for the fork-verdict
+    probes. Raises on anything but a 200 with a well-formed body under `cap` (the probes turn any raise
+    into "no answer", as they did with urlopen's HTTPError)."""
+    import json
+    status, body = run(fetch(url, timeout, cap=cap), timeout=timeout + _RUN_SLACK_S)
+    if status != 200:
+        raise IOError(f"HTTP {status} from {url}")
+    return json.loads(body)
+
+
+def close():
+    """Stop the IO loop and close its session (tests / interpreter shutdown). A later run() restarts it."""
+    with _io_lock:
+        loop, thread = _io["loop"], _io["thread"]
+        _io["loop"] = _io["thread"] = None
+    if loop is None or not thread.is_alive():
+        return
+    asyncio.run_coroutine_threadsafe(release_loop(), loop).result(10)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(10)
@@ -0,0 +1,163 @@
+"""
+POOL SKETCH — an invertible Bloom lookup table (IBLT) over the pooled txids, for mempool set reconciliation
+(GET /transaction_ids?sketch=<log2>, memserver._fetch_missing_remote_txs).
+
+Why: reconciliation used to pull every divergent peer's FULL txid list each pass (~66 B per id on the wire,
+~10 MB for a capped 150k pool) to find the handful of ids it was missing. Two pools that differ by d ids
+need only O(d) to reconcile: each side keeps an IBLT of its ids, the peer ships its table, we subtract ours
+cell by cell and PEEL the difference — ids only they hold come out with count +1, ids only we hold with -1.
+The table's size is set by the expected difference, not by the pool.
+
+Layout: SKETCH_HASHES subtables of 2**log2 cells; a txid lands in one cell per subtable (indices from a
+blake2b of the id under a public personalization), and a cell holds (count, XOR of ids, XOR of id
+checksums). Both sides must index identically, so there is no secret: anyone can grind txids that collide in
+the same cells. That buys an attacker nothing but a table that will not peel, and an unpeelable table is a
+failure the caller answers with the full id list — grinding costs bandwidth, never correctness. The mempool
+keeps ONE table at SKETCH_MAX_LOG2 and updates it per insert/drop (O(SKETCH_HASHES)); smaller tables are
+FOLDS of it — cell i of a 2**l subtable is the sum of the cells i (mod 2**l) of the kept one, which is
+exactly the table built at 2**l directly, because the index is the hash mod a power of two. So any requested
+size is served without rebuilding.
+
+Wire (network byte order), version 1:
+
+    "NS" | version u8 | log2 u8 | pool size u32 | cells (count i32 | id 32 B | check u64) x 3 * 2**log2
+
+Only 64-hex txids are sketched — every admitted tx has one (merge_transaction's validate_txid). Decoding is
+STRICT: a peer body is UNTRUSTED, and a table that does not peel to empty is a failure (the caller falls
+back to the full id list), never a partial answer.
+"""
+import struct
+from hashlib import blake2b
+
+SKETCH_MAGIC = b"NS"
+SKETCH_VERSION = 1
+SKETCH_HASHES = 3
+# the kept table: 3 x 4096 cells peels a difference of ~3,000 ids; folds serve anything smaller
+SKETCH_MAX_LOG2 = 12
+SKETCH_MIN_LOG2 = 4
+
+_HEAD = struct.Struct("!2sBBI")
+_CELL = struct.Struct("!i32sQ")
+_PERSON = b"nado-poolsketch"
+_HEX = frozenset("0123456789abcdef")
+
+
+def sketch_bytes(log2) -> int:
+    """Wire size of a table at `log2`."""
+    return _HEAD.size + SKETCH_HASHES * (1 << log2) * _CELL.size
+
+
+def _id_key(txid):
+    """The 32-byte key of a sketchable txid, else None."""
+    if isinstance(txid, str) and len(txid) == 64 and _HEX.issuperset(txid):
+        return bytes.fromhex(txid)
+    return None
+
+
+def _spread(key):
+    """(subtable hashes, checksum) of a 32-byte key — one blake2b for all of them, personalized but not
+    keyed."""
+    d = blake2b(key, digest_size=8 * (SKETCH_HASHES + 1), person=_PERSON).digest()
+    words = [int.from_bytes(d[i:i + 8], "big") for i in range(0, len(d), 8)]
+    return words[:SKETCH_HASHES], words[SKETCH_HASHES]
+
+
+class PoolSketch:
+    """An IBLT over txids (see the module docstring). Not thread-safe — the mempool guards its own."""
+
+    def __init__(self, log2=SKETCH_MAX_LOG2):
+        self.log2 = int(log2)
+        size = SKETCH_HASHES << self.log2
+        self.counts = [0] * size
+        self.keys = [0] * size             # XOR of the ids, as ints
+        self.checks = [0] * size           # XOR of the id checksums
+
+    def _cells(self, hashes):
+        mask = (1 << self.log2) - 1
+        return [(j << self.log2) + (h & mask) for j, h in enumerate(hashes)]
+
+    def toggle(self, txid, sign) -> bool:
+        """Add (`sign` +1) or remove (-1) one txid. False (and nothing changes) for an unsketchable id."""
+        key = _id_key(txid)
+        if key is None:
+            return False
+        hashes, check = _spread(key)
+        k = int.from_bytes(key, "big")
+        for c in self._cells(hashes):
+            self.counts[c] += sign
+            self.keys[c] ^= k
+            self.checks[c] ^= check
+        return True
+
+    def fold(self, log2) -> "PoolSketch":
+        """This table folded down to 2**log2 cells per subtable (log2 <= self.log2)."""
+        if not SKETCH_MIN_LOG2 <= log2 <= self.log2:
+            raise ValueError(f"cannot fold a 2**{self.log2} sketch to 2**{log2}")
+        out = PoolSketch(log2)
+        m, m2 = 1 << self.log2, 1 << log2
+        for j in range(SKETCH_HASHES):
+            src, dst = j * m, j * m2
+            for i in range(m):
+                c = dst + (i & (m2 - 1))
+                out.counts[c] += self.counts[src + i]
+                out.keys[c] ^= self.keys[src + i]
+                out.checks[c] ^= self.checks[src + i]
+        return out
+
+    def subtract(self, other) -> "PoolSketch":
+        """self - other, cell by cell (same size): the sketch of the symmetric difference."""
+        if other.log2 != self.log2:
+            raise ValueError("sketch sizes differ")
+        out = PoolSketch(self.log2)
+        out.counts = [a - b for a, b in zip(self.counts, other.counts)]
+        out.keys = [a ^ b for a, b in zip(self.keys, other.keys)]
+        out.checks = [a ^ b for a, b in zip(self.checks, other.checks)]
+        return out
+
+    def peel(self):
+        """Decode a difference sketch -> (ids with count +1, ids with count -1), or None when it does not
+        peel to empty (too many differences for its size). Consumes the table."""
+        plus, minus = [], []
+        stack = list(range(len(self.counts)))
+        while stack:
+            c = stack.pop()
+            n = self.counts[c]
+            if n not in (1, -1):
+                continue
+            if len(plus) + len(minus) >= len(self.counts):
+                return None                      # more ids than cells: a crafted table, not a difference
+            key = self.keys[c].to_bytes(32, "big")
+            hashes, check = _spread(key)
+            if check != self.checks[c]:
+                continue
+            (plus if n == 1 else minus).append(key.hex())
+            k = self.keys[c]
+            for cell in self._cells(hashes):
+                self.counts[cell] -= n
+                self.keys[cell] ^= k
+                self.checks[cell] ^= check
+                stack.append(cell)
+        if any(self.counts) or any(self.keys) or any(self.checks):
+            return None
+        return plus, minus
+
+    def to_bytes(self, pool_size) -> bytes:
+        """The wire form, with the sender's pool size in the header."""
+        return _HEAD.pack(SKETCH_MAGIC, SKETCH_VERSION, self.log2, min(pool_size, 0xFFFFFFFF)) + b"".join(
+            _CELL.pack(n, k.to_bytes(32, "big"), ch) for n, k, ch in zip(self.counts, self.keys, self.checks))
+
+    @classmethod
+    def from_bytes(cls, body):
+        """Decode an UNTRUSTED wire table -> (PoolSketch, pool size). Raises ValueError when malformed."""
+        body = bytes(body)
+        if len(body) < _HEAD.size:
+            raise ValueError(f"sketch of {len(body)} bytes")
+        magic, version, log2, pool_size = _HEAD.unpack_from(body)
+        if magic != SKETCH_MAGIC or version != SKETCH_VERSION:
+            raise ValueError(f"not a v{SKETCH_VERSION} pool sketch")
+        if not SKETCH_MIN_LOG2 <= log2 <= SKETCH_MAX_LOG2 or len(body) != sketch_bytes(log2):
+            raise ValueError("sketch size mismatch")
+        out = cls(log2)
+        for i, (n, k, ch) in enumerate(_CELL.iter_unpack(body[_HEAD.size:])):
+            out.counts[i], out.keys[i], out.checks[i] = n, int.from_bytes(k, "big"), ch
+        return out, pool_size
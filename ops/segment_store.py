@@ -29,11 +29,20 @@ record bytes become inert garbage. Whole segments are GC'd by rolling-mode pruni
 live-locator count (kv_ops seg_live counters) reaches zero.
 
 One writer thread is assumed per home (the core loop; genesis/migration run before it starts) —
-appends are serialized by a per-home lock anyway. Reads come from the many HTTP threads through a
-cached per-segment file object under a read lock — PORTABLE seek+read only (no os.pread: it does
-not exist on Windows, and a node must run identically on every OS).
+appends are serialized by a per-home lock anyway. Reads come from the many HTTP threads. SEALED
+segments (every one but the active) are immutable, so they are memory-mapped once and read with NO
+lock: a memoryview slice of the map is crc-checked and handed straight to zstd (read_view), zero
+copies. Before this every /blocks_after, /blocks_before, get_block and snapshot-backfill read queued
+on ONE read lock around seek+read, and a peer forward-syncing thousands of consecutive blocks
+convoyed every executor thread behind it. The ACTIVE segment (still growing) and any platform without
+mmap keep the old cached per-segment file object under the read lock — PORTABLE seek+read only (no
+os.pread: it does not exist on Windows, and a node must run identically on every OS).
 """
 import os
+try:
+    import mmap as _mmap
+except ImportError:                                    # e.g. some embedded/WASI builds — seek+read path only
+    _mmap = None
 import struct
 import threading
 import zlib
@@ -85,6 +94,10 @@ class _Store:
         self.lock = threading.RLock()
         self.read_files = {}                          # seg -> open 'rb' file (seek+read under read_lock)
         self.read_lock = threading.Lock()
+        # seg -> read-only mmap of a SEALED segment. Published under read_lock (so two readers never map
+        # the same file twice) but READ without it: dict.get is atomic, and a sealed segment never
+        # changes under a map. Each map pins one dup'd fd, the same budget read_files already spends.
+        self.maps = {}
         d = segments_dir(home)
         os.makedirs(d, exist_ok=True)
         segs = []
@@ -155,11 +168,74 @@ class _Store:
                 self._roll()
             return seg, off, len(record)
 
+    def _map(self, seg: int):
+        """The read-only mmap of SEALED segment `seg`, mapping it on first use; None for the active
+        segment, without mmap, or when the file can't be mapped (empty, missing) — the caller then
+        takes the locked seek+read path, which reports the miss the way it always has."""
+        if _mmap is None or seg == self.active_seg:
+            return None
+        m = self.maps.get(seg)
+        if m is not None:
+            return m
+        with self.read_lock:
+            m = self.maps.get(seg)
+            if m is None:
+                try:
+                    with open(segment_path(seg, self.home), "rb") as f:
+                        m = _mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_READ)
+                except (OSError, ValueError):          # ValueError: mmap of an empty file
+                    return None
+                self.maps[seg] = m
+            return m
+
+    def _unmap(self, seg: int):
+        """Drop (and close) segment `seg`'s map — caller holds read_lock. A reader still holding a view
+        into it makes close() raise BufferError; the map is then just left to the GC (POSIX unlinks a
+        mapped file fine; the view's owner releases it within one decompress)."""
+        m = self.maps.pop(seg, None)
+        if m is not None:
+            try:
+                m.close()
+            except BufferError:
+                pass
+
+    def read_view(self, seg: int, off: int, total_len: int, expect_hash_hex: str):
+        """Like read() but may return a zero-copy memoryview into a sealed segment's map (no lock, no
+        copy) — for callers that consume the payload immediately (zstd decompress) and drop it. Do NOT
+        keep the view: it pins the map, and delete_segment then can't close it."""
+        m = self._map(seg)
+        if m is None:
+            return self.read(seg, off, total_len, expect_hash_hex)
+        try:
+            if off + total_len > len(m):
+                return None
+            raw = memoryview(m)[off:off + total_len]
+        except ValueError:                             # map closed by a concurrent delete_segment/reset
+            return None
+        return self._verify(raw, total_len, expect_hash_hex)
+
+    @staticmethod
+    def _verify(raw, total_len: int, expect_hash_hex: str):
+        """The payload slice of one raw record (bytes or memoryview) iff it is the intact record of
+        `expect_hash_hex`, else None."""
+        if len(raw) != total_len or raw[:4] != MAGIC:
+            return None
+        _magic, plen, crc = _HDR.unpack(raw[:_HDR.size])
+        if HEADER_SIZE + plen != total_len:
+            return None
+        if raw[_HDR.size:HEADER_SIZE].hex() != expect_hash_hex or zlib.crc32(raw[_HDR.size:]) != crc:
+            return None
+        return raw[HEADER_SIZE:]
+
     def read(self, seg: int, off: int, total_len: int, expect_hash_hex: str):
         """Verified payload bytes for a locator, or None (missing segment, torn read, crc mismatch,
         or a locator pointing at a different block's record — every failure is a miss, never junk).
-        Cached per-segment 'rb' file, seek+read under the read lock: portable across every OS
-        (os.pread does not exist on Windows — the launch bug a Windows joiner hit live)."""
+        Sealed segments: lock-free copy out of the mmap. Active segment / no mmap: cached per-segment
+        'rb' file, seek+read under the read lock — portable across every OS (os.pread does not exist
+        on Windows — the launch bug a Windows joiner hit live)."""
+        if self._map(seg) is not None:
+            view = self.read_view(seg, off, total_len, expect_hash_hex)
+            return None if view is None else bytes(view)
         try:
             with self.read_lock:
                 f = self.read_files.get(seg)
@@ -170,16 +246,7 @@ class _Store:
                 raw = f.read(total_len)
         except (OSError, ValueError):                 # ValueError: read on a file closed by delete_segment
             return None
-        if len(raw) != total_len or raw[:4] != MAGIC:
-            return None
-        _magic, plen, crc = _HDR.unpack(raw[:_HDR.size])
-        if HEADER_SIZE + plen != total_len:
-            return None
-        hraw = raw[_HDR.size:HEADER_SIZE]
-        payload = raw[HEADER_SIZE:]
-        if hraw.hex() != expect_hash_hex or zlib.crc32(hraw + payload) != crc:
-            return None
-        return payload
+        return self._verify(raw, total_len, expect_hash_hex)
 
     def reset(self):
         """Delete EVERY segment and start over at an empty seg-0 — the block-body half of a local
@@ -194,6 +261,8 @@ class _Store:
                     except OSError:
                         pass
                 self.read_files.clear()
+                for seg in list(self.maps):
+                    self._unmap(seg)
             try:
                 self.active_f.close()
             except Exception:
@@ -222,6 +291,7 @@ class _Store:
                         f.close()                     # also required on Windows: can't unlink an open file
                     except OSError:
                         pass
+                self._unmap(seg)                      # ditto for a mapped file
             try:
                 os.remove(segment_path(seg, self.home))
                 return True
@@ -256,6 +326,11 @@ def read(seg: int, off: int, total_len: int, expect_hash_hex: str, home=None):
     return _store(home).read(seg, off, total_len, expect_hash_hex)
 
 
+def read_view(seg: int, off: int, total_len: int, expect_hash_hex: str, home=None):
+    """Zero-copy read for immediate consumers (block decode); see _Store.read_view."""
+    return _store(home).read_view(seg, off, total_len, expect_hash_hex)
+
+
 def delete_segment(seg: int, home=None) -> bool:
     return _store(home).delete_segment(seg)
 
@@ -29,6 +29,7 @@ from protocol import INDEX_RETENTION_NUM, INDEX_RETENTION_HASH
 from ops.data_ops import get_home
 from ops import kv_ops
 from ops import segment_store
+from ops import state_tree
 
 # how many state entries (db, key, value triples) go into one transferable chunk
 CHUNK_ROWS = int(os.environ.get("NADO_SNAPSHOT_CHUNK_ROWS", "25000"))
@@ -105,14 +106,71 @@ def read_state(home=None):
     # commits mid-walk, yielding a root for no committed height. CANONICALIZE empty accounts: skip any
     # all-default (absent-equivalent) account row — a zero doc reads identically to a missing one, so dropping
     # it makes the state_root INVARIANT to read-created-account residue (an betanet-7 h76000 seed-split cause).
-    for name, k, v in kv_ops.all_db_pairs(kv_ops.SNAPSHOT_DBS):
-        if name == "accounts" and kv_ops.account_value_is_default(v):
-            continue
-        triples.append((name, k, v))
+    # VALUES ARE RE-RENDERED CANONICALLY: kv_ops now STORES docs in the binary storage codec, but the root,
+    # the snapshot chunks and state_digest commit to the JSON bytes pack() produces (codec.canonical is the
+    # identity on JSON rows, an exact re-render on binary ones) — so the root is independent of which codec
+    # (or which lazy-migration state) a node's rows happen to be in, and snapshots still carry JSON rows.
+    # DUPSORT values are raw utf-8 / be8 bytes, never codec documents, so they pass through untouched.
+    triples.extend(_iter_state())
     triples.sort(key=lambda t: (t[0], t[1], t[2]))
     return triples
 
 
+def _iter_state(txn=None):
+    """read_state() as a GENERATOR (same rows, same canonical values) — the streaming snapshot build walks
+    this instead of materializing the list. Already in canonical order without a sort: SNAPSHOT_DBS is a
+    sorted tuple, and LMDB yields keys (and DUPSORT dups) in memcmp order, which is Python's bytes order.
+    `txn`: a kv_ops.read_view() snapshot to walk (default: a fresh one for this walk)."""
+    canonical, dup = codec.canonical, kv_ops._DUP_DBS
+    for name, k, v in kv_ops.all_db_pairs(kv_ops.SNAPSHOT_DBS, txn=txn):
+        if name == "accounts" and kv_ops.account_value_is_default(v):
+            continue
+        yield name, k, v if name in dup else canonical(v)
+
+
+class _MerkleStream:
+    """merkle_root over leaf digests fed one at a time, in O(log n) memory — the SAME fold (pairwise by
+    position, odd tail duplicated at every level), computed like a binary counter: pending[i] holds the
+    left sibling waiting at level i. A snapshot build/import no longer needs every leaf in RAM at once."""
+
+    def __init__(self):
+        self.pending = []
+        self.count = 0
+
+    def add(self, digest):
+        self.count += 1
+        i = 0
+        while i < len(self.pending) and self.pending[i] is not None:
+            digest = hashlib.blake2b(self.pending[i] + digest, digest_size=32).digest()
+            self.pending[i] = None
+            i += 1
+        if i == len(self.pending):
+            self.pending.append(None)
+        self.pending[i] = digest
+
+    def root(self) -> str:
+        if not self.count:
+            return _blake2b(b"")
+        carry, top = None, len(self.pending) - 1
+        while self.pending[top] is None:
+            top -= 1
+        for i, node in enumerate(self.pending):
+            if node is not None and carry is not None:
+                carry = hashlib.blake2b(node + carry, digest_size=32).digest()
+            elif node is not None:
+                carry = node if i == top else hashlib.blake2b(node + node, digest_size=32).digest()
+            elif carry is not None and i < top:
+                carry = hashlib.blake2b(carry + carry, digest_size=32).digest()   # odd tail: duplicated
+        return carry.hex()
+
+
+def _leaf_digest(t):
+    """blake2b(_leaf(t)) — from the shared leaf cache when it's there, never populating it (a streamed
+    snapshot walk would otherwise flush the cache the per-block root depends on)."""
+    d = _leaf_cache.get(t)
+    return d if d is not None else hashlib.blake2b(_leaf(t), digest_size=32).digest()
+
+
 # State carried in the snapshot for TRANSFER (a joiner's deep hash-lookbacks, block-body recovery, and
 # operational metadata) but DELIBERATELY EXCLUDED from the consensus STATE ROOT, because it is NODE-LOCAL /
 # PATH-DEPENDENT rather than a pure function of the canonical block sequence. The state root is committed
@@ -249,28 +307,46 @@ def _root_reference_epoch(triples):
     return best
 
 
+def _in_root_base(t):
+    """True when triple `t` is consensus state at all (not block storage, not a node-local / retention-
+    dependent meta row — see ROOT_EXCLUDED_DBS / ROOT_EXCLUDED_META_KEYS / ROOT_EXCLUDED_META_PREFIXES)."""
+    return (t[0] not in ROOT_EXCLUDED_DBS
+            and not (t[0] == "meta" and t[1] in ROOT_EXCLUDED_META_KEYS)
+            and not (t[0] == "meta" and t[1].startswith(ROOT_EXCLUDED_META_PREFIXES)))
+
+
+def _root_floor(base):
+    """The retention floor for a base-filtered triple list (see (4) above): rows of the windowed families
+    with an epoch below it leave the root. None while the window still covers the whole chain."""
+    ref = _root_reference_epoch(base)
+    if ref is None or ref < ROOT_RETENTION_EPOCHS:
+        return None
+    return ref - ROOT_RETENTION_EPOCHS
+
+
+def _in_root_window(t, floor):
+    """True when base triple `t` is inside the retention window `floor` (_root_floor). Split out of
+    _root_triples so ops/state_tree.py filters single rows by the EXACT rule the full walk applies."""
+    if floor is None:
+        return True
+    name, key = t[0], t[1]
+    if name in ROOT_WINDOWED_DBS or (name == "meta" and key.startswith(ROOT_WINDOWED_META_PREFIXES)):
+        e = _row_epoch(name, key)
+        if e is not None and e < floor:
+            return False
+    return True
+
+
 def _root_triples(triples):
     """the consensus subset of a full read_state() list — everything the state root commits (block storage
     and node-local / retention-dependent meta rows excluded; see ROOT_EXCLUDED_DBS / ROOT_EXCLUDED_META_KEYS
     / ROOT_EXCLUDED_META_PREFIXES), then the RETENTION WINDOW over the epoch-growing families (see (4)
     above). Order-preserving, so a pre-sorted input stays sorted."""
-    base = [t for t in triples
-            if t[0] not in ROOT_EXCLUDED_DBS
-            and not (t[0] == "meta" and t[1] in ROOT_EXCLUDED_META_KEYS)
-            and not (t[0] == "meta" and t[1].startswith(ROOT_EXCLUDED_META_PREFIXES))]
-    ref = _root_reference_epoch(base)
-    if ref is None or ref < ROOT_RETENTION_EPOCHS:
+    base = [t for t in triples if _in_root_base(t)]
+    floor = _root_floor(base)
+    if floor is None:
         return base                    # window covers the whole chain: byte-identical to the unwindowed root
-    floor = ref - ROOT_RETENTION_EPOCHS
-    out = []
-    for t in base:
-        name, key = t[0], t[1]
-        if name in ROOT_WINDOWED_DBS or (name == "meta" and key.startswith(ROOT_WINDOWED_META_PREFIXES)):
-            e = _row_epoch(name, key)
-            if e is not None and e < floor:
-                continue
-        out.append(t)
-    return out
+    return [t for t in base if _in_root_window(t, floor)]
 
 
 # state-root cache: a SINGLE ((env_path, home, write_generation), root) tuple, held as one reference so a
@@ -293,14 +369,20 @@ def l1_state_root(home=None):
     computation, because incorporate_block bumps the generation.
 
     Bypassed inside a write txn: mid-transaction reads see uncommitted rows, so caching one would poison
-    every later reader (get_bonded_registry takes the same escape hatch)."""
+    every later reader (get_bonded_registry takes the same escape hatch).
+
+    INCREMENTAL (2026-10): a cache miss no longer walks the whole state — ops/state_tree.py keeps the sorted
+    root leaves and every fold level in memory and advances them from each commit's touched keys, so the
+    once-per-block cost is O(changed rows · log n) (plus the positional shift of an insert), not O(state).
+    Same root by construction; NADO_STATE_ROOT_CHECK=1 recomputes it from scratch on every miss and serves
+    the full root (loudly) if they ever disagree."""
     if kv_ops.in_write_txn():
         return merkle_root(_root_triples(read_state(home)))
     key = (kv_ops.env_path(home), home, kv_ops.write_generation())
     entry = _root_cache[0]
     if entry is not None and entry[0] == key:
         return entry[1]
-    root = merkle_root(_root_triples(read_state(home)))
+    root = state_tree.root(home)
     _root_cache[0] = (key, root)
     return root
 
@@ -324,19 +406,24 @@ def per_db_roots(home=None):
     return state_fingerprint(home)[1]
 
 
+def _pack_chunk(cid, part):
+    """one deterministic chunk: (packed_bytes, chunk_meta) for the sorted triples `part`"""
+    packed = codec.pack([[n, k, v] for (n, k, v) in part])
+    return packed, {
+        "id": cid,
+        "sha256": hashlib.sha256(packed).hexdigest(),
+        "bytes": len(packed),
+        "rows": len(part),
+    }
+
+
 def _pack_chunks(triples):
     """split sorted state triples into deterministic msgpack chunks; returns (chunk_bytes_list, chunk_meta_list)"""
     chunk_bytes, chunk_meta = [], []
     for cid, start in enumerate(range(0, len(triples), CHUNK_ROWS)):
-        part = triples[start:start + CHUNK_ROWS]
-        packed = codec.pack([[n, k, v] for (n, k, v) in part])
+        packed, meta = _pack_chunk(cid, triples[start:start + CHUNK_ROWS])
         chunk_bytes.append(packed)
-        chunk_meta.append({
-            "id": cid,
-            "sha256": hashlib.sha256(packed).hexdigest(),
-            "bytes": len(packed),
-            "rows": len(part),
-        })
+        chunk_meta.append(meta)
     return chunk_bytes, chunk_meta
 
 
@@ -412,6 +499,15 @@ def _index_row_in_window(name, key, value, checkpoint_height):
     return lo <= height <= checkpoint_height
 
 
+def _in_payload(t, checkpoint_height=None):
+    """True when triple `t` belongs to the canonical TRANSFER payload (see _payload_triples)."""
+    return (t[0] not in SNAPSHOT_PAYLOAD_EXCLUDED_DBS
+            and not (t[0] == "meta"
+                     and (t[1] in SNAPSHOT_PAYLOAD_EXCLUDED_META_KEYS
+                          or t[1].startswith(SNAPSHOT_PAYLOAD_EXCLUDED_META_PREFIXES)))
+            and _index_row_in_window(t[0], t[1], t[2], checkpoint_height))
+
+
 def _payload_triples(triples, checkpoint_height=None):
     """The canonical TRANSFER payload: read_state() minus the rows two honest nodes can legitimately differ
     on, and minus number<->hash index rows outside the retention window for `checkpoint_height`.
@@ -422,12 +518,7 @@ def _payload_triples(triples, checkpoint_height=None):
     IMPORT it re-derives the same window from the manifest's own snapshot_height, so a donor that ships
     out-of-window index rows has them dropped rather than trusted — the same reason finalized_height and
     execsum rows are re-filtered here instead of being taken on faith."""
-    return [t for t in triples
-            if t[0] not in SNAPSHOT_PAYLOAD_EXCLUDED_DBS
-            and not (t[0] == "meta"
-                     and (t[1] in SNAPSHOT_PAYLOAD_EXCLUDED_META_KEYS
-                          or t[1].startswith(SNAPSHOT_PAYLOAD_EXCLUDED_META_PREFIXES)))
-            and _index_row_in_window(t[0], t[1], t[2], checkpoint_height)]
+    return [t for t in triples if _in_payload(t, checkpoint_height)]
 
 
 def state_digest(triples, checkpoint_height=None):
@@ -444,22 +535,64 @@ def state_digest(triples, checkpoint_height=None):
 
 def build_snapshot(snapshot_height, block_hash, protocol, version, home=None):
     """build a manifest + chunk payloads committing the FULL consensus state at the given checkpoint height.
-    Returns (manifest_dict, list_of_chunk_bytes). Pure function of the state DB."""
+    Returns (manifest_dict, list_of_chunk_bytes). Pure function of the state DB. Holds every chunk in RAM —
+    persist_checkpoint streams the same build straight to disk instead (stream_snapshot)."""
+    chunk_bytes = []
+    manifest = stream_snapshot(snapshot_height, block_hash, protocol, version,
+                               lambda cid, packed: chunk_bytes.append(packed), home=home)
+    return manifest, chunk_bytes
+
+
+def stream_snapshot(snapshot_height, block_hash, protocol, version, emit, home=None):
+    """The snapshot build as ONE streaming pass: LMDB cursors -> canonical rows -> chunks handed to
+    emit(cid, chunk_bytes) the moment CHUNK_ROWS rows are ready. Returns the manifest (built last, it needs
+    the whole stream). Byte-identical to packing read_state() in memory — same rows, same order, same
+    chunk boundaries, same state_root / state_digest — but peak memory is one chunk plus an O(log n)
+    Merkle frontier, not the whole state (at ~1M rows the list form was the node's largest allocation,
+    once per CHECKPOINT_INTERVAL, on the block-production thread).
+
+    The root's retention floor needs the max epochw:<E> row, which sorts AFTER some windowed families
+    (attestations, commits < meta), so it is read FIRST from the same MVCC snapshot (kv_ops.read_view) —
+    a cheap prefix range — and the single walk then applies the exact _root_triples rule row by row."""
     home = home or get_home()
-    triples = read_state(home)
+    kv_ops.init_env(home)
     # ROOT excludes block storage (deterministic consensus subset); CHUNKS still carry everything so a
     # joiner's deep hash-lookbacks resolve. The two roles are intentionally different — see ROOT_EXCLUDED_DBS.
     # state_root over the consensus subset of the FULL state; everything else (what we TRANSFER and what
     # identifies it) over the canonical payload, so two honest nodes at the same checkpoint emit the
     # identical entry_count / chunks / state_digest / snapshot_hash.
-    state_root = merkle_root(_root_triples(triples))
-    payload = _payload_triples(triples, snapshot_height)
-    chunk_bytes, chunk_meta = _pack_chunks(payload)
+    root, digest, chunk_meta, part = _MerkleStream(), hashlib.blake2b(digest_size=32), [], []
+    entries = 0
+
+    def _flush():
+        packed, meta = _pack_chunk(len(chunk_meta), part)
+        emit(meta["id"], packed)
+        chunk_meta.append(meta)
+        part.clear()
+
+    with kv_ops.read_view() as txn:
+        floor = _root_floor([("meta", k, v) for k, v in kv_ops.prefix_pairs("meta", _EPOCHW_PREFIX, txn)])
+        for t in _iter_state(txn):
+            in_root = _in_root_base(t) and _in_root_window(t, floor)
+            in_payload = _in_payload(t, snapshot_height)
+            if not (in_root or in_payload):
+                continue
+            d = _leaf_digest(t)
+            if in_root:
+                root.add(d)
+            if in_payload:
+                digest.update(d)                       # == state_digest(payload, snapshot_height)
+                entries += 1
+                part.append(t)
+                if len(part) >= CHUNK_ROWS:
+                    _flush()
+    if part:
+        _flush()
 
     manifest = {
         "snapshot_height": snapshot_height,
         "block_hash": block_hash,
-        "state_root": state_root,
+        "state_root": root.root(),
         # PAYLOAD DIGEST over the FULL triple list — including every row the state_root EXCLUDES
         # (block storage, finalized_height/pruned_below, execsum:, tvprev*). Chunking-invariant (it
         # hashes the canonical rows, not the transport split), so it authenticates the whole payload
@@ -467,8 +600,8 @@ def build_snapshot(snapshot_height, block_hash, protocol, version, home=None):
         # manifest_hash + import_snapshot: without this, a donor matching an honest snapshot_hash could
         # substitute arbitrary EXCLUDED rows (a forged finalized_height permanently wedges rollback; a
         # forged block_by_num row forges the epoch-beacon anchor) — entry_count alone is only a count.
-        "state_digest": state_digest(payload, snapshot_height),
-        "entry_count": len(payload),
+        "state_digest": digest.hexdigest(),
+        "entry_count": entries,
         "chunk_count": len(chunk_meta),
         "chunks": chunk_meta,
         "payload": "canonical-v1",   # transfer-payload format (see _payload_triples)
@@ -476,7 +609,7 @@ def build_snapshot(snapshot_height, block_hash, protocol, version, home=None):
         "version": version,
     }
     manifest["snapshot_hash"] = manifest_hash(manifest)
-    return manifest, chunk_bytes
+    return manifest
 
 
 def manifest_hash(manifest) -> str:
@@ -523,6 +656,27 @@ def verify_chunk(chunk_bytes, meta) -> bool:
     return hashlib.sha256(chunk_bytes).hexdigest() == meta["sha256"]
 
 
+class _ImportRejected(Exception):
+    """raised inside import_snapshot's write txn to abort it (the message is the log line)"""
+
+
+def _chunk_rows(manifest, chunks, allowed):
+    """Yield (chunk_meta, [triples]) per chunk, ONE chunk resident at a time: sha256 against the (self-hash-
+    verified) manifest, then decode, restricted to well-formed rows of the allowed sub-DBs. Raises
+    _ImportRejected on the first bad chunk."""
+    for meta, cb in zip(manifest["chunks"], chunks):
+        if not verify_chunk(cb, meta):
+            raise _ImportRejected(f"snapshot chunk {meta['id']} sha256 mismatch")
+        rows = []
+        for row in codec.unpack(cb):
+            if (not isinstance(row, (list, tuple)) or len(row) != 3 or row[0] not in allowed
+                    or not isinstance(row[1], (bytes, bytearray))
+                    or not isinstance(row[2], (bytes, bytearray))):
+                raise _ImportRejected("snapshot chunk holds a malformed / out-of-scope state entry")
+            rows.append((row[0], bytes(row[1]), bytes(row[2])))
+        yield meta, rows
+
+
 def import_snapshot(manifest, chunk_bytes_list, home=None, logger=None):
     """Verify the chunks against the manifest, recompute the state_root locally, assert it equals the
     manifest, then atomically replace the ENTIRE consensus state (kv_ops.SNAPSHOT_DBS). Block + tx history
@@ -531,7 +685,16 @@ def import_snapshot(manifest, chunk_bytes_list, home=None, logger=None):
     Returns True on success. A donor cannot feed corrupted state without failing the recomputed state_root
     (consensus rows) or the recomputed state_digest (EVERY row, including the root-excluded ones — block
     storage, finalized_height/pruned_below, execsum:, tvprev*), and it can only write into the allowed
-    SNAPSHOT_DBS sub-DBs. Both are bound into snapshot_hash, which the peer quorum agreed on."""
+    SNAPSHOT_DBS sub-DBs. Both are bound into snapshot_hash, which the peer quorum agreed on.
+
+    STREAMING: `chunk_bytes_list` is any re-iterable sized sequence of chunk bytes — a list, or the
+    on-disk SnapshotChunks a fetch_snapshot download journal hands back — and is read one chunk at a time,
+    TWICE: pass 1 verifies sha256 / shape / canonical order and computes entry_count, state_digest and the
+    retention floor; pass 2 re-verifies each chunk as it streams its rows into ONE write txn while folding
+    the state_root, and the txn commits only if that root matches (else it aborts — the old identity is
+    untouched, exactly as when everything was checked up front in RAM). Two passes because the root's
+    floor comes from the epochw:<E> rows, which sort after some windowed families. Rows must arrive in
+    strictly increasing canonical order — what every honest build emits — since nothing sorts them here."""
     home = home or get_home()
 
     # 1) manifest self-consistency
@@ -542,58 +705,68 @@ def import_snapshot(manifest, chunk_bytes_list, home=None, logger=None):
         _log(logger, "error", "snapshot chunk count mismatch")
         return False
 
-    # 2) per-chunk integrity + reassembly into (db, key, value) triples, restricted to allowed sub-DBs
     allowed = set(kv_ops.SNAPSHOT_DBS)
-    triples = []
-    for meta, cb in zip(manifest["chunks"], chunk_bytes_list):
-        if not verify_chunk(cb, meta):
-            _log(logger, "error", f"snapshot chunk {meta['id']} sha256 mismatch")
-            return False
-        for row in codec.unpack(cb):
-            if (not isinstance(row, (list, tuple)) or len(row) != 3 or row[0] not in allowed
-                    or not isinstance(row[1], (bytes, bytearray))
-                    or not isinstance(row[2], (bytes, bytearray))):
-                _log(logger, "error", "snapshot chunk holds a malformed / out-of-scope state entry")
-                return False
-            triples.append((row[0], bytes(row[1]), bytes(row[2])))
-
-    # 3) CANONICALIZE the received payload, then verify. Dropping the excluded rows here (rather than
-    # trusting the donor to have omitted them) means an injected finalized_height / execsum row can never
-    # reach our DB NOR shift entry_count/state_digest — it is simply not part of the identity.
     # Re-derive the index window from the manifest's own snapshot_height, exactly as the donor should
     # have. A donor shipping rows outside it has them dropped here, so they can neither enter our DB nor
     # shift entry_count/state_digest — the same posture already applied to finalized_height and execsum.
     _C = int(manifest.get("snapshot_height") or 0) or None
-    triples = _payload_triples(triples, _C)
-    triples.sort(key=lambda t: (t[0], t[1], t[2]))
-    if len(triples) != manifest["entry_count"]:
-        _log(logger, "error", "snapshot entry_count mismatch")
-        return False
-    if merkle_root(_root_triples(triples)) != manifest["state_root"]:
-        _log(logger, "error", "snapshot state_root mismatch after reassembly")
-        return False
-    # PAYLOAD AUTHENTICATION: state_root covers only the CONSENSUS subset, so without this a donor matching
-    # the quorum-agreed snapshot_hash could substitute any EXCLUDED row (a forged finalized_height wedges
-    # rollback permanently; a forged block_by_num forges the epoch-beacon anchor). entry_count is a count,
-    # not a digest, so an in-place value edit keeps it exact. state_digest covers every transferred row.
-    if manifest.get("state_digest") != state_digest(triples, _C):
-        _log(logger, "error", "snapshot state_digest mismatch after reassembly (payload tampered)")
+    try:
+        # 2) per-chunk integrity + CANONICALIZE the received payload, then verify count + digest. Dropping
+        # the excluded rows here (rather than trusting the donor to have omitted them) means an injected
+        # finalized_height / execsum row can never reach our DB NOR shift entry_count/state_digest — it is
+        # simply not part of the identity.
+        prev, entries, digest, epochw = None, 0, hashlib.blake2b(digest_size=32), []
+        for _meta, rows in _chunk_rows(manifest, chunk_bytes_list, allowed):
+            for t in rows:
+                if prev is not None and t <= prev:
+                    raise _ImportRejected("snapshot payload is not in canonical order")
+                prev = t
+                if not _in_payload(t, _C):
+                    continue
+                entries += 1
+                digest.update(hashlib.blake2b(_leaf(t), digest_size=32).digest())
+                if t[0] == "meta" and t[1].startswith(_EPOCHW_PREFIX):
+                    epochw.append(t)
+        if entries != manifest["entry_count"]:
+            raise _ImportRejected("snapshot entry_count mismatch")
+        # PAYLOAD AUTHENTICATION: state_root covers only the CONSENSUS subset, so without this a donor
+        # matching the quorum-agreed snapshot_hash could substitute any EXCLUDED row (a forged
+        # finalized_height wedges rollback permanently; a forged block_by_num forges the epoch-beacon
+        # anchor). entry_count is a count, not a digest, so an in-place value edit keeps it exact.
+        # state_digest covers every transferred row.
+        if manifest.get("state_digest") != digest.hexdigest():
+            raise _ImportRejected("snapshot state_digest mismatch after reassembly (payload tampered)")
+        floor = _root_floor(epochw)
+
+        # 3) atomically replace the WHOLE consensus state (all SNAPSHOT_DBS) in ONE write txn, folding the
+        # state_root from the very rows being written; a mismatch raises inside the txn, which aborts it.
+        root = _MerkleStream()
+
+        def _stream():
+            for _meta, rows in _chunk_rows(manifest, chunk_bytes_list, allowed):
+                for t in rows:
+                    if not _in_payload(t, _C):
+                        continue
+                    if _in_root_base(t) and _in_root_window(t, floor):
+                        root.add(hashlib.blake2b(_leaf(t), digest_size=32).digest())
+                    yield t
+            # The NODE-LOCAL rows are not transferred (see _payload_triples). Reconstruct the one the
+            # joiner actually needs, deterministically: a checkpoint is only ever advertised once
+            # FINALIZED, so finalized_height == snapshot_height is correct by construction and identical
+            # on every importer — no donor input, so no forged-floor wedge is possible. pruned_below stays
+            # absent (local pruning advances it). The execsum WINDOW *is* transferred, because
+            # settle-with-proof block validity depends on it and a joiner cannot rebuild pre-checkpoint
+            # summaries from bodies it never had.
+            yield "meta", b"finalized_height", codec.pack(int(manifest.get("snapshot_height") or 0))
+
+        kv_ops.init_env(home)
+        with kv_ops.write_txn() as txn:
+            kv_ops.restore_snapshot_state(_stream(), txn)
+            if root.root() != manifest["state_root"]:
+                raise _ImportRejected("snapshot state_root mismatch after reassembly")
+    except _ImportRejected as e:
+        _log(logger, "error", str(e))
         return False
-
-    # The NODE-LOCAL rows are not transferred (see _payload_triples). Reconstruct the one the joiner
-    # actually needs, deterministically: a checkpoint is only ever advertised once FINALIZED, so
-    # finalized_height == snapshot_height is correct by construction and identical on every importer — no
-    # donor input, so no forged-floor wedge is possible. pruned_below stays absent (local pruning advances
-    # it). The execsum WINDOW *is* transferred, because settle-with-proof block validity depends on it and
-    # a joiner cannot rebuild pre-checkpoint summaries from bodies it never had.
-    _h = int(manifest.get("snapshot_height") or 0)
-    triples.append(("meta", b"finalized_height", codec.pack(_h)))
-    triples.sort(key=lambda t: (t[0], t[1], t[2]))
-
-    # 4) atomically replace the WHOLE consensus state (all SNAPSHOT_DBS) in ONE write txn
-    kv_ops.init_env(home)
-    with kv_ops.write_txn() as txn:
-        kv_ops.restore_snapshot_state(triples, txn)
     _log(logger, "info",
          f"Imported snapshot height {manifest['snapshot_height']} "
          f"({manifest['entry_count']} state entries, state_root {manifest['state_root'][:16]}...)")
@@ -661,36 +834,100 @@ def agree_snapshot(statuses, min_peers=SNAPSHOT_MIN_PEERS, threshold=0.8, seed_i
 
 
 async def fetch_block(target, port, block_hash, timeout=15):
-    """fetch a single block dict from a peer by hash, or None"""
-    import aiohttp
-    from ops.net_ops import read_capped, unpack_zstd_peer, MAX_PEER_BODY
+    """fetch a single block dict from a peer by hash, or None (pooled keep-alive connection — the deep
+    fork walks call this once per block, hundreds of times against the same donor)"""
+    from ops import peer_transport
     from config import hostport
     url = f"http://{hostport(target, port)}/get_block?hash={block_hash}&compress=zstd"
     try:
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as session:
-            async with session.get(url) as r:
-                if r.status != 200:
-                    return None
-                block = unpack_zstd_peer(await read_capped(r, MAX_PEER_BODY))   # bomb-capped zstd wire
-                return block if isinstance(block, dict) else None
+        block = await peer_transport.fetch_zstd(url, timeout)            # capped + bomb-capped zstd wire
+        return block if isinstance(block, dict) else None
+    except Exception:
+        return None
+
+
+# MULTI-PEER CHUNK SCHEDULING (fetch_snapshot). Every donor that advertises the agreed snapshot_hash AND serves
+# the same chunk array serves chunks; each gets SNAPSHOT_PEER_SLOTS request workers that PULL from one shared
+# queue, so a fast donor simply comes back for more work sooner. A donor whose measured throughput falls under
+# SNAPSHOT_SLOW_FRACTION of the best one keeps ONE worker (it can't hog the queue tail). A chunk that errors —
+# HTTP status, timeout, sha256 mismatch — is requeued for the OTHER donors; SNAPSHOT_PEER_MAX_ERRORS consecutive
+# failures bench the donor for the rest of this download. An idle worker STEALS a chunk that has been in
+# flight elsewhere for longer than SNAPSHOT_STEAL_FACTOR x the median chunk time (first verified copy wins —
+# journaling is an idempotent rename). Nothing a donor sends is trusted: every chunk must match the sha256 in
+# the self-hash-verified manifest, and import_snapshot re-derives state_root + state_digest regardless.
+SNAPSHOT_PEER_SLOTS = int(os.environ.get("NADO_SNAPSHOT_PEER_SLOTS", "2"))
+SNAPSHOT_CHUNK_TIMEOUT = float(os.environ.get("NADO_SNAPSHOT_CHUNK_TIMEOUT", "60"))
+SNAPSHOT_PEER_MAX_ERRORS = 3
+SNAPSHOT_SLOW_FRACTION = 0.25
+SNAPSHOT_STEAL_FACTOR = 3.0
+
+
+class _DonorStats:
+    """per-donor throughput + error bookkeeping for the chunk scheduler"""
+
+    def __init__(self, ip):
+        self.ip = ip
+        self.bytes = 0
+        self.secs = 0.0
+        self.chunks = 0
+        self.errors = 0
+        self.consecutive = 0
+        self.benched = False
+
+    def rate(self):
+        """bytes/s over this donor's completed chunks (None until it has completed one)"""
+        return self.bytes / self.secs if self.chunks and self.secs > 0 else None
+
+    def ok(self, nbytes, secs):
+        self.bytes += nbytes
+        self.secs += secs
+        self.chunks += 1
+        self.consecutive = 0
+
+    def fail(self):
+        self.errors += 1
+        self.consecutive += 1
+        if self.consecutive >= SNAPSHOT_PEER_MAX_ERRORS:
+            self.benched = True
+
+
+async def _fetch_manifest(session, target, port):
+    """one donor's snapshot manifest (self-hash NOT yet checked), or None"""
+    from ops.net_ops import read_capped, unpack_zstd_peer, MAX_PEER_BODY
+    from ops import peer_transport
+    from config import hostport
+    try:
+        async with session.get(f"http://{hostport(target, port)}/get_snapshot_manifest?compress=zstd") as r:
+            if r.status != 200:
+                return None
+            return await peer_transport.decode(unpack_zstd_peer, await read_capped(r, MAX_PEER_BODY))
     except Exception:
         return None
 
 
-async def fetch_snapshot(target, port, logger=None, concurrency=8, timeout=120):
-    """download a peer's snapshot manifest then all chunks in parallel.
-    Returns (manifest, chunk_bytes_list) or (None, None) on failure."""
+async def fetch_snapshot(target, port, logger=None, concurrency=8, timeout=120, home=None, sources=()):
+    """download the snapshot manifest from `target`, then every chunk still missing from the DOWNLOAD JOURNAL,
+    striped across `target` and every extra donor in `sources` that serves the SAME manifest (see MULTI-PEER
+    CHUNK SCHEDULING above). Returns (manifest, SnapshotChunks) or (None, None) on failure.
+
+    RESUMABLE + BOUNDED. Each chunk is sha256-verified against the manifest the moment it arrives and
+    written to snapshots/incoming/<snapshot_hash>/chunk_<id>.bin (tmp + atomic rename), so RAM holds at
+    most `concurrency` chunks, never the snapshot. That directory IS the journal: a verified chunk file is
+    a completed step, so a dropped connection (or a restart, or another donor of the same snapshot_hash)
+    resumes with only the missing chunks instead of starting over. Files already there are re-hashed
+    against THIS manifest's chunk list before being trusted (the chunk array is not covered by
+    snapshot_hash, so a different donor may split the same payload differently)."""
+    import asyncio
+    import time
     import aiohttp
-    from ops.net_ops import read_capped, unpack_zstd_peer, MAX_PEER_BODY, MAX_SNAPSHOT_TOTAL, MAX_SNAPSHOT_ACCOUNTS
+    from ops.net_ops import read_capped, MAX_SNAPSHOT_TOTAL, MAX_SNAPSHOT_ACCOUNTS
     from config import hostport
-    base = f"http://{hostport(target, port)}"
     try:
         async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as session:
-            async with session.get(f"{base}/get_snapshot_manifest?compress=zstd") as r:
-                if r.status != 200:
-                    _log(logger, "info", f"No snapshot manifest from {target} (HTTP {r.status})")
-                    return None, None
-                manifest = unpack_zstd_peer(await read_capped(r, MAX_PEER_BODY))
+            manifest = await _fetch_manifest(session, target, port)
+            if manifest is None:
+                _log(logger, "info", f"No snapshot manifest from {target}")
+                return None, None
 
             # VALIDATE the manifest BEFORE allocating anything sized by its (untrusted) fields. A lone donor
             # under weak-subjectivity could otherwise advertise a huge chunk_count/entry_count and OOM us
@@ -720,29 +957,199 @@ async def fetch_snapshot(target, port, logger=None, concurrency=8, timeout=120):
                 _log(logger, "warning", f"Snapshot from {target} exceeds size ceiling ({total} bytes) — rejecting")
                 return None, None
 
-            chunks = [None] * cc
+            # EXTRA DONORS serve only if their manifest is the IDENTICAL document (same snapshot_hash AND same
+            # chunk array — a donor with a different NADO_SNAPSHOT_CHUNK_ROWS splits the payload differently
+            # and its chunks would never match this manifest's sha256s).
+            extra = [ip for ip in dict.fromkeys(sources or ()) if ip != target]
+            found = await asyncio.gather(*(_fetch_manifest(session, ip, port) for ip in extra))
+            donors = [_DonorStats(target)] + [
+                _DonorStats(ip) for ip, m in zip(extra, found)
+                if isinstance(m, dict) and m.get("snapshot_hash") == manifest["snapshot_hash"]
+                and m.get("chunks") == chunk_meta]
+
+            journal = _open_journal(manifest, home)
+            queue = [cid for cid in range(cc) if not journal.has(cid)]
+            if len(queue) < cc:
+                _log(logger, "info", f"Resuming snapshot download: {cc - len(queue)}/{cc} chunks already "
+                                     f"verified on disk")
             height = manifest["snapshot_height"]     # pin chunks to the manifest we just fetched
-            sem = __import__("asyncio").Semaphore(concurrency)
-
-            async def _one(cid):
-                """fetch chunk `cid` under the concurrency semaphore, read-capped to chunk_meta[cid]['bytes']
-                (trusted because the manifest passed its self-hash) — the donor can't over-feed us"""
-                async with sem:
-                    async with session.get(f"{base}/get_snapshot_chunk?id={cid}&height={height}") as cr:
-                        if cr.status != 200:
-                            raise IOError(f"chunk {cid} HTTP {cr.status}")
-                        # chunk_meta[cid]['bytes'] is NOT self-hash-covered, but the per-read cap + the total
-                        # bytes ceiling (<= MAX_SNAPSHOT_TOTAL, checked above) still bound what the donor feeds
-                        # us; the imported state is re-derived and root-checked regardless.
-                        chunks[cid] = await read_capped(cr, int(chunk_meta[cid].get("bytes", 0)))
-
-            await __import__("asyncio").gather(*(_one(i) for i in range(cc)))
-            return manifest, chunks
+            done, failed_by = set(range(cc)) - set(queue), {}   # failed_by: cid -> donors that failed it
+            inflight = {}                                       # cid -> [(donor, started)]
+            durations = []
+            sem = asyncio.Semaphore(concurrency)                # RAM bound: chunks buffered at once
+
+            def _live():
+                return [d for d in donors if not d.benched]
+
+            def _next(donor):
+                """the next chunk for `donor`: queued work it has not failed, else a stealable straggler"""
+                for i, cid in enumerate(queue):
+                    if donor not in failed_by.get(cid, ()) or len(failed_by[cid]) >= len(_live()):
+                        return queue.pop(i)
+                if not durations:
+                    return None
+                slow = SNAPSHOT_STEAL_FACTOR * sorted(durations)[len(durations) // 2]
+                now = time.monotonic()
+                for cid, runs in inflight.items():
+                    if (len(runs) == 1 and runs[0][0] is not donor and now - runs[0][1] > slow
+                            and donor not in failed_by.get(cid, ())):
+                        return cid
+                return None
+
+            async def _get(donor, cid):
+                url = f"http://{hostport(donor.ip, port)}/get_snapshot_chunk?id={cid}&height={height}"
+                async with session.get(url, timeout=aiohttp.ClientTimeout(total=SNAPSHOT_CHUNK_TIMEOUT)) as cr:
+                    if cr.status != 200:
+                        raise IOError(f"chunk {cid} HTTP {cr.status}")
+                    # chunk_meta[cid]['bytes'] is NOT self-hash-covered, but the per-read cap + the total
+                    # bytes ceiling (<= MAX_SNAPSHOT_TOTAL, checked above) still bound what the donor feeds
+                    # us; the imported state is re-derived and root-checked regardless.
+                    return await read_capped(cr, int(chunk_meta[cid].get("bytes", 0)))
+
+            async def _worker(donor, slot):
+                while len(done) < cc and not donor.benched:
+                    best = max((d.rate() or 0 for d in donors), default=0)
+                    r = donor.rate()
+                    if slot and r is not None and best and r < SNAPSHOT_SLOW_FRACTION * best:
+                        await asyncio.sleep(0.05)       # slow donor: only its first slot keeps pulling
+                        continue
+                    cid = _next(donor)
+                    if cid is None:                     # nothing for us right now; a failure may requeue work
+                        await asyncio.sleep(0.05)
+                        continue
+                    started = time.monotonic()
+                    inflight.setdefault(cid, []).append((donor, started))
+                    try:
+                        async with sem:
+                            body = await _get(donor, cid)
+                        journal.put(cid, body)          # sha256-verifies (raises on mismatch), then journals
+                    except Exception:
+                        donor.fail()
+                        failed_by.setdefault(cid, set()).add(donor)
+                        runs = [x for x in inflight.get(cid, []) if x[0] is not donor]
+                        if runs:
+                            inflight[cid] = runs
+                        else:
+                            inflight.pop(cid, None)
+                            if cid not in done:
+                                queue.append(cid)
+                        continue
+                    took = time.monotonic() - started
+                    donor.ok(len(body), took)
+                    durations.append(took)
+                    done.add(cid)
+                    inflight.pop(cid, None)
+                    if cid in queue:
+                        queue.remove(cid)
+
+            workers = [asyncio.ensure_future(_worker(d, k))
+                       for d in donors for k in range(max(1, SNAPSHOT_PEER_SLOTS))]
+            while len(done) < cc and not all(w.done() for w in workers):
+                await asyncio.sleep(0.05)
+            for w in workers:                           # a request a stealer already answered is abandoned
+                w.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            summary = ", ".join(f"{d.ip}: {d.chunks} chunks{' BENCHED' if d.benched else ''}" for d in donors)
+            if len(done) < cc:
+                _log(logger, "error", f"Snapshot download incomplete ({len(done)}/{cc} chunks; every donor "
+                                      f"failed or was benched) — {summary}")
+                return None, None
+            if len(donors) > 1:
+                _log(logger, "info", f"Snapshot chunks fetched from {len(donors)} donors — {summary}")
+            return manifest, journal.chunks()
     except Exception as e:
         _log(logger, "error", f"Failed to fetch snapshot from {target}: {e}")
         return None, None
 
 
+# --------------------------------------------------------------------------------------------------
+# SNAPSHOT DOWNLOAD JOURNAL. snapshots/incoming/<snapshot_hash>/ holds the manifest being downloaded and
+# every chunk that already PASSED its sha256 — written tmp + rename, so a file that exists is a complete,
+# verified chunk. Only the snapshot currently being fetched is kept (starting another discards the rest),
+# and the caller drops it once the import has run (discard_incoming) — it exists to resume a DOWNLOAD,
+# never to be imported twice. Not a checkpoint: list_checkpoint_heights skips the non-numeric dir.
+# --------------------------------------------------------------------------------------------------
+
+def _incoming_root(home=None):
+    return f"{_snap_dir(home)}/incoming"
+
+
+class SnapshotChunks:
+    """The chunks of one journaled download, read from disk one at a time on iteration — what
+    import_snapshot streams instead of a list of every chunk's bytes."""
+
+    def __init__(self, path, count):
+        self.path, self.count = path, count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, cid):
+        if not 0 <= cid < self.count:
+            raise IndexError(cid)
+        with open(f"{self.path}/chunk_{int(cid)}.bin", "rb") as f:
+            return f.read()
+
+    def __iter__(self):
+        for cid in range(self.count):
+            yield self[cid]
+
+
+class _Journal:
+    """The download journal of one manifest (see above)."""
+
+    def __init__(self, manifest, path):
+        self.manifest, self.path = manifest, path
+
+    def _file(self, cid):
+        return f"{self.path}/chunk_{int(cid)}.bin"
+
+    def has(self, cid):
+        """True when chunk `cid` is on disk AND matches this manifest's sha256 (anything else is removed)."""
+        p = self._file(cid)
+        if not os.path.isfile(p):
+            return False
+        with open(p, "rb") as f:
+            if verify_chunk(f.read(), self.manifest["chunks"][cid]):
+                return True
+        os.remove(p)
+        return False
+
+    def put(self, cid, chunk_bytes):
+        """verify then journal one downloaded chunk; a mismatch raises (the donor served bad bytes)"""
+        if not verify_chunk(chunk_bytes, self.manifest["chunks"][cid]):
+            raise IOError(f"chunk {cid} sha256 mismatch")
+        tmp = self._file(cid) + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(chunk_bytes)
+        os.replace(tmp, self._file(cid))
+
+    def chunks(self):
+        return SnapshotChunks(self.path, int(self.manifest["chunk_count"]))
+
+
+def _open_journal(manifest, home=None):
+    """the journal for `manifest` (its self-hash already verified, so snapshot_hash is a safe hex dir name),
+    discarding any journal of a DIFFERENT snapshot"""
+    root = _incoming_root(home)
+    path = f"{root}/{manifest['snapshot_hash']}"
+    if os.path.isdir(root):
+        for name in os.listdir(root):
+            if name != manifest["snapshot_hash"]:
+                shutil.rmtree(f"{root}/{name}", ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+    with open(f"{path}/manifest.json.tmp", "wb") as f:
+        f.write(codec.pack(manifest))
+    os.replace(f"{path}/manifest.json.tmp", f"{path}/manifest.json")
+    return _Journal(manifest, path)
+
+
+def discard_incoming(home=None):
+    """drop the download journal (after an import attempt — a verified-and-imported or a rejected payload
+    is never worth resuming)"""
+    shutil.rmtree(_incoming_root(home), ignore_errors=True)
+
+
 def _log(logger, level, msg):
     """log at `level` if a logger was passed (falling back to .info for unknown levels); silent no-op
     without one, so library callers and tests need not wire up logging"""
@@ -801,16 +1208,19 @@ def persist_checkpoint(height, block_hash, protocol, version, home=None, keep=2)
     of block `height`) and atomically persist manifest + chunks under snapshots/<height>/. Keeps the
     newest `keep` checkpoints. Returns the manifest. Correct by construction — never derives past state."""
     home = home or get_home()
-    manifest, chunk_bytes = build_snapshot(height, block_hash, protocol, version, home=home)
     final = _ckpt_path(height, home)
     tmp = final + ".tmp"
     shutil.rmtree(tmp, ignore_errors=True)
     os.makedirs(tmp, exist_ok=True)
-    with open(f"{tmp}/manifest.json", "wb") as f:
-        f.write(codec.pack(manifest))
-    for cid, cb in enumerate(chunk_bytes):
+
+    def _emit(cid, cb):
+        """chunks go to disk as the stream produces them — never the whole snapshot in RAM"""
         with open(f"{tmp}/chunk_{cid}.bin", "wb") as f:
             f.write(cb)
+
+    manifest = stream_snapshot(height, block_hash, protocol, version, _emit, home=home)
+    with open(f"{tmp}/manifest.json", "wb") as f:
+        f.write(codec.pack(manifest))
     shutil.rmtree(final, ignore_errors=True)
     os.rename(tmp, final)                      # atomic publish (a partial write never becomes visible)
     _prune_old_checkpoints(keep, home)
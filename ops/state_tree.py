@@ -0,0 +1,225 @@
+"""
+INCREMENTAL L1 state root — the same root snapshot_ops.merkle_root(_root_triples(read_state())) computes,
+maintained from each commit's write set instead of re-walking the whole state.
+
+Why: l1_state_root is memoised per write generation, but every block commit moves the generation, so every
+block paid read_state() (one LMDB walk over EVERY snapshot row + canonical render + sort) and a full fold —
+O(state) per block, per checkpoint (maybe_checkpoint_state) and per /state_health miss. Between two blocks
+only a few dozen rows change. So a tree per LMDB env keeps:
+
+    rows    — the sorted base triples (read_state() minus the root-excluded DBs / meta rows — everything the
+              retention window may still need to re-admit)
+    leaves  — the sorted ROOT triples (rows inside the retention window), i.e. exactly _root_triples()
+    levels  — levels[0] = blake2b(_leaf(t)) per leaf, levels[i+1] = the pairwise fold of levels[i] with the
+              odd tail duplicated — the EXACT fold merkle_root performs, so levels[-1][0] IS the root
+
+and kv_ops hands apply_commit() the final values of every (db, key) a write txn touched (read inside the
+txn, just before it commits, under the shared commit lock — see kv_ops._commit). A changed value rehashes
+its leaf and one path to the top: O(log n). An insert/delete shifts every later position, and because the
+fold pairs by POSITION (that is the committed rule, it can't change) every parent right of the first shift
+must be recomputed: O(n - p) hashes, but no LMDB walk, no render, no sort. When the retention floor moves
+(an epochw:<E> row — once per epoch) the leaf set is re-filtered from `rows` and refolded once.
+
+Same contract as ops/account_columns.py: a tree is tagged with the write generation it equals; a commit that
+lands while the tree is behind, or a bulk rewrite (snapshot restore drops whole sub-DBs), drops it, and the
+next l1_state_root rebuilds it from one read_state() walk. In-memory only: with a position-keyed fold an
+insert rewrites every node to its right, so persisting the tree would cost more LMDB writes per block than the
+one startup walk it would save.
+
+CROSS-CHECK: NADO_STATE_ROOT_CHECK=1 makes every served root also be recomputed from scratch and compared
+(a mismatch is logged loudly, the tree dropped and the from-scratch root served); check_root() runs the same
+comparison on demand (tests, operator diagnostics).
+"""
+import bisect
+import hashlib
+import os
+
+_EMPTY_ROOT = hashlib.blake2b(b"", digest_size=32).hexdigest()
+CROSS_CHECK = os.environ.get("NADO_STATE_ROOT_CHECK", "").strip() not in ("", "0")
+
+_trees = {}            # env_path -> StateTree
+
+
+def _h(data):
+    return hashlib.blake2b(data, digest_size=32).digest()
+
+
+class StateTree:
+    """Sorted base rows, sorted root leaves and the full fold over them, valid for write generation `gen`."""
+
+    def __init__(self, gen, rows, so):
+        self.gen = gen
+        self.rows = rows
+        self.floor = self._floor(so)
+        self.leaves = [t for t in rows if so._in_root_window(t, self.floor)]
+        self._refold(so)
+
+    def _floor(self, so):
+        """The retention floor from the epochw:<E> rows alone — one contiguous range of the sorted rows, so
+        an epoch boundary doesn't rescan the whole state to find the reference epoch."""
+        lo = bisect.bisect_left(self.rows, ("meta", so._EPOCHW_PREFIX))
+        hi = bisect.bisect_left(self.rows, ("meta", so._EPOCHW_PREFIX[:-1] + b";"))
+        return so._root_floor(self.rows[lo:hi])
+
+    def _refold(self, so):
+        level = [_h(so._leaf(t)) for t in self.leaves]
+        self.levels = [level]
+        while len(level) > 1:
+            if len(level) % 2:
+                level = level + [level[-1]]
+            level = [_h(level[i] + level[i + 1]) for i in range(0, len(level), 2)]
+            self.levels.append(level)
+
+    def root(self) -> str:
+        if not self.leaves:
+            return _EMPTY_ROOT
+        return self.levels[-1][0].hex()
+
+    @staticmethod
+    def _replace(lst, name, key, new):
+        """Replace every (name, key, *) triple in sorted list `lst` with the sorted triples `new`; returns the
+        first index touched and whether the list length changed."""
+        lo = bisect.bisect_left(lst, (name, key))
+        hi = lo
+        n = len(lst)
+        while hi < n and lst[hi][0] == name and lst[hi][1] == key:
+            hi += 1
+        lst[lo:hi] = new
+        return lo, (hi - lo) != len(new)
+
+    def apply(self, changes, so):
+        """Apply {(name, key): [sorted canonical triples]} (empty list = the key is gone / is default)."""
+        leaf_changes = []
+        for (name, key), new in changes.items():
+            new = [t for t in new if so._in_root_base(t)]
+            self._replace(self.rows, name, key, new)
+            leaf_changes.append((name, key, new))
+        floor = self.floor
+        if any(name == "meta" and key.startswith(so._EPOCHW_PREFIX) for name, key in changes):
+            floor = self._floor(so)
+        if floor != self.floor:
+            # the retention window slid (epoch boundary, or its rollback): re-filter + refold once
+            self.floor = floor
+            self.leaves = [t for t in self.rows if so._in_root_window(t, floor)]
+            self._refold(so)
+            return
+        level0 = self.levels[0]
+        dirty, tail = set(), None
+        for name, key, new in leaf_changes:
+            new = [t for t in new if so._in_root_window(t, floor)]
+            lo, shifted = self._replace(self.leaves, name, key, new)
+            if shifted:
+                tail = lo if tail is None else min(tail, lo)
+            else:
+                dirty.update(range(lo, lo + len(new)))
+        if tail is not None:
+            level0[tail:] = [_h(so._leaf(t)) for t in self.leaves[tail:]]
+        for i in dirty:
+            if tail is None or i < tail:
+                level0[i] = _h(so._leaf(self.leaves[i]))
+        self._fold_up(dirty, tail)
+
+    def _fold_up(self, dirty, tail):
+        """Recompute the parents of `dirty` children and every parent at/after `tail` (a positional shift),
+        level by level. The last parent of each level is always recomputed: its odd-tail duplication
+        depends on the level's length, which an insert/delete may have flipped."""
+        i = 0
+        while len(self.levels[i]) > 1:
+            child = self.levels[i]
+            n = len(child)
+            size = (n + 1) // 2
+            if i + 1 == len(self.levels):
+                self.levels.append([])
+            parent = self.levels[i + 1]
+            if tail is not None:
+                del parent[tail // 2:]
+            del parent[size:]
+            pdirty = {c // 2 for c in dirty if c < n}
+            pdirty.add(size - 1)
+            start = len(parent)
+            for p in range(start, size):
+                parent.append(None)
+            pdirty.update(range(start, size))
+            for p in pdirty:
+                left = child[2 * p]
+                right = child[2 * p + 1] if 2 * p + 1 < n else left
+                parent[p] = _h(left + right)
+            dirty, tail = pdirty, None
+            i += 1
+        del self.levels[i + 1:]
+
+
+def apply_commit(env_path, changes, full, gen_before, gen_after):
+    """Advance the env's tree by one commit (called by kv_ops under the commit lock, after the generation
+    bump). `changes`: {(db_name, key): [canonical (db, key, value) triples]}; `full` or a tree that wasn't at
+    `gen_before` drops the tree (next reader rebuilds)."""
+    t = _trees.get(env_path)
+    if t is None:
+        return
+    if full or t.gen != gen_before:
+        del _trees[env_path]
+        return
+    if changes:
+        from ops import snapshot_ops
+        t.apply(changes, snapshot_ops)
+    t.gen = gen_after
+
+
+def wanted(env_path) -> bool:
+    """True when a tree exists for this env — kv_ops only collects a commit's final values if so."""
+    return env_path in _trees
+
+
+def drop(env_path=None):
+    if env_path is None:
+        _trees.clear()
+    else:
+        _trees.pop(env_path, None)
+
+
+def root(home=None, logger=None):
+    """The incremental L1 state root for the committed state (building the tree on first use / after a drop).
+    Equal to merkle_root(_root_triples(read_state(home))) by construction — and by comparison when
+    CROSS_CHECK is on."""
+    from ops import kv_ops, snapshot_ops as so
+    path = kv_ops.env_path(home)
+    t = _trees.get(path)
+    if t is None or t.gen != kv_ops.write_generation():
+        gen = kv_ops.write_generation()
+        rows = [x for x in so.read_state(home) if so._in_root_base(x)]
+        t = StateTree(gen, rows, so)
+        with kv_ops._commit_lock:
+            if kv_ops.write_generation() == gen:
+                _trees[path] = t
+        return t.root()
+    with kv_ops._commit_lock:
+        r, gen = t.root(), t.gen
+    if CROSS_CHECK:
+        full = check_root(home, _incremental=(r, gen), logger=logger)
+        if full is not None:
+            return full
+    return r
+
+
+def check_root(home=None, _incremental=None, logger=None):
+    """Recompute the root from scratch and compare with the tree. Returns None when they agree (or the state
+    moved mid-check — nothing to conclude), else the from-scratch root, after dropping the tree."""
+    from ops import kv_ops, snapshot_ops as so
+    path = kv_ops.env_path(home)
+    if _incremental is None:
+        t = _trees.get(path)
+        if t is None:
+            return None
+        with kv_ops._commit_lock:
+            _incremental = (t.root(), t.gen)
+    gen = kv_ops.write_generation()
+    full = so.merkle_root(so._root_triples(so.read_state(home)))
+    if gen != _incremental[1] or kv_ops.write_generation() != gen or full == _incremental[0]:
+        return None
+    msg = f"INCREMENTAL STATE ROOT MISMATCH at gen {gen}: tree {_incremental[0][:16]} != full {full[:16]} — dropped"
+    if logger is not None:
+        logger.error(msg)
+    else:
+        print(f"[state_tree] {msg}", flush=True)
+    drop(path)
+    return full
@@ -0,0 +1,159 @@
+"""
+STATUS CORE — the compact, fixed-layout binary form of a peer's status (GET /status_core, and the
+`compress=core` mode of /status_stream).
+
+Why: /status is a diagnostic dump. Next to the dozen fields consensus reads it carries recovery state,
+recent_tx_rejects, last_fork_diff, update/disk checks, the pq backend — and it goes over the wire as
+zstd(JSON), so every poll and every pushed frame cost the peer a zstd decompress, a JSON parse of a few KB
+and a field-type walk (status_fields_well_typed), once a second per peer. Everything the peer loop, the
+consensus pools and the core loop's donor/snapshot votes read from a peer's status, plus every field the
+network panel (renderNodes in static/interface.js) shows from /status_pool, is CORE_FIELDS below: ints,
+32-byte digests and a few short labels. A field the panel starts reading needs a slot here, or it renders
+empty for every peer polled over the core wire (tests/test_status_core.py pins this). Fixed slots for those are
+~0.4 KB and decode with one struct.unpack — no zstd, no JSON, and the types are right by construction.
+
+Layout (network byte order), version 1:
+
+    "NC" | version u8 | present u32 | INT_FIELDS  u64 x 10 | HASH_FIELDS 32 B x 6 | STR_FIELDS (u8 len + ASCII) x 6
+
+`present` has one bit per field in CORE_FIELDS order; an absent (None) field is a zeroed slot / empty
+string with its bit clear, and decodes back to None — the same "absent or None" the full status
+already allows for every one of them. The record decodes to a dict with EXACTLY CORE_FIELDS as keys,
+so every consumer of consensus.status_pool keeps reading `st.get("latest_block_weight")` unchanged.
+
+A stream frame wraps a record: "NF" | version u8 | boot 8 B | seq u64 | kind u8 (0 idle, 1 full) | record
+— decoded to the same {"boot","seq","full","status"} shape as a zstd frame, so status_feed.apply_frame
+validates both alike. Core frames are always full (the record is smaller than most deltas).
+
+The encoding is STRICT both ways: pack_core raises on a value that does not fit its slot (a negative or
+>= 2**64 int, a bool, a hash that is not 64 lowercase hex, a non-ASCII / over-long label) instead of
+silently rounding it, and unpack_core raises on a wrong magic/version, unknown presence bits, an absent
+label carrying bytes, any length mismatch or an undecodable label. Peer bodies are UNTRUSTED; the
+decoded dict still goes through the usual admission gates.
+"""
+import struct
+
+CORE_MAGIC = b"NC"
+FRAME_MAGIC = b"NF"
+CORE_VERSION = 1
+# a record is ~0.4 KB; this bounds what a client reads from a peer claiming to send one
+CORE_MAX_BYTES = 4096
+
+# reported_uptime: the network panel's uptime column
+INT_FIELDS = ("protocol", "latest_block_height", "latest_block_weight", "earliest_block_height",
+              "finalized_height", "ffg_finalized", "hard_finality", "snapshot_height", "history_retention",
+              "reported_uptime")
+HASH_FIELDS = ("latest_block_hash", "upcoming_block_hash", "transaction_pool_hash", "earliest_block_hash",
+               "genesis_hash", "snapshot_hash")
+# address / chain_id: admission + key-collision; version, node_type, commits: the network panel and the
+# self-update cascade (peer_loop -> self_update.peer_hint)
+STR_FIELDS = ("address", "chain_id", "version", "node_type", "running_commit", "latest_main")
+CORE_FIELDS = INT_FIELDS + HASH_FIELDS + STR_FIELDS
+
+_HEAD = struct.Struct("!2sBI")
+_BODY = struct.Struct("!" + "Q" * len(INT_FIELDS) + "32s" * len(HASH_FIELDS))
+_FIXED = _HEAD.size + _BODY.size
+_FRAME = struct.Struct("!2sB8sQB")
+_ALL_BITS = (1 << len(CORE_FIELDS)) - 1
+_HEX = frozenset("0123456789abcdef")
+
+
+def pack_core(status) -> bytes:
+    """The core record of a status dict (any extra keys are ignored). Raises ValueError when a core
+    field does not fit its slot."""
+    present, ints, hashes, tail = 0, [], [], []
+    for i, f in enumerate(INT_FIELDS):
+        v = status.get(f)
+        if v is None:
+            ints.append(0)
+            continue
+        if not isinstance(v, int) or isinstance(v, bool) or not 0 <= v < 1 << 64:
+            raise ValueError(f"{f} does not fit a u64: {v!r}")
+        present |= 1 << i
+        ints.append(v)
+    for i, f in enumerate(HASH_FIELDS, len(INT_FIELDS)):
+        v = status.get(f)
+        if v is None:
+            hashes.append(b"\0" * 32)
+            continue
+        if not isinstance(v, str) or len(v) != 64 or not _HEX.issuperset(v):
+            raise ValueError(f"{f} is not a 32-byte lowercase hex digest: {v!r}")
+        present |= 1 << i
+        hashes.append(bytes.fromhex(v))
+    for i, f in enumerate(STR_FIELDS, len(INT_FIELDS) + len(HASH_FIELDS)):
+        v = status.get(f)
+        if v is None:
+            tail.append(b"\0")
+            continue
+        if not isinstance(v, str) or not v.isascii() or len(v) > 255:
+            raise ValueError(f"{f} is not a short ASCII label: {v!r}")
+        present |= 1 << i
+        tail.append(bytes((len(v),)) + v.encode("ascii"))
+    return _HEAD.pack(CORE_MAGIC, CORE_VERSION, present) + _BODY.pack(*ints, *hashes) + b"".join(tail)
+
+
+def unpack_core(body) -> dict:
+    """Decode an UNTRUSTED core record -> {field: value or None} over exactly CORE_FIELDS. Raises
+    ValueError on anything malformed (wrong magic/version, unknown presence bits, bad lengths)."""
+    body = bytes(body)
+    if len(body) < _FIXED or len(body) > CORE_MAX_BYTES:
+        raise ValueError(f"core record of {len(body)} bytes")
+    magic, version, present = _HEAD.unpack_from(body)
+    if magic != CORE_MAGIC or version != CORE_VERSION:
+        raise ValueError(f"not a v{CORE_VERSION} core record")
+    if present & ~_ALL_BITS:
+        raise ValueError("unknown core fields present")
+    slots = _BODY.unpack_from(body, _HEAD.size)
+    out, pos = {}, _FIXED
+    for i, f in enumerate(INT_FIELDS):
+        out[f] = slots[i] if present >> i & 1 else None
+    for i, f in enumerate(HASH_FIELDS, len(INT_FIELDS)):
+        out[f] = slots[i].hex() if present >> i & 1 else None
+    for i, f in enumerate(STR_FIELDS, len(INT_FIELDS) + len(HASH_FIELDS)):
+        if pos >= len(body):
+            raise ValueError("truncated core record")
+        n = body[pos]
+        raw = body[pos + 1:pos + 1 + n]
+        if len(raw) != n:
+            raise ValueError("truncated core record")
+        pos += 1 + n
+        if present >> i & 1:
+            out[f] = raw.decode("ascii")
+        elif n:
+            raise ValueError(f"absent {f} carries bytes")
+        else:
+            out[f] = None
+    if pos != len(body):
+        raise ValueError("trailing bytes after core record")
+    return out
+
+
+def pack_frame(boot, seq, status=None) -> bytes:
+    """A /status_stream?compress=core frame: the full core record of `status`, or an idle heartbeat when
+    `status` is None. `boot` is the feed's 16-hex boot id."""
+    head = _FRAME.pack(FRAME_MAGIC, CORE_VERSION, bytes.fromhex(boot), seq, 0 if status is None else 1)
+    return head if status is None else head + pack_core(status)
+
+
+def unpack_frame(body) -> dict:
+    """Decode an UNTRUSTED core stream frame -> {"boot", "seq", "full", "status"} (the zstd frame shape,
+    for status_feed.apply_frame). Raises ValueError on anything malformed."""
+    body = bytes(body)
+    if len(body) < _FRAME.size:
+        raise ValueError(f"core frame of {len(body)} bytes")
+    magic, version, boot, seq, kind = _FRAME.unpack_from(body)
+    if magic != FRAME_MAGIC or version != CORE_VERSION:
+        raise ValueError(f"not a v{CORE_VERSION} core frame")
+    if kind == 0:
+        if len(body) != _FRAME.size:
+            raise ValueError("idle core frame carries a record")
+        return {"boot": boot.hex(), "seq": seq, "full": False, "status": {}}
+    if kind != 1:
+        raise ValueError(f"unknown core frame kind {kind}")
+    return {"boot": boot.hex(), "seq": seq, "full": True, "status": unpack_core(body[_FRAME.size:])}
+
+
+def is_frame(body) -> bool:
+    """True when `body` is a core stream frame (a pre-core /status_stream answers compress=core with a
+    JSON frame instead — the subscriber then drops to the zstd wire)."""
+    return bytes(body[:2]) == FRAME_MAGIC
@@ -0,0 +1,316 @@
+"""
+PUSH STATUS — the /status_stream long-poll channel between peers, both halves.
+
+Why: the peer loop rebuilt consensus.status_pool by polling every peer's full /status once a second, and
+every one of those requests ran nado.status' _build on the serving node — self-update info, the snapshot
+manifest lookup, recovery debug, a zstd encode — for each poller, each second. With every node polling
+every other, the mesh paid peers² builds per second to learn, almost always, "nothing changed".
+
+The feed turns that around:
+
+  SERVER (StatusFeed, one per node, on the HTTP loop). A watcher reads the cheap change key — tip hash,
+  mempool hash, upcoming hash, finality — every STATUS_FEED_TICK_S. Only when it moves (or every
+  STATUS_FEED_REFRESH_S, for the slow fields nobody watches: update info, recovery, snapshot) is the
+  status dict built, ONCE, in a worker thread. A build that differs from the last one becomes a new
+  sequence number with a precomputed delta; its wire bytes are encoded once per (seq, kind, compress)
+  and handed to every subscriber. A subscriber asks GET /status_stream?since=<seq>&boot=<id>: one change
+  behind gets the delta, further behind (or another boot of the node) gets the full dict, caught up
+  waits until the next change or STATUS_STREAM_WAIT_S, whichever is first (an empty heartbeat).
+
+  CLIENT (StatusSubscriptions, in the peer loop). One long-poll per peer runs on the shared peer
+  transport loop (ops/peer_transport.py, keep-alive), merging frames into a per-peer status dict.
+  The peer loop reads snapshot() each pass and applies its admission gates exactly as before; a failed
+  subscription is reported through drain_failures() so the peer is purged like a failed poll was. A
+  peer that does not serve /status_stream yet (404 — mid-rollout) is polled on plain /status instead.
+
+  CORE WIRE (compress=core, ops/status_core.py). The peer loop subscribes for the fixed-layout binary
+  record of the consensus fields instead of zstd(JSON) frames of the whole diagnostic dict: ~0.4 KB per
+  change, one struct.unpack to decode. A stream that predates it (or whose status does not fit the core
+  slots) is followed on the zstd wire instead.
+
+Full /status is untouched: wallets, the exec node and the explorer keep using it.
+
+Frames are UNTRUSTED peer input: apply_frame validates shape and ordering and raises on anything off,
+which resets the subscription to a full resync. The merged dict then goes through the same admission
+gates (protocol, chain_id, genesis, field types) as a polled status always did.
+"""
+import asyncio
+import os
+import threading
+import time
+
+from ops import status_core
+
+# how often the server reads the change key (cheap attribute reads on the HTTP loop). Also the floor
+# between two builds, so a mempool churning every few ms still costs at most 1/TICK builds a second.
+STATUS_FEED_TICK_S = max(0.05, float(os.environ.get("NADO_STATUS_FEED_TICK_S", "0.25")))
+# rebuild this often even with the key unchanged, to carry the fields the key does not cover
+STATUS_FEED_REFRESH_S = max(1.0, float(os.environ.get("NADO_STATUS_FEED_REFRESH_S", "10")))
+# longest a caught-up subscriber is held before an empty heartbeat — also what bounds how long a dead
+# peer can go unnoticed (the client times out at WAIT + STATUS_STREAM_SLACK_S)
+STATUS_STREAM_WAIT_S = max(1, int(os.environ.get("NADO_STATUS_STREAM_WAIT_S", "10")))
+STATUS_STREAM_SLACK_S = 5
+# held requests beyond this are answered at once (heartbeat) instead of parked — a flood of idle
+# subscribers cannot pin unbounded connections on the HTTP loop
+STATUS_STREAM_MAX_WAITERS = 1024
+# client: pause after a failed subscription round / between legacy /status polls
+STATUS_RETRY_S = 1.0
+
+_BOOT_MAX = 32
+
+
+class StatusFeed:
+    """The server half. build() -> status dict (blocking; run in a worker thread), key() -> the cheap
+    change key (read on the loop), serialize(output, name, compress) -> the wire form (nado.serialize)."""
+
+    def __init__(self, build, key, serialize):
+        self._build, self._key, self._serialize = build, key, serialize
+        self.boot = os.urandom(8).hex()          # a restarted node is another stream: since= resets
+        self.seq = 0
+        self.snapshot = None
+        self.delta = None                        # (changed fields, removed keys) from seq-1 to seq
+        self.builds = 0
+        self._wire = {}                          # (seq, kind, compress) -> encoded frame, this seq only
+        self._changed = None                     # asyncio.Event, replaced (after set) on every publish
+        self._waiters = 0
+
+    def _event(self):
+        if self._changed is None:
+            self._changed = asyncio.Event()
+        return self._changed
+
+    def publish(self, status):
+        """Install a freshly built status dict. Returns True when it differs from the current one (new
+        seq, delta computed, waiters woken); an identical build is dropped."""
+        if not isinstance(status, dict) or status == self.snapshot:
+            return False
+        prev = self.snapshot or {}
+        self.delta = ({k: v for k, v in status.items() if k not in prev or prev[k] != v},
+                      [k for k in prev if k not in status])
+        self.snapshot = status
+        self.seq += 1
+        self._wire = {}
+        changed, self._changed = self._event(), asyncio.Event()
+        changed.set()
+        return True
+
+    async def refresh(self):
+        """Build once (worker thread) and publish."""
+        status = await asyncio.to_thread(self._build)
+        self.builds += 1
+        return self.publish(status)
+
+    async def run(self, logger=None):
+        """The watcher: rebuild when the key moves or STATUS_FEED_REFRESH_S passed. Never returns."""
+        last_key, last_build = object(), 0.0
+        while True:
+            try:
+                key = self._key()
+                now = time.monotonic()
+                if key != last_key or now - last_build >= STATUS_FEED_REFRESH_S:
+                    await self.refresh()
+                    last_key, last_build = key, now
+            except Exception as e:
+                if logger is not None:
+                    logger.error(f"Status feed build failed: {e}")
+            await asyncio.sleep(STATUS_FEED_TICK_S)
+
+    def frame(self, since, boot, compress=None):
+        """The encoded frame for a subscriber at (since, boot), or None when it is caught up. Each frame
+        kind is encoded once per seq and shared."""
+        if self.snapshot is None:
+            return None
+        if boot == self.boot and since == self.seq:
+            return None
+        kind = "delta" if (boot == self.boot and since == self.seq - 1) else "full"
+        return self._encode(kind, compress)
+
+    def heartbeat(self, compress=None):
+        """The empty frame for a subscriber that is (still) caught up."""
+        return self._encode("idle", compress)
+
+    def core(self):
+        """The current status as a bare core record (GET /status_core), packed once per seq; None before
+        the first build."""
+        if self.snapshot is None:
+            return None
+        wire = self._wire.get((self.seq, "record", "core"))
+        if wire is None:
+            wire = self._wire[(self.seq, "record", "core")] = status_core.pack_core(self.snapshot)
+        return wire
+
+    def _encode(self, kind, compress):
+        if compress == "core":
+            kind = "idle" if kind == "idle" else "full"     # core frames carry the whole record, no deltas
+        wire = self._wire.get((self.seq, kind, compress))
+        if wire is None and compress == "core":
+            try:
+                wire = status_core.pack_frame(self.boot, self.seq, None if kind == "idle" else self.snapshot)
+            except ValueError:
+                # our status does not fit the core slots: answer with the zstd frame — a 200 that is not a
+                # core frame is what moves a core subscriber to the zstd wire (an error only gets retried)
+                wire = self._encode(kind, "zstd")
+            self._wire[(self.seq, kind, compress)] = wire
+        elif wire is None:
+            frame = {"boot": self.boot, "seq": self.seq, "full": kind == "full"}
+            if kind == "full":
+                frame["status"] = self.snapshot
+            elif kind == "delta":
+                frame["status"], frame["removed"] = self.delta
+            else:
+                frame["status"] = {}
+            wire = self._wire[(self.seq, kind, compress)] = self._serialize(output=frame, name="status_stream",
+                                                                           compress=compress)
+        return wire
+
+    async def next_frame(self, since, boot, compress=None, wait=STATUS_STREAM_WAIT_S):
+        """What /status_stream answers: a frame at once when the subscriber is behind, otherwise the next
+        change or an empty heartbeat after `wait` seconds."""
+        wire = self.frame(since, boot, compress)
+        if wire is not None:
+            return wire
+        if self.snapshot is not None and self._waiters < STATUS_STREAM_MAX_WAITERS:
+            changed = self._event()
+            self._waiters += 1
+            try:
+                await asyncio.wait_for(changed.wait(), max(0, min(wait, STATUS_STREAM_WAIT_S)))
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                self._waiters -= 1
+            wire = self.frame(since, boot, compress)
+        if wire is None and self.snapshot is None:
+            return None
+        return wire if wire is not None else self.heartbeat(compress)
+
+
+def apply_frame(current, frame):
+    """Merge one UNTRUSTED frame into `current` ((boot, seq, status) or None) -> the new triple. A full
+    frame replaces; a delta/heartbeat must continue the same boot at seq or seq+1. Raises on anything
+    malformed or out of order (the caller drops its state and resubscribes from scratch). Never mutates
+    the previous status dict — the peer loop hands it to the consensus pools as-is."""
+    if not isinstance(frame, dict):
+        raise ValueError("frame is not a dict")
+    boot, seq, status = frame.get("boot"), frame.get("seq"), frame.get("status")
+    if not (isinstance(boot, str) and 0 < len(boot) <= _BOOT_MAX and isinstance(seq, int) and seq > 0
+            and isinstance(status, dict)):
+        raise ValueError("malformed frame")
+    if frame.get("full") is True:
+        return boot, seq, dict(status)
+    if current is None or current[0] != boot or seq not in (current[1], current[1] + 1):
+        raise ValueError("delta out of order")
+    if seq == current[1]:
+        if status:
+            raise ValueError("heartbeat carries fields")
+        return current
+    removed = frame.get("removed") or []
+    if not isinstance(removed, list):
+        raise ValueError("malformed removed list")
+    merged = {k: v for k, v in current[2].items() if k not in removed}
+    merged.update(status)
+    return boot, seq, merged
+
+
+class StatusSubscriptions:
+    """The client half: one /status_stream long-poll per peer on the shared peer transport loop.
+
+    follow(peers) starts subscriptions for new peers and cancels those for peers no longer listed;
+    snapshot() is {peer: latest status} for every peer whose subscription is healthy; drain_failures()
+    returns (and forgets) the peers whose subscription failed since the last call. Thread-safe.
+
+    core=True (the peer loop) subscribes on the binary core wire (ops/status_core.py): each status is the
+    CORE_FIELDS record, not the full diagnostic dict. core=False keeps the full dict over zstd frames."""
+
+    def __init__(self, port, logger=None, wait=STATUS_STREAM_WAIT_S, core=True):
+        self.port, self.logger, self.wait, self.core = port, logger, wait, core
+        self._lock = threading.Lock()
+        self._tasks = {}                 # peer -> concurrent.futures.Future of its _follow task
+        self._status = {}                # peer -> latest merged status dict
+        self._failed = []
+
+    def follow(self, peers):
+        from ops import peer_transport
+        want = set(peers)
+        with self._lock:
+            for peer in list(self._tasks):
+                if peer not in want or self._tasks[peer].done():
+                    self._tasks.pop(peer).cancel()
+                    self._status.pop(peer, None)
+            for peer in want - set(self._tasks):
+                self._tasks[peer] = peer_transport.spawn(self._follow(peer))
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._status)
+
+    def drain_failures(self):
+        with self._lock:
+            out, self._failed = self._failed, []
+            return out
+
+    def close(self):
+        self.follow(())
+
+    def _set(self, peer, status):
+        with self._lock:
+            if peer in self._tasks:
+                self._status[peer] = status
+
+    def _fail(self, peer, e):
+        with self._lock:
+            self._status.pop(peer, None)
+            if peer not in self._failed:
+                self._failed.append(peer)
+        if self.logger is not None:
+            self.logger.error(f"Status stream of {peer} failed: {e}")
+
+    async def _follow(self, peer):
+        from config import hostport
+        from ops import peer_transport
+        from ops.net_ops import unpack_zstd_peer, MAX_PEER_BODY
+        base = f"http://{hostport(peer, self.port)}"
+        current, legacy, idle = None, False, 0.0
+        wire = "core" if self.core else "zstd"
+        while True:
+            try:
+                if legacy:
+                    status = await peer_transport.fetch_zstd(f"{base}/status?compress=zstd", 5)
+                    if not isinstance(status, dict):
+                        raise IOError("no status")
+                    self._set(peer, status)
+                    await asyncio.sleep(STATUS_RETRY_S)
+                    continue
+                since, boot = (current[1], current[0]) if current else (0, "")
+                asked = time.monotonic()
+                code, body = await peer_transport.fetch(
+                    f"{base}/status_stream?since={since}&boot={boot}&wait={self.wait}&compress={wire}",
+                    self.wait + STATUS_STREAM_SLACK_S, connect=5,
+                    cap=status_core.CORE_MAX_BYTES if wire == "core" else MAX_PEER_BODY)
+                if code == 404:
+                    legacy = True                 # pre-stream node: plain polling until it updates
+                    continue
+                if code != 200:
+                    raise IOError(f"HTTP {code}")     # a 429 / proxy 502 is transient: keep the wire
+                if wire == "core" and not status_core.is_frame(body):
+                    # a stream without the core wire (it answers compress=core with a JSON frame), or one
+                    # whose status does not fit the core slots (it answers with a zstd frame): the zstd
+                    # wire carries anything
+                    wire, current = "zstd", None
+                    continue
+                frame = status_core.unpack_frame(body) if wire == "core" else \
+                    await peer_transport.decode(unpack_zstd_peer, body)
+                current = apply_frame(current, frame)
+                self._set(peer, current[2])
+                if frame.get("full") or frame.get("status") or time.monotonic() - asked >= STATUS_RETRY_S:
+                    idle = 0.0
+                else:
+                    # an empty heartbeat answered at once: the peer is over STATUS_STREAM_MAX_WAITERS and
+                    # is not parking us — back off instead of re-asking in a tight loop
+                    idle = min(float(self.wait), max(STATUS_RETRY_S, idle * 2))
+                    await asyncio.sleep(idle)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                current = None
+                self._fail(peer, e)
+                await asyncio.sleep(STATUS_RETRY_S)
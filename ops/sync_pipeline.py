@@ -0,0 +1,193 @@
+"""
+PIPELINED forward sync — fetch-ahead + stateless pre-verification for core_loop._fast_forward_from.
+
+Why: emergency sync pulled one batch, then (since the first pipelining pass) overlapped exactly ONE next
+download with applying the current batch. Applying a batch is verify-bound, and the expensive half of that
+verification — ML-DSA signatures (one per tx, plus the detached winner signature) and re-hashing the block
+content — does not depend on chain state at all. Those were still paid inline, on the one thread that also
+has to do the strictly sequential state work (rebuild, reward, producer, state root, incorporate). So sync
+ran at fetch + verify + apply per batch, with only the fetch of ONE batch hidden.
+
+The pipeline splits it into three stages:
+
+    fetch        one thread walks the donor's chain ahead of us, tail hash to tail hash, keeping up to
+                 SYNC_PREFETCH_BATCHES batches in flight/ready (a bounded queue — a donor far ahead of us
+                 can never balloon memory to its whole chain: the fetcher blocks once the queue is full)
+    pre-verify   every fetched batch goes to a small worker pool for the STATELESS checks: block hash ==
+                 content hash, the detached winner signature, parent linkage inside the batch, and one
+                 preverify_origins pass per block (which fans signatures out to the signatures.verify_many
+                 process pool and records every accept in the verified-signature cache)
+    incorporate  the caller — core_loop — takes batches strictly in order and applies each block with
+                 produce_block exactly as before. Its own preverify_origins call then finds the block's
+                 signatures already cached and only pays the state checks.
+
+PRE-VERIFICATION DECIDES NOTHING. produce_block/verify_block stay the one authority on accept/reject: a
+block the pre-verifier flags is still handed over and rejected there, with the usual reject bookkeeping
+(last_block_reject, tip exclusion). The only thing a flagged block changes is that the fetcher stops walking
+past it — every descendant of an invalid block is invalid, so downloading them is waste. A triple missing
+from the signature cache (pre-verify skipped, lost the race, or a PUBKEY-ONCE tx whose key is only
+established by an earlier block not yet incorporated) is verified normally in validate_origin, so the
+pipeline can change timing but never an outcome.
+
+DISCARD: close() (rejected block, shutdown, a reorg decision, or simply leaving the loop) stops the fetcher,
+drops every queued batch and cancels their pending pre-verification. A fetch already on the wire finishes in
+its daemon thread and its result is thrown away — nothing fetched after close() ever reaches the caller.
+"""
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# batches kept ahead of the one being applied. SYNC_BATCH_MAX (500) blocks of ~7 KB is ~3.5 MB per batch,
+# so the default keeps ~10 MB of chain in memory — and a fat-block donor is still bounded by the count.
+SYNC_PREFETCH_BATCHES = max(1, int(os.environ.get("NADO_SYNC_PREFETCH_BATCHES", "3")))
+# pre-verification threads. Signature work itself runs in the verify_many process pool; these threads only
+# hash block content and fan batches out, so two keep the pool fed without competing with the apply thread.
+SYNC_PREVERIFY_WORKERS = max(1, int(os.environ.get("NADO_SYNC_PREVERIFY_WORKERS", "2")))
+
+_POLL_S = 0.2          # how often a blocked put/get re-checks the stop flag
+
+
+def preverify_block(block):
+    """The STATELESS checks for one synced block. Returns None when they pass, else a short reason. Never
+    raises. Side effect (the point): the block's tx signatures land in the verified-signature cache."""
+    from ops.block_ops import block_content_hash, verify_block_signature
+    from ops.transaction_ops import preverify_origins
+    try:
+        if not isinstance(block, dict) or not isinstance(block.get("block_transactions"), list):
+            return "malformed block"
+        if block_content_hash(block) != block.get("block_hash"):
+            return "content does not hash to block_hash"
+        if not verify_block_signature(block):
+            return "invalid detached winner signature"
+        preverify_origins(block["block_transactions"])
+    except Exception as e:
+        return f"malformed block ({e})"
+    return None
+
+
+def preverify_batch(batch, from_hash):
+    """Pre-verify a batch in order. Returns the index of the first block that fails (stateless checks, or
+    parent linkage to `from_hash` / the previous block), or None when the whole batch passes. Stops at the
+    first failure: nothing after an invalid block can be applied."""
+    parent = from_hash
+    for i, block in enumerate(batch):
+        if not isinstance(block, dict) or block.get("parent_hash") != parent:
+            return i
+        if preverify_block(block) is not None:
+            return i
+        parent = block.get("block_hash")
+    return None
+
+
+class SyncPipeline:
+    """Fetch-ahead + pre-verify for one donor, starting after `from_hash`.
+
+    fetch(from_hash) -> list of blocks (falsy on failure / nothing newer) — core_loop._fetch_sync_batch.
+    next() hands the batches over strictly in chain order, each already pre-verified; None once the donor
+    ran dry, a fetch failed, a pre-verify failure ended the walk (after that batch was handed over), or the
+    pipeline was closed. Always close() it — it is also a context manager."""
+
+    def __init__(self, fetch, from_hash, depth=None, workers=None, preverify=preverify_batch):
+        self._fetch = fetch
+        self._preverify = preverify
+        self._stop = threading.Event()
+        self._queue = queue.Queue(maxsize=depth or SYNC_PREFETCH_BATCHES)
+        self._pool = ThreadPoolExecutor(max_workers=workers or SYNC_PREVERIFY_WORKERS,
+                                        thread_name_prefix="sync-preverify")
+        self.bad_at = None              # (batch number, block index) of the first pre-verify failure
+        self._thread = threading.Thread(target=self._run, args=(from_hash,), daemon=True,
+                                        name="sync-prefetch")
+        self._thread.start()
+
+    def _put(self, item):
+        """Blocking put that gives up once the pipeline is closed (the queue being full is the backpressure)."""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=_POLL_S)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self, tail):
+        pending = []                                         # (batch number, verdict future), fetch order
+        n = 0
+        try:
+            while not self._stop.is_set():
+                # stop walking past a batch that does not continue the chain or carries an invalid block.
+                # Verdicts are checked as they complete, not awaited: several batches pre-verify at once.
+                if self._first_bad(pending):
+                    break
+                batch = self._fetch(tail)
+                if self._stop.is_set():
+                    return                                   # closed while on the wire: discard
+                if not batch:
+                    break
+                try:
+                    fut = self._pool.submit(self._preverify, batch, tail)
+                except RuntimeError:
+                    return                                   # pool shut down by close()
+                if not self._put((batch, fut)):
+                    fut.cancel()
+                    return
+                pending.append((n, fut))
+                tail = batch[-1].get("block_hash") if isinstance(batch[-1], dict) else None
+                if not tail:
+                    break
+                n += 1
+        except Exception:
+            pass                                             # _fetch never raises; belt for the pool/queue
+        finally:
+            self._put(None)                                  # end-of-stream marker (dropped if closed)
+
+    def _first_bad(self, pending):
+        """Pop completed verdicts off the front of `pending`; True (and bad_at set) at the first failure."""
+        while pending and pending[0][1].done():
+            n, fut = pending.pop(0)
+            try:
+                bad = fut.result()
+            except Exception:
+                bad = None
+            if bad is not None:
+                self.bad_at = (n, bad)
+                return True
+        return False
+
+    def next(self):
+        """The next batch (fetched + pre-verified), or None at end of stream / after close()."""
+        while not self._stop.is_set():
+            try:
+                item = self._queue.get(timeout=_POLL_S)
+            except queue.Empty:
+                if not self._thread.is_alive() and self._queue.empty():
+                    return None
+                continue
+            if item is None:
+                return None
+            batch, fut = item
+            try:
+                fut.result()                                 # signatures cached before we apply
+            except Exception:
+                pass                                         # pre-verify is an accelerator only
+            return batch
+        return None
+
+    def close(self):
+        """Stop fetching, drop every queued batch and cancel their pending pre-verification. Idempotent."""
+        self._stop.set()
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                item[1].cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
@@ -1,9 +1,12 @@
 import asyncio
+import threading
 import time as _time
 import json
+from collections import OrderedDict
+from hashlib import blake2b
 
 
-from signatures import sign, verify, unhex
+from signatures import sign, verify, verify_many, unhex
 from ops.account_ops import get_account, reflect_transaction
 from ops.address_ops import proof_sender, make_address, is_address
 from ops.address_ops import validate_address
@@ -864,7 +867,7 @@ class ProofUnavailable(Exception):
     """
 
 
-def validate_transaction(transaction, logger, block_height, deep=False):
+def validate_transaction(transaction, logger, block_height, deep=False, preverified=None):
     """CONSENSUS admission gate for one tx — raises AssertionError on the first violation. Checks:
     chain_id (no cross-chain replay), signature over the txid (validate_origin, PUBKEY-ONCE aware),
     sender is a real KEYED address (a keyless reserved name can never originate a tx), recipient is a
@@ -874,7 +877,9 @@ def validate_transaction(transaction, logger, block_height, deep=False):
     +nullifier exits, treasury quorum, HTLC windows, fee floors, ...), and finally validate_txid so
     the signature binds the FULL body. Runs in both the mempool and block verification and reads only
     committed state, so it MUST be deterministic — nodes that disagree here fork on block validity.
-    Rejection is what stands between the ledger and forged, replayed, underpaid or double-claimed txs."""
+    Rejection is what stands between the ledger and forged, replayed, underpaid or double-claimed txs.
+    `preverified` is an optional preverify_origins() set for the block being validated — it only lets
+    validate_origin skip re-verifying a signature the batch pass already accepted; every check still runs."""
     assert isinstance(transaction, dict), "Data structure incomplete"
     assert transaction.get("chain_id") == CHAIN_ID, "Wrong or missing chain id"
     # HALT-CLASS (codec safety, audit 2026-07): `data` must survive the STORAGE codec, which
@@ -918,7 +923,7 @@ def validate_transaction(transaction, logger, block_height, deep=False):
         assert isinstance(transaction.get("signature"), list), "multisig tx needs a signature list"
         assert transaction.get("fee", 0) >= MIN_TX_FEE * len(transaction["signature"]), \
             "multisig fee below the per-signature floor"
-    assert validate_origin(transaction), "Invalid origin"
+    assert validate_origin(transaction, preverified=preverified), "Invalid origin"
     # SENDER must be a real keyed address — never a reserved protocol pseudo-recipient.
     assert validate_address(transaction["sender"], allow_reserved=False), f"Invalid sender {transaction['sender']}"
     # RECIPIENT (the target) must be a checksum-valid address OR a reserved protocol recipient
@@ -1934,7 +1939,123 @@ def validate_all_spending(transaction_pool: list):
     return True
 
 
-def validate_origin(transaction: dict):
+# VERIFIED-SIGNATURE CACHE shared by mempool admission and block verification. Every tx we see is verified
+# twice — once in merge_transaction (mempool admission), then again when a peer's block carrying it goes
+# through validate_transactions_in_block — and on the pure-Python backend that second pass is ~15 ms per tx
+# per block, for an answer we already have. An ML-DSA verdict is a pure function of (signature, public key,
+# message), and the message IS the txid, so the key binds the txid plus digests of the exact key and
+# signature bytes: a different key or signature for the same txid is a different entry and is verified on
+# its own. Only ACCEPTS are cached; a reject is never remembered, so the cache can skip work but never
+# decide anything verify() would not. Bounded LRU (an OrderedDict, moved-to-end on hit), sized to cover a
+# full mempool.
+#
+# Cleared on rollback (rollback.rollback_one_block) although no verdict depends on chain state: a reorg is
+# the point where a node re-validates the most txs from the least trusted source, and starting it with no
+# remembered verdicts keeps "what did this node actually verify" simple to reason about. NOT persisted across
+# restarts: the verdicts are only as good as the backend that produced them, and a restart is exactly when
+# the backend can change (a rebuilt or newly-failing native lib) — re-verifying the pool once is cheap next
+# to carrying an unauditable accept-list across that boundary.
+_VERIFIED_SIGS = OrderedDict()
+_VERIFIED_SIGS_MAX = 200_000
+_VERIFIED_SIGS_LOCK = threading.Lock()
+
+
+def _verified_key(signed, public_key, message) -> bytes:
+    """Cache key for one verdict: blake2b over (txid, blake2b(public_key), blake2b(signature))."""
+    return blake2b(bytes(message) + blake2b(str(public_key).encode(), digest_size=32).digest()
+                   + blake2b(str(signed).encode(), digest_size=32).digest(), digest_size=32).digest()
+
+
+def _verified_get(key) -> bool:
+    with _VERIFIED_SIGS_LOCK:
+        if key in _VERIFIED_SIGS:
+            _VERIFIED_SIGS.move_to_end(key)
+            return True
+        return False
+
+
+def _verified_put(key):
+    with _VERIFIED_SIGS_LOCK:
+        _VERIFIED_SIGS[key] = True
+        _VERIFIED_SIGS.move_to_end(key)
+        while len(_VERIFIED_SIGS) > _VERIFIED_SIGS_MAX:
+            _VERIFIED_SIGS.popitem(last=False)
+
+
+def clear_verified_signatures():
+    """Drop every cached signature verdict (rollback; see _VERIFIED_SIGS)."""
+    with _VERIFIED_SIGS_LOCK:
+        _VERIFIED_SIGS.clear()
+
+
+def signature_ok(signed, public_key, message, preverified=None) -> bool:
+    """verify(), short-circuited by the verified-signature cache and a preverify_origins() set: a triple
+    already ACCEPTED (at mempool admission, or by the block's batch pass) is not verified again. Only accepts
+    are ever recorded, so a miss is just the ordinary verify — the answer for any triple is identical."""
+    if preverified is not None and (signed, public_key, message) in preverified:
+        return True
+    try:
+        key = _verified_key(signed, public_key, message)
+    except Exception:
+        return verify(signed=signed, public_key=public_key, message=message)
+    if _verified_get(key):
+        return True
+    ok = verify(signed=signed, public_key=public_key, message=message)
+    if ok:
+        _verified_put(key)
+    return ok
+
+
+def origin_claims(transaction) -> list:
+    """The (signature, public_key, message) triples validate_origin would verify for this tx, resolved the
+    same way (PUBKEY-ONCE falls back to the sender's on-chain key). Best-effort: anything malformed yields
+    no claim and is left for validate_origin to reject with its usual error."""
+    try:
+        message = unhex(transaction["txid"])
+        if transaction.get("multisig") is not None:
+            return [(e["signature"], e["public_key"], message) for e in transaction["signature"]
+                    if isinstance(e, dict) and isinstance(e.get("signature"), str)
+                    and isinstance(e.get("public_key"), str)]
+        public_key = transaction.get("public_key")
+        if not public_key:
+            account = get_account(transaction["sender"], create_on_error=False)
+            public_key = account.get("public_key") if account else None
+        if isinstance(public_key, str) and isinstance(transaction.get("signature"), str):
+            return [(transaction["signature"], public_key, message)]
+    except Exception:
+        pass
+    return []
+
+
+def preverify_origins(transactions) -> set:
+    """ONE parallel signature pass over a whole block (signatures.verify_many), ahead of the sequential
+    per-tx checks. Triples already in the verified-signature cache (gossiped txs admitted to our mempool)
+    are not sent to the pool at all, and fresh accepts are added to it. Returns the set of triples that
+    verified; validate_transaction(preverified=...) then only pays the cheap state checks. Pure accelerator: a triple missing from the set is verified normally, so a
+    failed/partial pass can change timing but never an accept/reject outcome."""
+    claims = []
+    for transaction in transactions:
+        if isinstance(transaction, dict):
+            claims.extend(origin_claims(transaction))
+    claims = list(dict.fromkeys(claims))
+    known, pending = set(), []
+    for claim in claims:
+        try:
+            key = _verified_key(*claim)
+        except Exception:
+            continue
+        if _verified_get(key):
+            known.add(claim)                 # already verified at mempool admission: nothing to re-check
+        else:
+            pending.append((claim, key))
+    for (claim, key), ok in zip(pending, verify_many([c for c, _ in pending])):
+        if ok:
+            known.add(claim)
+            _verified_put(key)
+    return known
+
+
+def validate_origin(transaction: dict, preverified=None):
     """signature is verified over the txid (which canonically commits the whole body,
     including chain_id); it is not itself part of the signed message."""
 
@@ -1943,7 +2064,7 @@ def validate_origin(transaction: dict):
     # origin question (descriptor -> sender binding, M distinct valid member sigs) lives there.
     if transaction.get("multisig") is not None:
         from ops.multisig_ops import verify_multisig_origin
-        return verify_multisig_origin(transaction)
+        return verify_multisig_origin(transaction, preverified=preverified)
 
     transaction = transaction.copy()
     signature = transaction["signature"]
@@ -1963,10 +2084,11 @@ def validate_origin(transaction: dict):
         public_key=public_key
     ), "Invalid sender"
 
-    assert verify(
+    assert signature_ok(
         signed=signature,
-        message=unhex(transaction["txid"]),
         public_key=public_key,
+        message=unhex(transaction["txid"]),
+        preverified=preverified,
     ), "Invalid signature"
 
     return True
@@ -3,7 +3,7 @@ from ops.account_ops import (index_totals, get_totals, get_finalized_height, set
                              get_hard_finality)
 from ops.block_ops import load_block_from_hash, set_latest_block_info, unindex_block
 from ops import kv_ops
-from ops.transaction_ops import unindex_transactions
+from ops.transaction_ops import unindex_transactions, clear_verified_signatures
 from ops.reward_ops import credit_block_reward, apply_treasury_burn
 
 
@@ -101,6 +101,10 @@ def rollback_one_block(logger, block, depth: int = 1) -> dict:
 
     set_latest_block_info(latest_block=previous_block, logger=logger)
 
+    # Forget every remembered signature verdict (transaction_ops._VERIFIED_SIGS): the reorg re-validates
+    # the replacement branch's txs from scratch.
+    clear_verified_signatures()
+
     # ROLLING-NODE SYNC: discard any persisted state checkpoint above the new tip — it captured a state
     # that is being reverted. Advertised checkpoints are always finalized (and finality refuses this
     # rollback above the floor), so in practice this only clears a not-yet-final checkpoint.
@@ -292,6 +292,95 @@ def verify(signed, public_key, message):
         return False
 
 
+# --- batch verification (block validation) --------------------------------------------------------
+# A 150-tx block is 150 ML-DSA verifies, and every one of them queues on _CRYPTO_LOCK above — so block
+# verification cost scaled with TX COUNT on one core even on a 16-core validator. The lock cannot simply be
+# dropped (the backend's NTT state is module-level, see THREAD-SAFETY), but it only serialises callers that
+# share one copy of that state. A worker PROCESS has its own copy, so N workers verify N signatures at once
+# with no lock at all: per-process backend instances, not per-thread ones (which did not help — measured).
+#
+# FORK, not spawn/forkserver: both of those re-import __main__ in the child, and nado.py is the server
+# entrypoint and deliberately NOT import-safe — a spawned verify worker would boot a second node. The pool is
+# forked under _CRYPTO_LOCK so no thread can be mid-verify at the fork instant: the child's copy of the
+# backend state is always quiescent, never a half-mutated NTT buffer.
+#
+# verify_many has exactly verify()'s contract per item (True/False, never raises). Small batches, single-core
+# boxes and any pool failure all degrade to the plain sequential verify — the batch path can only ever be an
+# accelerator, never a different answer.
+VERIFY_PARALLEL_MIN = 8        # items per worker below which IPC costs more than it saves -> verify inline
+_VERIFY_POOL = [None]          # [ProcessPoolExecutor | None], created lazily on the first big batch
+_VERIFY_POOL_LOCK = threading.Lock()
+
+
+def verify_workers() -> int:
+    """How many verify worker processes a batch may use: NADO_VERIFY_WORKERS if set, else the core count.
+    0/1 disables the pool entirely (every batch verifies inline)."""
+    try:
+        return max(1, int(os.environ.get("NADO_VERIFY_WORKERS", "") or (os.cpu_count() or 1)))
+    except ValueError:
+        return max(1, os.cpu_count() or 1)
+
+
+def _verify_chunk(items):
+    """Worker-process body: verify() over a slice of the batch. No lock — this process is single-threaded
+    and owns its backend state outright (that is the whole point of the pool)."""
+    out = []
+    for signed, public_key, message in items:
+        try:
+            out.append(bool(_BACKEND.verify_internal(unhex(public_key), message, unhex(signed))))
+        except Exception:
+            out.append(False)
+    return out
+
+
+def _verify_pool():
+    """The shared fork-context pool, created on first use (None where fork is unavailable)."""
+    with _VERIFY_POOL_LOCK:
+        if _VERIFY_POOL[0] is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            if "fork" not in multiprocessing.get_all_start_methods():
+                return None
+            _VERIFY_POOL[0] = ProcessPoolExecutor(max_workers=verify_workers(),
+                                                  mp_context=multiprocessing.get_context("fork"))
+        return _VERIFY_POOL[0]
+
+
+def _drop_verify_pool():
+    """Discard a broken pool (a worker died / was OOM-killed); the next batch forks a fresh one."""
+    with _VERIFY_POOL_LOCK:
+        pool, _VERIFY_POOL[0] = _VERIFY_POOL[0], None
+    if pool is not None:
+        try:
+            pool.shutdown(wait=False, cancel_futures=True)
+        except Exception:
+            pass
+
+
+def verify_many(items):
+    """Batch verify(): `items` is an iterable of (signed_hex, public_key_hex, message_bytes); returns a list
+    of bools in the same order, each exactly what verify() would return for that triple. Large batches are
+    split across the worker pool so block verification scales with cores instead of tx count."""
+    items = list(items)
+    workers = min(verify_workers(), len(items) // VERIFY_PARALLEL_MIN)
+    if workers < 2:
+        return [verify(signed=s, public_key=pk, message=m) for s, pk, m in items]
+    try:
+        pool = _verify_pool()
+        if pool is None:
+            return [verify(signed=s, public_key=pk, message=m) for s, pk, m in items]
+        size = -(-len(items) // workers)
+        with _CRYPTO_LOCK:                 # the first submit forks the workers — see the fork note above
+            futures = [pool.submit(_verify_chunk, items[i:i + size]) for i in range(0, len(items), size)]
+        out = []
+        for f in futures:
+            out.extend(f.result())
+        return out
+    except Exception:
+        _drop_verify_pool()
+        return [verify(signed=s, public_key=pk, message=m) for s, pk, m in items]
+
+
 def _keydict_from_seed(seed: bytes):
     """seed -> the canonical keydict shape the rest of the node stores/passes around. The 32-byte
     seed alone IS the identity: the ML-DSA secret key is never persisted, only re-derived, which
@@ -1549,11 +1549,21 @@ export class NadoDapp {
   // decode_view can't enumerate (e.g. bet's claimable_of/stake_of). Returns the method's RET value as a
   // BigInt (the server sends it as a STRING so amounts/hashes over 2^53 survive JSON.parse), or null on
   // error. A non-numeric RET falls back to the raw value. Args may be ints or address strings.
+  // The last reply per URL is kept with its ETag and sent back as If-None-Match, so a tick that finds the
+  // answer unchanged costs the server a 304 and no body.
   async view(method, args) {
     try {
-      const r = await (await fetch(base() + "/exec/view?ns=" + this.ns + "&cid=" + this.cid
-        + "&method=" + encodeURIComponent(method) + "&args=" + encodeURIComponent(JSON.stringify(args || [])),
-        { cache: "no-store" })).json();
+      const url = base() + "/exec/view?ns=" + this.ns + "&cid=" + this.cid
+        + "&method=" + encodeURIComponent(method) + "&args=" + encodeURIComponent(JSON.stringify(args || []));
+      const memo = this._viewEtags || (this._viewEtags = new Map()), last = memo.get(url);
+      const resp = await fetch(url, { cache: "no-store", headers: last ? { "If-None-Match": last.etag } : {} });
+      let r;
+      if (resp.status === 304 && last) r = last.r;
+      else {
+        r = await resp.json();
+        const etag = resp.headers.get("ETag");
+        if (etag) { memo.delete(url); memo.set(url, { etag, r }); if (memo.size > 256) memo.delete(memo.keys().next().value); }
+      }
       const v = r && (r.result !== undefined ? r.result : r.ret);
       if (v == null) return null;
       try { return BigInt(v); } catch { return v; }
@@ -0,0 +1,160 @@
+"""
+Columnar account mirror (ops/account_columns.py) kept current from each commit's account write set.
+
+The mirror feeds producer selection (get_bonded_registry), so it is held to EXACT equality with a full scan
+of the committed accounts table after every kind of write: block-style write txns, standalone helper
+writes, deletes (idle GC), aborted txns (nothing may leak in), and a snapshot restore that rewrites the
+table wholesale. The registry and rich-list derivations are compared against the scan-based originals.
+
+Run: python3 tests/test_account_columns.py
+"""
+import os, sys, tempfile, traceback, random, math, heapq
+os.environ["HOME"] = tempfile.mkdtemp(prefix="nado_acols_")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for d in ("index", "blocks", "logs", "peers"):
+    os.makedirs(f"{os.environ['HOME']}/nado/{d}", exist_ok=True)
+
+from genesis import create_indexers
+create_indexers()
+
+from ops import kv_ops, account_columns, account_ops
+from protocol import B_MIN, DENOMINATION
+
+fails = 0
+def check(name, fn):
+    """Run fn; print PASS/FAIL and count failures."""
+    global fails
+    try: fn(); print(f"PASS  {name}")
+    except Exception as e:
+        fails += 1; print(f"FAIL  {name}: {e}"); traceback.print_exc()
+
+RNG = random.Random(7)
+ADDRS = [f"ndo{i:040d}" for i in range(60)]
+
+
+def _scan():
+    """{address: (fields...)} straight from LMDB — the ground truth."""
+    return {a: tuple(int(d.get(f, 0)) for f in account_columns.FIELDS) for a, d in kv_ops.iter_accounts()}
+
+def _mirror():
+    """{address: (fields...)} from the INSTALLED mirror, which must be at the current generation."""
+    account_columns.holdings()                               # make sure one is built / current
+    m = account_columns._mirrors[kv_ops.env_path()]
+    assert m.gen == kv_ops.write_generation(), "mirror not at the committed generation"
+    return {a: tuple(m.cols[f][r] for f in account_columns.FIELDS) for a, r in m.row.items()}
+
+def _random_write():
+    a = RNG.choice(ADDRS)
+    op = RNG.random()
+    if op < 0.45:
+        kv_ops.account_adjust(a, RNG.choice(("balance", "bonded")), RNG.choice((B_MIN, 10, B_MIN * 3)))
+    elif op < 0.7:
+        kv_ops.account_adjust(a, "bonded", -B_MIN)               # floor_zero refuses an underflow: no-op
+    elif op < 0.85:
+        kv_ops.account_set(a, RNG.choice(("registered", "fidelity")), RNG.randrange(3))
+    else:
+        kv_ops.account_del(a)
+
+
+def t1_mirror_tracks_every_commit_kind():
+    """Prove the mirror equals the full scan after block txns, standalone writes and deletes — and that
+    after the first build it is advanced incrementally (never rebuilt)."""
+    assert account_columns.FIELDS == kv_ops.ACCOUNT_FIELDS
+    for a in ADDRS[:20]:
+        kv_ops.account_adjust(a, "balance", 1000)
+    assert _mirror() == _scan()
+    installed = account_columns._mirrors[kv_ops.env_path()]
+    for _ in range(30):
+        with kv_ops.write_txn():
+            for _ in range(RNG.randrange(1, 8)):
+                _random_write()
+        _random_write()                                          # a standalone (self-committing) write
+        assert _mirror() == _scan()
+    assert account_columns._mirrors[kv_ops.env_path()] is installed, "commits must update, not rebuild"
+
+def t2_aborted_txn_leaves_no_trace():
+    """Prove writes inside an aborted write txn never reach the mirror."""
+    before = _mirror()
+    try:
+        with kv_ops.write_txn():
+            kv_ops.account_adjust(ADDRS[0], "bonded", B_MIN * 50)
+            kv_ops.account_del(ADDRS[1])
+            raise RuntimeError("void the block")
+    except RuntimeError:
+        pass
+    assert _mirror() == before == _scan()
+
+def t3_snapshot_restore_drops_and_rebuilds():
+    """Prove a wholesale restore_snapshot_state (untracked bulk rewrite) invalidates the mirror and the
+    rebuilt one matches the restored table."""
+    triples = [t for t in __import__("ops.snapshot_ops", fromlist=["x"]).read_state()
+               if t[0] != "accounts" or t[1] != ADDRS[2].encode()]
+    kv_ops.account_adjust(ADDRS[3], "bonded", B_MIN * 7)
+    _mirror()
+    with kv_ops.write_txn() as txn:
+        kv_ops.restore_snapshot_state(triples, txn)
+    assert _mirror() == _scan()
+
+def t4_registries_match_the_scan():
+    """Prove get_bonded_registry / get_open_registry from the mirror equal the scan-based derivations
+    (including key order), and inside a write txn the registry sees uncommitted bonds."""
+    for a in ADDRS[:10]:
+        kv_ops.account_adjust(a, "bonded", B_MIN * 2)
+    want = {a: {"bonded": d["bonded"], "fidelity": None, "bond_since": kv_ops.bond_since_many([a]).get(a)}
+            for a, d in kv_ops.iter_accounts() if d.get("bonded", 0) >= B_MIN}
+    got = account_ops.get_bonded_registry()
+    assert got == want and list(got) == list(want)
+    for i, a in enumerate(ADDRS[:4]):
+        kv_ops.account_set(a, "registered", int(i != 3))          # a lessee that isn't registered drops out
+        kv_ops.account_set(a, "fidelity", 10 + i)
+        kv_ops.recert_put(a, 5)
+    open_reg = account_ops.get_open_registry(5)
+    assert open_reg == {a: {"fidelity": 10 + i} for i, a in enumerate(ADDRS[:3])}, open_reg
+    with kv_ops.write_txn():
+        assert account_ops.get_open_registry(5) == open_reg, "columnar and scan open registries differ"
+    with kv_ops.write_txn():
+        kv_ops.account_adjust(ADDRS[40], "bonded", B_MIN * 9)
+        assert ADDRS[40] in account_ops.get_bonded_registry(), "in-txn registry must see uncommitted bonds"
+
+def t5_rich_list_matches_sorted_scan():
+    """Prove richest / rich_list equal the old sort-the-scan results, ties broken by address order."""
+    whales = ["ndo" + "z" * 39 + "b", "ndo" + "z" * 39 + "a"]          # equal totals, written out of order
+    for w in whales:
+        kv_ops.account_set(w, "balance", 10 ** 21)
+    scan = sorted(((d["balance"] + d["bonded"], a, d["balance"], d["bonded"]) for a, d in kv_ops.iter_accounts()
+                   if d["balance"] + d["bonded"] > 0), key=lambda t: t[0], reverse=True)
+    assert account_columns.rich_list(100) == scan[:100]
+    assert account_columns.richest() == (10 ** 21, whales[1])
+
+
+def t6_wealth_matches_the_row_loop():
+    """Prove the column reductions of wealth() equal the per-row loop /wealth_stats ran before it, on
+    holdings that straddle the decade edges (bucketed exactly: the old float log10 put 1M NADO minus one
+    raw unit in the >=1M bucket)."""
+    for i, v in enumerate((1, DENOMINATION // 100 - 1, DENOMINATION // 100, DENOMINATION, 10 ** 6 * DENOMINATION,
+                           10 ** 6 * DENOMINATION - 1, 7 * 10 ** 17)):
+        kv_ops.account_set(f"ndo{'w' * 38}{i:02d}", "balance", v)
+    n, s, s2, richest, buckets, top = 0, 0.0, 0.0, 0, [0] * 10, []
+    for tot in account_columns.holdings()[1]:
+        richest = max(richest, tot)
+        if tot > 0:
+            lt = math.log(tot)
+            n += 1; s += lt; s2 += lt * lt
+            buckets[sum(tot >= DENOMINATION * 10 ** e // 100 for e in range(9))] += 1   # exact decades
+            top.append(tot)
+    top = heapq.nlargest(100, top)
+    got = account_columns.wealth()
+    assert (got["count"], got["richest"], got["buckets"]) == (n, richest, buckets), got
+    assert math.isclose(got["log_mean"], s / n) and math.isclose(got["log_std"], math.sqrt(s2 / n - (s / n) ** 2))
+    assert got["sum_total"] == str(sum(t for t in account_columns.holdings()[1] if t > 0))
+    assert (got["top10"], got["top100"]) == (str(sum(top[:10])), str(sum(top)))
+
+
+check("t1_mirror_tracks_every_commit_kind", t1_mirror_tracks_every_commit_kind)
+check("t2_aborted_txn_leaves_no_trace", t2_aborted_txn_leaves_no_trace)
+check("t3_snapshot_restore_drops_and_rebuilds", t3_snapshot_restore_drops_and_rebuilds)
+check("t4_registries_match_the_scan", t4_registries_match_the_scan)
+check("t5_rich_list_matches_sorted_scan", t5_rich_list_matches_sorted_scan)
+check("t6_wealth_matches_the_row_loop", t6_wealth_matches_the_row_loop)
+print("ALL PASS" if not fails else f"{fails} FAILURE(S)")
+sys.exit(1 if fails else 0)
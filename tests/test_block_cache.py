@@ -0,0 +1,118 @@
+"""
+Decoded-block LRU (block_ops._load_body) and the served-batch cache of the block-sync endpoints (nado.py
+_serve_block_chain).
+
+A cache in front of block bodies may only save the zstd + decode work — never serve a body the store would
+not: a rolled-back (unindexed) block must miss, a re-saved block must read its NEW body, child_hash must
+still be derived per read, and a caller mutating what it got must not poison the next reader.
+
+Run: python3 tests/test_block_cache.py
+"""
+import os, sys, tempfile, traceback, logging
+os.environ["HOME"] = tempfile.mkdtemp(prefix="nado_blkcache_")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for d in ("index", "blocks", "logs", "peers"):
+    os.makedirs(f"{os.environ['HOME']}/nado/{d}", exist_ok=True)
+
+logger = logging.getLogger("blkcache"); logger.addHandler(logging.NullHandler())
+from genesis import create_indexers
+create_indexers()
+
+from ops import kv_ops, segment_store, block_ops
+from ops.block_ops import save_block, get_block, construct_block, unindex_block
+
+fails = 0
+def check(name, fn):
+    """Run fn; print PASS/FAIL and count failures."""
+    global fails
+    block_ops.clear_block_cache()
+    try: fn(); print(f"PASS  {name}")
+    except Exception as e:
+        fails += 1; print(f"FAIL  {name}: {e}"); traceback.print_exc()
+
+READS = [0]
+_real_read_view = segment_store.read_view
+def _counting_read_view(*a, **k):
+    READS[0] += 1
+    return _real_read_view(*a, **k)
+segment_store.read_view = _counting_read_view
+
+
+def make_block(number, parent_hash="00" * 32):
+    """A real, hash-consistent block dict."""
+    return construct_block(block_timestamp=1000 + number, block_number=number, parent_hash=parent_hash,
+                           creator="ndo" + "ab" * 23, transaction_pool=[], block_reward=0)
+
+
+def t1_second_read_skips_the_store():
+    """Prove a repeated read is served from the LRU (no segment read) and equals the first."""
+    b = make_block(1)
+    save_block(b, logger)
+    READS[0] = 0
+    first = get_block(b["block_hash"])
+    second = get_block(b["block_hash"])
+    assert READS[0] == 1, f"expected one segment read, got {READS[0]}"
+    assert first == second and first["block_hash"] == b["block_hash"]
+
+def t2_callers_get_private_copies():
+    """Prove mutating a returned body (top level or a nested list) never reaches the next reader."""
+    b = make_block(2)
+    save_block(b, logger)
+    got = get_block(b["block_hash"])
+    got["block_number"] = -1
+    got["block_transactions"].append({"txid": "poison"})
+    again = get_block(b["block_hash"])
+    assert again["block_number"] == 2 and again["block_transactions"] == []
+
+def t3_unindex_and_resave_are_never_stale():
+    """Prove a rolled-back body misses at once, a re-saved body (new locator) reads its new content, and
+    child_hash is still derived from the index on every read."""
+    b = make_block(3)
+    save_block(b, logger)
+    kv_ops.block_index_put(3, b["block_hash"])
+    assert get_block(b["block_hash"])["child_hash"] is None
+    child = make_block(4, parent_hash=b["block_hash"])
+    save_block(child, logger)
+    kv_ops.block_index_put(4, child["block_hash"])
+    assert get_block(b["block_hash"])["child_hash"] == child["block_hash"], "child must re-derive on a hit"
+    save_block(dict(b, block_timestamp=424242), logger)
+    assert get_block(b["block_hash"])["block_timestamp"] == 424242, "re-save must not serve the old body"
+    with kv_ops.write_txn():
+        unindex_block(child, logger)
+    assert get_block(child["block_hash"]) is False, "an unindexed body must miss despite being cached"
+
+def t4_byte_budget_bounds_the_cache():
+    """Prove the LRU stays under BLOCK_CACHE_BYTES (oldest evicted first)."""
+    old = block_ops.BLOCK_CACHE_BYTES
+    blocks = [make_block(100 + i) for i in range(6)]
+    for b in blocks:
+        save_block(b, logger)
+    try:
+        get_block(blocks[0]["block_hash"])
+        one = block_ops._body_cache_bytes[0]
+        block_ops.BLOCK_CACHE_BYTES = one * 4 + 1          # room for 4 (and each one under the 1/4 cap)
+        for b in blocks:
+            get_block(b["block_hash"])
+        assert len(block_ops._body_cache) == 4 and block_ops._body_cache_bytes[0] <= block_ops.BLOCK_CACHE_BYTES
+        READS[0] = 0
+        get_block(blocks[0]["block_hash"])
+        assert READS[0] == 1, "the oldest entry must have been evicted"
+    finally:
+        block_ops.BLOCK_CACHE_BYTES = old
+
+def t5_sync_endpoints_use_the_generation_tagged_cache():
+    """Prove both block-sync endpoints go through _serve_block_chain, whose entries are tagged with
+    kv_ops.write_generation() (nado.py runs the node at import, so this is a source check)."""
+    src = open(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "nado.py")).read()
+    assert src.count("return _serve_block_chain(request,") == 2
+    body = src.split("def _serve_block_chain", 1)[1].split("\nasync def ", 1)[0]
+    assert "write_generation()" in body and "hit[0] == gen" in body
+
+
+check("t1_second_read_skips_the_store", t1_second_read_skips_the_store)
+check("t2_callers_get_private_copies", t2_callers_get_private_copies)
+check("t3_unindex_and_resave_are_never_stale", t3_unindex_and_resave_are_never_stale)
+check("t4_byte_budget_bounds_the_cache", t4_byte_budget_bounds_the_cache)
+check("t5_sync_endpoints_use_the_generation_tagged_cache", t5_sync_endpoints_use_the_generation_tagged_cache)
+print("ALL PASS" if not fails else f"{fails} FAILURE(S)")
+sys.exit(1 if fails else 0)
@@ -0,0 +1,169 @@
+"""
+DA lane-vector codec (ops/da.py _lanes / _lane_mod / _lane_dot, used by encode and reconstruct).
+
+Batching stripes into big-int lane vectors may only change how fast the codec runs, never a byte: for
+every (k, n) and for lane batches that split the blob unevenly, encode must give exactly the shards and
+commitment of the per-stripe _encode_stripe path, reconstruct must give exactly what the per-stripe decode
+gave — including for NON-CANONICAL shard words (>= P, which a forged shard can carry) — a corrupt extra
+shard must still be caught in any batch, and the slot-local mod-P fold must be exact at the edges
+(0, P-1, P, P+1, 2^64-1) for wide dot products.
+
+Run: python3 tests/test_da_lane_codec.py
+"""
+import os, sys, tempfile, traceback, random
+os.environ["HOME"] = tempfile.mkdtemp(prefix="nado_dalane_")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hashing import merkle_root
+from ops import da
+
+P = da.P
+
+fails = 0
+def check(name, fn):
+    """Run fn; print PASS/FAIL and count failures."""
+    global fails
+    try: fn(); print(f"PASS  {name}")
+    except Exception as e:
+        fails += 1; print(f"FAIL  {name}: {e}"); traceback.print_exc()
+
+def raises(fn):
+    """True if fn raises."""
+    try: fn(); return False
+    except Exception: return True
+
+RNG = random.Random(13)
+
+
+# --- the per-stripe codec, as the oracle -------------------------------------------------------------
+
+def encode_ref(data, k, n):
+    syms, length = da._pack(data)
+    while len(syms) % k:
+        syms.append(0)
+    stripes = len(syms) // k
+    cols = [[] for _ in range(n)]
+    for s in range(stripes):
+        for j, v in enumerate(da._encode_stripe(syms[s * k:(s + 1) * k], n)):
+            cols[j].append(v)
+    shards = [da._shard_bytes(c) for c in cols]
+    return merkle_root([da._leaf(j, shards[j], k, n, stripes, length) for j in range(n)]), shards, stripes
+
+def decode_ref(meta, known, verify=True):
+    k, stripes, length = meta["k"], meta["stripes"], meta["length"]
+    syms = {i: da._shard_syms(b) for i, b in known.items()}
+    order = sorted(syms)
+    use, extra = order[:k], (order[k:] if verify else [])
+    def basis(xs, x):
+        row = []
+        for i, xi in enumerate(xs):
+            num = den = 1
+            for m, xm in enumerate(xs):
+                if m != i:
+                    num, den = num * (x - xm) % P, den * (xi - xm) % P
+            row.append(num * pow(den, P - 2, P) % P)
+        return row
+    xs = [i + 1 for i in use]
+    dec = [basis(xs, x) for x in range(1, k + 1)]
+    out = []
+    for s in range(stripes):
+        ys = [syms[i][s] % P for i in use]
+        data = [sum(a * b for a, b in zip(dec[j], ys)) % P for j in range(k)]
+        for i in extra:
+            if sum(a * b for a, b in zip(basis(list(range(1, k + 1)), i + 1), data)) % P != syms[i][s] % P:
+                raise ValueError("inconsistent")
+        out.extend(data)
+    return da._unpack(out, length)
+
+
+def _with_lanes(n, fn):
+    old, da.LANE_STRIPES = da.LANE_STRIPES, n
+    try:
+        return fn()
+    finally:
+        da.LANE_STRIPES = old
+
+
+def t1_encode_matches_per_stripe():
+    """Prove encode's shards and commitment equal the per-stripe path for several (k, n), blob sizes on and
+    off the stripe grid (empty and one byte included), and lane batches that split the blob unevenly."""
+    for k, n in [(4, 8), (1, 2), (3, 5), (5, 7), (8, 16), (2, 2)]:
+        for size in (0, 1, 7 * k, 7 * k + 1, RNG.randrange(1, 5000)):
+            blob = os.urandom(size)
+            want = encode_ref(blob, k, n)
+            for lanes in (1, 3, 64, 1 << 14):
+                m = _with_lanes(lanes, lambda: da.encode(blob, k, n))
+                assert (m["commitment"], m["shards"], m["stripes"]) == want, (k, n, size, lanes)
+
+def t2_reconstruct_matches_per_stripe():
+    """Prove reconstruct equals the per-stripe decode for systematic, mixed and parity-only subsets, with and
+    without extra shards, under uneven lane batches."""
+    for k, n in [(4, 8), (3, 6), (5, 7), (2, 4)]:
+        blob = os.urandom(RNG.randrange(1000, 6000))
+        m = da.encode(blob, k, n)
+        meta = {"k": k, "stripes": m["stripes"], "length": m["length"]}
+        for _ in range(6):
+            pick = RNG.sample(range(n), RNG.randrange(k, n + 1))
+            known = {i: m["shards"][i] for i in pick}
+            got = _with_lanes(RNG.choice([1, 5, 97, 1 << 14]), lambda: da.reconstruct(meta, dict(known)))
+            assert got == decode_ref(meta, known) == blob, (k, n, sorted(pick))
+
+def t3_non_canonical_words_and_corruption():
+    """Prove shard words >= P (forged, not produced by encode) decode exactly as the per-stripe path reduces
+    them — to the same bytes or the same out-of-range refusal — and that a corrupt extra shard is caught
+    whichever lane batch its bad stripe falls in."""
+    k, n = 4, 8
+    blob = os.urandom(3000)
+    m = da.encode(blob, k, n)
+    meta = {"k": k, "stripes": m["stripes"], "length": m["length"]}
+    for trial in range(20):
+        forged = {i: bytearray(m["shards"][i]) for i in (1, 4, 6, 7)}
+        s = RNG.randrange(m["stripes"])
+        forged[RNG.choice(list(forged))][s * 8:s * 8 + 8] = RNG.choice([P, P + 1, 2 ** 64 - 1]).to_bytes(8, "big")
+        known = {i: bytes(b) for i, b in forged.items()}
+        try:
+            want = decode_ref(meta, known)
+        except ValueError:
+            want = None
+        try:
+            got = _with_lanes(7, lambda: da.reconstruct(meta, dict(known)))
+        except ValueError:
+            got = None
+        assert got == want, trial
+    for s in (0, m["stripes"] // 2, m["stripes"] - 1):
+        bad = bytearray(m["shards"][6]); bad[s * 8 + 3] ^= 0x40
+        known = {0: m["shards"][0], 1: m["shards"][1], 2: m["shards"][2], 5: m["shards"][5], 6: bytes(bad)}
+        assert _with_lanes(9, lambda: raises(lambda: da.reconstruct(meta, dict(known)))), s
+
+def t4_lane_fold_is_exact():
+    """Prove _lane_dot's per-slot reduction equals `% P` for edge words and coefficients, at every k width."""
+    edges = [0, 1, P - 1, P, P + 1, 2 ** 56 - 1, 2 ** 61, 2 ** 64 - 1]
+    for k in (1, 2, 4, 8, 31, 64):
+        w = da._lane_width(k)
+        c = 40
+        vecs, cols = [], []
+        for _ in range(k):
+            vals = [RNG.choice(edges + [RNG.randrange(2 ** 64)]) for _ in range(c)]
+            cols.append(vals)
+            vecs.append(da._lanes(b"".join(v.to_bytes(8, "big") for v in vals), c, w))
+        row = [RNG.choice([0, 1, P - 1, RNG.randrange(P)]) for _ in range(k)]
+        got = da._lane_words(da._lane_dot(row, vecs, da._lane_masks(c, w), w), c, w)
+        want = b"".join((sum(r * col[s] for r, col in zip(row, cols)) % P).to_bytes(8, "big") for s in range(c))
+        assert got == want, k
+
+def t5_short_shard_refused():
+    """Prove a shard shorter than the manifest's stripe count is refused on the lane path."""
+    m = da.encode(os.urandom(500), 4, 8)
+    meta = {"k": 4, "stripes": m["stripes"], "length": m["length"]}
+    known = {i: m["shards"][i] for i in (0, 1, 2, 7)}
+    known[7] = known[7][:-8]
+    assert raises(lambda: da.reconstruct(meta, known))
+
+
+check("t1_encode_matches_per_stripe", t1_encode_matches_per_stripe)
+check("t2_reconstruct_matches_per_stripe", t2_reconstruct_matches_per_stripe)
+check("t3_non_canonical_words_and_corruption", t3_non_canonical_words_and_corruption)
+check("t4_lane_fold_is_exact", t4_lane_fold_is_exact)
+check("t5_short_shard_refused", t5_short_shard_refused)
+print("ALL PASS" if not fails else f"{fails} FAILURE(S)")
+sys.exit(1 if fails else 0)
@@ -135,7 +135,7 @@ check("the systematic path is materially cheaper than interpolation", t_fast < t
 
 # ---- the shipped code must actually contain it --------------------------------------------------------
 src = open(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ops", "da.py")).read()
-check("reconstruct prefers systematic shards deterministically", "idx_list = sorted(sym_by_idx)" in src)
+check("reconstruct prefers systematic shards deterministically", "idx_list = sorted(known_shards)" in src)
 check("the systematic set with no extras takes the pure BYTE path (no field elements formed)",
       "if systematic and not extra:" in src and "_systematic_bytes" in src)
 check("...built from extended slices, not per-symbol conversions",
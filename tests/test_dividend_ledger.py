@@ -0,0 +1,161 @@
+"""
+Dividend FIDELITY LEDGER (ops/dividend_ops.ledger_record / weights_at_epoch) — a DIFFERENTIAL test.
+
+The ledger may only change how fast weights_at_epoch answers, never what: after random register/recert
+sequences driven through the live apply_register — continuous runs, anti-farm close recerts, lapses, and
+rollbacks (LIFO reverts, like rollback_one_block) — the ledger range read must equal the replay definition
+(weights_at_epoch_replay) at every epoch, AND actually be the path taken. A ledger that does not cover the
+window (rows written before it existed, a restored snapshot, a GC sweep) must fall back to the replay and
+heal itself only inside a write txn; it is node-local (never snapshot-carried), and the cross-check must
+catch a corrupted row.
+
+Run: python3 tests/test_dividend_ledger.py
+"""
+import os, sys, tempfile, logging, traceback, random
+os.environ["HOME"] = tempfile.mkdtemp(prefix="nado_divledger_")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for d in ("index", "blocks", "logs", "peers"):
+    os.makedirs(f"{os.environ['HOME']}/nado/{d}", exist_ok=True)
+logger = logging.getLogger("divledger"); logger.addHandler(logging.NullHandler())
+from genesis import create_indexers
+create_indexers()
+
+from protocol import POSW_LEASE_EPOCHS as LEASE, FIDELITY_MIN_GAP_EPOCHS as MIN_GAP, FIDELITY_CAP
+from ops import kv_ops
+from ops import dividend_ops as do
+from ops.account_ops import create_account, apply_register
+from ops.mining_ops import open_shares
+
+fails = 0
+def check(name, fn):
+    """Run fn; print PASS/FAIL and count failures."""
+    global fails
+    try: fn(); print(f"PASS  {name}")
+    except Exception as e:
+        fails += 1; print(f"FAIL  {name}: {e}"); traceback.print_exc()
+
+def raises(fn):
+    """True if fn raises."""
+    try: fn(); return False
+    except Exception: return True
+
+RNG = random.Random(12)
+ADDRS = [f"ndledger{i:02d}" for i in range(10)]
+for a in ADDRS:
+    create_account(a, registered=0)
+
+
+def _covered(epoch):
+    """True when the ledger holds every recert row of epoch's lease window (the fast path is taken)."""
+    lo = epoch - LEASE + 1
+    return kv_ops.fid_ledger_window(lo, epoch)[1] == kv_ops.recert_count_in_window(lo, epoch)
+
+def _agree(epochs, need_ledger=True):
+    for e in epochs:
+        if need_ledger:
+            assert _covered(e), f"ledger does not cover epoch {e}"
+        got, want = do.weights_at_epoch(e), do.weights_at_epoch_replay(e)
+        assert got == want, f"epoch {e}: ledger {got} != replay {want}"
+
+
+APPLIED = []                                     # (address, epoch) in apply order — reverts pop from the end
+EPOCH = [5]
+
+def _step():
+    """Advance the clock by a gap spanning the close / spaced / lapsed cases, then register a few addresses."""
+    EPOCH[0] += RNG.choice([1, MIN_GAP // 2, MIN_GAP, LEASE, LEASE + 1, 2 * LEASE])
+    for a in RNG.sample(ADDRS, RNG.randrange(1, 5)):
+        if kv_ops.recert_latest(a) < EPOCH[0]:   # one register per (sender, epoch), like the validation guard
+            apply_register(a, epoch=EPOCH[0], logger=logger)
+            APPLIED.append((a, EPOCH[0]))
+
+
+def t1_random_apply_matches_replay():
+    """Prove that across 60 random register rounds the ledger is complete and weights_at_epoch equals the
+    replay at every recert epoch and one epoch either side."""
+    for _ in range(60):
+        _step()
+    epochs = sorted({e + d for _a, e in APPLIED for d in (-1, 0, 1)})
+    _agree(epochs)
+    assert any(do.weights_at_epoch(e) for e in epochs), "fixture: some epoch must have present miners"
+
+def t2_reverts_are_symmetric():
+    """Prove LIFO reverts (rollbacks) delete exactly their ledger rows — the ledger stays complete and equal
+    to the replay after each one — and re-applying the same recerts reproduces the same weights."""
+    before = {e: do.weights_at_epoch(e) for _a, e in APPLIED[-30:]}
+    undone = []
+    for _ in range(30):
+        a, e = APPLIED.pop()
+        apply_register(a, epoch=e, logger=logger, revert=True)
+        assert kv_ops.fid_ledger_get(e, a) is None
+        undone.append((a, e))
+        _agree([e, e - 1])
+    for a, e in reversed(undone):
+        apply_register(a, epoch=e, logger=logger)
+        APPLIED.append((a, e))
+    for e, w in before.items():
+        assert do.weights_at_epoch(e) == w == do.weights_at_epoch_replay(e)
+
+def t3_uncovered_window_falls_back_and_heals_in_txn():
+    """Prove recert rows the ledger never saw (genesis-style recert_put, pre-ledger history) make weights fall
+    back to the replay; a plain read does not write, a read inside the block's write txn backfills the
+    window, and the next register ramps on the healed row."""
+    e = EPOCH[0] + 3
+    kv_ops.recert_put("ndgenesis", e - 10)
+    kv_ops.recert_put("ndgenesis", e - 10 + MIN_GAP)
+    create_account("ndgenesis", registered=0)
+    e2 = e - 10 + MIN_GAP
+    assert not _covered(e2)
+    _agree([e2], need_ledger=False)
+    assert not _covered(e2), "a read outside a write txn must not write the ledger"
+    with kv_ops.write_txn():
+        assert do.weights_at_epoch(e2) == do.weights_at_epoch_replay(e2)
+    assert _covered(e2) and kv_ops.fid_ledger_get(e2, "ndgenesis") == 2
+    apply_register("ndgenesis", epoch=e2 + MIN_GAP, logger=logger)
+    assert kv_ops.fid_ledger_get(e2 + MIN_GAP, "ndgenesis") == 3
+    _agree([e2 + MIN_GAP])
+
+def t4_ledger_is_node_local():
+    """Prove the ledger is not snapshot-carried, the GC row sweep removes a bucket's ledger rows with its
+    recert rows, and a snapshot restore drops the ledger (which then heals)."""
+    from ops import snapshot_ops as so
+    assert "fid_ledger" not in kv_ops.SNAPSHOT_DBS and "fid_ledger" in kv_ops._LOCAL_DBS
+    assert not any(name == "fid_ledger" for name, _k, _v in so.read_state())
+    first = min(ep for _a, ep in APPLIED)
+    assert kv_ops.fid_ledger_window(first, first)[1]
+    kv_ops.recert_bucket_del(first)
+    assert kv_ops.fid_ledger_window(first, first)[1] == 0
+    a, e = APPLIED[-1]
+    kv_ops.restore_snapshot_state(so.read_state())
+    assert kv_ops.fid_ledger_window(0, e)[1] == 0, "restore must drop the ledger"
+    _agree([e], need_ledger=False)
+    with kv_ops.write_txn():
+        do.weights_at_epoch(e)
+    _agree([e])
+
+def t5_cross_check_catches_corruption():
+    """Prove check_weights_at_epoch returns None on agreement, and on a corrupted ledger row reports it and
+    returns the replay — which weights_at_epoch then serves when CROSS_CHECK is on."""
+    a, e = APPLIED[-1]
+    assert do.check_weights_at_epoch(e) is None
+    good = kv_ops.fid_ledger_get(e, a)
+    bad = next(v for v in (0, 1, FIDELITY_CAP + 1) if open_shares(v) != open_shares(good))
+    kv_ops.fid_ledger_put(e, a, bad)
+    try:
+        replay = do.check_weights_at_epoch(e, logger=logger)
+        assert replay == do.weights_at_epoch_replay(e) and replay != do.weights_at_epoch(e)
+        do.CROSS_CHECK = True
+        assert do.weights_at_epoch(e) == replay
+    finally:
+        do.CROSS_CHECK = False
+        kv_ops.fid_ledger_put(e, a, good)
+    assert do.check_weights_at_epoch(e) is None
+
+
+check("t1_random_apply_matches_replay", t1_random_apply_matches_replay)
+check("t2_reverts_are_symmetric", t2_reverts_are_symmetric)
+check("t3_uncovered_window_falls_back_and_heals_in_txn", t3_uncovered_window_falls_back_and_heals_in_txn)
+check("t4_ledger_is_node_local", t4_ledger_is_node_local)
+check("t5_cross_check_catches_corruption", t5_cross_check_catches_corruption)
+print("ALL PASS" if not fails else f"{fails} FAILURE(S)")
+sys.exit(1 if fails else 0)
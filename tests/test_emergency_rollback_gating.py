@@ -153,7 +153,7 @@ def t_verdict_is_checked_before_any_donor_is_consulted():
     loop = s[s.index("def emergency_mode"):s.index("def _fast_forward_from")]
     verdict_at = loop.index("verdict = self._fork_verdict()")
     donor_at = loop.index("peer = self.get_peer_to_sync_from(")
-    knows_at = loop.index("known_block = asyncio.run(knows_block(")
+    knows_at = loop.index("known_block = peer_transport.run(knows_block(")
     assert verdict_at < donor_at < knows_at, "the verdict no longer precedes donor selection"
     assert loop.index("self._adopt_branch(_anc)") < donor_at, \
         "the REORG path consults the heaviest-tip donor flow first — the seesaw is back"
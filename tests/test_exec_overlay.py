@@ -0,0 +1,280 @@
+"""
+Copy-on-write exec state (execnode/overlay.py) and the layer stack the provisional tail keeps on it
+(execnode._refresh_provisional).
+
+ExecState.clone() used to deep-copy the whole state; it now returns an ExecOverlay that holds only its own
+writes and reads the rest through. That may only make the tail cheaper, never different: a stack of layers
+must show exactly the state, snapshot and state_root a deep-copied replay reaches, must never write
+through to the state below it, and a reorg or finality advance that pops or re-bases layers must leave the
+same view a from-scratch rebuild would.
+
+Run: python3 tests/test_exec_overlay.py
+"""
+import asyncio, copy, os, random, sys, tempfile, traceback
+from unittest import mock
+os.environ["HOME"] = tempfile.mkdtemp(prefix="nado_overlay_")
+os.environ.setdefault("NADO_ALLOW_PYTHON_KERNELS", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for d in ("index", "blocks", "logs", "peers"):
+    os.makedirs(f"{os.environ['HOME']}/nado/{d}", exist_ok=True)
+
+from execnode import zkvmasm, exec_root as ER
+from execnode.stark import storage_tree as SST
+from execnode.state import ExecState
+from execnode.overlay import ExecOverlay, LayerDict
+
+fails = 0
+def check(name, fn):
+    """Run fn; print PASS/FAIL and count failures."""
+    global fails
+    try: fn(); print(f"PASS  {name}")
+    except Exception as e:
+        fails += 1; print(f"FAIL  {name}: {e}"); traceback.print_exc()
+
+
+CODE = zkvmasm.assemble_contract({"put": "sstore r0 r1\nret r1"})
+USERS = ["ndoA", "ndoB", "ndoC", "ndoD"]
+
+
+def _st():
+    return ExecState(tempfile.mktemp(prefix="nado_overlay_", suffix=".json"))
+
+
+def _op(st, rng, i):
+    """One random state transition touching the layered maps: contract storage, bridge balances and
+    withdrawals, assets, the blockhash ring, reveals and the outbox — including deletions."""
+    who = rng.choice(USERS)
+    k = rng.random()
+    if k < 0.1 or not st.contracts:
+        st.apply_blob({"op": "deploy", "code": CODE, "nonce": i}, who, f"d{i}")
+    elif k < 0.35:
+        cid = rng.choice(sorted(st.contracts))
+        st.apply_blob({"op": "call", "contract": cid, "method": "put", "args": [rng.randint(0, 6), i]},
+                      who, f"c{i}")
+    elif k < 0.45:
+        st.credit_deposit(who, rng.randint(1, 50))
+    elif k < 0.55:
+        st.apply_blob({"op": "bridge_withdraw", "amount": rng.randint(1, 30)}, who, f"w{i}")
+    elif k < 0.6 and st.withdrawals:
+        st.drop_claimed("bridge_withdraw", rng.choice(sorted(st.withdrawals)))
+    elif k < 0.7:
+        st.apply_blob({"op": "asset_create", "seed": rng.randint(0, 3), "name": "T", "sym": "T",
+                       "supply": 1000}, who, f"a{i}")
+    elif k < 0.78 and st.assets:
+        st.apply_blob({"op": "asset_transfer", "asset": rng.choice(sorted(st.assets)),
+                       "to": rng.choice(USERS), "amount": rng.randint(1, 300)}, who, f"t{i}")
+    elif k < 0.86:
+        st.record_block_hash(rng.randint(1, 40), "%064x" % rng.getrandbits(256))
+    elif k < 0.93:
+        st.record_reveal(rng.randint(1, 3), "%016x" % rng.getrandbits(64))
+    else:
+        st.apply_blob({"op": "emit", "to_ns": "b", "data": f"m{i}"}, who, f"e{i}")
+    st.cursor += 1
+
+
+def _frozen(st):
+    """A deep, comparable picture of a state's payload."""
+    return copy.deepcopy(st._snapshot())
+
+
+def t1_stack_matches_a_deep_copy_replay():
+    """Prove a stack of overlays, each taking a random batch of ops, shows the same snapshot and state_root
+    at every layer as a deep-copied state that replayed the same ops, and the base is left untouched."""
+    rng = random.Random(21)
+    base = _st()
+    for i in range(60):
+        _op(base, rng, i)
+    before, base_root = _frozen(base), base.state_root()
+    ref = ExecState.snapshot_view(copy.deepcopy(base._snapshot()))
+    top = base
+    for layer in range(8):
+        top = top.clone()
+        assert isinstance(top, ExecOverlay) and top.depth() == layer + 1
+        seed = rng.random()
+        for j in range(25):
+            _op(top, random.Random(seed * 1e6 + j), 1000 * layer + j)
+            _op(ref, random.Random(seed * 1e6 + j), 1000 * layer + j)
+        assert top._snapshot() == ref._snapshot(), f"layer {layer}: snapshot differs from the replay"
+        assert top.state_root() == ref.state_root(), f"layer {layer}: root differs from the replay"
+    assert _frozen(base) == before and base.state_root() == base_root, "a layer wrote through to the base"
+
+def t2_layers_never_alias():
+    """Prove a value read from a layer belongs to that layer alone: mutating a contract's storage, an asset
+    row, a reveal set or the private-state pool through an overlay changes neither its parent nor a sibling."""
+    base = _st()
+    base.apply_blob({"op": "deploy", "code": CODE, "nonce": 1}, "ndoA", "d")
+    base.apply_blob({"op": "asset_create", "seed": 1, "name": "T", "sym": "T", "supply": 10}, "ndoA", "a")
+    base.record_reveal(2, "aa")
+    cid, aid = next(iter(base.contracts)), next(iter(base.assets))
+    before = _frozen(base)
+    a, b = base.clone(), base.clone()
+    a.contracts[cid]["storage"].setdefault("slots", {})["9"] = 1
+    a.abal[aid]["ndoB"] = 5
+    a.randao_reveals[2].append("bb") if isinstance(a.randao_reveals[2], list) else a.randao_reveals[2].add("bb")
+    a.app_state.append(cid, 7)
+    assert _frozen(base) == before, "a layer's write reached the base"
+    assert b._snapshot() == base._snapshot(), "a layer's write reached its sibling"
+    assert a.contracts[cid]["code"] is base.contracts[cid]["code"], "contract code must be shared, not copied"
+    c = a.clone()
+    c.contracts[cid]["storage"].setdefault("slots", {})["9"] = 2
+    assert a.contracts[cid]["storage"]["slots"]["9"] == 1, "a child layer wrote into its parent"
+
+def t3_layer_dict_semantics():
+    """Prove LayerDict behaves as the dict it stands for: shadowing, tombstones, re-insert after delete,
+    len/bool/iteration/pop/setdefault over several layers, and that items() copies nothing up."""
+    base = {"a": {"n": 1}, "b": 2}
+    l1 = LayerDict(base)
+    l2 = LayerDict(l1)
+    del l1["b"]
+    l1["c"] = 3
+    assert dict(l2.items()) == {"a": {"n": 1}, "c": 3} and len(l2) == 2 and "b" not in l2
+    assert not l2._delta, "items() copied a value up"
+    l2["b"] = 4
+    assert l2["b"] == 4 and "b" not in l1 and base["b"] == 2
+    assert l2.pop("c") == 3 and "c" not in l2 and l1["c"] == 3
+    assert l2.setdefault("d", 5) == 5 and l2.get("zz") is None
+    l2["a"]["n"] = 7
+    assert base["a"]["n"] == 1 and l1["a"]["n"] == 1, "a read-up value was not copied into the layer"
+    empty = LayerDict(LayerDict({"x": 1}))
+    del empty["x"]
+    assert not empty and bool(l2) and len(empty) == 0
+    try:
+        del empty["x"]
+        raise AssertionError("deleting a tombstoned key succeeded")
+    except KeyError:
+        pass
+    assert l2 == {"a": {"n": 7}, "b": 4, "d": 5}
+
+def t4_overlay_root_forks_the_trees():
+    """Prove an overlay's first state_root forks its parent's half-trees instead of building cold, that a
+    layer takes over an overlay parent's trees, and that proofs against the overlay's root verify."""
+    rng = random.Random(24)
+    base = _st()
+    for i in range(80):
+        _op(base, rng, i)
+    base.state_root()
+    a = base.clone()
+    base.credit_deposit("ndoZ", 1)             # the base keeps moving; the fork must not share its trees
+    base.state_root()
+    a.apply_blob({"op": "bridge_withdraw", "amount": 1}, "ndoZ", "w")
+    with mock.patch.object(SST, "SparseStore", side_effect=AssertionError("cold tree build")):
+        ra = a.state_root()
+    b = a.clone()
+    b.credit_deposit("ndoY", 3)
+    with mock.patch.object(SST, "SparseStore", side_effect=AssertionError("cold tree build")):
+        rb = b.state_root()
+    assert a._kv_store is None, "the parent layer's trees were copied, not taken over"
+    ref = ExecState.snapshot_view(copy.deepcopy(b._snapshot()))
+    assert rb == ref.state_root() and ra != rb
+    for nonce, w in b.withdrawals.items():
+        p = b.withdrawal_proof(nonce)
+        assert p and ER.verify_withdrawal(rb, w["addr"], w["amount"], nonce, p["proof"])
+
+def t5_rebase_drops_finalized_layers():
+    """Prove that once the finalized state has applied the blocks of the lowest layers, re-basing the next
+    layer onto it leaves the view identical — the finality step of the provisional tail."""
+    rng = random.Random(25)
+    fin = _st()
+    for i in range(40):
+        _op(fin, rng, i)
+    seeds = [rng.random() for _ in range(5)]
+    top, layers = fin, []
+    for n, s in enumerate(seeds):
+        top = top.clone()
+        for j in range(15):
+            _op(top, random.Random(s * 1e6 + j), 100 * n + j)
+        layers.append(top)
+    view, root = top._snapshot(), top.state_root()
+    for n, s in enumerate(seeds[:2]):          # finality: the finalized state applies blocks 1 and 2
+        for j in range(15):
+            _op(fin, random.Random(s * 1e6 + j), 100 * n + j)
+    layers[2].rebase(fin)
+    assert top.depth() == 3 and top.base() is fin
+    assert top._snapshot() == view, "re-basing onto the advanced finalized state changed the view"
+    top._root_cache = None
+    assert top.state_root() == root
+
+def t6_refresh_keeps_one_layer_per_block():
+    """Prove _refresh_provisional applies each new block once onto a new layer, re-applies only from the
+    fork point after a reorg, keeps the stack bounded by the unfinalized window as finality advances, and
+    always shows what a from-scratch replay of the finalized state plus the tail shows."""
+    from execnode import execnode as X
+    chain = {}                                  # height -> block hash on the current chain
+    applied = []
+
+    def _mk(h, fork=""):
+        chain[h] = f"{fork}h{h}"
+
+    async def fake_get(session, path):
+        h = int(path.split("number=")[1])
+        if h not in chain:
+            return None
+        return {"block_number": h, "block_hash": chain[h], "block_transactions": []}
+
+    def _block_ops(st, h):
+        r = random.Random(chain[h])
+        for j in range(4):
+            _op(st, r, h * 10 + j)
+        st.cursor = h
+
+    async def fake_apply(session, states_map, default_state, block, verbose=True):
+        applied.append(block["block_number"])
+        for st in states_map.values():
+            _block_ops(st, block["block_number"])
+        return True
+
+    def _want(fin, tip):
+        ref = ExecState.snapshot_view(copy.deepcopy(fin._snapshot()))
+        for h in range(fin.cursor + 1, tip + 1):
+            _block_ops(ref, h)
+        return ref._snapshot(), ref.state_root()
+
+    fin = _st()
+    fin.cursor, fin.last_div_epoch = 10, 0
+    X.states = {"default": fin}
+    X.prov_states, X._prov_key, X._prov_last, X._prov_stack = None, None, None, []
+    X._prov_since_full, X._prov_div_epoch = 0, None
+
+    async def run():
+        for h in range(1, 40):
+            _mk(h)
+        with mock.patch.object(X, "_get_json", fake_get), mock.patch.object(X, "_apply_block", fake_apply):
+            await X._refresh_provisional(None, 10, 16, "t16")
+            assert applied == list(range(11, 17)) and len(X._prov_stack) == 6
+            applied.clear()
+            await X._refresh_provisional(None, 10, 18, "t18")
+            assert applied == [17, 18], f"extension re-applied {applied}"
+            # a reorg replaces 17 and 18: only those are re-applied, on top of the kept layer for 16
+            _mk(17, "f"), _mk(18, "f"), _mk(19, "f")
+            applied.clear()
+            await X._refresh_provisional(None, 10, 19, "t19f")
+            assert applied == [17, 18, 19], f"reorg re-applied {applied}"
+            assert X._prov_stack[-1][1] == "fh19"
+            assert X.prov_states["default"]._snapshot() == _want(fin, 19)[0]
+            # finality advances to 14: the finalized state applies 11..14, the tail drops those layers
+            for h in range(11, 15):
+                _block_ops(fin, h)
+            applied.clear()
+            await X._refresh_provisional(None, 14, 20, "t20")
+            assert applied == [20] and [e[0] for e in X._prov_stack] == list(range(15, 21))
+            top = X.prov_states["default"]
+            assert top.depth() == 6 and top.base() is fin
+            snap, root = _want(fin, 20)
+            assert top._snapshot() == snap and top.state_root() == root, "the tail drifted from a replay"
+            # once the finalized state passes the whole tail, readers fall back to it
+            for h in range(15, 21):
+                _block_ops(fin, h)
+            assert X._prov_for("default") is top
+            _block_ops(fin, 21)
+            assert X._prov_for("default") is None
+    asyncio.run(run())
+
+
+check("t1_stack_matches_a_deep_copy_replay", t1_stack_matches_a_deep_copy_replay)
+check("t2_layers_never_alias", t2_layers_never_alias)
+check("t3_layer_dict_semantics", t3_layer_dict_semantics)
+check("t4_overlay_root_forks_the_trees", t4_overlay_root_forks_the_trees)
+check("t5_rebase_drops_finalized_layers", t5_rebase_drops_finalized_layers)
+check("t6_refresh_keeps_one_layer_per_block", t6_refresh_keeps_one_layer_per_block)
+print("ALL PASS" if not fails else f"{fails} FAILURE(S)")
+sys.exit(1 if fails else 0)
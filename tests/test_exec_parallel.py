@@ -0,0 +1,230 @@
+"""
+Optimistic parallel call execution (execnode/parallel_exec.py) behind execnode._apply_block.
+
+A busy block's zkvm calls are run ahead of time in forked workers against the state the block found, and
+the ordered loop adopts a speculative run only if everything it read still holds. That may only make a
+block cheaper to apply, never different: a block full of conflicting writes, reverts that an earlier call
+turns into successes, asset escrows, payouts that outrun the contract's balance, and an upgrade and a deploy
+landing mid-block must all leave exactly the state, root and per-call results of sequential application.
+
+Run: python3 tests/test_exec_parallel.py
+"""
+import asyncio, os, random, sys, tempfile, time, traceback
+from unittest import mock
+os.environ["HOME"] = tempfile.mkdtemp(prefix="nado_parallel_")
+os.environ.setdefault("NADO_ALLOW_PYTHON_KERNELS", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for d in ("index", "blocks", "logs", "peers"):
+    os.makedirs(f"{os.environ['HOME']}/nado/{d}", exist_ok=True)
+
+from execnode import zkvmasm
+from execnode import parallel_exec as PX
+from execnode.execnode import _apply_block
+from execnode.state import ExecState
+
+fails = 0
+def check(name, fn):
+    """Run fn; print PASS/FAIL and count failures."""
+    global fails
+    try: fn(); print(f"PASS  {name}")
+    except Exception as e:
+        fails += 1; print(f"FAIL  {name}: {e}"); traceback.print_exc()
+
+
+USERS = ["ndoA", "ndoB", "ndoC", "ndoD"]
+CTR = zkvmasm.assemble_contract({
+    "inc": "sload r2 r0\nadd r2 r1\nsstore r0 r2\nret r2",
+    "need": "sload r2 r0\nrequire r2\nsstore r1 r2\nret r2",                # reverts until slot r0 is set
+    "peek": "bhash r2 r0\nabal r3 r1\nadd r2 r3\nret r2",
+    "pay": "ctx r2 caller\npay r2 r0\nret r0",                               # pays the caller r0 from the pot
+    "spin": "movi r3 1\nloop:\n sub r0 r3\n sload r2 r1\n add r2 r3\n sstore r1 r2\n jnz r0 @loop\nret r2",
+})
+CTR2 = zkvmasm.assemble_contract({"inc": "sload r2 r0\nadd r2 r1\nadd r2 r1\nsstore r0 r2\nret r2"})
+
+
+def _pair():
+    """Two identical states with a few deployed counters, some funded."""
+    out = []
+    for _ in range(2):
+        st = ExecState(tempfile.mktemp(prefix="nado_parallel_", suffix=".json"))
+        for n in range(6):
+            st.apply_blob({"op": "deploy", "code": CTR, "nonce": n}, USERS[n % 2], f"d{n}")
+        for u in USERS:
+            st.credit_deposit(u, 1000)
+        for i, cid in enumerate(sorted(st.contracts)[:3]):
+            st.apply_blob({"op": "call", "contract": cid, "method": "inc", "args": [0, 1], "value": 50},
+                          USERS[i % 4], f"f{i}")
+        st.record_block_hash(1, "%064x" % 12345)
+        st.cursor = 1
+        out.append(st)
+    return out
+
+
+def _block(st, rng, h, n=80):
+    """A busy block of conflicting calls, with deposits, an upgrade and a deploy (and calls on it) mixed in."""
+    cids = sorted(st.contracts)
+    txs = []
+    for i in range(n):
+        who, cid = rng.choice(USERS), rng.choice(cids[:4])     # four hot contracts: plenty of conflicts
+        r = rng.random()
+        if r < 0.35:
+            d = {"op": "call", "contract": cid, "method": "inc", "args": [rng.randrange(3), rng.randint(1, 9)]}
+        elif r < 0.5:
+            d = {"op": "call", "contract": cid, "method": "need", "args": [rng.randrange(3), 5 + rng.randrange(3)]}
+        elif r < 0.6:
+            d = {"op": "call", "contract": cid, "method": "peek", "args": [rng.choice((1, 2)), 0]}
+        elif r < 0.7:
+            d = {"op": "call", "contract": cid, "method": "pay", "args": [rng.randint(1, 40)]}
+        elif r < 0.8:
+            d = {"op": "call", "contract": cid, "method": "spin", "args": [rng.randint(20, 200), 7],
+                 "value": rng.choice((0, 3))}
+        elif r < 0.85:
+            txs.append({"recipient": "bridge", "txid": f"b{h}.{i}", "sender": who, "amount": 25})
+            continue
+        elif r < 0.9:
+            d = {"op": "call", "contract": cid, "method": "nope", "args": []}
+        else:
+            d = {"op": "call", "contract": cid, "method": "inc", "args": [0, 1], "value": 10_000}   # can't pay
+        txs.append({"recipient": "blob", "txid": f"t{h}.{i}", "sender": who, "data": d})
+    up = cids[0]
+    txs.insert(n // 2, {"recipient": "blob", "txid": f"u{h}", "sender": st.contracts[up]["deployer"],
+                        "data": {"op": "upgrade", "contract": up, "code": CTR2 if h % 2 else CTR}})
+    txs.insert(n // 3, {"recipient": "blob", "txid": f"n{h}", "sender": "ndoA",
+                        "data": {"op": "deploy", "code": CTR, "nonce": 100 + h}})
+    return {"block_number": h, "block_hash": "%064x" % (h * 7919), "block_timestamp": 0,
+            "block_transactions": txs}
+
+
+def _apply(st, block, workers):
+    """Apply `block` with `workers` speculation processes; returns (per-tx results, speculations)."""
+    log, specs = [], {}
+    real_apply, real_spec = ExecState.apply_blob, PX.speculate
+
+    def apply_blob(self, payload, sender, txid, spec=None):
+        r = real_apply(self, payload, sender, txid, spec=spec)
+        log.append((txid, r))
+        return r
+
+    def speculate(states_map, txs):
+        specs.update(real_spec(states_map, txs))
+        return specs
+    env = {"NADO_EXEC_WORKERS": str(workers)}
+    with mock.patch.dict(os.environ, env), mock.patch.object(PX, "PARALLEL_MIN_CALLS", 1), \
+            mock.patch.object(ExecState, "apply_blob", apply_blob), mock.patch.object(PX, "speculate", speculate):
+        assert asyncio.run(_apply_block(None, {"default": st}, st, block, verbose=False)) is True
+    return log, specs
+
+
+def t1_blocks_match_sequential():
+    """Prove busy, conflict-heavy blocks leave the identical snapshot, root and per-call results with and
+    without speculation — and that speculation was both adopted and rejected along the way."""
+    seq, par = _pair()
+    rng = random.Random(25)
+    adopted = rejected = 0
+    for h in range(2, 8):
+        block = _block(seq, rng, h)
+        want, _ = _apply(seq, block, 1)
+        got, specs = _apply(par, block, 4)
+        assert got == want, f"block {h}: results differ"
+        assert par._snapshot() == seq._snapshot() and par.state_root() == seq.state_root(), f"block {h}"
+        adopted += sum(s.adopted for s in specs.values())
+        rejected += sum(not s.adopted for s in specs.values())
+    assert adopted > 100 and rejected > 10, (adopted, rejected)
+
+def t2_stale_reads_are_refused():
+    """Prove a speculation is refused once a slot it read, an asset holding or block hash it looked up, or
+    its contract's code changes — and adopted while none has."""
+    st, _ = _pair()
+    cid = sorted(st.contracts)[0]
+    block = {"block_number": 2, "block_hash": "00" * 32, "block_transactions": [
+        {"recipient": "blob", "txid": f"x{i}", "sender": "ndoA",
+         "data": {"op": "call", "contract": c, "method": m, "args": a}}
+        for i, (c, m, a) in enumerate([(cid, "inc", [0, 4]), (cid, "peek", [1, 0])] +
+                                      [(c, "inc", [1, 1]) for c in sorted(st.contracts)[1:]])]}
+    with mock.patch.dict(os.environ, {"NADO_EXEC_WORKERS": "2"}), mock.patch.object(PX, "PARALLEL_MIN_CALLS", 1):
+        specs = PX.speculate({"default": st}, block["block_transactions"])
+    inc, peek = specs[0], specs[1]
+    code, slots = st.contracts[cid]["code"], {0: 1}          # _pair funded it with inc(0, 1)
+    args = (inc.method, inc.inputs, slots, st.beacons, st.block_hashes, st.holder_assets(cid))
+    assert inc.replay(code, *args)[:3] == (True, 5, {0: 5})
+    assert inc.replay(code, inc.method, inc.inputs, {0: 2}, *args[3:]) is None, "a moved slot was adopted"
+    assert inc.replay(dict(code), *args) is None, "replaced code was adopted"
+    assert peek.replay(code, peek.method, peek.inputs, {}, st.beacons, st.block_hashes,
+                       st.holder_assets(cid)) is not None
+    st.record_block_hash(1, "%064x" % 999)
+    assert peek.replay(code, peek.method, peek.inputs, {}, st.beacons, st.block_hashes,
+                       st.holder_assets(cid)) is None, "a changed block hash was adopted"
+
+def t3_small_blocks_and_disabled_workers_do_not_fork():
+    """Prove blocks under PARALLEL_MIN_CALLS, NADO_EXEC_WORKERS=1 and a failing pool all fall back to plain
+    sequential application (no speculation at all)."""
+    st, _ = _pair()
+    txs = [{"recipient": "blob", "txid": f"s{i}", "sender": "ndoA",
+            "data": {"op": "call", "contract": c, "method": "inc", "args": [0, 1]}}
+           for i, c in enumerate(sorted(st.contracts))]
+    assert PX.speculate({"default": st}, txs) == {}               # 6 calls < the default minimum
+    with mock.patch.object(PX, "PARALLEL_MIN_CALLS", 1):
+        with mock.patch.dict(os.environ, {"NADO_EXEC_WORKERS": "1"}):
+            assert PX.speculate({"default": st}, txs) == {}
+        with mock.patch.dict(os.environ, {"NADO_EXEC_WORKERS": "2"}), \
+                mock.patch.object(PX, "_speculate_chunk", side_effect=RuntimeError("worker died")):
+            assert PX.speculate({"default": st}, txs) == {}
+
+
+def _hang(groups):
+    time.sleep(60)
+
+
+def t4_malformed_txs_and_hung_workers_fall_back():
+    """Prove a non-dict tx in the block never raises out of speculate(), and a wedged worker is killed at
+    SPECULATE_TIMEOUT instead of blocking the exec loop."""
+    st, _ = _pair()
+    txs = [{"recipient": "blob", "txid": f"s{i}", "sender": "ndoA",
+            "data": {"op": "call", "contract": c, "method": "inc", "args": [0, 1]}}
+           for i, c in enumerate(sorted(st.contracts))]
+    with mock.patch.object(PX, "PARALLEL_MIN_CALLS", 1), mock.patch.dict(os.environ, {"NADO_EXEC_WORKERS": "2"}):
+        specs = PX.speculate({"default": st}, ["junk", None, 7] + txs)
+        assert set(specs) <= set(range(3, 3 + len(txs))), specs
+        assert PX.speculate({"default": st}, None) == {}
+        with mock.patch.object(PX, "SPECULATE_TIMEOUT", 0.5), mock.patch.object(PX, "_speculate_chunk", _hang):
+            t0 = time.monotonic()
+            assert PX.speculate({"default": st}, txs) == {}
+            assert time.monotonic() - t0 < 10, "speculate waited on a hung worker"
+
+
+class _PlainRuntime:
+    """A runtime on the registry seam that knows nothing about speculation (no `speculated=`)."""
+    name = "plain-test"
+
+    def validate_code(self, code):
+        return True
+
+    def run(self, code, method, caller, args, storage, value=0, cursor=0, timestamp=0, beacons=None,
+            block_hashes=None, asset=0, selfd=0, abal=None):
+        return True, 7, storage, []
+
+
+def t5_speculation_only_reaches_the_zkvm():
+    """Prove a call whose contract moved to another runtime before it applied (a mid-block upgrade) runs
+    on that runtime instead of being skipped for the speculation it cannot take."""
+    from execnode import runtimes
+    st, _ = _pair()
+    cids = sorted(st.contracts)
+    txs = [{"recipient": "blob", "txid": f"r{i}", "sender": "ndoA",
+            "data": {"op": "call", "contract": c, "method": "inc", "args": [0, 1]}} for i, c in enumerate(cids)]
+    with mock.patch.dict(os.environ, {"NADO_EXEC_WORKERS": "2"}), mock.patch.object(PX, "PARALLEL_MIN_CALLS", 1):
+        specs = PX.speculate({"default": st}, txs)
+    assert 0 in specs
+    runtimes.register(_PlainRuntime())
+    st.contracts[cids[0]]["runtime"] = _PlainRuntime.name
+    res = st.apply_blob(txs[0]["data"], "ndoA", "r0", spec=specs[0])
+    assert not str(res).startswith("skip") and not specs[0].adopted, res
+
+
+check("t1_blocks_match_sequential", t1_blocks_match_sequential)
+check("t2_stale_reads_are_refused", t2_stale_reads_are_refused)
+check("t3_small_blocks_and_disabled_workers_do_not_fork", t3_small_blocks_and_disabled_workers_do_not_fork)
+check("t4_malformed_txs_and_hung_workers_fall_back", t4_malformed_txs_and_hung_workers_fall_back)
+check("t5_speculation_only_reaches_the_zkvm", t5_speculation_only_reaches_the_zkvm)
+print("ALL PASS" if not fails else f"{fails} FAILURE(S)")
+sys.exit(1 if fails else 0)
@@ -31,6 +31,7 @@ if os.environ.get("_EX_REWIND_CHILD") != "1":
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import execnode.execnode as X          # noqa: E402
+from execnode.state_journal import load_payload  # noqa: E402
 
 FAILS = []
 
@@ -104,8 +105,8 @@ def t_recovery_rewinds_below_the_fork_and_clears_stale_artifacts():
     assert X.state.cursor == max(c for c in cks_before if c <= FORK), "did not rewind to the newest checkpoint at/below the fork"
     assert all(h <= X.state.cursor for h in X.state.block_hashes), "block hashes above the rewind point survived"
     assert all(c <= X.state.cursor for c in X._ckpt_list().get("default", [])), "checkpoints above the rewind point survived"
-    # the state on disk agrees with the state in memory
-    on_disk = json.load(open(X.STATE_PATH))
+    # the state on disk (base + journal) agrees with the state in memory
+    on_disk = load_payload(X.STATE_PATH)
     assert int(on_disk.get("cursor", -9)) == X.state.cursor, "rewound state was not persisted"
 
 
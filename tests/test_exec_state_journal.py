@@ -0,0 +1,174 @@
+"""
+Incremental exec-state persistence (execnode/state_journal.py): a sorted-key JSON base plus an append-only,
+checksummed journal of per-save deltas, behind ExecState.save / ExecState.load.
+
+save() used to rewrite the whole payload every time. It now appends what changed — and that may only make
+saving cheaper, never different: a state loaded back from base + journal must show exactly the snapshot
+and state_root of the state that was saved, a torn journal record must load as the save before it, and a
+journal that does not belong to the base on disk must never be replayed over it.
+
+Run: python3 tests/test_exec_state_journal.py
+"""
+import json, os, random, sys, tempfile, traceback
+os.environ["HOME"] = tempfile.mkdtemp(prefix="nado_journal_")
+os.environ.setdefault("NADO_ALLOW_PYTHON_KERNELS", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for d in ("index", "blocks", "logs", "peers"):
+    os.makedirs(f"{os.environ['HOME']}/nado/{d}", exist_ok=True)
+
+from execnode import zkvmasm
+from execnode import state_journal as SJ
+from execnode.state import ExecState
+
+fails = 0
+def check(name, fn):
+    """Run fn; print PASS/FAIL and count failures."""
+    global fails
+    try: fn(); print(f"PASS  {name}")
+    except Exception as e:
+        fails += 1; print(f"FAIL  {name}: {e}"); traceback.print_exc()
+
+
+CODE = zkvmasm.assemble_contract({"put": "sstore r0 r1\nret r1"})
+USERS = ["ndoA", "ndoB", "ndoC"]
+
+
+def _path():
+    return os.path.join(tempfile.mkdtemp(prefix="nado_journal_"), "exec_state.json")
+
+
+def _step(st, rng, i):
+    """One block's worth of writes: a slot, a balance, a withdrawal, a blockhash, sometimes a deploy."""
+    who = rng.choice(USERS)
+    if i % 7 == 0 or not st.contracts:
+        st.apply_blob({"op": "deploy", "code": CODE, "nonce": i}, who, f"d{i}")
+    cid = rng.choice(sorted(st.contracts))
+    st.apply_blob({"op": "call", "contract": cid, "method": "put", "args": [rng.randint(0, 9), i]}, who, f"c{i}")
+    st.credit_deposit(who, rng.randint(1, 40))
+    if i % 3 == 0:
+        st.apply_blob({"op": "bridge_withdraw", "amount": 1}, who, f"w{i}")
+    if i % 5 == 0 and st.withdrawals:
+        st.drop_claimed("bridge_withdraw", sorted(st.withdrawals)[0])
+    st.record_block_hash(i + 1, "%064x" % rng.getrandbits(256))
+    st.cursor = i
+
+
+def _same(a, b, what):
+    assert a._snapshot() == b._snapshot(), f"{what}: snapshot differs"
+    assert a.state_root() == b.state_root(), f"{what}: state_root differs"
+
+
+def t1_journal_round_trips():
+    """Prove every save after the first appends a journal record, not a rewrite, and that a fresh load at
+    any point shows the same snapshot and root as the live state."""
+    p, rng = _path(), random.Random(22)
+    st = ExecState(p)
+    for i in range(30):
+        _step(st, rng, i)
+        st.save()
+        if i % 6 == 5:
+            _same(ExecState(p), st, f"reload after save {i}")
+    assert os.path.exists(p + SJ.JOURNAL_SUFFIX) and st._journal.records == 29, st._journal.records
+    assert st.save() == 0, "a save with nothing changed wrote bytes"
+
+def t2_deltas_are_small():
+    """Prove a save that moved one slot journals a record far smaller than the base it would have
+    rewritten."""
+    p, rng = _path(), random.Random(23)
+    st = ExecState(p)
+    for i in range(60):
+        _step(st, rng, i)
+    st.save()
+    base = os.path.getsize(p)
+    cid = sorted(st.contracts)[0]
+    st.apply_blob({"op": "call", "contract": cid, "method": "put", "args": [3, 12345]}, "ndoA", "x")
+    wrote = st.save()
+    assert 0 < wrote < base // 10, f"one slot cost {wrote} bytes against a {base}-byte base"
+
+def t3_torn_record_loads_the_save_before():
+    """Prove a journal cut anywhere inside its last record — or with a flipped byte — loads exactly the
+    previous save, and that the next save truncates the torn bytes away rather than appending after them."""
+    p, rng = _path(), random.Random(24)
+    st = ExecState(p)
+    for i in range(5):
+        _step(st, rng, i)
+        st.save()
+    good = json.loads(json.dumps(st._snapshot(), sort_keys=True))
+    _step(st, rng, 5)
+    st.save()
+    jp = p + SJ.JOURNAL_SUFFIX
+    full = open(jp, "rb").read()
+    cut = full.rstrip(b"\n").rfind(b"\n") + 1
+    for torn in (full[:cut + 10], full[:-1], full[:cut] + full[cut:].replace(b"1", b"2", 1)):
+        open(jp, "wb").write(torn)
+        back = ExecState(p)
+        assert back._snapshot() == good, "a torn record was observed"
+    back.apply_blob({"op": "bridge_withdraw", "amount": 2}, "ndoA", "after")
+    back.save()
+    _same(ExecState(p), back, "save after a torn tail")
+
+def t4_foreign_journal_is_ignored():
+    """Prove a journal whose header names a different base (a base replaced under it, a restored backup)
+    is never replayed: the base loads on its own."""
+    p, rng = _path(), random.Random(25)
+    st = ExecState(p)
+    for i in range(4):
+        _step(st, rng, i)
+        st.save()
+    jp = p + SJ.JOURNAL_SUFFIX
+    journal = open(jp, "rb").read()
+    other = ExecState(_path())
+    _step(other, rng, 99)
+    other.save()
+    os.replace(other.path, p)
+    open(jp, "wb").write(journal)
+    _same(ExecState(p), other, "foreign journal")
+
+def t5_compaction_rewrites_a_plain_base():
+    """Prove that once the journal outgrows the base, a save compacts: the journal is gone and the base is
+    the exact sorted-key JSON of the payload — what save() always wrote, so a plain json.load still works.
+    A base wiped underneath a live instance is rewritten too, never journaled against."""
+    p, rng = _path(), random.Random(26)
+    st = ExecState(p)
+    _step(st, rng, 0)
+    st.save()
+    old = SJ.COMPACT_MIN_BYTES
+    SJ.COMPACT_MIN_BYTES = 0
+    try:
+        i = 1
+        while os.path.exists(p + SJ.JOURNAL_SUFFIX) or i < 3:
+            _step(st, rng, i)
+            st.save()
+            i += 1
+            assert i < 500, "the journal never compacted"
+    finally:
+        SJ.COMPACT_MIN_BYTES = old
+    assert open(p).read() == json.dumps(st._snapshot(), sort_keys=True)
+    os.remove(p)
+    _step(st, rng, 1000)
+    st.save()
+    assert not os.path.exists(p + SJ.JOURNAL_SUFFIX)
+    _same(ExecState(p), st, "rewrite after a wipe")
+
+def t6_diff_patch_algebra():
+    """Prove patch(old, diff(old, new)) == new for nested maps, deletions, appended and rewritten lists and
+    non-string keys, and that equal values produce no op."""
+    old = {"a": {"x": 1, "y": {"z": [1, 2]}}, "l": [1, 2, 3], "s": "v", "n": 1}
+    new = {"a": {"x": 1, "y": {"z": [1, 2, 3], "w": True}}, "l": [9], "n": 1.5, 7: "seven"}
+    op = SJ.diff(old, new)
+    assert op[0] == "~" and op[1]["a"][1]["y"][1]["z"] == ["+", [3]]
+    doc = json.loads(json.dumps(old))
+    SJ.patch(doc, json.loads(json.dumps(op[1])))
+    assert doc == json.loads(json.dumps(new)), doc
+    assert SJ.diff(doc, json.loads(json.dumps(new))) is None
+    assert SJ.diff(1, True) == ["=", True] and SJ.diff([1], (1,)) is None
+
+
+check("t1_journal_round_trips", t1_journal_round_trips)
+check("t2_deltas_are_small", t2_deltas_are_small)
+check("t3_torn_record_loads_the_save_before", t3_torn_record_loads_the_save_before)
+check("t4_foreign_journal_is_ignored", t4_foreign_journal_is_ignored)
+check("t5_compaction_rewrites_a_plain_base", t5_compaction_rewrites_a_plain_base)
+check("t6_diff_patch_algebra", t6_diff_patch_algebra)
+print("ALL PASS" if not fails else f"{fails} FAILURE(S)")
+sys.exit(1 if fails else 0)
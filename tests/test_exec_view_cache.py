@@ -0,0 +1,142 @@
+"""
+View result cache (ExecState.view / execnode/state.py _ViewCache) and the ETag path of GET /exec/view.
+
+Every frontend polls the same read-only views on a tick, so a view result is memoized until something it
+can read moves. That may only make /exec/view cheaper, never staler: a call that writes the contract, an
+asset moved onto it, a new block and a restored snapshot must each miss, a clone must never serve its
+parent's results (or the other way round), and a poller echoing the ETag gets a 304 exactly while the
+answer is unchanged.
+
+Run: python3 tests/test_exec_view_cache.py
+"""
+import asyncio, os, sys, tempfile, traceback
+from unittest import mock
+os.environ["HOME"] = tempfile.mkdtemp(prefix="nado_viewcache_")
+os.environ.setdefault("NADO_ALLOW_PYTHON_KERNELS", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for d in ("index", "blocks", "logs", "peers"):
+    os.makedirs(f"{os.environ['HOME']}/nado/{d}", exist_ok=True)
+
+from execnode import zkvmasm
+from execnode import state as S
+from execnode.state import ExecState
+
+fails = 0
+def check(name, fn):
+    """Run fn; print PASS/FAIL and count failures."""
+    global fails
+    try: fn(); print(f"PASS  {name}")
+    except Exception as e:
+        fails += 1; print(f"FAIL  {name}: {e}"); traceback.print_exc()
+
+
+CODE = zkvmasm.assemble_contract({"put": "sstore r0 r1\nret r1", "get": "sload r1 r0\nret r1"})
+
+
+def _st():
+    st = ExecState(tempfile.mktemp(prefix="nado_viewcache_", suffix=".json"))
+    st.apply_blob({"op": "deploy", "code": CODE, "nonce": 1}, "ndoA", "d")
+    return st, next(iter(st.contracts))
+
+
+def _runs(st):
+    """Count interpreter runs behind st.view."""
+    real, n = ExecState._rt_run, [0]
+
+    def counted(rt, *a, **kw):
+        n[0] += 1
+        return real(rt, *a, **kw)
+    return mock.patch.object(ExecState, "_rt_run", staticmethod(counted)), n
+
+
+def t1_repeat_views_hit():
+    """Prove a repeated view runs the interpreter once and answers the same every time."""
+    st, cid = _st()
+    st.apply_blob({"op": "call", "contract": cid, "method": "put", "args": [3, 41]}, "ndoA", "c")
+    patch, n = _runs(st)
+    with patch:
+        assert [st.view(cid, "get", [3]) for _ in range(5)] == [41] * 5
+    assert n[0] == 1, f"{n[0]} runs for five identical views"
+    s = st.view_stats()
+    assert s["hits"] == 4 and s["misses"] == 1 and s["size"] == 1, s
+
+def t2_writes_and_blocks_miss():
+    """Prove a call that writes the contract, an asset credited to it, a new cursor and a restore each make
+    the next view re-run, and that a write to ANOTHER contract does not."""
+    st, cid = _st()
+    st.apply_blob({"op": "deploy", "code": CODE, "nonce": 2}, "ndoA", "d2")
+    other = [c for c in st.contracts if c != cid][0]
+    st.apply_blob({"op": "call", "contract": cid, "method": "put", "args": [1, 5]}, "ndoA", "c1")
+    patch, n = _runs(st)
+
+    def ran(want):
+        """How many interpreter runs one view took (0 = served from the cache); checks its answer."""
+        before = n[0]
+        assert st.view(cid, "get", [1]) == want
+        return n[0] - before
+    with patch:
+        assert ran(5) == 1
+        st.apply_blob({"op": "call", "contract": other, "method": "put", "args": [1, 9]}, "ndoA", "o")
+        assert ran(5) == 0, "a write elsewhere retired this view"
+        st.apply_blob({"op": "call", "contract": cid, "method": "put", "args": [1, 6]}, "ndoA", "c2")
+        assert ran(6) == 1, "a write to the contract did not retire its view"
+        st._asset_credit(1, cid, 1)
+        assert ran(6) == 1, "an asset moved onto the contract did not retire its views"
+        st.cursor += 1
+        assert ran(6) == 1, "a new block did not retire the view"
+        st._restore(st._snapshot())
+        assert ran(6) == 1, "a restored state served a pre-restore result"
+
+def t3_clones_keep_their_own_results():
+    """Prove a provisional clone neither serves nor poisons its parent's cached views."""
+    st, cid = _st()
+    st.apply_blob({"op": "call", "contract": cid, "method": "put", "args": [2, 7]}, "ndoA", "c")
+    assert st.view(cid, "get", [2]) == 7
+    pv = st.clone()
+    pv.apply_blob({"op": "call", "contract": cid, "method": "put", "args": [2, 8]}, "ndoA", "p")
+    assert pv.view(cid, "get", [2]) == 8 and st.view(cid, "get", [2]) == 7
+    assert pv.view_stats()["size"] == 1 and st.view_stats()["hits"] == 1
+
+def t4_bounded():
+    """Prove the cache never holds more than VIEW_CACHE_MAX results and evicts the least recently used."""
+    st, cid = _st()
+    with mock.patch.object(S, "VIEW_CACHE_MAX", 8):
+        for k in range(20):
+            st.view(cid, "get", [k])
+        st.view(cid, "get", [19])
+        assert st.view_stats()["size"] == 8
+        patch, n = _runs(st)
+        with patch:
+            st.view(cid, "get", [19])
+            st.view(cid, "get", [0])
+        assert n[0] == 1, "the wrong entry was evicted"
+
+def t5_etag_revalidation():
+    """Prove /exec/view answers with an ETag, a matching If-None-Match gets a bodiless 304, and a changed
+    answer gets a 200 with a new tag."""
+    from aiohttp.test_utils import make_mocked_request
+    from execnode import execnode as X
+    st, cid = _st()
+    st.apply_blob({"op": "call", "contract": cid, "method": "put", "args": [4, 1]}, "ndoA", "c")
+    X.states = {"default": st}
+    url = f"/exec/view?cid={cid}&method=get&args=[4]"
+
+    async def go(inm=None):
+        return await X.h_view(make_mocked_request("GET", url, headers={"If-None-Match": inm} if inm else {}))
+    r1 = asyncio.run(go())
+    tag = r1.headers["ETag"]
+    assert r1.status == 200 and '"result": "1"' in r1.text
+    r2 = asyncio.run(go(tag))
+    assert r2.status == 304 and not r2.body and r2.headers["ETag"] == tag
+    st.apply_blob({"op": "call", "contract": cid, "method": "put", "args": [4, 2]}, "ndoA", "c2")
+    r3 = asyncio.run(go(tag))
+    assert r3.status == 200 and r3.headers["ETag"] != tag and '"result": "2"' in r3.text
+
+
+check("t1_repeat_views_hit", t1_repeat_views_hit)
+check("t2_writes_and_blocks_miss", t2_writes_and_blocks_miss)
+check("t3_clones_keep_their_own_results", t3_clones_keep_their_own_results)
+check("t4_bounded", t4_bounded)
+check("t5_etag_revalidation", t5_etag_revalidation)
+print("ALL PASS" if not fails else f"{fails} FAILURE(S)")
+sys.exit(1 if fails else 0)
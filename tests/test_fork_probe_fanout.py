@@ -0,0 +1,177 @@
+"""
+Concurrent fork-verdict probing (fork_resolution.fan_out, majority_hash early termination, the verdict
+deadline, peer_ops.ProbeMemo / core_loop._memo_probe, the concurrent stranded_below_finality).
+
+Probing may only get FASTER, never say something different: a round that stops early must return exactly
+what the full round would have, a dead or slow peer may cost at most the deadline (and is then no
+evidence, as a timeout always was), and the (peer, height) memo must carry answers across verdict passes
+while letting a failure be re-asked soon.
+
+Run: python3 tests/test_fork_probe_fanout.py
+"""
+import os, sys, tempfile, traceback, random, threading, time
+os.environ["HOME"] = tempfile.mkdtemp(prefix="nado_fanout_")
+os.environ["NADO_PROBE_DEADLINE_S"] = "1"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for d in ("index", "blocks", "logs", "peers"):
+    os.makedirs(f"{os.environ['HOME']}/nado/{d}", exist_ok=True)
+
+from ops import fork_resolution as FR
+from ops import peer_ops as P
+
+fails = 0
+def check(name, fn):
+    """Run fn; print PASS/FAIL and count failures."""
+    global fails
+    try: fn(); print(f"PASS  {name}")
+    except Exception as e:
+        fails += 1; print(f"FAIL  {name}: {e}"); traceback.print_exc()
+
+
+def _slow(answers, delays):
+    """probe(peer, h) -> answers[peer] after delays[peer] seconds (absent = 0)."""
+    def probe(peer, h):
+        time.sleep(delays.get(peer, 0))
+        return answers.get(peer)
+    return probe
+
+
+def t1_fan_out_deadline_and_errors():
+    """Prove fan_out returns the answered keys once the deadline passes instead of waiting on a 5 s
+    straggler, drops a raising call as unanswered, and returns nothing for an expired deadline."""
+    def call(k):
+        if k == "boom":
+            raise IOError("peer reset")
+        time.sleep(5 if k == "dead" else 0.05)
+        return k.upper()
+    t0 = time.monotonic()
+    got = FR.fan_out(["a", "b", "dead", "boom"], call, deadline=time.monotonic() + 0.5)
+    assert got == {"a": "A", "b": "B"}, got
+    assert time.monotonic() - t0 < 1.5, "the round waited for the straggler"
+    assert FR.fan_out(["a"], call, deadline=time.monotonic() - 1) == {}
+
+def t2_early_stop_matches_full_round():
+    """Prove majority_hash with max_weight returns, on 300 random weighted splits with random latencies,
+    exactly what the full round returns — and settles a clear majority without waiting for slow peers."""
+    rng = random.Random(18)
+    for _ in range(300):
+        n = rng.randint(1, 7)
+        peers = [f"p{i}" for i in range(n)]
+        answers = {p: (rng.choice(["X", "Y", None]), rng.randint(0, 3)) for p in peers}
+        delays = {p: rng.choice([0, 0.001, 0.003]) for p in peers}
+        full = FR.majority_hash(5, peers, _slow(answers, {}), min_answers=2)
+        early = FR.majority_hash(5, peers, _slow(answers, delays), min_answers=2, max_weight=4)
+        assert early == full, (answers, early, full)
+    peers = ["a", "b", "c", "s1", "s2"]
+    answers = {p: ("X", 0) for p in peers}
+    t0 = time.monotonic()
+    assert FR.majority_hash(1, peers, _slow(answers, {"s1": 3, "s2": 3}), max_weight=1) == "X"
+    assert time.monotonic() - t0 < 1.5, "a settled 3-of-5 majority still waited for the stragglers"
+
+def t3_verdict_deadline():
+    """Prove resolve() against peers that never answer in time ends UNKNOWN and timed_out at its
+    deadline, instead of ~26 rounds x 8 retries of timeouts."""
+    probe = _slow({"a": "X", "b": "X"}, {"a": 3, "b": 3})
+    t0 = time.monotonic()
+    v = FR.resolve(lambda h: "X", tip=100, finalized=50, peers=["a", "b"], probe=probe,
+                   deadline=time.monotonic() + 0.6)
+    assert v["state"] == FR.UNKNOWN and v.get("timed_out"), v
+    assert time.monotonic() - t0 < 2.0, f"verdict took {time.monotonic() - t0:.1f}s past a 0.6s deadline"
+
+def t4_stranded_probes_concurrently():
+    """Prove stranded_below_finality asks its peers at once (six 0.4 s peers take ~0.4 s, not 2.4 s),
+    counts a peer still silent at the deadline as unknown, keeps peer order in its lists, and stops as
+    soon as the disagreement quorum is out of reach."""
+    orig = (P.probe_block_hash, P._common_probe_height, P.peer_tip_weight)
+    asked = []
+    try:
+        def probe(peer, height, port=9173, timeout=6):
+            asked.append(peer)
+            time.sleep(5 if peer == "dead" else 0.4)
+            return "OURS" if peer in ("a2",) else "THEIRS"
+        P.probe_block_hash = probe
+        P._common_probe_height = lambda peer, h, port=9173: (h, None)
+        P.peer_tip_weight = lambda peer, port=9173, timeout=6: 10
+        peers = ["d1", "d2", "d3", "a2", "d4", "d5", "dead"]
+        t0 = time.monotonic()
+        stranded, detail = P.stranded_below_finality("OURS", 40, peers, quorum=2)
+        took = time.monotonic() - t0
+        assert took < 1.6, f"serial probing: {took:.1f}s"
+        assert detail["disagree"] == ["d1", "d2", "d3", "d4", "d5"] and detail["agree"] == ["a2"], detail
+        assert detail["unknown"] == ["dead"] and stranded is False, detail
+
+        # quorum 3 among [x, y, z] where x answers at once "agree": the other two can still reach at most
+        # 2 disagreements, so the round must not wait for them
+        def probe2(peer, height, port=9173, timeout=6):
+            time.sleep(0 if peer == "x" else 3)
+            return "OURS"
+        P.probe_block_hash = probe2
+        t0 = time.monotonic()
+        stranded, detail = P.stranded_below_finality("OURS", 40, ["x", "y", "z"], quorum=3)
+        assert stranded is False and time.monotonic() - t0 < 1.0, detail
+        assert detail["unknown"] == ["y", "z"], detail
+    finally:
+        P.probe_block_hash, P._common_probe_height, P.peer_tip_weight = orig
+
+def t5_probe_memo_ttls_and_single_flight():
+    """Prove ProbeMemo expires answers and failures on their own TTLs and keeps one probe in flight per
+    key: eight threads fetching the same (peer, height) cause exactly one ask."""
+    m = P.ProbeMemo(ttl=0.4, fail_ttl=0.1)
+    m[("a", 1)] = ("H", 2)
+    m[("b", 1)] = (None, 0)
+    assert ("a", 1) in m and m.get(("b", 1)) == (None, 0)
+    time.sleep(0.2)
+    assert m.get(("a", 1)) == ("H", 2) and ("b", 1) not in m, "a failure must be re-askable quickly"
+    time.sleep(0.3)
+    assert m.get(("a", 1)) is None, "an answer must expire after its TTL"
+
+    calls = []
+    def ask():
+        calls.append(1)
+        time.sleep(0.3)
+        return ("H", 0)
+    out = []
+    ts = [threading.Thread(target=lambda: out.append(m.fetch(("c", 7), ask))) for _ in range(8)]
+    for t in ts: t.start()
+    for t in ts: t.join()
+    assert len(calls) == 1 and out == [("H", 0)] * 8, (calls, out)
+
+def t6_memo_shared_across_verdict_passes():
+    """Prove core_loop._memo_probe carries answers across two verdict passes (the second asks nobody),
+    keeping the signed probe's 3 s timeout and tip hint."""
+    from loops.core_loop import CoreClient
+    seen = []
+    def signed(peer, h, port=9173, timeout=6, tip_hint=0):
+        seen.append((peer, h, timeout, tip_hint))
+        return ("X%d" % h, 1)
+    orig = P.probe_block_hash_signed
+    P.probe_block_hash_signed = signed
+    try:
+        class _Mem:
+            port = 9173
+        class _Stub:
+            memserver = _Mem()
+            _memo_probe = CoreClient._memo_probe
+        s = _Stub()
+        ours = lambda h: "X%d" % h
+        for _ in range(2):
+            v = FR.resolve(ours, tip=64, finalized=10, peers=["a", "b", "c"],
+                           probe=lambda peer, h: s._memo_probe(peer, h, 64), max_weight=4)
+            assert v["state"] == FR.BEHIND, v
+        first = len(seen)
+        assert first and all(t == 3 and hint == 64 for _p, _h, t, hint in seen), seen[:3]
+        FR.resolve(ours, tip=64, finalized=10, peers=["a", "b", "c"],
+                   probe=lambda peer, h: s._memo_probe(peer, h, 64))
+        assert len(seen) == first, "a later pass re-probed memoized heights"
+    finally:
+        P.probe_block_hash_signed = orig
+
+
+check("t1_fan_out_deadline_and_errors", t1_fan_out_deadline_and_errors)
+check("t2_early_stop_matches_full_round", t2_early_stop_matches_full_round)
+check("t3_verdict_deadline", t3_verdict_deadline)
+check("t4_stranded_probes_concurrently", t4_stranded_probes_concurrently)
+check("t5_probe_memo_ttls_and_single_flight", t5_probe_memo_ttls_and_single_flight)
+check("t6_memo_shared_across_verdict_passes", t6_memo_shared_across_verdict_passes)
+print("ALL PASS" if not fails else f"{fails} FAILURE(S)")
+sys.exit(1 if fails else 0)
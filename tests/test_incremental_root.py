@@ -0,0 +1,152 @@
+"""
+Incremental L1 state root (ops/state_tree.py) — a DIFFERENTIAL test against the full walk.
+
+The incremental tree may only change how fast the root is computed, never which root: after every commit it
+must equal merkle_root(_root_triples(read_state())) exactly. Exercised with random account / meta / DUPSORT
+writes and deletes (inserts shift every later leaf, overwrites don't), all-default account rows (excluded
+from the root), aborted txns (nothing applied), retention-window slides in both directions (an epochw row
+committed / deleted), and a snapshot restore (sub-DB drops: the tree must be dropped, then rebuilt).
+
+Run: python3 tests/test_incremental_root.py
+"""
+import os, sys, tempfile, traceback, random
+os.environ["HOME"] = tempfile.mkdtemp(prefix="nado_incroot_")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for d in ("index", "blocks", "logs", "peers"):
+    os.makedirs(f"{os.environ['HOME']}/nado/{d}", exist_ok=True)
+
+from genesis import create_indexers
+create_indexers()
+
+from ops import kv_ops, state_tree
+from ops import snapshot_ops as so
+
+fails = 0
+def check(name, fn):
+    """Run fn; print PASS/FAIL and count failures."""
+    global fails
+    try: fn(); print(f"PASS  {name}")
+    except Exception as e:
+        fails += 1; print(f"FAIL  {name}: {e}"); traceback.print_exc()
+
+def raises(fn):
+    """True if fn raises."""
+    try: fn(); return False
+    except Exception: return True
+
+RNG = random.Random(7)
+ADDRS = [f"addr{i:04d}" for i in range(40)]
+W = so.ROOT_RETENTION_EPOCHS
+
+
+def _full():
+    return so.merkle_root(so._root_triples(so.read_state()))
+
+def _tree():
+    return state_tree._trees.get(kv_ops.env_path())
+
+def _same(msg=""):
+    """The incremental root equals the from-scratch root, served from the SAME (not rebuilt) tree."""
+    t = _tree()
+    inc = state_tree.root()
+    assert inc == _full(), f"incremental root diverged {msg}"
+    if t is not None:
+        assert _tree() is t, f"tree was rebuilt instead of advanced {msg}"
+
+def _random_op(txn):
+    dbs = kv_ops._dbs()
+    r = RNG.random()
+    a = RNG.choice(ADDRS)
+    if r < 0.30:
+        kv_ops._acct_put(txn, a, kv_ops._normalize({"balance": RNG.randrange(0, 5), "bonded": RNG.randrange(0, 3)}))
+    elif r < 0.40:
+        kv_ops._acct_del(txn, a)
+    elif r < 0.55:
+        txn.put(f"divnull:{a}:{RNG.randrange(0, 3 * W)}".encode(), b"1", db=dbs["meta"])
+    elif r < 0.65:
+        txn.delete(f"divnull:{a}:{RNG.randrange(0, 3 * W)}".encode(), db=dbs["meta"])
+    elif r < 0.80:
+        txn.put(kv_ops.be8(RNG.randrange(0, 3 * W)), f"{a}|h{RNG.randrange(3)}".encode(),
+                db=dbs["attestations"], dupdata=True)
+    elif r < 0.88:
+        txn.delete(kv_ops.be8(RNG.randrange(0, 3 * W)), f"{a}|h{RNG.randrange(3)}".encode(), db=dbs["attestations"])
+    elif r < 0.95:
+        txn.put(f"{a}|{RNG.randrange(0, 3 * W)}".encode(), b"c", db=dbs["commits"])
+    else:
+        txn.put(a.encode(), b"local", db=dbs["hb_revert"])        # node-local: never in the root
+
+
+def t1_random_commits_match_full_walk():
+    """Prove that across 150 random commits (1-6 writes each, inserts/overwrites/deletes over plain and
+    DUPSORT sub-DBs) the incremental root equals the full-walk root after every one, without rebuilds."""
+    state_tree.root()
+    assert _tree() is not None
+    for i in range(150):
+        with kv_ops.write_txn() as txn:
+            for _ in range(RNG.randrange(1, 7)):
+                _random_op(txn)
+        _same(f"after commit {i}")
+
+def t2_default_accounts_and_standalone_writes():
+    """Prove an all-default account row stays out of the root (and leaves it when zeroed), and that the
+    standalone (no write_txn) helper path is tracked too."""
+    state_tree.root()
+    kv_ops.account_set("ghost0001", "balance", 5)
+    _same("after a standalone account write")
+    kv_ops.account_set("ghost0001", "balance", 0)
+    _same("after zeroing the account (default row)")
+    assert not any(k == b"ghost0001" for n, k, _v in _tree().rows), "a default account row must not be a leaf"
+    kv_ops.meta_set_int("some_counter", 3)
+    kv_ops.meta_del("some_counter")
+    _same("after a meta put + delete")
+
+def t3_aborted_txn_changes_nothing():
+    """Prove a txn that raises applies nothing to the tree (and the generation does not move)."""
+    state_tree.root()
+    before, gen = state_tree.root(), kv_ops.write_generation()
+    def _boom():
+        with kv_ops.write_txn() as txn:
+            _random_op(txn); _random_op(txn)
+            raise RuntimeError("void the block")
+    assert raises(_boom)
+    assert kv_ops.write_generation() == gen
+    assert state_tree.root() == before
+    _same("after an aborted txn")
+
+def t4_window_slides_both_ways():
+    """Prove committing epochw rows past ROOT_RETENTION_EPOCHS slides the window (old windowed rows leave
+    the root) and deleting them slides it back (they re-enter) — incrementally, matching the full walk."""
+    state_tree.root()
+    for e in range(0, 2 * W + 5, 7):
+        kv_ops.epoch_weights_commit(e, {"a": 1})
+        _same(f"after epochw:{e}")
+    assert _tree().floor is not None, "the window must have started sliding"
+    for e in reversed(range(0, 2 * W + 5, 7)):
+        kv_ops.epoch_weights_commit(e, revert=True)
+        _same(f"after deleting epochw:{e}")
+    assert _tree().floor is None
+
+def t5_restore_drops_then_rebuilds_and_cross_check():
+    """Prove a snapshot restore (sub-DB drops) drops the tree rather than mis-advancing it, the next root
+    rebuilds it correctly, l1_state_root serves the same value, and check_root flags a corrupted tree."""
+    state_tree.root()
+    triples = so.read_state()
+    with kv_ops.write_txn() as txn:
+        kv_ops.restore_snapshot_state([t for t in triples if t[0] != "commits"], txn=txn)
+    assert _tree() is None, "a bulk rewrite must drop the tree"
+    assert state_tree.root() == _full()
+    assert so.l1_state_root() == _full()
+    assert state_tree.check_root() is None, "an honest tree must pass the cross-check"
+    t = _tree()
+    t.levels[-1][0] = b"\x00" * 32                                     # simulate a divergent tree
+    assert state_tree.check_root() == _full(), "a divergent tree must be caught and the full root served"
+    assert _tree() is None, "a divergent tree must be dropped"
+
+
+check("t1_random_commits_match_full_walk", t1_random_commits_match_full_walk)
+check("t2_default_accounts_and_standalone_writes", t2_default_accounts_and_standalone_writes)
+check("t3_aborted_txn_changes_nothing", t3_aborted_txn_changes_nothing)
+check("t4_window_slides_both_ways", t4_window_slides_both_ways)
+check("t5_restore_drops_then_rebuilds_and_cross_check", t5_restore_drops_then_rebuilds_and_cross_check)
+print("ALL PASS" if not fails else f"{fails} FAILURE(S)")
+sys.exit(1 if fails else 0)
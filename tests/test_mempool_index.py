@@ -0,0 +1,198 @@
+"""
+The indexed mempool (ops/mempool.Mempool) behind MemServer.transaction_pool.
+
+The pool went from one list that every operation rebuilt to a txid map with per-sender queues, expiry heaps,
+a running byte total and an incrementally kept pool hash. It may only get FASTER: the pool hash peers
+majority-vote on must depend on the tx set alone (never on arrival order or on the path that built it),
+every index must agree with the contents after any mix of adds and drops, expiry and cull must drop exactly
+what the list rules dropped, and two same-sender admissions racing each other must not both pass the spend
+check. (The digests and the sketch themselves: tests/test_pool_digests.py.)
+
+Run: python3 tests/test_mempool_index.py
+"""
+import os, sys, tempfile, traceback, random, threading, time
+os.environ["HOME"] = tempfile.mkdtemp(prefix="nado_mempool_")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for d in ("index", "blocks", "logs", "peers"):
+    os.makedirs(f"{os.environ['HOME']}/nado/{d}", exist_ok=True)
+
+from hashing import canonical_bytes
+from ops.mempool import Mempool, PoolView
+from ops.pool_ops import cull_buffer
+from ops.transaction_ops import remove_outdated_transactions
+
+fails = 0
+def check(name, fn):
+    """Run fn; print PASS/FAIL and count failures."""
+    global fails
+    try: fn(); print(f"PASS  {name}")
+    except Exception as e:
+        fails += 1; print(f"FAIL  {name}: {e}"); traceback.print_exc()
+
+
+def _tx(rng, i, sender=None, recipient=None, fee=None, max_block=None):
+    return {"txid": "%064x" % rng.getrandbits(256), "sender": sender or f"s{rng.randint(0, 9)}",
+            "recipient": recipient or f"r{rng.randint(0, 9)}", "amount": rng.randint(0, 10 ** 12),
+            "fee": rng.randint(0, 1000) if fee is None else fee,
+            "max_block": rng.randint(1, 500) if max_block is None else max_block, "min_block": 0,
+            "data": {"n": i}}
+
+
+def _fresh_hash(txs):
+    """The pool hash of a mempool built in one go from `txs`, in reversed order."""
+    mp = Mempool()
+    mp.replace(list(reversed(txs)))
+    return mp.pool_hash()
+
+
+def _consistent(mp, expected):
+    """Every index of `mp` agrees with the tx list `expected` (arrival order)."""
+    assert list(mp.snapshot()) == expected
+    assert len(mp) == len(expected) and mp.ids() == [t["txid"] for t in expected]
+    assert mp.byte_size == sum(len(canonical_bytes(t)) for t in expected)
+    for s in {t["sender"] for t in expected} | {"nobody"}:
+        assert mp.of_sender(s) == [t for t in expected if t["sender"] == s], s
+    for r in {t["recipient"] for t in expected} | {"nobody"}:
+        assert mp.has_recipient(r) == any(t["recipient"] == r for t in expected), r
+    want = _fresh_hash(expected) if expected else None
+    assert mp.pool_hash() == want, "the incrementally kept pool hash drifted from the tx set's"
+
+
+def t1_indexes_and_hash_track_the_list():
+    """Prove 2,000 random adds, id discards, sender purges and re-adds leave every index (snapshot, ids,
+    sender queues, recipients, byte total) equal to the plain list, and the pool hash equal to that of a
+    pool built from scratch, in another order, from the same txs."""
+    rng = random.Random(19)
+    mp, ref = Mempool(stripes=4), []
+    _consistent(mp, ref)
+    for i in range(2000):
+        op = rng.random()
+        if op < 0.6 or not ref:
+            tx = _tx(rng, i)
+            assert mp.add(tx) is True
+            ref.append(tx)
+            assert mp.add(dict(tx)) is False, "a pooled txid was added twice"
+        elif op < 0.8:
+            gone = {t["txid"] for t in rng.sample(ref, min(3, len(ref)))} | {"f" * 64}
+            assert mp.discard_ids(gone) == len(gone) - 1
+            ref = [t for t in ref if t["txid"] not in gone]
+        else:
+            s = rng.choice(ref)["sender"]
+            assert mp.purge_sender(s) == sum(t["sender"] == s for t in ref)
+            ref = [t for t in ref if t["sender"] != s]
+        if i % 50 == 0:
+            _consistent(mp, ref)
+    _consistent(mp, ref)
+    assert mp.add({"sender": "x"}) is False and mp.add({"txid": 5, "sender": "x"}) is False
+
+def t2_expiry_matches_the_list_rule():
+    """Prove evict_outdated drops exactly what the list rules dropped as the tip moves: max_block <= tip
+    every pass, and with the landing window the remove_outdated_transactions rule (tip < max_block <
+    tip + window) — including a tip that moved BACK (rollback) so far-future txs fall out of the window."""
+    rng = random.Random(7)
+    mp, ref = Mempool(), []
+    for i in range(600):
+        tx = _tx(rng, i)
+        mp.add(tx)
+        ref.append(tx)
+    for tip in (10, 10, 60, 150):
+        mp.evict_outdated(tip)
+        ref = [t for t in ref if t["max_block"] > tip]
+        _consistent(mp, ref)
+    mp.evict_outdated(40, 200)                      # rolled back to 40: max_block >= 240 is out of reach
+    ref = remove_outdated_transactions(ref, 40)
+    ref = [t for t in ref if t["max_block"] < 40 + 200]
+    _consistent(mp, ref)
+    mp.evict_outdated(500)
+    _consistent(mp, [])
+
+def t3_cull_keeps_fee_exempt_and_matches_cull_buffer():
+    """Prove cull drops the cheapest ordinary txs until the canonical byte total fits, never a fee-exempt
+    reserved tx, keeps what cull_buffer keeps for the same byte measure, and is a no-op under the limit."""
+    rng = random.Random(3)
+    mp, ref = Mempool(), []
+    for i in range(200):
+        tx = _tx(rng, i, recipient="register" if i % 20 == 0 else None, fee=rng.randint(1, 10 ** 6))
+        mp.add(tx)
+        ref.append(tx)
+    gen = mp.gen
+    assert mp.cull(10 ** 9) == 0 and mp.gen == gen, "an under-limit cull touched the pool"
+    limit = mp.byte_size // 3
+    mp.cull(limit)
+    assert mp.byte_size <= limit
+    kept = mp.snapshot()
+    assert all(t in kept for t in ref if t["recipient"] == "register"), "a fee-exempt tx was culled"
+    import ops.pool_ops as PO
+    orig = PO._tx_size
+    PO._tx_size = lambda t: len(canonical_bytes(t))
+    try:
+        assert [t["txid"] for t in cull_buffer(list(ref), limit)] == [t["txid"] for t in kept]
+    finally:
+        PO._tx_size = orig
+
+def t4_same_sender_spend_check_is_atomic():
+    """Prove two threads admitting different txs of ONE sender, each passing a spend check that allows
+    only one of them, cannot both get in — the check and the insert share the sender's stripe lock."""
+    for _ in range(20):
+        mp = Mempool()
+        def check_spend(queued):
+            time.sleep(0.005)                       # widen the check-then-insert window
+            assert not queued, "Overspending balance"
+        out = []
+        def admit(i):
+            tx = {"txid": "%064x" % i, "sender": "alice", "recipient": "bob", "amount": 10, "fee": 1,
+                  "max_block": 50, "min_block": 0}
+            try:
+                out.append(mp.add(tx, check=check_spend))
+            except AssertionError:
+                out.append("refused")
+        ts = [threading.Thread(target=admit, args=(i,)) for i in range(2)]
+        for t in ts: t.start()
+        for t in ts: t.join()
+        assert sorted(out, key=str) == [True, "refused"] and len(mp) == 1, out
+
+def t5_snapshot_is_read_only_and_cached():
+    """Prove the list view is built once per change (same object until the pool changes), copies and
+    slices like a list, and refuses in-place mutation."""
+    rng = random.Random(5)
+    mp = Mempool()
+    mp.add(_tx(rng, 0))
+    v = mp.snapshot()
+    assert isinstance(v, PoolView) and mp.snapshot() is v
+    assert v.copy() == list(v) and v[:1] == list(v) and (v + []) == list(v)
+    for mutate in (lambda: v.append({}), lambda: v.remove(v[0]), lambda: v.__setitem__(0, {}),
+                   lambda: v.sort(), lambda: v.clear()):
+        try:
+            mutate()
+            raise AssertionError("the snapshot was mutated")
+        except TypeError:
+            pass
+    mp.add(_tx(rng, 1))
+    assert mp.snapshot() is not v and len(v) == 1 and len(mp.snapshot()) == 2
+
+def t6_memserver_forwards_to_the_mempool():
+    """Prove MemServer's transaction_pool / pool_gen / get_transaction_pool_hash read the mempool, that
+    assigning transaction_pool re-indexes it (first copy of a txid wins), and that a MemServer built with
+    object.__new__ (how the other tests bind its methods) gets a working mempool on first use."""
+    from memserver import MemServer
+    rng = random.Random(6)
+    ms = object.__new__(MemServer)
+    a, b = _tx(rng, 0), _tx(rng, 1)
+    gen = ms.pool_gen
+    ms.transaction_pool = [a, b, dict(a)]
+    assert ms.pool_gen > gen and list(ms.transaction_pool) == [a, b]
+    assert ms.get_transaction_pool_hash() == _fresh_hash([a, b])
+    ms.purge_txs_of_sender(a["sender"])
+    assert a not in ms.transaction_pool
+    ms.transaction_pool = []
+    assert ms.get_transaction_pool_hash() is None and len(ms.mempool) == 0
+
+
+check("t1_indexes_and_hash_track_the_list", t1_indexes_and_hash_track_the_list)
+check("t2_expiry_matches_the_list_rule", t2_expiry_matches_the_list_rule)
+check("t3_cull_keeps_fee_exempt_and_matches_cull_buffer", t3_cull_keeps_fee_exempt_and_matches_cull_buffer)
+check("t4_same_sender_spend_check_is_atomic", t4_same_sender_spend_check_is_atomic)
+check("t5_snapshot_is_read_only_and_cached", t5_snapshot_is_read_only_and_cached)
+check("t6_memserver_forwards_to_the_mempool", t6_memserver_forwards_to_the_mempool)
+print("ALL PASS" if not fails else f"{fails} FAILURE(S)")
+sys.exit(1 if fails else 0)
@@ -73,7 +73,7 @@ def t_the_caching_site_uses_the_grading():
     assert "self.reject_cooldown_s(result.get(\"message\")" in site, "the flat 60s cooldown is back"
     assert "now + 60" not in site, "a hardcoded 60s survives at the caching site"
     assert "if _cool:" in site, "a zero cooldown must mean NO cache entry, not an instantly-expired one"
-    assert 't.get("recipient") == tx.get("sender")' in site, "the funder-in-pool check is gone"
+    assert 'self.mempool.has_recipient(tx.get("sender"))' in site, "the funder-in-pool check is gone"
 
 
 def t_duplicate_unbond_withdraw_is_refused_at_the_door():
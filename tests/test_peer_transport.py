@@ -0,0 +1,172 @@
+"""
+Pooled keep-alive peer transport (ops/peer_transport.py — peer_session / run / fetch / get_json).
+
+The transport may only change how requests reach a peer, never their answers: repeated calls through the
+sync facade (and the peer_ops probes built on it) must reuse ONE kept-alive connection instead of dialing
+per call, concurrent callers on many threads must all get their answers while staying inside the per-host
+connection limit, a non-200 / oversized body must fail exactly like the urllib probes did, a loop without
+a pooled session must get a private one that is closed with it, and run() must refuse to wait on itself
+and honour its outer timeout.
+
+Run: python3 tests/test_peer_transport.py
+"""
+import os, sys, tempfile, traceback, asyncio, socket, threading, time
+os.environ["HOME"] = tempfile.mkdtemp(prefix="nado_peertransport_")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for d in ("index", "blocks", "logs", "peers"):
+    os.makedirs(f"{os.environ['HOME']}/nado/{d}", exist_ok=True)
+
+from aiohttp import web
+from ops import peer_transport as pt
+from ops import peer_ops
+
+fails = 0
+def check(name, fn):
+    """Run fn; print PASS/FAIL and count failures."""
+    global fails
+    try: fn(); print(f"PASS  {name}")
+    except Exception as e:
+        fails += 1; print(f"FAIL  {name}: {e}"); traceback.print_exc()
+
+def raises(fn):
+    """True if fn raises."""
+    try: fn(); return False
+    except Exception: return True
+
+CLIENT_PORTS = []                      # the client-side port of every request served = one per connection
+
+
+def _serve():
+    """one loopback aiohttp peer answering /status, /big, /slow and 404 elsewhere; returns its port."""
+    async def _status(request):
+        CLIENT_PORTS.append(request.transport.get_extra_info("peername")[1])
+        return web.json_response({"latest_block_weight": 77, "finalized_height": 5, "latest_block_height": 9})
+
+    async def _big(request):
+        return web.Response(body=b"x" * 2_000_000)
+
+    async def _slow(request):
+        await asyncio.sleep(3)
+        return web.json_response({})
+
+    _s = socket.socket(); _s.bind(("127.0.0.1", 0)); port = _s.getsockname()[1]; _s.close()
+    ready = threading.Event()
+
+    def _run():
+        loop = asyncio.new_event_loop()
+        app = web.Application()
+        app.router.add_get("/status", _status)
+        app.router.add_get("/big", _big)
+        app.router.add_get("/slow", _slow)
+        runner = web.AppRunner(app)
+        loop.run_until_complete(runner.setup())
+        loop.run_until_complete(web.TCPSite(runner, "127.0.0.1", port).start())
+        ready.set()
+        loop.run_forever()
+    threading.Thread(target=_run, daemon=True).start()
+    ready.wait(10)
+    return port
+
+PORT = _serve()
+URL = f"http://127.0.0.1:{PORT}"
+
+
+def t1_sync_facade_reuses_one_connection():
+    """Prove 20 sequential get_json calls — and the peer_ops probes on top of it — ride ONE kept-alive
+    connection, while the same calls on throwaway asyncio.run loops dial a new connection every time."""
+    CLIENT_PORTS.clear()
+    for _ in range(20):
+        assert pt.get_json(f"{URL}/status", timeout=5)["latest_block_weight"] == 77
+    assert peer_ops.peer_tip_weight("127.0.0.1", port=PORT) == 77
+    assert peer_ops._peer_heights("127.0.0.1", port=PORT) == (5, 9)
+    assert len(CLIENT_PORTS) == 22 and len(set(CLIENT_PORTS)) == 1, f"{len(set(CLIENT_PORTS))} connections"
+    CLIENT_PORTS.clear()
+    for _ in range(5):
+        assert asyncio.run(pt.fetch(f"{URL}/status", 5))[0] == 200
+    assert len(set(CLIENT_PORTS)) == 5, "an ephemeral loop must not share the pooled session"
+
+def t2_status_and_cap_policy():
+    """Prove a non-200 comes back as (status, b"") from fetch and raises from get_json (the probes map that
+    to "no answer", as with urllib), a body over the cap raises, and the probe returns None for it."""
+    assert pt.run(pt.fetch(f"{URL}/nope", 5)) == (404, b"")
+    assert raises(lambda: pt.get_json(f"{URL}/nope", timeout=5))
+    assert raises(lambda: pt.get_json(f"{URL}/big", timeout=5))
+    assert len(pt.run(pt.fetch(f"{URL}/big", 5))[1]) == 2_000_000
+    assert peer_ops.probe_block_hash("127.0.0.1", 3, port=PORT) is None
+    assert pt.get_json(f"{URL}/status", timeout=5)["finalized_height"] == 5, "pool must survive a capped read"
+
+def t3_threads_share_the_pool_within_the_host_limit():
+    """Prove 32 threads calling the facade at once all get their answer, over no more connections than
+    PEER_POOL_PER_HOST."""
+    CLIENT_PORTS.clear()
+    out, errs = [], []
+
+    def _one():
+        try:
+            out.append(pt.get_json(f"{URL}/status", timeout=10)["latest_block_weight"])
+        except Exception as e:
+            errs.append(e)
+    threads = [threading.Thread(target=_one) for _ in range(32)]
+    for t in threads: t.start()
+    for t in threads: t.join(30)
+    assert not errs and out == [77] * 32, errs[:3]
+    assert len(set(CLIENT_PORTS)) <= pt.PEER_POOL_PER_HOST, f"{len(set(CLIENT_PORTS))} connections"
+
+def t4_session_lifetimes():
+    """Prove a loop without a pooled session gets a private one, closed on exit; an adopted loop gets the
+    same open session every time until release_loop closes it."""
+    async def _ephemeral():
+        async with pt.peer_session() as s:
+            assert not s.closed
+        return s
+    assert asyncio.run(_ephemeral()).closed
+
+    async def _adopted():
+        mine = await pt.adopt_loop()
+        async with pt.peer_session() as a:
+            pass
+        async with pt.peer_session() as b:
+            pass
+        assert a is b is mine and not mine.closed
+        await pt.release_loop()
+        return mine
+    assert asyncio.run(_adopted()).closed
+
+def t5_run_guards():
+    """Prove run() refuses to be called from the IO loop itself (instead of deadlocking), and its outer
+    timeout raises TimeoutError and cancels the coroutine while the pool keeps serving."""
+    async def _nested():
+        coro = pt.fetch(f"{URL}/status", 5)
+        try:
+            pt.run(coro)
+        except RuntimeError:
+            return "refused"
+    assert pt.run(_nested()) == "refused"
+    t0 = time.monotonic()
+    assert raises(lambda: pt.run(pt.fetch(f"{URL}/slow", 30), timeout=0.5))
+    assert time.monotonic() - t0 < 2
+    assert pt.get_json(f"{URL}/status", timeout=5)["latest_block_weight"] == 77
+    pt.close()
+    assert pt.get_json(f"{URL}/status", timeout=5)["latest_block_weight"] == 77, "run() restarts after close()"
+
+
+def t6_big_bodies_decode_off_the_io_loop():
+    """Prove a body at or above OFFLOOP_DECODE_BYTES is decoded on a worker thread (the shared IO loop keeps
+    serving other peer coroutines meanwhile) and a small one in line."""
+    seen = []
+    decoder = lambda body: seen.append(threading.current_thread()) or len(body)
+    assert pt.run(pt.decode(decoder, b"x" * 10), timeout=5) == 10
+    assert pt.run(pt.decode(decoder, b"x" * pt.OFFLOOP_DECODE_BYTES), timeout=5) == pt.OFFLOOP_DECODE_BYTES
+    assert seen[0] is pt._io["thread"], "a small body left the loop"
+    assert seen[1] is not pt._io["thread"], "a big body was decoded on the shared IO loop"
+
+
+check("t1_sync_facade_reuses_one_connection", t1_sync_facade_reuses_one_connection)
+check("t2_status_and_cap_policy", t2_status_and_cap_policy)
+check("t3_threads_share_the_pool_within_the_host_limit", t3_threads_share_the_pool_within_the_host_limit)
+check("t4_session_lifetimes", t4_session_lifetimes)
+check("t5_run_guards", t5_run_guards)
+check("t6_big_bodies_decode_off_the_io_loop", t6_big_bodies_decode_off_the_io_loop)
+pt.close()
+print("ALL PASS" if not fails else f"{fails} FAILURE(S)")
+sys.exit(1 if fails else 0)
@@ -0,0 +1,215 @@
+"""
+The mempool's incremental digests and its txid sketch: the pool multiset accumulator, the upcoming-block set
+(Mempool.upcoming_digest behind MemServer.get_upcoming_block_hash) and the IBLT served on
+/transaction_ids?sketch= (ops/pool_sketch.py).
+
+Maintaining them per insert/drop may only make them cheaper, never different: the pool digest must be a
+function of the tx set alone, the upcoming digest must cover exactly the set match_transactions_target
+would assemble at that height (landing rule, mined txids, reserved-key dedupe, blob cap) after any mix of
+adds, drops, tip moves and commits, and a sketch must peel to exactly the two pools' difference — or fail
+cleanly so the caller falls back to the id list.
+
+Run: python3 tests/test_pool_digests.py
+"""
+import os, sys, tempfile, traceback, random
+from unittest import mock
+os.environ["HOME"] = tempfile.mkdtemp(prefix="nado_digests_")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for d in ("index", "blocks", "logs", "peers"):
+    os.makedirs(f"{os.environ['HOME']}/nado/{d}", exist_ok=True)
+
+from hashing import canonical_bytes
+from ops import kv_ops
+from ops.block_ops import match_transactions_target
+from ops.mempool import Mempool, multiset_digest, _leaf
+from ops.pool_sketch import PoolSketch, SKETCH_MAX_LOG2
+
+fails = 0
+def check(name, fn):
+    """Run fn; print PASS/FAIL and count failures."""
+    global fails
+    try: fn(); print(f"PASS  {name}")
+    except Exception as e:
+        fails += 1; print(f"FAIL  {name}: {e}"); traceback.print_exc()
+
+
+def _id(rng):
+    return "%064x" % rng.getrandbits(256)
+
+
+def _tx(rng, i, height):
+    """A random pool tx around `height`: flexible transfers, exact-landing and windowed reserved txs
+    (some sharing a uniqueness key) and big blobs (some over the per-block cap together)."""
+    kind = rng.choice(["bridge", "faucet", "register", "duty", "blob", "attest"])
+    tx = {"txid": _id(rng), "sender": f"s{rng.randint(0, 5)}", "recipient": kind, "amount": 1,
+          "fee": rng.randint(0, 9), "max_block": height + rng.randint(-1, 3), "data": {"n": i}}
+    if kind in ("bridge", "faucet", "blob") or (kind == "duty" and rng.random() < 0.7):
+        tx["min_block"] = height + rng.randint(-2, 1)
+    if kind == "blob":
+        tx["data"] = {"n": i, "payload": "x" * rng.choice([10, 300_000])}
+    if kind == "attest":
+        tx["data"] = {"target_epoch": rng.randint(0, 1)}
+    return tx
+
+
+def _want_upcoming(pool, height):
+    """The upcoming digest computed the old way: match_transactions_target over the whole pool."""
+    matched = match_transactions_target(list(pool), height, logger=mock.Mock()) or []
+    acc = sum(_leaf(canonical_bytes(t)) for t in matched) % (1 << 512)
+    return multiset_digest(len(matched), acc, person=b"nado-upcoming")
+
+
+def t1_pool_digest_is_a_function_of_the_set():
+    """Prove the pool digest is the same for one tx set however it was built (arrival order, churn,
+    re-adds), differs when one tx's content differs, and is None for an empty pool."""
+    rng = random.Random(20)
+    txs = [_tx(rng, i, 100) for i in range(300)]
+    a, b = Mempool(), Mempool()
+    for t in txs:
+        a.add(t)
+    for t in rng.sample(txs, len(txs)) + [_tx(rng, 999, 100)]:
+        b.add(t)
+    assert a.pool_hash() != b.pool_hash()
+    b.discard_ids([list(b.ids())[-1]])
+    assert a.pool_hash() == b.pool_hash(), "equal sets, different digests"
+    c = Mempool()
+    c.replace(txs[:-1] + [dict(txs[-1], fee=txs[-1]["fee"] + 1)])
+    assert c.pool_hash() != a.pool_hash(), "a changed tx body left the digest unchanged"
+    assert Mempool().pool_hash() is None
+
+def t2_upcoming_digest_tracks_match_transactions_target():
+    """Prove upcoming_digest equals the digest of match_transactions_target's selection after every step
+    of random adds, drops, purges, tip moves and commits that mine pooled txids — including reserved-key
+    collisions and blobs over the per-block cap."""
+    rng = random.Random(21)
+    mined, wgen = set(), [0]
+    with mock.patch.object(kv_ops, "tx_get", side_effect=lambda t: {"b": 1} if t in mined else None), \
+            mock.patch.object(kv_ops, "write_generation", side_effect=lambda: wgen[0]):
+        mp, height = Mempool(), 100
+        for i in range(1500):
+            op = rng.random()
+            if op < 0.55 or not len(mp):
+                mp.add(_tx(rng, i, height))
+            elif op < 0.7:
+                mp.discard_ids(rng.sample(mp.ids(), 1))
+            elif op < 0.75:
+                mp.purge_sender(f"s{rng.randint(0, 5)}")
+            elif op < 0.85:
+                height += rng.choice([-1, 1, 1])      # the tip moves (rarely back)
+            else:
+                mined.add(rng.choice(mp.ids()))        # a commit mines a pooled tx
+                wgen[0] += 1
+            if i % 10 == 0:
+                assert mp.upcoming_digest(height) == _want_upcoming(mp.snapshot(), height), (i, height)
+
+def t3_upcoming_hash_is_never_none_and_tip_specific():
+    """Prove MemServer.get_upcoming_block_hash hashes an EMPTY next block too, changes with the parent
+    hash, and changes when a tx matching the next height is pooled — but not for one that targets later."""
+    from memserver import MemServer
+    rng = random.Random(22)
+    ms = object.__new__(MemServer)
+    ms.latest_block = {"block_hash": "aa" * 32, "block_number": 50}
+    empty = ms.get_upcoming_block_hash()
+    assert isinstance(empty, str) and len(empty) == 64
+    later = dict(_tx(rng, 0, 60), recipient="register", max_block=60)
+    ms.mempool.add(later)
+    assert ms.get_upcoming_block_hash() == empty, "a tx for a later block moved the upcoming hash"
+    now = dict(_tx(rng, 1, 51), recipient="register", max_block=51)
+    ms.mempool.add(now)
+    assert ms.get_upcoming_block_hash() != empty
+    ms.latest_block = {"block_hash": "bb" * 32, "block_number": 50}
+    with_now = ms.get_upcoming_block_hash()
+    ms.mempool.discard_ids([now["txid"]])
+    assert ms.get_upcoming_block_hash() not in (with_now, empty)
+
+def t4_sketch_peels_the_difference():
+    """Prove theirs-minus-ours of two pools sharing 5,000 ids peels to exactly the ids only they hold and
+    only we hold at sizes that fit the difference, that a fold equals the table built at that size
+    directly, and that a difference too big for the table fails instead of answering partially."""
+    rng = random.Random(23)
+    shared = [_id(rng) for _ in range(5000)]
+    only_them = [_id(rng) for _ in range(120)]
+    only_us = [_id(rng) for _ in range(60)]
+    theirs, ours = PoolSketch(), PoolSketch()
+    for t in shared + only_them:
+        theirs.toggle(t, 1)
+    for t in shared + only_us:
+        ours.toggle(t, 1)
+    plus, minus = theirs.fold(8).subtract(ours.fold(8)).peel()
+    assert sorted(plus) == sorted(only_them) and sorted(minus) == sorted(only_us)
+    direct = PoolSketch(8)
+    for t in shared + only_them:
+        direct.toggle(t, 1)
+    f = theirs.fold(8)
+    assert (f.counts, f.keys, f.checks) == (direct.counts, direct.keys, direct.checks)
+    assert theirs.fold(5).subtract(ours.fold(5)).peel() is None, "180 ids cannot peel from 96 cells"
+    assert theirs.toggle("not-a-txid", 1) is False
+
+def t5_sketch_wire_is_strict():
+    """Prove the wire form round-trips (with the pool size) and that a truncated, oversized, re-versioned
+    or wrongly sized body is refused; and a crafted table never yields more ids than it has cells."""
+    rng = random.Random(24)
+    s = PoolSketch(6)
+    for _ in range(40):
+        s.toggle(_id(rng), 1)
+    wire = s.to_bytes(40)
+    back, n = PoolSketch.from_bytes(wire)
+    assert n == 40 and (back.counts, back.keys, back.checks) == (s.counts, s.keys, s.checks)
+    for bad in (wire[:-1], wire + b"\0", b"NS\x02" + wire[3:], wire[:3] + bytes([SKETCH_MAX_LOG2 + 1]) + wire[4:],
+                b"", b"XX" + wire[2:]):
+        try:
+            PoolSketch.from_bytes(bad)
+            raise AssertionError("a malformed sketch decoded")
+        except ValueError:
+            pass
+    junk = PoolSketch(4)
+    junk.counts = [1] * len(junk.counts)
+    assert junk.peel() is None
+
+def t6_reconcile_uses_the_sketch_then_falls_back():
+    """Prove _fetch_missing_remote_txs asks for a sketch, fetches exactly the peer's extra ids when it
+    peels, and re-asks a peer whose sketch does not peel for its plain id list."""
+    import asyncio
+    import compounder
+    from memserver import MemServer
+    rng = random.Random(25)
+    ms = object.__new__(MemServer)
+    ms.port, ms.logger, ms.purge_peers_list, ms._tx_reject_cache = 9173, mock.Mock(), [], {}
+    shared = [dict(_tx(rng, i, 100), txid=_id(rng)) for i in range(400)]
+    for t in shared:
+        ms.mempool.add(t)
+    extra_near = [_id(rng) for _ in range(7)]
+    extra_far = [_id(rng) for _ in range(2000)]
+
+    def peer_sketch(ids):
+        sk = PoolSketch()
+        for i in ids:
+            sk.toggle(i, 1)
+        return sk.fold(ms._RECONCILE_SKETCH_LOG2).to_bytes(len(ids))
+    served, asked = {}, []
+    async def get_ids(ips, port, logger, fail, sem, sketch=None):
+        asked.append((tuple(ips), sketch))
+        return {p: ({"sketch": peer_sketch(served[p])} if sketch else list(served[p])) for p in ips}
+    async def by_id(peer, port, want, logger, fail, sem):
+        return [{"txid": w, "from": peer} for w in want]
+    served["near"] = [t["txid"] for t in shared] + extra_near
+    served["far"] = [t["txid"] for t in shared] + extra_far
+    with mock.patch.object(compounder, "compound_get_tx_ids", get_ids), \
+            mock.patch.object(compounder, "post_txs_by_id", by_id), \
+            mock.patch.object(kv_ops, "tx_get", return_value=None):
+        got = asyncio.run(ms._fetch_missing_remote_txs(["near", "far"]))
+    assert asked[0] == (("near", "far"), ms._RECONCILE_SKETCH_LOG2) and asked[1] == (("far",), None), asked
+    near = sorted(t["txid"] for t in got if t["from"] == "near")
+    far = {t["txid"] for t in got if t["from"] == "far"}
+    assert near == sorted(extra_near), "the peeled want-list is not the peer's extra ids"
+    assert len(far) == ms._RECONCILE_MAX_IDS and far <= set(extra_far), "the list fallback did not run"
+
+
+check("t1_pool_digest_is_a_function_of_the_set", t1_pool_digest_is_a_function_of_the_set)
+check("t2_upcoming_digest_tracks_match_transactions_target", t2_upcoming_digest_tracks_match_transactions_target)
+check("t3_upcoming_hash_is_never_none_and_tip_specific", t3_upcoming_hash_is_never_none_and_tip_specific)
+check("t4_sketch_peels_the_difference", t4_sketch_peels_the_difference)
+check("t5_sketch_wire_is_strict", t5_sketch_wire_is_strict)
+check("t6_reconcile_uses_the_sketch_then_falls_back", t6_reconcile_uses_the_sketch_then_falls_back)
+print("ALL PASS" if not fails else f"{fails} FAILURE(S)")
+sys.exit(1 if fails else 0)
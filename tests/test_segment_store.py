@@ -7,6 +7,8 @@ Append-only segment block store (ops/segment_store.py + kv_ops block_loc + block
   5. re-save (replay) repoints the locator, last write wins
   6. rollback atomicity: unindex_block inside an ABORTED txn restores locator + index
   7. migration: legacy flat + sharded *.block files fold into segments and read back identically
+  8. sealed segments read through the mmap with NO lock (zero-copy view), corruption still a miss
+  9. without mmap (or for the active segment) reads fall back to the locked seek+read path
 
 Run: python3 tests/test_segment_store.py
 """
@@ -29,7 +31,7 @@ create_indexers()
 
 from ops import kv_ops, segment_store
 from ops.block_ops import save_block, get_block, load_block_from_hash, unindex_block, migrate_block_store, \
-    block_content_hash, construct_block
+    block_content_hash, construct_block, clear_block_cache
 from ops.data_ops import get_home
 
 HOME = get_home()
@@ -176,6 +178,62 @@ def t7_migration_from_legacy_files():
     assert migrate_block_store(logger) == 0, "second run is a no-op (idempotent)"
 
 
+def t8_sealed_segments_mmap_lock_free():
+    """A body in a SEALED segment reads through the segment map while another thread HOLDS the read lock
+    (so it can't be taking the lock), the view decodes, a flipped byte is still a miss, and delete_segment
+    drops the map."""
+    import threading
+    blocks = [make_block(300 + i) for i in range(12)]
+    for b in blocks:
+        save_block(b, logger)
+    st = segment_store._store()
+    loc = kv_ops.block_loc_get(blocks[0]["block_hash"])
+    assert loc[0] != segment_store.active_segment(), "fixture needs a sealed segment"
+    assert get_block(blocks[0]["block_hash"]) is not False   # first touch maps the segment (under the lock)
+    got = {}
+    with st.read_lock:                                 # a lock-taking read would deadlock here
+        t = threading.Thread(target=lambda: got.update(b=get_block(blocks[0]["block_hash"])))
+        t.start(); t.join(10)
+    assert not t.is_alive() and got["b"]["block_hash"] == blocks[0]["block_hash"], "sealed read took the lock"
+    assert loc[0] in st.maps, "sealed segment must be served from its map"
+    view = segment_store.read_view(*loc, blocks[0]["block_hash"])
+    assert isinstance(view, memoryview) and bytes(view) == segment_store.read(*loc, blocks[0]["block_hash"])
+    view.release()
+    path = segment_store.segment_path(loc[0])
+    with open(path, "r+b") as f:
+        f.seek(loc[1] + segment_store.HEADER_SIZE + 5)
+        orig = f.read(1); f.seek(-1, 1); f.write(bytes([orig[0] ^ 0xFF]))
+    clear_block_cache()                                # the decoded-body LRU would (rightly) still serve it
+    assert get_block(blocks[0]["block_hash"]) is False, "corrupted mapped record must be a clean miss"
+    with open(path, "r+b") as f:
+        f.seek(loc[1] + segment_store.HEADER_SIZE + 5); f.write(orig)
+    held = segment_store.read_view(*loc, blocks[0]["block_hash"])     # a reader mid-decode
+    assert segment_store.delete_segment(loc[0]) and loc[0] not in st.maps, "delete must drop the map"
+    assert len(bytes(held)) > 0, "a view held across the delete stays readable (map closed lazily)"
+    held.release()
+    assert segment_store.read(*loc, blocks[0]["block_hash"]) is None, "deleted segment is a miss"
+
+
+def t9_no_mmap_falls_back_to_locked_read():
+    """Without mmap every read takes the portable seek+read path and still round-trips; the ACTIVE
+    segment is never mapped (it is still growing)."""
+    blocks = [make_block(400 + i) for i in range(12)]
+    for b in blocks:
+        save_block(b, logger)
+    st = segment_store._store()
+    assert st._map(segment_store.active_segment()) is None, "the active segment must not be mapped"
+    real, segment_store._mmap = segment_store._mmap, None
+    try:
+        for seg in list(st.maps):
+            with st.read_lock:
+                st._unmap(seg)
+        for b in blocks:
+            assert get_block(b["block_hash"]) is not False, "fallback read must round-trip"
+        assert not st.maps, "no map may be created without mmap"
+    finally:
+        segment_store._mmap = real
+
+
 for name, fn in sorted((n, f) for n, f in list(globals().items())
                        if n.startswith("t") and callable(f) and n[1].isdigit()):
     check(name, fn)
@@ -0,0 +1,198 @@
+"""
+Cached cumulative-weight selection index (mining_ops.SelectionIndex / selection_index) — a DIFFERENTIAL test.
+
+The index may only change how fast a winner is found, never which: for random open + bonded registries
+(fidelity spread, bond sizes across the cap, fresh / ramping / aged bond_since, empty lanes, all-ramping
+registries that hit the un-ramped fallback) select_producer_two_lane — uncached AND through the cache —
+must return exactly what the pre-index sorted linear walk returned for every slot, duty_committee must seat
+exactly the same committee, and lane_of's memoised permutation must equal the per-call sort. The cache must
+keep kinds / epochs / registry keys apart and stay bounded.
+
+Run: python3 tests/test_selection_index.py
+"""
+import os, sys, tempfile, traceback, random
+os.environ["HOME"] = tempfile.mkdtemp(prefix="nado_selidx_")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hashing import blake2b_hash
+from protocol import B_MIN, BOND_CAP, BOND_RAMP_EPOCHS, EPOCH_LENGTH, FIDELITY_CAP, K_OPEN, DUTY_COMMITTEE_SEATS
+from ops import mining_ops as mo
+
+fails = 0
+def check(name, fn):
+    """Run fn; print PASS/FAIL and count failures."""
+    global fails
+    try: fn(); print(f"PASS  {name}")
+    except Exception as e:
+        fails += 1; print(f"FAIL  {name}: {e}"); traceback.print_exc()
+
+def raises(fn):
+    """True if fn raises."""
+    try: fn(); return False
+    except Exception: return True
+
+RNG = random.Random(11)
+
+
+# --- the pre-index reference implementations, verbatim in behaviour ---------------------------------------
+
+def ref_weighted_draw(registry, weight_fn, beacon, slot):
+    weighted, total = [], 0
+    for address in sorted(registry):
+        w = weight_fn(registry[address])
+        if w > 0:
+            weighted.append((address, w))
+            total += w
+    if total == 0:
+        return None
+    draw = int(blake2b_hash([beacon, slot]), 16) % total
+    cumulative = 0
+    for address, w in weighted:
+        cumulative += w
+        if draw < cumulative:
+            return address
+    return weighted[-1][0]
+
+def ref_lane_of(slot, beacon):
+    i = slot % EPOCH_LENGTH
+    order = sorted(range(EPOCH_LENGTH), key=lambda j: (int(blake2b_hash([beacon, "lane", j]), 16), j))
+    return "open" if i in order[:K_OPEN] else "bonded"
+
+def ref_two_lane(open_registry, bonded_registry, beacon, slot):
+    bonded_weight = mo._bonded_ramped_weight(slot // EPOCH_LENGTH)
+    def _bonded_draw():
+        w = ref_weighted_draw(bonded_registry, bonded_weight, beacon, slot)
+        if w is None and bonded_registry:
+            w = ref_weighted_draw(bonded_registry, mo._bonded_shares, beacon, slot)
+        return w
+    if ref_lane_of(slot, beacon) == "open":
+        winner = ref_weighted_draw(open_registry, mo._open_weight, beacon, slot)
+        return winner if winner is not None else _bonded_draw()
+    winner = _bonded_draw()
+    if winner is not None:
+        return winner
+    if not bonded_registry:
+        return ref_weighted_draw(open_registry, mo._open_weight, beacon, slot)
+    return None
+
+def ref_committee(bonded_registry, beacon, epoch):
+    cumulative, total = [], 0
+    for address in sorted(bonded_registry):
+        w = mo.selection_shares(bonded_registry[address]["bonded"])
+        if w > 0:
+            total += w
+            cumulative.append((total, address))
+    if total == 0:
+        return {}
+    seats = {}
+    for i in range(DUTY_COMMITTEE_SEATS):
+        draw = int(blake2b_hash([beacon, f"duty:{int(epoch)}:{i}"]), 16) % total
+        lo, hi = 0, len(cumulative) - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if draw < cumulative[mid][0]:
+                hi = mid
+            else:
+                lo = mid + 1
+        seats[cumulative[lo][1]] = seats.get(cumulative[lo][1], 0) + 1
+    return seats
+
+
+# --- random registries ---------------------------------------------------------------------------------
+
+def _open_registry(n):
+    return {f"nd{RNG.getrandbits(40):010x}": {"fidelity": RNG.choice([None, -1, 0, RNG.randrange(0, 2 * FIDELITY_CAP)])}
+            for _ in range(n)}
+
+def _bonded_registry(n, epoch, mode="mixed"):
+    reg = {}
+    for _ in range(n):
+        bonded = RNG.choice([B_MIN - 1, B_MIN, RNG.randrange(B_MIN, 3 * BOND_CAP)])
+        if mode == "fresh":
+            since = epoch                                   # every bond still ramping -> un-ramped fallback
+        else:
+            since = RNG.choice([None, 0, epoch, epoch - RNG.randrange(0, 2 * BOND_RAMP_EPOCHS), epoch + 3])
+        reg[f"nd{RNG.getrandbits(40):010x}"] = {"bonded": bonded, "fidelity": None, "bond_since": since}
+    return reg
+
+def _cases():
+    """(open, bonded, beacon, epoch) scenarios: mixed, empty lanes, all-ramping, all-under-minimum."""
+    for k in range(14):
+        epoch = RNG.randrange(2, 400)
+        beacon = blake2b_hash(["beacon", k])
+        yield _open_registry(RNG.randrange(1, 300)), _bonded_registry(RNG.randrange(1, 60), epoch), beacon, epoch
+    yield {}, _bonded_registry(20, 50), "aa" * 32, 50
+    yield _open_registry(40), {}, "bb" * 32, 51
+    yield {}, {}, "cc" * 32, 52
+    yield _open_registry(30), _bonded_registry(25, 53, mode="fresh"), "dd" * 32, 53
+    yield _open_registry(30), {"ndlow": {"bonded": B_MIN - 1, "fidelity": None, "bond_since": None}}, "ee" * 32, 54
+
+
+def t1_two_lane_matches_linear_walk():
+    """Prove select_producer_two_lane equals the linear-walk reference for every slot of every scenario,
+    both uncached (registry_key=None) and through the shared cache (a second pass must hit it)."""
+    for n, (open_reg, bonded_reg, beacon, epoch) in enumerate(_cases()):
+        key = ("env", n)
+        for slot in range(epoch * EPOCH_LENGTH, (epoch + 1) * EPOCH_LENGTH):
+            want = ref_two_lane(open_reg, bonded_reg, beacon, slot)
+            assert mo.select_producer_two_lane(open_reg, bonded_reg, beacon, slot) == want, (n, slot)
+            assert mo.select_producer_two_lane(open_reg, bonded_reg, beacon, slot, registry_key=key) == want, (n, slot)
+            assert mo._weighted_draw(open_reg, mo._open_weight, beacon, slot) == \
+                ref_weighted_draw(open_reg, mo._open_weight, beacon, slot)
+
+def t2_committee_and_select_producer_match():
+    """Prove duty_committee (cached and not) seats exactly the reference committee, and the legacy
+    select_producer matches its sorted walk."""
+    for n, (_o, bonded_reg, beacon, epoch) in enumerate(_cases()):
+        want = ref_committee(bonded_reg, beacon, epoch)
+        assert mo.duty_committee(bonded_reg, beacon, epoch) == want
+        assert mo.duty_committee(bonded_reg, beacon, epoch, registry_key=("env", n)) == want
+        fn = lambda info: mo.selection_shares(info["bonded"], info.get("fidelity"))
+        for slot in range(0, 40):
+            assert mo.select_producer(bonded_reg, beacon, slot) == ref_weighted_draw(bonded_reg, fn, beacon, slot)
+
+def t3_lane_of_memo_matches_sort():
+    """Prove the memoised open-slot set gives the per-call sort's lane for every slot, K_OPEN open slots per
+    epoch, and stays bounded."""
+    for k in range(20):
+        beacon = blake2b_hash(["lanes", k])
+        lanes = [mo.lane_of(s, beacon) for s in range(EPOCH_LENGTH)]
+        assert lanes == [ref_lane_of(s, beacon) for s in range(EPOCH_LENGTH)]
+        assert lanes.count("open") == K_OPEN
+    assert len(mo._open_slots_memo) <= 8
+
+def t4_cache_keys_are_isolated_and_bounded():
+    """Prove an index is reused only for the same (registry key, epoch, kind): another kind, epoch or key
+    builds its own, a hit returns the identical object, and the cache never exceeds its bound."""
+    reg = _bonded_registry(30, 100)
+    a = mo.selection_index(reg, mo._bonded_shares, "bonded", 100, ("env", "k"))
+    assert mo.selection_index(reg, mo._bonded_shares, "bonded", 100, ("env", "k")) is a
+    assert mo.selection_index(reg, mo._committee_shares, "committee", 100, ("env", "k")) is not a
+    assert mo.selection_index(reg, mo._bonded_shares, "bonded", 101, ("env", "k")) is not a
+    assert mo.selection_index(reg, mo._bonded_shares, "bonded", 100, ("env", "k2")) is not a
+    assert mo.selection_index(reg, mo._bonded_shares, "bonded", 100, None) is not a
+    for i in range(3 * mo._INDEX_CACHE_MAX):
+        mo.selection_index(reg, mo._bonded_shares, "bonded", i, ("env", "flood"))
+    assert len(mo._index_cache) <= mo._INDEX_CACHE_MAX
+
+def t5_index_bands_are_the_walk_bands():
+    """Prove, draw value by draw value across a whole small draw space, that the bisect lands in the same
+    band as the linear cumulative walk (band edges included)."""
+    reg = {f"a{i:02d}": {"fidelity": i % (FIDELITY_CAP + 3)} for i in range(25)}
+    idx = mo.SelectionIndex(reg, mo._open_weight)
+    walk = []
+    for address in sorted(reg):
+        walk.extend([address] * mo._open_weight(reg[address]))
+    assert idx.total == len(walk)
+    for v in range(2 * idx.total):
+        assert idx.draw(v) == walk[v % idx.total], v
+    assert mo.SelectionIndex({}, mo._open_weight).draw(5) is None
+
+
+check("t1_two_lane_matches_linear_walk", t1_two_lane_matches_linear_walk)
+check("t2_committee_and_select_producer_match", t2_committee_and_select_producer_match)
+check("t3_lane_of_memo_matches_sort", t3_lane_of_memo_matches_sort)
+check("t4_cache_keys_are_isolated_and_bounded", t4_cache_keys_are_isolated_and_bounded)
+check("t5_index_bands_are_the_walk_bands", t5_index_bands_are_the_walk_bands)
+print("ALL PASS" if not fails else f"{fails} FAILURE(S)")
+sys.exit(1 if fails else 0)
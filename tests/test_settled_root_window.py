@@ -145,7 +145,7 @@ def t_expired_txs_evict_every_pass_not_only_after_own_production():
     s = open(os.path.join(ROOT, "loops", "core_loop.py"), encoding="utf8").read()
     seg = s[s.index("def normal_mode"):]
     seg = seg[:seg.index("_peer_ahead = peer_claims_heavier_tip")]
-    assert 'max_block", 0) > _tip_now' in seg, \
+    assert 'mempool.evict_outdated(self.memserver.latest_block["block_number"])' in seg, \
         "the per-pass pool sweep no longer drops expired txs — the .26 hoard returns"
 
 
@@ -0,0 +1,131 @@
+"""
+Multi-peer snapshot chunk download (snapshot_ops.fetch_snapshot(sources=...) + its per-donor scheduler).
+
+Striping only changes WHERE chunk bytes come from, never what is accepted: every chunk is still checked
+against the sha256 in the one self-hash-verified manifest, a donor whose manifest differs (other chunking)
+is never asked for a chunk, a donor serving garbage is benched, a fast donor ends up serving more than a
+slow one, a chunk stuck on a hanging donor is stolen by an idle one, and the result imports.
+
+Run: python3 tests/test_snapshot_multipeer.py
+"""
+import os, sys, tempfile, traceback, asyncio, socket, threading, time
+os.environ["HOME"] = tempfile.mkdtemp(prefix="nado_snapmulti_")
+os.environ["NADO_SNAPSHOT_CHUNK_ROWS"] = "4"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for d in ("index", "blocks", "logs", "peers"):
+    os.makedirs(f"{os.environ['HOME']}/nado/{d}", exist_ok=True)
+
+from genesis import create_indexers
+create_indexers()
+
+import zstandard
+from ops import kv_ops, codec
+from ops import snapshot_ops as so
+
+fails = 0
+def check(name, fn):
+    """Run fn; print PASS/FAIL and count failures."""
+    global fails
+    so.discard_incoming()
+    try: fn(); print(f"PASS  {name}")
+    except Exception as e:
+        fails += 1; print(f"FAIL  {name}: {e}"); traceback.print_exc()
+
+def raises(fn):
+    """True if fn raises."""
+    try: fn(); return False
+    except Exception: return True
+
+for i in range(120):
+    kv_ops.account_set(f"acct{i:04d}", "balance", 1000 + i)
+MANIFEST = so.persist_checkpoint(5, "ab" * 32, "p", "v")
+CHUNKS = [so.load_checkpoint_chunk(5, i) for i in range(MANIFEST["chunk_count"])]
+assert MANIFEST["chunk_count"] >= 25
+
+
+def _donor(behave, manifest=MANIFEST):
+    """start one aiohttp donor on its own loopback address (127.0.0.N, so donors are distinct IPs on one
+    port). behave(cid) -> (delay_s, status, body). Returns (ip, request log)."""
+    from aiohttp import web
+    served = []
+
+    async def _manifest(request):
+        return web.Response(body=zstandard.ZstdCompressor().compress(codec.pack(manifest)))
+
+    async def _chunk(request):
+        cid = int(request.query["id"])
+        served.append(cid)
+        delay, status, body = behave(cid)
+        if delay:
+            await asyncio.sleep(delay)
+        return web.Response(status=status, body=body)
+
+    ip = f"127.0.0.{len(DONORS) + 2}"
+    ready = threading.Event()
+
+    def _run():
+        loop = asyncio.new_event_loop()
+        app = web.Application()
+        app.router.add_get("/get_snapshot_manifest", _manifest)
+        app.router.add_get("/get_snapshot_chunk", _chunk)
+        runner = web.AppRunner(app)
+        loop.run_until_complete(runner.setup())
+        loop.run_until_complete(web.TCPSite(runner, ip, PORT).start())
+        ready.set()
+        loop.run_forever()
+    threading.Thread(target=_run, daemon=True).start()
+    ready.wait(10)
+    DONORS.append(ip)
+    return ip, served
+
+DONORS = []
+_s = socket.socket(); _s.bind(("127.0.0.1", 0)); PORT = _s.getsockname()[1]; _s.close()
+
+def _fetch(target, sources):
+    return asyncio.run(so.fetch_snapshot(target, PORT, concurrency=8, sources=sources))
+
+FAST, FAST_LOG = _donor(lambda cid: (0.0, 200, CHUNKS[cid]))
+SLOW, SLOW_LOG = _donor(lambda cid: (0.4, 200, CHUNKS[cid]))
+EVIL, EVIL_LOG = _donor(lambda cid: (0.0, 200, CHUNKS[cid][::-1]))              # valid length, wrong bytes
+_other = dict(MANIFEST, chunks=MANIFEST["chunks"][::-1])
+ODD, ODD_LOG = _donor(lambda cid: (0.0, 200, CHUNKS[cid]), manifest=_other)     # same hash, other chunking
+
+
+def t1_stripes_across_donors_and_imports():
+    """Prove a fetch with several donors completes, uses more than one donor, gives the fast donor more
+    chunks than the slow one, benches the garbage donor after SNAPSHOT_PEER_MAX_ERRORS, never asks the
+    differently-chunked donor for a chunk, and the journaled result imports."""
+    for log in (FAST_LOG, SLOW_LOG, EVIL_LOG, ODD_LOG):
+        log.clear()
+    m, ch = _fetch(SLOW, [FAST, SLOW, EVIL, ODD])
+    assert m == MANIFEST and list(ch) == CHUNKS
+    assert FAST_LOG and SLOW_LOG, "both honest donors should have served"
+    assert len(FAST_LOG) > len(SLOW_LOG), f"fast {len(FAST_LOG)} vs slow {len(SLOW_LOG)}"
+    assert len(EVIL_LOG) <= so.SNAPSHOT_PEER_MAX_ERRORS * so.SNAPSHOT_PEER_SLOTS, "garbage donor not benched"
+    assert not ODD_LOG, "a donor with a different chunk array must not serve chunks"
+    assert so.import_snapshot(m, ch)
+
+def t2_stuck_chunk_is_stolen():
+    """Prove a chunk hanging on one donor is re-requested from an idle donor (work stealing), so the
+    download finishes long before the hang would."""
+    hang = 0                                     # the target's first worker takes chunk 0 first
+    STUCK, stuck_log = _donor(lambda cid: (30.0 if cid == hang else 0.0, 200, CHUNKS[cid]))
+    t0 = time.monotonic()
+    m, ch = _fetch(STUCK, [STUCK, FAST])
+    took = time.monotonic() - t0
+    assert hang in stuck_log, "fixture: the hanging donor must have been asked for the chunk"
+    assert m == MANIFEST and ch[hang] == CHUNKS[hang]
+    assert took < 20, f"the stuck chunk was not stolen ({took:.1f}s)"
+
+def t3_every_donor_failing_fails_the_fetch():
+    """Prove that when every donor fails every chunk the fetch reports failure (no partial result)."""
+    BAD, _l = _donor(lambda cid: (0.0, 500, b""))
+    m, ch = _fetch(BAD, [BAD, EVIL])
+    assert m is None and ch is None
+
+
+check("t1_stripes_across_donors_and_imports", t1_stripes_across_donors_and_imports)
+check("t2_stuck_chunk_is_stolen", t2_stuck_chunk_is_stolen)
+check("t3_every_donor_failing_fails_the_fetch", t3_every_donor_failing_fails_the_fetch)
+print("ALL PASS" if not fails else f"{fails} FAILURE(S)")
+sys.exit(1 if fails else 0)
@@ -0,0 +1,182 @@
+"""
+Streaming, resumable snapshot pipeline (snapshot_ops.stream_snapshot / import_snapshot / fetch_snapshot).
+
+Streaming may only change how much memory the pipeline needs, never what it produces or accepts: the
+streamed manifest must equal the one the in-memory build (read_state -> _pack_chunks) gives, the O(log n)
+Merkle frontier must equal merkle_root for every leaf count, import from the on-disk chunks must restore
+the exact state and still refuse a tampered or re-ordered payload without touching the DB, and an
+interrupted download must resume from the chunks already verified on disk.
+
+Run: python3 tests/test_snapshot_streaming.py
+"""
+import os, sys, tempfile, traceback, asyncio, socket, threading
+os.environ["HOME"] = tempfile.mkdtemp(prefix="nado_snapstream_")
+os.environ["NADO_SNAPSHOT_CHUNK_ROWS"] = "7"          # many small chunks, uneven tail
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for d in ("index", "blocks", "logs", "peers"):
+    os.makedirs(f"{os.environ['HOME']}/nado/{d}", exist_ok=True)
+
+import logging
+logger = logging.getLogger("snapstream"); logger.addHandler(logging.NullHandler())
+from genesis import create_indexers
+create_indexers()
+
+import hashlib
+import zstandard
+from ops import kv_ops, codec
+from ops import snapshot_ops as so
+
+fails = 0
+def check(name, fn):
+    """Run fn; print PASS/FAIL and count failures."""
+    global fails
+    try: fn(); print(f"PASS  {name}")
+    except Exception as e:
+        fails += 1; print(f"FAIL  {name}: {e}"); traceback.print_exc()
+
+def raises(fn):
+    """True if fn raises."""
+    try: fn(); return False
+    except Exception: return True
+
+W = so.ROOT_RETENTION_EPOCHS
+
+# a state with every interesting family: accounts, DUPSORT rows, windowed rows on both sides of the floor,
+# epochw rows past the window (so the floor is live), and payload-excluded meta rows
+kv_ops.account_set("alice", "balance", 1000)
+kv_ops.account_set("bob", "bonded", 7)
+for e in range(0, W + 20, 3):
+    kv_ops.epoch_weights_commit(e, {"alice": e})
+    kv_ops.attestation_put(e, f"v{e % 4}", f"h{e}")
+    kv_ops._write(lambda txn, e=e: txn.put(f"divnull:alice:{e}".encode(), b"1", db=kv_ops._dbs()["meta"]))
+kv_ops.meta_set_int("finalized_height", 4)
+kv_ops._write(lambda txn: txn.put(b"tvprevE:x", b"1", db=kv_ops._dbs()["meta"]))
+
+
+def _reference(height):
+    """the manifest the pre-streaming build computed, from the whole state in RAM"""
+    triples = so.read_state()
+    payload = so._payload_triples(triples, height)
+    chunk_bytes, chunk_meta = so._pack_chunks(payload)
+    return (so.merkle_root(so._root_triples(triples)), so.state_digest(payload, height), len(payload),
+            chunk_meta, chunk_bytes)
+
+
+def t1_merkle_stream_equals_merkle_root():
+    """Prove the O(log n) streaming fold equals merkle_root for every leaf count 0..130 (odd tails at
+    every level included)."""
+    triples = sorted(("meta", os.urandom(6), os.urandom(4)) for _ in range(130))
+    for n in range(131):
+        ms = so._MerkleStream()
+        for t in triples[:n]:
+            ms.add(hashlib.blake2b(so._leaf(t), digest_size=32).digest())
+        assert ms.root() == so.merkle_root(triples[:n]), f"fold differs at n={n}"
+
+def t2_streamed_build_equals_in_memory_build():
+    """Prove stream_snapshot emits the same chunks, chunk meta, state_root, state_digest and entry_count
+    as packing read_state() in memory — with a live retention floor and payload-excluded rows present."""
+    assert so._root_floor(so.read_state()) is not None, "fixture must exercise the retention window"
+    root, digest, entries, meta, chunk_bytes = _reference(5)
+    got = []
+    manifest = so.stream_snapshot(5, "ab" * 32, "p", "v", lambda cid, cb: got.append((cid, cb)))
+    assert manifest["state_root"] == root == so.l1_state_root()
+    assert manifest["state_digest"] == digest and manifest["entry_count"] == entries
+    assert manifest["chunks"] == meta and [cb for _c, cb in got] == chunk_bytes
+    assert [c for c, _cb in got] == list(range(len(meta))) and len(meta) > 3
+    assert manifest["snapshot_hash"] == so.manifest_hash(manifest)
+
+def t3_import_from_disk_restores_exact_state():
+    """Prove a persisted checkpoint streamed back from disk (SnapshotChunks) imports over a diverged DB and
+    restores the exact checkpointed state, with the finality floor reconstructed."""
+    manifest = so.persist_checkpoint(5, "cd" * 32, "p", "v")
+    before = so.l1_state_root()
+    kv_ops.account_set("alice", "balance", 1)
+    kv_ops.account_set("mallory", "balance", 9)
+    chunks = so.SnapshotChunks(so._ckpt_path(5), manifest["chunk_count"])
+    assert so.import_snapshot(manifest, chunks, logger=logger)
+    assert so.l1_state_root() == before
+    assert kv_ops.get_account("alice")["balance"] == 1000
+    assert kv_ops.meta_get_int("finalized_height") == 5
+
+def t4_bad_payloads_rejected_db_untouched():
+    """Prove a tampered chunk, a re-ordered payload and a wrong state_root are each refused and leave the
+    DB exactly as it was (the write txn aborts)."""
+    manifest = so.load_checkpoint_manifest(5)
+    chunks = [so.load_checkpoint_chunk(5, i) for i in range(manifest["chunk_count"])]
+    kv_ops.account_set("carol", "balance", 77)
+    before = so.read_state()
+    bad = bytearray(chunks[1]); bad[len(bad) // 2] ^= 0xFF
+    assert not so.import_snapshot(manifest, [chunks[0], bytes(bad)] + chunks[2:])
+    # swap two chunks AND their meta: every sha256 still matches, the order does not
+    m2 = dict(manifest, chunks=[manifest["chunks"][1], manifest["chunks"][0]] + manifest["chunks"][2:])
+    assert not so.import_snapshot(m2, [chunks[1], chunks[0]] + chunks[2:])
+    m3 = dict(manifest, state_root="00" * 32)
+    m3["snapshot_hash"] = so.manifest_hash(m3)
+    assert not so.import_snapshot(m3, chunks)
+    assert so.read_state() == before, "a rejected import must not change the DB"
+
+def _serve(manifest, chunks, broken):
+    """a minimal donor (aiohttp) serving one manifest + its chunks; chunk ids in the (mutable) set `broken`
+    answer 500. Returns (port, request log)."""
+    from aiohttp import web
+    served = []
+
+    async def _manifest(request):
+        return web.Response(body=zstandard.ZstdCompressor().compress(codec.pack(manifest)))
+
+    async def _chunk(request):
+        cid = int(request.query["id"])
+        served.append(cid)
+        if cid in broken:
+            return web.Response(status=500)
+        return web.Response(body=chunks[cid])
+
+    sock = socket.socket(); sock.bind(("127.0.0.1", 0)); port = sock.getsockname()[1]; sock.close()
+    ready = threading.Event()
+
+    def _run():
+        loop = asyncio.new_event_loop()
+        app = web.Application()
+        app.router.add_get("/get_snapshot_manifest", _manifest)
+        app.router.add_get("/get_snapshot_chunk", _chunk)
+        runner = web.AppRunner(app)
+        loop.run_until_complete(runner.setup())
+        loop.run_until_complete(web.TCPSite(runner, "127.0.0.1", port).start())
+        ready.set()
+        loop.run_forever()
+    threading.Thread(target=_run, daemon=True).start()
+    ready.wait(10)
+    return port, served
+
+def t5_interrupted_download_resumes_from_journal():
+    """Prove a download that fails half way keeps its verified chunks on disk, the retry fetches ONLY the
+    missing ones, the journaled chunks import, and discard_incoming clears the journal."""
+    manifest = so.load_checkpoint_manifest(5)
+    chunks = [so.load_checkpoint_chunk(5, i) for i in range(manifest["chunk_count"])]
+    cc = manifest["chunk_count"]
+    broken = {2}
+    port, served = _serve(manifest, chunks, broken)
+    m, ch = asyncio.run(so.fetch_snapshot("127.0.0.1", port, concurrency=1))
+    assert m is None and ch is None, "a chunk no donor can serve must fail the fetch"
+    broken.clear()
+    jdir = f"{so._incoming_root()}/{manifest['snapshot_hash']}"
+    journaled = {int(n[6:-4]) for n in os.listdir(jdir) if n.startswith("chunk_") and n.endswith(".bin")}
+    assert {0, 1} <= journaled and 2 not in journaled, f"journal holds {sorted(journaled)}"
+    served.clear()
+    m, ch = asyncio.run(so.fetch_snapshot("127.0.0.1", port, concurrency=1))
+    assert m == manifest and len(ch) == cc
+    assert 2 in served and not set(served) & journaled, \
+        f"resume re-downloaded verified chunks: journaled={sorted(journaled)} retry={served}"
+    assert list(ch) == chunks
+    assert so.import_snapshot(m, ch)
+    so.discard_incoming()
+    assert not os.path.isdir(so._incoming_root())
+
+
+check("t1_merkle_stream_equals_merkle_root", t1_merkle_stream_equals_merkle_root)
+check("t2_streamed_build_equals_in_memory_build", t2_streamed_build_equals_in_memory_build)
+check("t3_import_from_disk_restores_exact_state", t3_import_from_disk_restores_exact_state)
+check("t4_bad_payloads_rejected_db_untouched", t4_bad_payloads_rejected_db_untouched)
+check("t5_interrupted_download_resumes_from_journal", t5_interrupted_download_resumes_from_journal)
+print("ALL PASS" if not fails else f"{fails} FAILURE(S)")
+sys.exit(1 if fails else 0)
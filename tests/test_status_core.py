@@ -0,0 +1,273 @@
+"""
+Binary core status (ops/status_core.py — pack_core / unpack_core / frames, GET /status_core, and the
+compress=core wire of /status_stream).
+
+The core record may only change how a peer's consensus fields travel, never what they say: every
+CORE_FIELDS value of a realistic status must come back identical (absent as None) and pass the same
+admission type gate; a value that does not fit its slot must be refused on the packing side rather than
+rounded; any malformed, truncated or padded body must raise ValueError; and the record must be several
+times smaller on the wire than the zstd(JSON) full status it replaces in the peer loop, and an order of
+magnitude smaller than the JSON itself (decode times are reported alongside).
+End to end, a core subscriber and the compounder's core poll must mirror the node's consensus fields, and
+fall back to the full status for a node that predates the core wire.
+
+Run: python3 tests/test_status_core.py
+"""
+import os, sys, tempfile, traceback, asyncio, socket, threading, time, random
+os.environ["HOME"] = tempfile.mkdtemp(prefix="nado_statuscore_")
+os.environ["NADO_STATUS_FEED_TICK_S"] = "0.05"
+os.environ["NADO_STATUS_FEED_REFRESH_S"] = "3600"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for d in ("index", "blocks", "logs", "peers"):
+    os.makedirs(f"{os.environ['HOME']}/nado/{d}", exist_ok=True)
+
+import logging
+import zstandard
+from aiohttp import web
+from ops import codec, peer_transport
+from ops import status_core as sc
+from ops import status_feed as sf
+from ops.net_ops import unpack_zstd_peer
+from ops.peer_ops import status_fields_well_typed
+import compounder
+
+fails = 0
+def check(name, fn):
+    """Run fn; print PASS/FAIL and count failures."""
+    global fails
+    try: fn(); print(f"PASS  {name}")
+    except Exception as e:
+        fails += 1; print(f"FAIL  {name}: {e}"); traceback.print_exc()
+
+def raises(fn):
+    """True if fn raises ValueError (the one exception the decoders may raise)."""
+    try: fn(); return False
+    except ValueError: return True
+
+logger = logging.getLogger("statuscore"); logger.addHandler(logging.NullHandler())
+RNG = random.Random(17)
+
+
+def _hex():
+    return "".join(RNG.choice("0123456789abcdef") for _ in range(64))
+
+
+def full_status():
+    """a /status dict shaped like nado._status_dict's on a busy node (diagnostic fields populated)."""
+    return {
+        "reported_uptime": 86_400, "address": "ndo" + "7" * 42, "transaction_pool_hash": _hex(),
+        "upcoming_block_hash": _hex(), "latest_block_hash": _hex(), "latest_block_height": 91_234,
+        "latest_block_weight": 9_876_543_210, "genesis_hash": _hex(), "earliest_block_hash": _hex(),
+        "earliest_block_height": 90_969, "finalized_height": 91_189, "ffg_finalized": 91_100,
+        "hard_finality": 90_000,
+        "recovery": {"phase": "verdict", "at": 1_760_000_000, "tip": 91_234, "agree": 5, "disagree": 0},
+        "recovery_fail": None, "last_block_reject": {"h": 91_200, "why": "Target block too low " * 2},
+        "last_fork_diff": {"at": 1_760_000_000, "h": 91_100, "anc": 91_090, "src": "10.0.0.5",
+                           "only_ours": [["ndo" + _hex()[:21], "collect", _hex()[:16]] for _ in range(6)],
+                           "only_theirs": [["ndo" + _hex()[:21], None, _hex()[:16]] for _ in range(6)]},
+        "recent_tx_rejects": [{"txid": _hex()[:16], "recipient": "ndo" + _hex()[:21],
+                               "why": "Transaction already in the pool or mined", "at": 1_760_000_000 + i}
+                              for i in range(20)],
+        "protocol": 9, "finality_depth": 45, "epoch_length": 100, "pq_backend": "liboqs", "pq_degraded": None,
+        "version": "0.9.1-412-g1a2b3c4d5e6f", "running_commit": "1a2b3c4d5e6f", "latest_main": "1a2b3c4d5e6f",
+        "node_type": "rolling", "history_retention": 10_000, "update_available": False, "update_capable": True,
+        "update_blocking": [], "update_warnings": [], "update_free_disk_mb": 41_234,
+        "update_remote_reachable": True, "dead_fork_probe": {"state": "ok", "agree": 5, "disagree": 0},
+        "chain_id": "betanet-4", "snapshot_height": 91_000, "snapshot_hash": _hex(),
+    }
+
+
+def _wire_zstd(output, name=None, compress=None):
+    """nado.serialize's peer wire."""
+    return zstandard.ZstdCompressor().compress(codec.pack(output)) if compress == "zstd" else output
+
+
+def t1_round_trip():
+    """Prove every CORE_FIELDS value of a realistic status survives pack/unpack exactly, absent / None
+    fields come back None, the result has exactly CORE_FIELDS as keys and passes the admission type gate."""
+    for _ in range(50):
+        st = full_status()
+        for f in RNG.sample(sc.CORE_FIELDS, RNG.randrange(0, 6)):
+            if RNG.random() < 0.5:
+                st.pop(f)
+            else:
+                st[f] = None
+        got = sc.unpack_core(sc.pack_core(st))
+        assert set(got) == set(sc.CORE_FIELDS)
+        assert got == {f: st.get(f) for f in sc.CORE_FIELDS}
+        assert status_fields_well_typed(got)
+    edge = dict(full_status(), latest_block_weight=(1 << 64) - 1, protocol=0, address="", version="v" * 255)
+    assert sc.unpack_core(sc.pack_core(edge))["latest_block_weight"] == (1 << 64) - 1
+    assert sc.unpack_core(sc.pack_core(edge))["address"] == ""
+    assert sc.unpack_core(sc.pack_core({})) == {f: None for f in sc.CORE_FIELDS}
+
+def t2_pack_refuses_what_does_not_fit():
+    """Prove pack_core raises instead of rounding: bool / negative / >= 2**64 / string ints, hashes that
+    are short, uppercase or not hex, labels that are non-ASCII or over 255 bytes."""
+    for f, v in (("latest_block_weight", True), ("latest_block_height", -1), ("finalized_height", 1 << 64),
+                 ("protocol", "9"), ("latest_block_hash", "ab" * 31), ("genesis_hash", "AB" * 32),
+                 ("snapshot_hash", "zz" * 32), ("upcoming_block_hash", 5), ("address", "ndö"),
+                 ("version", "v" * 256), ("chain_id", 4)):
+        assert raises(lambda: sc.pack_core(dict(full_status(), **{f: v}))), (f, v)
+
+def t3_decode_is_strict():
+    """Prove unpack_core / unpack_frame raise ValueError on every truncation and on padding, a wrong
+    magic or version, unknown presence bits, an absent label carrying bytes, and random corruption never
+    escapes as anything but ValueError; frames round-trip (full and idle) into apply_frame's shape."""
+    rec = sc.pack_core(full_status())
+    for n in range(len(rec)):
+        assert raises(lambda: sc.unpack_core(rec[:n])), n
+    assert raises(lambda: sc.unpack_core(rec + b"\0"))
+    assert raises(lambda: sc.unpack_core(b"XX" + rec[2:]))
+    assert raises(lambda: sc.unpack_core(rec[:2] + bytes((2,)) + rec[3:]))
+    assert raises(lambda: sc.unpack_core(rec[:3] + (1 << 31).to_bytes(4, "big") + rec[7:]))
+    empty = sc.pack_core({})
+    assert raises(lambda: sc.unpack_core(empty[:-1] + b"\x01x"))       # latest_main absent, 1 byte attached
+    for _ in range(2000):
+        b = bytearray(rec)
+        for _ in range(RNG.randrange(1, 4)):
+            b[RNG.randrange(len(b))] = RNG.randrange(256)
+        try:
+            sc.unpack_core(bytes(b))
+        except ValueError:
+            pass
+
+    st = full_status()
+    full = sc.unpack_frame(sc.pack_frame("0123456789abcdef", 7, st))
+    assert full == {"boot": "0123456789abcdef", "seq": 7, "full": True,
+                    "status": {f: st.get(f) for f in sc.CORE_FIELDS}}
+    idle = sc.pack_frame("0123456789abcdef", 7)
+    assert sc.unpack_frame(idle) == {"boot": "0123456789abcdef", "seq": 7, "full": False, "status": {}}
+    cur = sf.apply_frame(None, full)
+    assert sf.apply_frame(cur, sc.unpack_frame(idle)) is cur
+    assert raises(lambda: sc.unpack_frame(idle + b"\0"))
+    assert raises(lambda: sc.unpack_frame(idle[:-1] + b"\x02"))
+    assert raises(lambda: sc.unpack_frame(idle[:-1]))
+    assert not sc.is_frame(b'{"boot": "x"}') and sc.is_frame(idle)
+
+def t4_smaller_and_cheaper_than_zstd_json():
+    """Prove the core record of a busy node's status is >= 4x smaller than its zstd(JSON) wire and >= 10x
+    smaller than the JSON. The six digests (192 B) are incompressible either way, which is what bounds the
+    zstd ratio. Decode times are printed, not asserted: a wall-clock ratio flakes under a parallel suite."""
+    st = full_status()
+    core, full = sc.pack_core(st), _wire_zstd(st, compress="zstd")
+    assert len(core) * 4 <= len(full), f"core {len(core)} B vs zstd {len(full)} B"
+    assert len(core) * 10 <= len(codec.pack(st)), f"core {len(core)} B vs JSON {len(codec.pack(st))} B"
+
+    def _best(fn, n=2000):
+        best = float("inf")
+        for _ in range(5):
+            t0 = time.perf_counter()
+            for _ in range(n):
+                fn()
+            best = min(best, time.perf_counter() - t0)
+        return best
+    t_core = _best(lambda: sc.unpack_core(core))
+    t_full = _best(lambda: status_fields_well_typed(unpack_zstd_peer(full)))
+    print(f"      core {len(core)} B / {t_core * 500:.1f} us  vs  zstd(JSON) {len(full)} B / {t_full * 500:.1f} us")
+
+
+class _Node:
+    """one loopback node serving /status_core + /status_stream (core=True) or only /status."""
+    def __init__(self, core=True):
+        self.state = full_status()
+        self.feed = sf.StatusFeed(build=lambda: dict(self.state), serialize=_wire_zstd,
+                                  key=lambda: (self.state["latest_block_hash"], self.state["finalized_height"]))
+        _s = socket.socket(); _s.bind(("127.0.0.1", 0)); self.port = _s.getsockname()[1]; _s.close()
+        ready = threading.Event()
+
+        async def _stream(request):
+            c = request.query.get("compress")
+            wire = await self.feed.next_frame(int(request.query.get("since", 0)), request.query.get("boot", ""),
+                                              compress=c if c in ("zstd", "core") else None,
+                                              wait=int(request.query.get("wait", 0)))
+            return web.Response(body=wire) if wire is not None else web.Response(status=503)
+
+        async def _core(request):
+            return web.Response(body=self.feed.core())
+
+        async def _status(request):
+            return web.Response(body=_wire_zstd(dict(self.state), compress="zstd"))
+
+        def _run():
+            self.loop = asyncio.new_event_loop()
+            app = web.Application()
+            if core:
+                app.router.add_get("/status_stream", _stream)
+                app.router.add_get("/status_core", _core)
+            app.router.add_get("/status", _status)
+            runner = web.AppRunner(app)
+            self.loop.run_until_complete(runner.setup())
+            self.loop.run_until_complete(web.TCPSite(runner, "127.0.0.1", self.port).start())
+            self.loop.create_task(self.feed.run())
+            ready.set()
+            self.loop.run_forever()
+        threading.Thread(target=_run, daemon=True).start()
+        ready.wait(10)
+
+    def core_view(self):
+        return {f: self.state.get(f) for f in sc.CORE_FIELDS}
+
+
+def _eventually(fn, timeout=5.0):
+    t0 = time.monotonic()
+    while time.monotonic() - t0 < timeout:
+        if fn():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def t5_core_clients_mirror_the_node():
+    """Prove a core subscription mirrors the node's consensus fields across changes, the compounder's
+    core poll returns the same record, and both fall back to the full status for a node without the
+    core wire."""
+    node, legacy = _Node(), _Node(core=False)
+    assert _eventually(lambda: node.feed.snapshot is not None)
+    subs = sf.StatusSubscriptions(port=node.port, wait=2)
+    try:
+        subs.follow(["127.0.0.1"])
+        assert _eventually(lambda: subs.snapshot().get("127.0.0.1") == node.core_view())
+        for i in range(4):
+            node.state = dict(node.state, latest_block_hash=_hex(), latest_block_height=91_235 + i,
+                              finalized_height=91_190 + i)
+            assert _eventually(lambda: subs.snapshot().get("127.0.0.1") == node.core_view()), i
+        assert not subs.drain_failures()
+
+        async def _poll(port):
+            return await compounder.compound_get_status_pool(["127.0.0.1"], port, logger, [], asyncio.Semaphore(5),
+                                                             compress="core")
+        assert peer_transport.run(_poll(node.port)) == {"127.0.0.1": node.core_view()}
+        assert peer_transport.run(_poll(legacy.port)) == {"127.0.0.1": legacy.state}
+
+        legacy_subs = sf.StatusSubscriptions(port=legacy.port, wait=2)
+        legacy_subs.follow(["127.0.0.1"])
+        assert _eventually(lambda: legacy_subs.snapshot().get("127.0.0.1") == legacy.state)
+        legacy_subs.close()
+    finally:
+        subs.close()
+
+
+def t6_every_field_the_network_panel_reads_has_a_slot():
+    """Prove every st.<field> that renderNodes (static/interface.js) reads from /status_pool is a core
+    field: the peer loop fills the pool from core records, so a field without a slot renders empty for
+    every peer."""
+    import re
+    src = open(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static",
+                            "interface.js"), encoding="utf8").read()
+    start = src.index("async function renderNodes(")
+    body = src[start:src.index("\n}\n", start)]
+    read = set(re.findall(r"\bst\.([a-z_]+)", body))
+    assert "reported_uptime" in read, "renderNodes no longer found where the test looks for it"
+    assert read <= set(sc.CORE_FIELDS), f"no core slot for {sorted(read - set(sc.CORE_FIELDS))}"
+
+
+check("t1_round_trip", t1_round_trip)
+check("t2_pack_refuses_what_does_not_fit", t2_pack_refuses_what_does_not_fit)
+check("t3_decode_is_strict", t3_decode_is_strict)
+check("t4_smaller_and_cheaper_than_zstd_json", t4_smaller_and_cheaper_than_zstd_json)
+check("t5_core_clients_mirror_the_node", t5_core_clients_mirror_the_node)
+check("t6_every_field_the_network_panel_reads_has_a_slot", t6_every_field_the_network_panel_reads_has_a_slot)
+peer_transport.close()
+print("ALL PASS" if not fails else f"{fails} FAILURE(S)")
+sys.exit(1 if fails else 0)
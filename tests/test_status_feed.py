@@ -0,0 +1,224 @@
+"""
+Push status channel (ops/status_feed.py — StatusFeed / apply_frame / StatusSubscriptions, /status_stream).
+
+The feed may only change how a peer's status reaches us, never what it says: a subscriber's merged dict
+must equal the serving node's latest build after every change, whether it caught up by delta, by full
+resync or across a server restart; the serving node must build once per CHANGE no matter how many
+subscribers wait on it; a caught-up subscriber gets an empty heartbeat; malformed or out-of-order frames
+must be refused without touching the previous dict; and a peer without /status_stream (mid-rollout)
+falls back to plain /status, while a dead one is reported for purge.
+
+Run: python3 tests/test_status_feed.py
+"""
+import os, sys, tempfile, traceback, asyncio, socket, threading, time
+os.environ["HOME"] = tempfile.mkdtemp(prefix="nado_statusfeed_")
+os.environ["NADO_STATUS_FEED_TICK_S"] = "0.05"
+os.environ["NADO_STATUS_FEED_REFRESH_S"] = "3600"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for d in ("index", "blocks", "logs", "peers"):
+    os.makedirs(f"{os.environ['HOME']}/nado/{d}", exist_ok=True)
+
+import zstandard
+from aiohttp import web
+from ops import codec, peer_transport
+from ops import status_feed as sf
+from ops.net_ops import unpack_zstd_peer
+
+fails = 0
+def check(name, fn):
+    """Run fn; print PASS/FAIL and count failures."""
+    global fails
+    try: fn(); print(f"PASS  {name}")
+    except Exception as e:
+        fails += 1; print(f"FAIL  {name}: {e}"); traceback.print_exc()
+
+def raises(fn):
+    """True if fn raises."""
+    try: fn(); return False
+    except Exception: return True
+
+
+def serialize(output, name=None, compress=None):
+    """nado.serialize's wire: zstd(codec) for peers, the dict itself for JSON."""
+    return zstandard.ZstdCompressor().compress(codec.pack(output)) if compress == "zstd" else output
+
+
+class _Node:
+    """one loopback aiohttp node serving /status_stream (or only /status, legacy=True) from STATE."""
+    def __init__(self, legacy=False):
+        self.state = {"latest_block_hash": "a" * 64, "transaction_pool_hash": "p0", "finalized_height": 1,
+                      "protocol": 9, "extra": [1, 2]}
+        self.feed = sf.StatusFeed(build=lambda: dict(self.state), serialize=serialize,
+                                  key=lambda: (self.state["latest_block_hash"], self.state["transaction_pool_hash"],
+                                               self.state["finalized_height"]))
+        self.status_hits = 0
+        self.asked, self.reject = [], 0          # compress= of each /status_stream request; 429s still to give
+        _s = socket.socket(); _s.bind(("127.0.0.1", 0)); self.port = _s.getsockname()[1]; _s.close()
+        ready = threading.Event()
+
+        async def _stream(request):
+            self.asked.append(request.query.get("compress"))
+            if self.reject:
+                self.reject -= 1
+                return web.Response(status=429)
+            wire = await self.feed.next_frame(int(request.query.get("since", 0)), request.query.get("boot", ""),
+                                              compress=request.query.get("compress"),
+                                              wait=int(request.query.get("wait", 0)))
+            return web.Response(body=wire) if wire is not None else web.Response(status=503)
+
+        async def _status(request):
+            self.status_hits += 1
+            return web.Response(body=serialize(dict(self.state), compress="zstd"))
+
+        def _run():
+            self.loop = asyncio.new_event_loop()
+            app = web.Application()
+            if not legacy:
+                app.router.add_get("/status_stream", _stream)
+            app.router.add_get("/status", _status)
+            runner = web.AppRunner(app)
+            self.loop.run_until_complete(runner.setup())
+            self.loop.run_until_complete(web.TCPSite(runner, "127.0.0.1", self.port).start())
+            if not legacy:
+                self.loop.create_task(self.feed.run())
+            ready.set()
+            self.loop.run_forever()
+        threading.Thread(target=_run, daemon=True).start()
+        ready.wait(10)
+
+    def change(self, **kw):
+        self.state = dict(self.state, **kw)
+
+    def call(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(30)
+
+
+def _eventually(fn, timeout=5.0):
+    t0 = time.monotonic()
+    while time.monotonic() - t0 < timeout:
+        if fn():
+            return True
+        time.sleep(0.02)
+    return False
+
+NODE = _Node()
+time.sleep(0.3)
+
+
+def t1_one_build_per_change_for_all_subscribers():
+    """Prove 40 subscribers parked on the feed are all woken by ONE change with the same shared frame
+    object, and the node built the status once for that change — not once per subscriber."""
+    boot, seq = NODE.feed.boot, NODE.feed.seq
+    builds = NODE.feed.builds
+
+    async def _all():
+        return await asyncio.gather(*[NODE.feed.next_frame(seq, boot, compress="zstd", wait=5) for _ in range(40)])
+    fut = asyncio.run_coroutine_threadsafe(_all(), NODE.loop)
+    time.sleep(0.3)
+    NODE.change(transaction_pool_hash="p1")
+    frames = fut.result(10)
+    assert len({id(f) for f in frames}) == 1, "every subscriber must get the one shared frame"
+    frame = unpack_zstd_peer(frames[0])
+    assert frame["seq"] == seq + 1 and frame["full"] is False and frame["status"] == {"transaction_pool_hash": "p1"}
+    assert NODE.feed.builds - builds == 1, f"{NODE.feed.builds - builds} builds for one change"
+
+def t2_delta_full_and_heartbeat():
+    """Prove a subscriber one change behind gets only the changed fields (and removed keys), one further
+    behind or on another boot gets the full dict, and a caught-up one gets an empty heartbeat after wait."""
+    NODE.change(finalized_height=2)
+    assert _eventually(lambda: NODE.feed.snapshot["finalized_height"] == 2)
+    seq, boot = NODE.feed.seq, NODE.feed.boot
+    state = dict(NODE.state); del state["extra"]; NODE.state = dict(state, finalized_height=3)
+    assert _eventually(lambda: NODE.feed.seq == seq + 1)
+    d = unpack_zstd_peer(NODE.call(NODE.feed.next_frame(seq, boot, "zstd", 1)))
+    assert d["status"] == {"finalized_height": 3} and d["removed"] == ["extra"] and not d["full"]
+    for since, b in ((seq - 1, boot), (seq + 1, "other"), (0, "")):
+        f = unpack_zstd_peer(NODE.call(NODE.feed.next_frame(since, b, "zstd", 1)))
+        assert f["full"] and f["status"] == NODE.feed.snapshot
+    t0 = time.monotonic()
+    hb = unpack_zstd_peer(NODE.call(NODE.feed.next_frame(seq + 1, boot, "zstd", 1)))
+    assert hb == {"boot": boot, "seq": seq + 1, "full": False, "status": {}}
+    assert 0.8 < time.monotonic() - t0 < 3
+
+def t3_apply_frame_validates():
+    """Prove apply_frame merges deltas without mutating the previous dict, and refuses malformed frames,
+    a delta from another boot or skipping a seq, and a heartbeat that carries fields."""
+    cur = sf.apply_frame(None, {"boot": "b1", "seq": 4, "full": True, "status": {"a": 1, "b": 2}})
+    prev = cur[2]
+    nxt = sf.apply_frame(cur, {"boot": "b1", "seq": 5, "full": False, "status": {"a": 7}, "removed": ["b"]})
+    assert nxt == ("b1", 5, {"a": 7}) and prev == {"a": 1, "b": 2}
+    assert sf.apply_frame(nxt, {"boot": "b1", "seq": 5, "full": False, "status": {}}) is nxt
+    for bad in ([1], {"boot": "b1", "seq": "5", "status": {}}, {"boot": "", "seq": 5, "status": {}},
+                {"boot": "x" * 40, "seq": 5, "full": True, "status": {}},
+                {"boot": "b2", "seq": 6, "full": False, "status": {"a": 1}},
+                {"boot": "b1", "seq": 7, "full": False, "status": {"a": 1}},
+                {"boot": "b1", "seq": 5, "full": False, "status": {"a": 1}},
+                {"boot": "b1", "seq": 6, "full": False, "status": {}, "removed": "a"}):
+        assert raises(lambda: sf.apply_frame(nxt, bad)), bad
+    assert raises(lambda: sf.apply_frame(None, {"boot": "b1", "seq": 6, "full": False, "status": {}}))
+
+def t4_subscriptions_track_the_node():
+    """Prove StatusSubscriptions mirrors the node's status after every change (full, then deltas), falls
+    back to /status polling for a node without /status_stream, reports a dead peer, and forgets a peer
+    it no longer follows."""
+    legacy = _Node(legacy=True)
+    subs = sf.StatusSubscriptions(port=NODE.port, wait=2)
+    try:
+        subs.follow(["127.0.0.1"])
+        assert _eventually(lambda: subs.snapshot().get("127.0.0.1") == NODE.feed.snapshot)
+        for i in range(5):
+            NODE.change(latest_block_hash=f"{i}" * 64, transaction_pool_hash=f"p{i}x")
+            assert _eventually(lambda: subs.snapshot().get("127.0.0.1") == NODE.state), i
+        assert not subs.drain_failures()
+
+        legacy_subs = sf.StatusSubscriptions(port=legacy.port, wait=2)
+        legacy_subs.follow(["127.0.0.1"])
+        assert _eventually(lambda: legacy_subs.snapshot().get("127.0.0.1") == legacy.state)
+        legacy.change(finalized_height=99)
+        assert _eventually(lambda: legacy_subs.snapshot().get("127.0.0.1", {}).get("finalized_height") == 99)
+        legacy_subs.close()
+
+        dead = sf.StatusSubscriptions(port=1, wait=2)
+        dead.follow(["127.0.0.1"])
+        assert _eventually(lambda: "127.0.0.1" in dead.drain_failures())
+        assert dead.snapshot() == {}
+        dead.close()
+        subs.follow([])
+        assert subs.snapshot() == {}
+    finally:
+        subs.close()
+
+
+def t5_core_wire_survives_errors_and_idle_answers_back_off():
+    """Prove a transient error (429) keeps a subscriber on the core wire, a status that does not fit the
+    core slots moves it to zstd, and heartbeats answered at once (server over STATUS_STREAM_MAX_WAITERS)
+    are backed off from instead of re-asked in a tight loop."""
+    from unittest import mock
+    node = _Node()
+    node.change(transaction_pool_hash="b" * 64)             # fits the core slots
+    assert _eventually(lambda: node.feed.snapshot == node.state)
+    node.reject = 2
+    subs = sf.StatusSubscriptions(port=node.port, wait=2)
+    try:
+        subs.follow(["127.0.0.1"])
+        assert _eventually(lambda: "protocol" in subs.snapshot().get("127.0.0.1", {}), timeout=10)
+        assert node.reject == 0 and set(node.asked) == {"core"}, node.asked
+        with mock.patch.object(sf, "STATUS_STREAM_MAX_WAITERS", 0):
+            seen = len(node.asked)
+            time.sleep(3)
+            assert len(node.asked) - seen <= 5, f"{len(node.asked) - seen} requests in 3 s"
+        node.change(transaction_pool_hash="p9")                 # no longer fits: the zstd wire takes over
+        assert _eventually(lambda: subs.snapshot().get("127.0.0.1") == node.state, timeout=10)
+        assert node.asked[-1] == "zstd"
+    finally:
+        subs.close()
+
+
+check("t1_one_build_per_change_for_all_subscribers", t1_one_build_per_change_for_all_subscribers)
+check("t2_delta_full_and_heartbeat", t2_delta_full_and_heartbeat)
+check("t3_apply_frame_validates", t3_apply_frame_validates)
+check("t4_subscriptions_track_the_node", t4_subscriptions_track_the_node)
+check("t5_core_wire_survives_errors_and_idle_answers_back_off", t5_core_wire_survives_errors_and_idle_answers_back_off)
+peer_transport.close()
+print("ALL PASS" if not fails else f"{fails} FAILURE(S)")
+sys.exit(1 if fails else 0)
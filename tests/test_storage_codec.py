@@ -0,0 +1,113 @@
+"""
+Binary storage codec (ops/codec.py pack_storage / unpack_stored / canonical) behind kv_ops._pack and block
+bodies.
+
+The codec is a LOCAL byte format only: every value must decode to exactly what the JSON codec gives back, and
+the state root must not be able to tell which codec wrote a row — a node half way through the lazy migration
+(some rows JSON, some binary) has to derive the same root as one that never migrated.
+
+Run: python3 tests/test_storage_codec.py
+"""
+import os, sys, tempfile, traceback
+os.environ["HOME"] = tempfile.mkdtemp(prefix="nado_scodec_")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for d in ("index", "blocks", "logs", "peers"):
+    os.makedirs(f"{os.environ['HOME']}/nado/{d}", exist_ok=True)
+
+from genesis import create_indexers
+create_indexers()
+
+from ops import codec, kv_ops, snapshot_ops
+from ops.block_ops import _pack_block, _unpack_block
+
+fails = 0
+def check(name, fn):
+    """Run fn; print PASS/FAIL and count failures."""
+    global fails
+    try: fn(); print(f"PASS  {name}")
+    except Exception as e:
+        fails += 1; print(f"FAIL  {name}: {e}"); traceback.print_exc()
+
+def raises(fn):
+    """True if fn raises."""
+    try: fn(); return False
+    except Exception: return True
+
+ACCT = {"balance": 10 ** 12, "produced": 5, "bonded": 2 ** 80, "registered": 1, "fidelity": 3,
+        "last_hb_epoch": 100, "public_key": "ab" * 1312}
+TX = {"sender": "ndo" + "1" * 40, "recipient": "blob", "amount": 7, "timestamp": 1, "data": {"k": [1, 2]},
+      "nonce": "n" * 9, "public_key": os.urandom(1312).hex(), "max_block": 9, "chain_id": "c", "fee": 1,
+      "txid": os.urandom(32).hex(), "signature": os.urandom(2420).hex()}
+BLOCK = {"block_number": 3, "block_hash": "ff" * 32, "parent_hash": "00" * 32, "block_timestamp": 12,
+         "block_transactions": [dict(TX, amount=i, txid=os.urandom(32).hex()) for i in range(4)]}
+VALUES = [None, True, False, 0, 63, 64, -1, -2 ** 300, 2 ** 300, 1.5, -0.0, "", "é☃", "AB" * 8, "0" * 15,
+          "de" * 8, b"\x00\xff", {1: 2, None: 3, "t": True}, {True: [1, (2, 3)]}, {"__b64__": "AAE="},
+          ACCT, TX, BLOCK, [{"a": 1, "b": b"x"}, {"a": 2, "b": "ff" * 20}],
+          [{"__b64__": "AA=="}, {"__b64__": "AQ=="}]]
+
+
+def t1_round_trip_matches_json_codec():
+    """Prove every value decodes to exactly what the JSON codec gives back (types included), and canonical()
+    re-renders the exact pack() bytes."""
+    for v in VALUES:
+        want, got = codec.unpack(codec.pack(v)), codec.unpack_stored(codec.pack_storage(v))
+        assert want == got and type(want) is type(got), f"{v!r:.60}: {got!r:.60}"
+        assert codec.canonical(codec.pack_storage(v)) == codec.pack(v), f"{v!r:.60}"
+        assert codec.unpack_stored(codec.pack(v)) == want, "legacy JSON rows must stay readable"
+
+def t2_rejects_what_json_rejects():
+    """Prove the storage codec refuses the same inputs pack() refuses instead of storing something the state
+    root could not render, and a wrong version byte is an error, not a mis-decode."""
+    for bad in ({"k": object()}, {(1, 2): 1}, "\ud800", {1, 2}):
+        assert raises(lambda: codec.pack(bad)) and raises(lambda: codec.pack_storage(bad)), repr(bad)
+    raw = bytearray(codec.pack_storage(ACCT)); raw[1] = codec.STORAGE_VERSION + 1
+    assert raises(lambda: codec.unpack_stored(bytes(raw)))
+    assert raises(lambda: codec.unpack_stored(codec.pack_storage(ACCT) + b"\x00"))
+    assert raises(lambda: codec.unpack(codec.pack_storage(ACCT))), "the peer-wire decoder must not accept it"
+
+def t3_smaller_and_interned_fields_pinned():
+    """Prove account docs and block bodies shrink, and the interned field table still leads with
+    kv_ops.ACCOUNT_FIELDS (ids are baked into stored rows — the table is append-only)."""
+    assert codec._FIELDS[:6] == kv_ops.ACCOUNT_FIELDS
+    assert len(codec._FIELDS) == len(set(codec._FIELDS)) <= 0x7F
+    small = dict(ACCT); small.pop("public_key")
+    assert len(codec.pack_storage(small)) * 2 <= len(codec.pack(small))
+    assert len(codec.pack_storage(BLOCK)) * 2 <= len(codec.pack(BLOCK))
+    assert _unpack_block(_pack_block(BLOCK)) == codec.unpack(codec.pack(BLOCK))
+
+def _put_account(address, doc):
+    """Write an account row exactly the way kv_ops' account writers do (_pack(_normalize(doc)))."""
+    kv_ops._write(lambda txn: txn.put(address.encode(), kv_ops._pack(kv_ops._normalize(doc)),
+                                      db=kv_ops._dbs()["accounts"]))
+
+def t4_state_root_independent_of_stored_codec():
+    """Prove a DB whose rows were written binary derives the SAME state root as the identical DB written as
+    legacy JSON, and a JSON row reads back and migrates to binary on its next write."""
+    _put_account("ndo_scodec_a", ACCT)
+    _put_account("ndo_scodec_b", {"balance": 9})
+    raw = kv_ops._read(lambda txn: txn.get(b"ndo_scodec_a", db=kv_ops._dbs()["accounts"]))
+    assert codec.is_storage(raw), "new writes must use the binary codec"
+    binary_root = snapshot_ops.l1_state_root()
+    binary_state = snapshot_ops.read_state()
+    codec.STORAGE_BINARY = False
+    try:
+        _put_account("ndo_scodec_a", ACCT)
+        _put_account("ndo_scodec_b", {"balance": 9})
+    finally:
+        codec.STORAGE_BINARY = True
+    raw = kv_ops._read(lambda txn: txn.get(b"ndo_scodec_a", db=kv_ops._dbs()["accounts"]))
+    assert not codec.is_storage(raw)
+    assert snapshot_ops.read_state() == binary_state
+    assert snapshot_ops.l1_state_root() == binary_root
+    assert kv_ops.get_account("ndo_scodec_a")["bonded"] == 2 ** 80
+    kv_ops.account_adjust("ndo_scodec_a", "balance", 1)
+    raw = kv_ops._read(lambda txn: txn.get(b"ndo_scodec_a", db=kv_ops._dbs()["accounts"]))
+    assert codec.is_storage(raw), "the next write migrates the row"
+
+
+check("t1_round_trip_matches_json_codec", t1_round_trip_matches_json_codec)
+check("t2_rejects_what_json_rejects", t2_rejects_what_json_rejects)
+check("t3_smaller_and_interned_fields_pinned", t3_smaller_and_interned_fields_pinned)
+check("t4_state_root_independent_of_stored_codec", t4_state_root_independent_of_stored_codec)
+print("ALL PASS" if not fails else f"{fails} FAILURE(S)")
+sys.exit(1 if fails else 0)
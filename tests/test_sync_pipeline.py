@@ -0,0 +1,154 @@
+"""
+Pipelined forward sync (ops/sync_pipeline.py — fetch-ahead + stateless pre-verify for _fast_forward_from).
+
+The pipeline may only change WHEN blocks are fetched and their signatures checked, never what gets applied:
+batches come out strictly in chain order, the fetcher never runs more than SYNC_PREFETCH_BATCHES ahead of
+the consumer, close() discards everything prefetched (nothing fetched afterwards ever reaches the caller), a
+block failing the stateless checks is still HANDED OVER (produce_block decides) but the walk stops there,
+and pre-verification leaves the block's tx signatures in the verified-signature cache.
+
+Run: python3 tests/test_sync_pipeline.py
+"""
+import os, sys, tempfile, traceback, time, hashlib, threading
+os.environ["HOME"] = tempfile.mkdtemp(prefix="nado_syncpipe_")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for d in ("index", "blocks", "logs", "peers"):
+    os.makedirs(f"{os.environ['HOME']}/nado/{d}", exist_ok=True)
+
+from genesis import create_indexers
+create_indexers()
+
+from signatures import generate_keydict, sign
+from ops.block_ops import construct_block
+from ops import transaction_ops
+from ops import sync_pipeline as sp
+
+fails = 0
+def check(name, fn):
+    """Run fn; print PASS/FAIL and count failures."""
+    global fails
+    try: fn(); print(f"PASS  {name}")
+    except Exception as e:
+        fails += 1; print(f"FAIL  {name}: {e}"); traceback.print_exc()
+
+def raises(fn):
+    """True if fn raises."""
+    try: fn(); return False
+    except Exception: return True
+
+KD = generate_keydict()
+BATCH = 4
+
+
+def _chain(n, parent="0" * 64):
+    """n real, hash-consistent blocks after `parent` (empty tx sets)."""
+    out = []
+    for i in range(n):
+        b = construct_block(block_timestamp=10 + i, block_number=1 + i, parent_hash=parent, creator=KD["address"],
+                            transaction_pool=[], block_reward=1, parent_cumulative_weight=i, block_weight=1)
+        out.append(b)
+        parent = b["block_hash"]
+    return out
+
+CHAIN = _chain(22)
+
+
+class _Donor:
+    """fetch(tail) over a list of blocks, BATCH at a time; counts calls (thread-safe)."""
+    def __init__(self, blocks, delay=0.0):
+        self.blocks, self.delay, self.calls = blocks, delay, []
+        self._lock = threading.Lock()
+
+    def __call__(self, tail):
+        with self._lock:
+            self.calls.append(tail)
+        if self.delay:
+            time.sleep(self.delay)
+        hashes = ["0" * 64] + [b["block_hash"] for b in self.blocks]
+        if tail not in hashes:
+            return None
+        i = hashes.index(tail)
+        return self.blocks[i:i + BATCH]
+
+
+def _drain(p):
+    out = []
+    while True:
+        batch = p.next()
+        if batch is None:
+            return out
+        out.append(batch)
+
+
+def t1_in_order_and_bounded():
+    """Prove batches come out in chain order and complete, and that a consumer that stops reading holds the
+    fetcher at depth queued batches + the one waiting to be queued."""
+    donor = _Donor(CHAIN)
+    with sp.SyncPipeline(donor, "0" * 64, depth=2, workers=2) as p:
+        time.sleep(1.0)
+        assert len(donor.calls) == 3, f"fetcher ran {len(donor.calls)} batches ahead with depth=2"
+        batches = _drain(p)
+    assert [b["block_hash"] for batch in batches for b in batch] == [b["block_hash"] for b in CHAIN]
+    assert p.bad_at is None
+
+def t2_close_discards_prefetched():
+    """Prove close() drops what was prefetched, stops the fetcher, and next() returns None afterwards —
+    including for a fetch that was on the wire when close() ran."""
+    donor = _Donor(CHAIN, delay=0.3)
+    p = sp.SyncPipeline(donor, "0" * 64, depth=3)
+    first = p.next()
+    assert first == CHAIN[:BATCH]
+    p.close()
+    assert p.next() is None, "a closed pipeline must not hand out prefetched batches"
+    n = len(donor.calls)
+    time.sleep(1.0)
+    assert len(donor.calls) <= n, "the fetcher kept walking after close()"
+
+def t3_invalid_block_stops_walk_but_is_delivered():
+    """Prove a block failing the stateless checks (content no longer hashes to block_hash) is still handed
+    over — produce_block is the authority — and that nothing past its batch is fetched; a batch that does
+    not link to the requested tail stops the walk the same way."""
+    bad = [dict(b) for b in CHAIN]
+    bad[6]["block_reward"] = 999                                # batch 1, index 2
+    assert sp.preverify_block(bad[6]) is not None and sp.preverify_block(CHAIN[6]) is None
+    donor = _Donor(bad)
+    with sp.SyncPipeline(donor, "0" * 64, depth=4) as p:
+        batches = _drain(p)
+    assert p.bad_at == (1, 2), p.bad_at
+    assert bad[6] in batches[1], "the flagged block must still reach produce_block"
+    assert len(batches) <= 1 + 4, "walk must stop at the flagged batch (plus at most a queue's worth in flight)"
+    assert sp.preverify_batch(CHAIN[4:8], CHAIN[2]["block_hash"]) == 0, "unlinked batch must be flagged"
+
+def t4_preverify_caches_tx_signatures():
+    """Prove pre-verifying a block with a signed tx leaves that signature in the verified-signature cache
+    (what makes the later in-order validate_transactions_in_block cheap), and a forged one does not."""
+    txid = hashlib.blake2b(b"pipeline tx", digest_size=32).hexdigest()
+    good = sign(KD["private_key"], bytes.fromhex(txid))
+    forged = sign(generate_keydict()["private_key"], bytes.fromhex(txid))
+    for sig, expect in ((good, True), (forged, False)):
+        tx = {"txid": txid, "sender": KD["address"], "recipient": KD["address"], "amount": 1, "fee": 0,
+              "public_key": KD["public_key"], "signature": sig}
+        b = construct_block(block_timestamp=10, block_number=1, parent_hash="0" * 64, creator=KD["address"],
+                            transaction_pool=[tx], block_reward=1, parent_cumulative_weight=0, block_weight=1)
+        key = transaction_ops._verified_key(sig, KD["public_key"], bytes.fromhex(txid))
+        assert not transaction_ops._verified_get(key)
+        assert sp.preverify_batch([b], "0" * 64) is None, "a bad tx signature is not a stateless block reject"
+        assert transaction_ops._verified_get(key) is expect
+
+def t5_fast_forward_uses_pipeline():
+    """Prove (source) that _fast_forward_from runs through SyncPipeline and closes it on every exit."""
+    src = open(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            "loops", "core_loop.py")).read()
+    body = src.split("def _fast_forward_from(", 1)[1].split("\n    def ", 1)[0]
+    assert "SyncPipeline(" in body and "pipeline.next()" in body
+    assert "finally:" in body and "pipeline.close()" in body.split("finally:", 1)[1]
+    assert "threading.Thread(" not in body, "the one-batch prefetch thread should be gone"
+
+
+check("t1_in_order_and_bounded", t1_in_order_and_bounded)
+check("t2_close_discards_prefetched", t2_close_discards_prefetched)
+check("t3_invalid_block_stops_walk_but_is_delivered", t3_invalid_block_stops_walk_but_is_delivered)
+check("t4_preverify_caches_tx_signatures", t4_preverify_caches_tx_signatures)
+check("t5_fast_forward_uses_pipeline", t5_fast_forward_uses_pipeline)
+print("ALL PASS" if not fails else f"{fails} FAILURE(S)")
+sys.exit(1 if fails else 0)
@@ -0,0 +1,115 @@
+"""
+Verified-signature cache (transaction_ops._VERIFIED_SIGS) shared by mempool admission and block verification.
+
+A tx admitted to the mempool must not pay a second ML-DSA verify when a peer's block carrying it is
+validated — but the cache may only ever SKIP work, never decide: rejects are not remembered, the key binds
+the exact key + signature bytes (same txid with a different signature is a miss), it is bounded, and a
+rollback empties it.
+
+Run: python3 tests/test_verified_sig_cache.py
+"""
+import os, sys, tempfile, traceback, logging
+os.environ["HOME"] = tempfile.mkdtemp(prefix="nado_sigcache_")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for d in ("index", "blocks", "logs", "peers"):
+    os.makedirs(f"{os.environ['HOME']}/nado/{d}", exist_ok=True)
+
+logger = logging.getLogger("sigcache"); logger.addHandler(logging.NullHandler())
+from genesis import create_indexers
+create_indexers()
+
+from ops import transaction_ops as txo
+from ops.key_ops import generate_keys
+from ops.account_ops import create_account
+from protocol import MIN_TX_FEE
+
+fails = 0
+def check(name, fn):
+    """Run fn; print PASS/FAIL and count failures."""
+    global fails
+    txo.clear_verified_signatures()
+    try: fn(); print(f"PASS  {name}")
+    except Exception as e:
+        fails += 1; print(f"FAIL  {name}: {e}"); traceback.print_exc()
+
+def raises(fn):
+    """True if fn raises."""
+    try: fn(); return False
+    except Exception: return True
+
+K, OTHER = generate_keys(), generate_keys()
+create_account(K["address"], balance=10 ** 15)
+_real_verify = txo.verify
+CALLS = [0]
+def _counting_verify(**kw):
+    CALLS[0] += 1
+    return _real_verify(**kw)
+txo.verify = _counting_verify
+
+def _tx(amount=1):
+    """One signed, pubkey-carrying transfer from K."""
+    draft = txo.draft_transaction(sender=K["address"], recipient=OTHER["address"], amount=amount,
+                                  public_key=K["public_key"], timestamp=1, data="", max_block=100)
+    return txo.create_transaction(draft=draft, private_key=K["private_key"], fee=MIN_TX_FEE * 50)
+
+
+def t1_second_validation_skips_verify():
+    """Prove a tx validated once (mempool admission) is not ML-DSA-verified again (block verification)."""
+    tx = _tx()
+    CALLS[0] = 0
+    txo.validate_transaction(tx, logger, 50)
+    assert CALLS[0] == 1, f"first validation must verify once, verified {CALLS[0]}x"
+    txo.validate_transaction(tx, logger, 50)
+    assert CALLS[0] == 1, "second validation must be served from the cache"
+
+def t2_rejects_are_never_cached():
+    """Prove an invalid signature is re-verified (and re-rejected) every time — nothing negative is stored."""
+    tx = _tx()
+    bad = dict(tx, signature=_tx(amount=2)["signature"])
+    CALLS[0] = 0
+    assert raises(lambda: txo.validate_transaction(bad, logger, 50))
+    assert raises(lambda: txo.validate_transaction(bad, logger, 50))
+    assert CALLS[0] == 2, "a rejected signature must be verified again, never remembered"
+
+def t3_same_txid_different_signature_is_a_miss():
+    """Prove the key binds the signature bytes: a cached accept for (txid, sig) does not vouch for the same
+    txid carrying some other signature."""
+    tx = _tx()
+    txo.validate_transaction(tx, logger, 50)
+    flipped = bytearray(bytes.fromhex(tx["signature"])); flipped[-1] ^= 1
+    assert raises(lambda: txo.validate_transaction(dict(tx, signature=flipped.hex()), logger, 50))
+
+def t4_block_preverify_uses_admission_verdicts():
+    """Prove preverify_origins does not re-verify txs already admitted, and still returns them as verified."""
+    txs = [_tx(amount=10 + i) for i in range(3)]
+    for tx in txs:
+        txo.validate_transaction(tx, logger, 50)
+    pre = txo.preverify_origins(txs)
+    assert len(pre) == 3, "admitted txs must come back as pre-verified"
+
+def t5_rollback_clears_and_lru_is_bounded():
+    """Prove clear_verified_signatures (called by rollback_one_block) empties the cache, and the cache never
+    grows past its bound (oldest evicted first)."""
+    txo.validate_transaction(_tx(), logger, 50)
+    assert len(txo._VERIFIED_SIGS) == 1
+    txo.clear_verified_signatures()
+    assert len(txo._VERIFIED_SIGS) == 0
+    src = open(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "rollback.py")).read()
+    assert "clear_verified_signatures()" in src, "rollback_one_block must invalidate the cache"
+    old_max, txo._VERIFIED_SIGS_MAX = txo._VERIFIED_SIGS_MAX, 4
+    try:
+        for i in range(10):
+            txo._verified_put(b"%032d" % i)
+        assert len(txo._VERIFIED_SIGS) == 4
+        assert not txo._verified_get(b"%032d" % 0) and txo._verified_get(b"%032d" % 9)
+    finally:
+        txo._VERIFIED_SIGS_MAX = old_max
+
+
+check("t1_second_validation_skips_verify", t1_second_validation_skips_verify)
+check("t2_rejects_are_never_cached", t2_rejects_are_never_cached)
+check("t3_same_txid_different_signature_is_a_miss", t3_same_txid_different_signature_is_a_miss)
+check("t4_block_preverify_uses_admission_verdicts", t4_block_preverify_uses_admission_verdicts)
+check("t5_rollback_clears_and_lru_is_bounded", t5_rollback_clears_and_lru_is_bounded)
+print("ALL PASS" if not fails else f"{fails} FAILURE(S)")
+sys.exit(1 if fails else 0)
@@ -0,0 +1,131 @@
+"""
+Batch signature verification (signatures.verify_many + transaction_ops.preverify_origins).
+
+verify_many is an ACCELERATOR for block validation: the worker-process pool may only change how fast a block
+verifies, never which signatures are accepted. So every check here compares against plain verify(): same
+answer per item, same order, malformed input is a False (never a raise), and a block validated with the
+preverified set accepts/rejects exactly the txs it does without one.
+
+Run: python3 tests/test_verify_many.py
+"""
+import os, sys, tempfile, traceback, logging
+os.environ["HOME"] = tempfile.mkdtemp(prefix="nado_vmany_")
+os.environ["NADO_VERIFY_WORKERS"] = "2"          # force the pool path even on a 1-core CI box
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for d in ("index", "blocks", "logs", "peers"):
+    os.makedirs(f"{os.environ['HOME']}/nado/{d}", exist_ok=True)
+
+logger = logging.getLogger("vmany"); logger.addHandler(logging.NullHandler())
+from genesis import create_indexers
+create_indexers()
+
+import signatures
+from signatures import sign, verify, verify_many, unhex, VERIFY_PARALLEL_MIN
+from ops.key_ops import generate_keys
+from ops.account_ops import create_account
+from ops.transaction_ops import (draft_transaction, create_transaction, validate_transaction,
+                                 preverify_origins, origin_claims)
+from protocol import MIN_TX_FEE
+
+fails = 0
+def check(name, fn):
+    """Run fn; print PASS/FAIL and count failures."""
+    global fails
+    try: fn(); print(f"PASS  {name}")
+    except Exception as e:
+        fails += 1; print(f"FAIL  {name}: {e}"); traceback.print_exc()
+
+def raises(fn):
+    """True if fn raises."""
+    try: fn(); return False
+    except Exception: return True
+
+K = generate_keys()
+OTHER = generate_keys()
+N = 2 * VERIFY_PARALLEL_MIN + 3                   # big enough for two workers, odd so chunks are uneven
+MSGS = [os.urandom(32) for _ in range(N)]
+SIGS = [sign(private_key=K["private_key"], message=m) for m in MSGS]
+
+
+def _batch():
+    """Valid triples, a third of them broken three different ways (wrong key, flipped byte, garbage hex)."""
+    items = []
+    for i, (s, m) in enumerate(zip(SIGS, MSGS)):
+        if i % 9 == 3:
+            items.append((s, OTHER["public_key"], m))
+        elif i % 9 == 6:
+            items.append(((bytes([unhex(s)[0] ^ 1]) + unhex(s)[1:]).hex(), K["public_key"], m))
+        elif i % 9 == 0:
+            items.append(("zz-not-hex", K["public_key"], m))
+        else:
+            items.append((s, K["public_key"], m))
+    return items
+
+
+def t1_matches_sequential_verify_in_order():
+    """Prove the pooled batch returns exactly verify()'s answer for every item, in input order."""
+    items = _batch()
+    want = [verify(signed=s, public_key=pk, message=m) for s, pk, m in items]
+    assert True in want and False in want, "the fixture must mix valid and invalid signatures"
+    assert verify_many(items) == want
+    assert signatures._VERIFY_POOL[0] is not None, "a batch this size should have used the worker pool"
+
+def t2_small_and_empty_batches_inline():
+    """Prove tiny batches verify inline (no IPC) and still give verify()'s answers."""
+    assert verify_many([]) == []
+    items = _batch()[:3]
+    assert verify_many(items) == [verify(signed=s, public_key=pk, message=m) for s, pk, m in items]
+
+def t3_broken_pool_degrades_to_sequential():
+    """Prove a dead pool is dropped and the batch still answers correctly (sequential fallback)."""
+    class _Broken:
+        def submit(self, *a, **k):
+            raise RuntimeError("pool is broken")
+        def shutdown(self, *a, **k):
+            pass
+    signatures._VERIFY_POOL[0] = _Broken()
+    items = _batch()
+    assert verify_many(items) == [verify(signed=s, public_key=pk, message=m) for s, pk, m in items]
+    assert signatures._VERIFY_POOL[0] is None, "the broken pool must be discarded"
+
+def _txs(count):
+    """`count` signed, pubkey-carrying transfers from K to OTHER (distinct amounts -> distinct txids)."""
+    out = []
+    for i in range(count):
+        draft = draft_transaction(sender=K["address"], recipient=OTHER["address"], amount=1 + i,
+                                  public_key=K["public_key"], timestamp=1, data="", max_block=100)
+        out.append(create_transaction(draft=draft, private_key=K["private_key"], fee=MIN_TX_FEE * 50))
+    return out
+
+def t4_preverified_block_same_outcomes():
+    """Prove validate_transaction with the block's preverified set accepts/rejects exactly the same txs as
+    without it — including a tx whose signature was swapped for another tx's (valid sig, wrong message)."""
+    create_account(K["address"], balance=10 ** 15)
+    txs = _txs(N)
+    txs[5] = dict(txs[5], signature=txs[6]["signature"])
+    pre = preverify_origins(txs)
+    assert len(pre) == N - 1, f"every honest signature should pre-verify, got {len(pre)}"
+    for tx in txs:
+        plain = raises(lambda: validate_transaction(tx, logger, 50))
+        batched = raises(lambda: validate_transaction(tx, logger, 50, preverified=pre))
+        assert plain == batched, f"outcome differs for {tx['txid'][:12]}"
+    assert not raises(lambda: validate_transaction(txs[0], logger, 50, preverified=pre)), "honest tx must pass"
+    assert raises(lambda: validate_transaction(txs[5], logger, 50, preverified=pre))
+
+def t5_claims_are_never_trusted_blindly():
+    """Prove the set is keyed by the FULL (signature, key, message) triple: a preverified claim for one tx
+    does not vouch for a different tx that reuses its signature."""
+    txs = _txs(2)
+    pre = preverify_origins(txs[:1])
+    forged = dict(txs[1], signature=txs[0]["signature"])
+    assert origin_claims(forged)[0] not in pre
+    assert raises(lambda: validate_transaction(forged, logger, 50, preverified=pre))
+
+
+check("t1_matches_sequential_verify_in_order", t1_matches_sequential_verify_in_order)
+check("t2_small_and_empty_batches_inline", t2_small_and_empty_batches_inline)
+check("t3_broken_pool_degrades_to_sequential", t3_broken_pool_degrades_to_sequential)
+check("t4_preverified_block_same_outcomes", t4_preverified_block_same_outcomes)
+check("t5_claims_are_never_trusted_blindly", t5_claims_are_never_trusted_blindly)
+print("ALL PASS" if not fails else f"{fails} FAILURE(S)")
+sys.exit(1 if fails else 0)
@@ -0,0 +1,182 @@
+"""
+Pre-decoded zkVM interpreter (execnode/zkvm.py compile_program / _run_compiled): the non-witness fast path
+of zkvm.run.
+
+A method body is decoded once into per-instruction handlers instead of being re-decoded on every step. That
+may only make calls cheaper, never different: over every execnode/games contract and over random programs
+that hit every opcode, every revert window and the gas ceiling, the compiled path must return exactly what
+the reference interpreter returns — ok, ret, storage and the io log entry for entry.
+
+Run: python3 tests/test_zkvm_compiled.py
+"""
+import importlib, os, random, sys, traceback
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from execnode.stark import field as F
+from execnode import zkvm, zkvmasm
+
+fails = 0
+def check(name, fn):
+    """Run fn; print PASS/FAIL and count failures."""
+    global fails
+    try: fn(); print(f"PASS  {name}")
+    except Exception as e:
+        fails += 1; print(f"FAIL  {name}: {e}"); traceback.print_exc()
+
+
+GAMES = sorted(f[:-3] for f in os.listdir(os.path.join(os.path.dirname(zkvm.__file__), "games"))
+               if f.endswith(".py") and not f.startswith("_") and f not in ("deploy.py", "redeploy.py"))
+BH = {h: (h * 0x9E3779B97F4A7C15) % F.P for h in range(64)}
+BEACONS = {e: (e * 0xC2B2AE3D27D4EB4F) % F.P for e in range(8)}
+
+
+def _both(code, method, caller, args, storage, **kw):
+    """(compiled, reference) results of one call; asserts the compiled path was actually taken."""
+    assert zkvm._program(code[method]) is not None, f"{method} did not compile"
+    got = zkvm.run(code, method, caller, args, storage, **kw)
+    want = zkvm._run_reference(code, method, caller, args, storage, **kw)
+    return got, want
+
+
+def _arg(rng):
+    r = rng.random()
+    if r < 0.6:
+        return rng.randint(0, 12)
+    if r < 0.8:
+        return rng.randint(0, 1 << 20)
+    return rng.randrange(F.P)
+
+
+def t1_games_match_reference():
+    """Prove every method of every game contract gives identical results on both paths, over a storage that
+    evolves with each successful call so the calls reach past the first REQUIRE."""
+    rng = random.Random(24)
+    ran = oks = 0
+    for name in GAMES:
+        code = importlib.import_module(f"execnode.games.{name}").build()
+        zkvm.validate_code(code)
+        storage = {}
+        for i in range(120):
+            method = rng.choice(sorted(code))
+            args = [_arg(rng) for _ in range(rng.choice((0, 2, 4, 8, 12)))]
+            kw = dict(value=rng.choice((0, 1, 100)), cursor=rng.randint(1, 60), timestamp=1700000000 + i,
+                      block_hashes=BH, beacons=BEACONS, asset=rng.choice((0, 0, 5)), selfd=99,
+                      abal={5: rng.randint(0, 50)})
+            got, want = _both(code, method, rng.choice((7, 8, 9)), args, storage, **kw)
+            assert got == want, f"{name}.{method}{args}: {got[:2]} != {want[:2]}"
+            ran += 1
+            if got[0]:
+                oks += 1
+                storage = got[2]
+    assert oks > ran // 10, f"only {oks}/{ran} calls succeeded — the differential barely left the entry checks"
+
+OPS_TEXT = ["nop", "movi r{d} {imm}", "mov r{d} r{s}", "add r{d} r{s}", "sub r{d} r{s}", "mul r{d} r{s}",
+            "eq r{d} r{s}", "nez r{d}", "notb r{d}", "lt r{d} r{s}", "range r{d}", "divmod r{d} r{s}",
+            "divmodw r{d} r{s}", "lo32 r{d}", "hinit", "habs r{s}", "hout r{d}",
+            "sload r{d} r{s}", "sstore r{d} r{s}", "bhash r{d} r{s}", "beacon r{d} r{s}", "arg r{d} r{s}",
+            "abal r{d} r{s}", "pay r{d} r{s}", "aburn r{d} r{s}", "arenounce r{d}"]
+
+
+def _random_program(rng, n):
+    """A random straight-line-plus-jumps program over (nearly) every opcode, built as raw instructions so no
+    macro hides a revert window."""
+    prog = []
+    for pc in range(n):
+        op = rng.random()
+        if op < 0.08:
+            prog.append(["JNZ" if rng.random() < 0.7 else "JMP", 0, rng.randrange(6), rng.randrange(n)])
+        elif op < 0.12:
+            prog.append(["REQUIRE", 0, rng.randrange(6), 0])
+        elif op < 0.14:
+            prog.append(["HR%d" % rng.randrange(27), 0, 0, 0])
+        elif op < 0.17:                                   # imm 4 is past both context tables: a revert
+            prog.append([rng.choice(("CTX", "ACTX")), rng.randrange(6), 0, rng.randrange(5)])
+        else:
+            t = rng.choice(OPS_TEXT).format(d=rng.randrange(6), s=rng.randrange(6),
+                                            imm=rng.choice((0, 1, 7, 1 << 31, 1 << 40, F.P - 1)))
+            prog.extend(zkvmasm.assemble(t))
+    prog.append(["RET", 0, rng.randrange(6), 0])
+    return prog
+
+def t2_random_programs_match_reference():
+    """Prove random programs — every op, wrap-around values, unreduced multiples of p read from storage (the
+    inverse-raises path), missing chain data, overdrawn assets — revert at exactly the same calls."""
+    rng = random.Random(2024)
+    outcomes = set()
+    real = zkvm.GAS_LIMIT
+    try:
+        zkvm.GAS_LIMIT = 500                      # random jumps loop; a low ceiling keeps those cheap
+        for i in range(1500):
+            code = {"m": _random_program(rng, rng.randint(2, 40))}
+            storage = {k: rng.choice((0, 1, 3, F.P, 2 * F.P, -F.P, F.P - 1, 1 << 62, rng.randrange(F.P)))
+                       for k in range(6)}
+            args = [rng.choice((0, 1, 2, 5, 70000, 1 << 33, F.P - 1, rng.randrange(F.P))) for _ in range(6)]
+            got, want = _both(code, "m", 7, args, storage, block_hashes={0: 1, 1: F.P + 3}, beacons={2: 9},
+                              abal={1: 4}, selfd=3)
+            assert got == want, f"program {i} {code['m']}: {got} != {want}"
+            outcomes.add(got[0])
+    finally:
+        zkvm.GAS_LIMIT = real
+    assert outcomes == {True, False}
+
+def t3_gas_and_malformed_code():
+    """Prove the gas ceiling reverts on the same step on both paths, and that code only the reference can
+    decode (unknown op, bool or out-of-range operands) still runs on the reference with its own result."""
+    loop = {"m": zkvmasm.assemble("movi r1 1\nloop:\n add r0 r1\n jnz r1 @loop\n ret r0")}
+    real = zkvm.GAS_LIMIT
+    try:
+        zkvm.GAS_LIMIT = 50
+        got, want = _both(loop, "m", 7, [], {})
+        assert got == want and not got[0]
+        exact = {"m": zkvmasm.assemble("movi r1 1\n" + "add r0 r1\n" * 48 + "ret r0")}
+        got, want = _both(exact, "m", 7, [], {})
+        assert got == want and got[:2] == (True, 48), got
+    finally:
+        zkvm.GAS_LIMIT = real
+    for prog in ([["NOPE", 0, 0, 0]], [["MOVI", True, 0, 1], ["RET", 0, 0, 0]], [["MOV", 9, 0, 0]],
+                 [["MOVI", 0, 0, F.P + 5], ["RET", 0, 0, 0]], [["MOVI", 0, 0, -1], ["RET", 0, 0, 0]]):
+        assert zkvm.compile_program(prog) is None, prog
+        code = {"m": prog}
+        assert zkvm.run(code, "m", 7, [], {}) == zkvm._run_reference(code, "m", 7, [], {})
+
+def t4_decode_is_cached_by_content():
+    """Prove a method body is decoded once: the same object hits, an equal copy (a reload) shares the decode,
+    a different body does not."""
+    text = "movi r1 5\nadd r0 r1\nret r0"
+    a, b = zkvmasm.assemble(text), zkvmasm.assemble(text)
+    fa = zkvm._program(a)
+    assert zkvm._program(a) is fa and zkvm._program(b) is fa
+    assert zkvm._program(zkvmasm.assemble("movi r1 6\nadd r0 r1\nret r0")) is not fa
+    assert zkvm.run({"m": b}, "m", 7, [1], {})[:2] == (True, 6)
+
+def t5_witness_and_crosscheck_modes():
+    """Prove witness runs still go through the reference (it alone records the trace), and that the
+    crosscheck mode runs both and raises on a divergence instead of returning either answer."""
+    code = {"m": zkvmasm.assemble("sload r2 r0\nadd r2 r1\nsstore r0 r2\nret r2")}
+    ok, ret, st, io, steps = zkvm.run(code, "m", 7, [3, 4], {3: 10}, witness=True)
+    assert ok and ret == 14 and len(steps) == 4
+    real = zkvm.INTERP
+    try:
+        zkvm.INTERP = "crosscheck"
+        assert zkvm.run(code, "m", 7, [3, 4], {3: 10})[:3] == (True, 14, {3: 14})
+        broken = zkvm.compile_program(code["m"])
+        broken = (broken[0], zkvm._op_sub(2, 1, 0, 2)) + broken[2:]
+        orig = zkvm._program
+        zkvm._program = lambda prog: broken
+        try:
+            zkvm.run(code, "m", 7, [3, 4], {3: 10})
+            raise AssertionError("a divergence went unnoticed")
+        except zkvm.ZkVMError as e:
+            assert "diverged" in str(e)
+        finally:
+            zkvm._program = orig
+    finally:
+        zkvm.INTERP = real
+
+
+check("t1_games_match_reference", t1_games_match_reference)
+check("t2_random_programs_match_reference", t2_random_programs_match_reference)
+check("t3_gas_and_malformed_code", t3_gas_and_malformed_code)
+check("t4_decode_is_cached_by_content", t4_decode_is_cached_by_content)
+check("t5_witness_and_crosscheck_modes", t5_witness_and_crosscheck_modes)
+print("ALL PASS" if not fails else f"{fails} FAILURE(S)")
+sys.exit(1 if fails else 0)
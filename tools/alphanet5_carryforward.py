@@ -23,6 +23,7 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from ops import kv_ops
 from ops.data_ops import get_home
+from execnode.state_journal import load_payload
 
 EXEC_STATE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "exec_state.json")
 
@@ -81,7 +82,9 @@ def attribute_pot(cid, contract, pot):
 
 def build():
     kv_ops.init_env()
-    d = json.load(open(EXEC_STATE))
+    d = load_payload(EXEC_STATE)              # base + journal: the file alone may be behind the state
+    if d is None:
+        raise SystemExit(f"no usable exec state at {EXEC_STATE}")
     contracts = d.get("contracts", {})
     bridge = d.get("bridge", {})
     dividend = d.get("dividend", {})
@@ -22,6 +22,7 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from ops import kv_ops
 from ops.data_ops import get_home
+from execnode.state_journal import load_payload
 from tools.alphanet5_carryforward import attribute_pot, _num
 
 EXEC_STATE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "exec_state.json")
@@ -29,7 +30,9 @@ EXEC_STATE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file
 
 def build():
     kv_ops.init_env()
-    d = json.load(open(EXEC_STATE))
+    d = load_payload(EXEC_STATE)              # base + journal: the file alone may be behind the state
+    if d is None:
+        raise SystemExit(f"no usable exec state at {EXEC_STATE}")
     contracts = d.get("contracts", {})
     bridge = d.get("bridge", {})
     dividend = d.get("dividend", {})